@@ -2,16 +2,19 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import copy
 import functools
 import json
 import logging
 import os
 import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from glob import glob
 from pathlib import Path
-from typing import List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import git
 import requests
@@ -66,6 +69,8 @@ DOCKERFILE_FILE_NAME = "Dockerfile"
 PYPROJECT_FILE_NAME = "pyproject.toml"
 ICON_FILE_NAME = "icon.svg"
 POETRY_LOCK_FILE_NAME = "poetry.lock"
+CONNECTOR_INDEX_FILE_NAME = "airbyte-ci-connector-index.json"
+CONNECTOR_INDEX_VERSION = 2
 
 STRATEGIC_CONNECTOR_THRESHOLDS = {
     "sl": 200,
@@ -85,6 +90,27 @@ class ConnectorVersionNotFound(Exception):
     pass
 
 
+# Parsed files, keyed by the absolute path, modification time and size of the file: a modified file is parsed again
+_PARSED_FILES_CACHE: Dict[Tuple[str, int, int], Any] = {}
+
+
+def _get_file_cache_key(file_path: Path) -> Tuple[str, int, int]:
+    file_stat = os.stat(file_path)
+    return os.path.abspath(file_path), file_stat.st_mtime_ns, file_stat.st_size
+
+
+def _get_parsed_file(file_path: Path, parse: Callable[[Path], Any]) -> Any:
+    """Parse a file, or return the previous result of the parsing if the file did not change."""
+    cache_key = _get_file_cache_key(file_path)
+    if cache_key not in _PARSED_FILES_CACHE:
+        _PARSED_FILES_CACHE[cache_key] = parse(file_path)
+    return _PARSED_FILES_CACHE[cache_key]
+
+
+def _load_metadata_data(metadata_file_path: Path) -> dict:
+    return yaml.safe_load(metadata_file_path.read_text())["data"]
+
+
 def get_connector_name_from_path(path):
     return path.split("/")[2]
 
@@ -174,13 +200,19 @@ def get_gradle_dependencies_block(build_file: Path) -> str:
 def parse_gradle_dependencies(build_file: Path) -> Tuple[List[Path], List[Path]]:
     """Parse the dependencies block of a Gradle file and return the list of project dependencies and test dependencies.
 
+    The build file is parsed again only if it changed since the last call.
+
     Args:
         build_file (Path): _description_
 
     Returns:
         Tuple[List[Tuple[str, Path]], List[Tuple[str, Path]]]: _description_
     """
+    project_dependencies, test_dependencies = _get_parsed_file(build_file, _parse_gradle_dependencies)
+    return list(project_dependencies), list(test_dependencies)
 
+
+def _parse_gradle_dependencies(build_file: Path) -> Tuple[List[Path], List[Path]]:
     dependencies_block = get_gradle_dependencies_block(build_file)
 
     project_dependencies: List[Path] = []
@@ -381,7 +413,8 @@ class Connector:
         file_path = self.metadata_file_path
         if not file_path.is_file():
             return None
-        return yaml.safe_load((self.code_directory / METADATA_FILE_NAME).read_text())["data"]
+        # The metadata file is parsed again only if it changed, callers get their own copy
+        return copy.deepcopy(_get_parsed_file(file_path, _load_metadata_data))
 
     @property
     def connector_spec_file_content(self) -> Optional[dict]:
@@ -765,21 +798,112 @@ def _get_relative_connector_folder_name_from_metadata_path(metadata_file_path: s
     return metadata_file_path
 
 
+class ConnectorIndex:
+    """A persistent index of the connectors of the repo.
+
+    The relative paths of the connectors are indexed per directory of the connectors folder,
+    with the git tree hash of the directory at HEAD.
+    A directory is scanned again only if its tree hash changed or if it has uncommitted changes or untracked files.
+    The directories to scan are scanned concurrently. The index is stored as JSON in the git directory, so it is never committed.
+    The metadata files are not indexed, the connectors parse their own metadata file when it is read.
+    """
+
+    def __init__(self, repo: git.Repo, index_path: Optional[Path] = None, max_workers: int = 8):
+        self.repo = repo
+        self.repo_path = Path(repo.working_tree_dir)
+        self.index_path = index_path or Path(repo.git_dir) / CONNECTOR_INDEX_FILE_NAME
+        self.max_workers = max_workers
+
+    def _read_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_path, "r") as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get("version") != CONNECTOR_INDEX_VERSION:
+            return {}
+        return index["directories"]
+
+    def _write_index(self, directories: Dict[str, dict]) -> None:
+        # Write to a temporary file first so that a concurrent command never reads a partially written index
+        try:
+            with tempfile.NamedTemporaryFile("w", dir=self.index_path.parent, delete=False) as index_file:
+                json.dump({"version": CONNECTOR_INDEX_VERSION, "directories": directories}, index_file)
+            os.replace(index_file.name, self.index_path)
+        except OSError as e:
+            logging.warning(f"Could not write the connector index to {self.index_path}: {e}")
+
+    def _get_tree_hashes(self) -> Dict[str, str]:
+        """Get the git tree hash of each directory of the connectors folder at HEAD."""
+        tree_hashes = {}
+        for line in self.repo.git.ls_tree("-d", "HEAD", f"{CONNECTOR_PATH_PREFIX}/").splitlines():
+            object_info, directory_path = line.split("\t", 1)
+            tree_hashes[directory_path.rsplit("/", 1)[-1]] = object_info.split()[2]
+        return tree_hashes
+
+    def _get_directories_with_changes(self) -> Set[str]:
+        """Get the directories of the connectors folder with uncommitted changes or untracked files."""
+        changed_files = self.repo.git.diff("--name-only", "HEAD", "--", CONNECTOR_PATH_PREFIX).splitlines()
+        untracked_files = self.repo.git.ls_files("--others", "--exclude-standard", "--", CONNECTOR_PATH_PREFIX).splitlines()
+        return {
+            file_path[len(CONNECTOR_PATH_PREFIX) + 1 :].split("/", 1)[0]
+            for file_path in changed_files + untracked_files
+            if file_path.startswith(f"{CONNECTOR_PATH_PREFIX}/")
+        }
+
+    def _scan_directory(self, directory_name: str) -> List[str]:
+        """Glob a directory of the connectors folder for metadata.yaml files and get the relative paths of their connectors."""
+        return sorted(
+            _get_relative_connector_folder_name_from_metadata_path(metadata_file)
+            for metadata_file in glob(f"{self.repo_path}/{CONNECTOR_PATH_PREFIX}/{directory_name}/**/{METADATA_FILE_NAME}", recursive=True)
+            if SCAFFOLD_CONNECTOR_GLOB not in metadata_file
+        )
+
+    def load(self) -> List[str]:
+        """Get the sorted relative paths of all the connectors in the repo.
+
+        The index is updated with the directories which had to be scanned.
+        """
+        connectors_directory = self.repo_path / CONNECTOR_PATH_PREFIX
+        if not connectors_directory.is_dir():
+            return []
+
+        indexed_directories = self._read_index()
+        tree_hashes = self._get_tree_hashes()
+        directories_with_changes = self._get_directories_with_changes()
+
+        directories = {}
+        directories_to_scan = []
+        for directory_name in sorted(entry.name for entry in os.scandir(connectors_directory) if entry.is_dir()):
+            # A directory with changes is not indexed by its tree hash, so it is scanned until its changes are committed
+            tree_hash = tree_hashes.get(directory_name) if directory_name not in directories_with_changes else None
+            indexed_directory = indexed_directories.get(directory_name)
+            if tree_hash is not None and indexed_directory is not None and indexed_directory["tree_hash"] == tree_hash:
+                directories[directory_name] = indexed_directory
+            else:
+                directories_to_scan.append((directory_name, tree_hash))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            scanned_directories = executor.map(self._scan_directory, [directory_name for directory_name, _ in directories_to_scan])
+            for (directory_name, tree_hash), connectors in zip(directories_to_scan, scanned_directories):
+                directories[directory_name] = {"tree_hash": tree_hash, "connectors": connectors}
+
+        if directories_to_scan or directories.keys() != indexed_directories.keys():
+            self._write_index(directories)
+
+        return sorted(relative_connector_path for directory in directories.values() for relative_connector_path in directory["connectors"])
+
+
 def get_all_connectors_in_repo() -> Set[Connector]:
     """Retrieve a set of all Connectors in the repo.
     We globe the connectors folder for metadata.yaml files and construct Connectors from the directory name.
+    The connectors are read from the connector index, only the directories which changed are globbed again.
 
     Returns:
         A set of Connectors.
     """
     repo = git.Repo(search_parent_directories=True)
-    repo_path = repo.working_tree_dir
-
-    return {
-        Connector(_get_relative_connector_folder_name_from_metadata_path(metadata_file))
-        for metadata_file in glob(f"{repo_path}/{CONNECTOR_PATH_PREFIX}/**/metadata.yaml", recursive=True)
-        if SCAFFOLD_CONNECTOR_GLOB not in metadata_file
-    }
+    return {Connector(relative_connector_path) for relative_connector_path in ConnectorIndex(repo).load()}
 
 
 class ConnectorTypeEnum(str, Enum):
@@ -2,9 +2,11 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import datetime
 from contextlib import nullcontext as does_not_raise
 from pathlib import Path
 
+import git
 import pytest
 import semver
 from connector_ops import utils
@@ -174,11 +176,97 @@ def test_parse_dependencies_with_cdk(gradle_file_with_local_cdk_dependencies):
     assert all([test_dependency in expected_test_dependencies for test_dependency in test_dependencies])
 
 
-def test_get_all_connectors_in_repo():
+def test_get_all_connectors_in_repo(tmp_path, mocker):
+    # Keep the index of the repo connectors out of the git directory of the repo
+    connector_index = utils.ConnectorIndex
+    mocker.patch.object(
+        utils, "ConnectorIndex", side_effect=lambda repo: connector_index(repo, index_path=tmp_path / utils.CONNECTOR_INDEX_FILE_NAME)
+    )
     all_connectors = utils.get_all_connectors_in_repo()
+    assert (tmp_path / utils.CONNECTOR_INDEX_FILE_NAME).is_file()
     assert len(all_connectors) > 0
     for connector in all_connectors:
         assert isinstance(connector, utils.Connector)
         assert connector.metadata is not None
         if connector.has_airbyte_docs and connector.is_enabled_in_any_registry:
             assert connector.documentation_file_path.exists()
+
+
+def test_get_all_connectors_in_repo_keeps_connector_metadata_types(tmp_path, mocker):
+    connector_index = utils.ConnectorIndex
+    mocker.patch.object(
+        utils, "ConnectorIndex", side_effect=lambda repo: connector_index(repo, index_path=tmp_path / utils.CONNECTOR_INDEX_FILE_NAME)
+    )
+    mocker.patch.object(utils, "_PARSED_FILES_CACHE", {})
+    parsed_metadata = utils.Connector("destination-astra").metadata
+    assert isinstance(parsed_metadata["releaseDate"], datetime.date)
+
+    mocker.patch.object(utils, "_PARSED_FILES_CACHE", {})
+    utils.get_all_connectors_in_repo()
+    assert utils.Connector("destination-astra").metadata == parsed_metadata
+
+
+@pytest.fixture
+def connectors_repo(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    for technical_name in ["source-foo", "destination-bar", "source-scaffold-source-python"]:
+        connector_directory = tmp_path / utils.CONNECTOR_PATH_PREFIX / technical_name
+        connector_directory.mkdir(parents=True)
+        (connector_directory / utils.METADATA_FILE_NAME).write_text(f"data:\n  dockerRepository: airbyte/{technical_name}\n")
+    repo.index.add([utils.CONNECTOR_PATH_PREFIX])
+    repo.index.commit("Add connectors")
+    return repo
+
+
+def test_connector_index(connectors_repo, mocker):
+    connector_index = utils.ConnectorIndex(connectors_repo)
+    scan_directory = mocker.spy(connector_index, "_scan_directory")
+
+    assert connector_index.load() == ["destination-bar", "source-foo"]
+    assert connector_index.index_path.is_file()
+    assert scan_directory.call_count == 3
+
+    # The index is reused as long as the connector directories don't change
+    scan_directory.reset_mock()
+    assert len(utils.ConnectorIndex(connectors_repo).load()) == 2
+    assert len(connector_index.load()) == 2
+    assert scan_directory.call_count == 0
+
+    # Only the directories with uncommitted changes are scanned again
+    metadata_file_path = Path(connectors_repo.working_tree_dir) / utils.CONNECTOR_PATH_PREFIX / "source-foo" / utils.METADATA_FILE_NAME
+    metadata_file_path.write_text("data:\n  dockerRepository: airbyte/source-foo-changed\n")
+    assert connector_index.load() == ["destination-bar", "source-foo"]
+    scan_directory.assert_called_once_with("source-foo")
+
+    # Until they are committed
+    connectors_repo.index.add([str(metadata_file_path)])
+    connectors_repo.index.commit("Change source-foo")
+    scan_directory.reset_mock()
+    connector_index.load()
+    scan_directory.assert_called_once_with("source-foo")
+    scan_directory.reset_mock()
+    connector_index.load()
+    assert scan_directory.call_count == 0
+
+
+def test_connector_metadata_is_parsed_again_when_changed(tmp_path, mocker):
+    mocker.patch.object(utils.Connector, "code_directory", tmp_path)
+    metadata_file_path = tmp_path / utils.METADATA_FILE_NAME
+    metadata_file_path.write_text("data:\n  dockerImageTag: 0.1.0\n")
+    connector = utils.Connector("source-foo")
+    assert connector.version == "0.1.0"
+    connector.metadata["dockerImageTag"] = "0.0.0"
+    assert connector.version == "0.1.0"
+
+    metadata_file_path.write_text("data:\n  dockerImageTag: 0.10.0\n")
+    assert connector.version == "0.10.0"
+
+
+def test_connector_index_scans_new_connectors(connectors_repo):
+    assert utils.ConnectorIndex(connectors_repo).load() == ["destination-bar", "source-foo"]
+
+    # An untracked connector directory is scanned, although it has no tree hash at HEAD
+    connector_directory = Path(connectors_repo.working_tree_dir) / utils.CONNECTOR_PATH_PREFIX / "source-baz"
+    connector_directory.mkdir()
+    (connector_directory / utils.METADATA_FILE_NAME).write_text("data:\n  dockerRepository: airbyte/source-baz\n")
+    assert utils.ConnectorIndex(connectors_repo).load() == ["destination-bar", "source-baz", "source-foo"]
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from .base_backend import BaseBackend
 from .duckdb_backend import DuckDbBackend
+from .duckdb_record_store import DuckDbRecordStore
 from .file_backend import FileBackend
 
-__all__ = ["BaseBackend", "FileBackend", "DuckDbBackend"]
+__all__ = ["BaseBackend", "FileBackend", "DuckDbBackend", "DuckDbRecordStore"]
@@ -0,0 +1,171 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import duckdb
+
+from live_tests.commons.backends.duckdb_backend import DuckDbBackend
+
+
+class DuckDbRecordStore:
+    """Store the records of connector executions in DuckDB tables to compare them with SQL.
+
+    Each execution gets a table with one row per record, indexed by stream and primary key.
+    Counts, missing primary keys and differing records are computed by joining the tables of two executions,
+    so that only the records which differ are read back in Python.
+    """
+
+    # emitted_at changes on every sync: records are compared without it
+    COMPARED_RECORD_EXPRESSION = """CAST(json_merge_patch(record, '{"emitted_at": null}') AS VARCHAR)"""
+
+    def __init__(self, duckdb_path: Union[Path, str] = ":memory:"):
+        self.duckdb_path = duckdb_path
+        self._connection = duckdb.connect(str(duckdb_path))
+        self._tables: set[str] = set()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    @staticmethod
+    def _get_primary_key_expression(primary_key: Optional[list[str]]) -> str:
+        # The primary key value is stored as JSON text, a record without it (or with a JSON null) gets a NULL primary key
+        if not primary_key:
+            return "NULL"
+        json_path = "$.data" + "".join(f'."{field}"' for field in primary_key)
+        return f"""nullif(CAST(json_extract(record, '{json_path.replace("'", "''")}') AS VARCHAR), 'null')"""
+
+    def load(
+        self,
+        name: Iterable[str],
+        record_paths_per_stream: Mapping[str, Path],
+        primary_keys_per_stream: Mapping[str, Optional[list[str]]],
+    ) -> str:
+        """Load the records written by a FileBackend in a table, once per name, and return the table name.
+
+        Args:
+            name (Iterable[str]): The parts of the name of the table, like the schema of a DuckDbBackend.
+            record_paths_per_stream (Mapping[str, Path]): The paths of the jsonl files containing the record messages of each stream.
+            primary_keys_per_stream (Mapping[str, Optional[list[str]]]): The path of the primary key in the record data of each stream.
+        """
+        table_name = "_".join(DuckDbBackend.sanitize_table_name(part) for part in [*name, "records"])
+        if table_name in self._tables:
+            return table_name
+
+        self._connection.execute(
+            f"""
+            CREATE OR REPLACE TABLE {table_name} (
+                stream VARCHAR,
+                position BIGINT,
+                pk VARCHAR,
+                pk_occurrence BIGINT,
+                compared_record VARCHAR,
+                record VARCHAR
+            )
+            """
+        )
+        for stream, records_path in record_paths_per_stream.items():
+            if not records_path.exists():
+                continue
+            logging.info(f"Loading records of stream {stream} from {records_path} in table {table_name}")
+            self._connection.execute(
+                f"""
+                INSERT INTO {table_name}
+                SELECT
+                    $1,
+                    position,
+                    pk,
+                    row_number() OVER (PARTITION BY pk ORDER BY position),
+                    {self.COMPARED_RECORD_EXPRESSION},
+                    CAST(record AS VARCHAR)
+                FROM (
+                    SELECT position, {self._get_primary_key_expression(primary_keys_per_stream.get(stream))} AS pk, record
+                    FROM (
+                        SELECT row_number() OVER () AS position, json -> '$.record' AS record
+                        FROM read_ndjson_objects('{str(records_path).replace("'", "''")}')
+                        WHERE json ->> '$.type' = 'RECORD'
+                    )
+                )
+                """,
+                [stream],
+            )
+        self._connection.execute(f"CREATE INDEX {table_name}_stream_pk ON {table_name} (stream, pk)")
+        self._tables.add(table_name)
+        return table_name
+
+    def _fetch_records(self, query: str, parameters: list[Any]) -> list[dict]:
+        return [json.loads(record) for (record,) in self._connection.execute(query, parameters).fetchall()]
+
+    def count_records_per_stream(self, table_name: str) -> dict[str, int]:
+        return dict(self._connection.execute(f"SELECT stream, count(*) FROM {table_name} GROUP BY stream").fetchall())
+
+    def get_records_with_missing_primary_keys(self, table_name: str, other_table_name: str, stream: str) -> list[dict]:
+        """The records of a stream whose primary key is not found in the other table, sorted by primary key."""
+        return self._fetch_records(
+            f"""
+            SELECT record FROM {table_name} AS records
+            WHERE stream = $1 AND pk IS NOT NULL
+            AND NOT EXISTS (SELECT 1 FROM {other_table_name} AS other_records WHERE other_records.stream = $1 AND other_records.pk = records.pk)
+            ORDER BY pk, pk_occurrence
+            """,
+            [stream],
+        )
+
+    def get_differing_records_by_primary_key(
+        self, control_table_name: str, target_table_name: str, stream: str
+    ) -> tuple[list[dict], list[dict]]:
+        """The records of a stream whose primary key is in both tables but whose values differ, sorted by primary key.
+
+        Records sharing a primary key are matched in the order they were emitted.
+        Records without a primary key are never matched, they are compared by get_unmatched_records().
+        """
+        rows = self._connection.execute(
+            f"""
+            WITH control AS (
+                SELECT * FROM {control_table_name}
+                WHERE stream = $1 AND pk IN (SELECT pk FROM {target_table_name} WHERE stream = $1)
+            ), target AS (
+                SELECT * FROM {target_table_name}
+                WHERE stream = $1 AND pk IN (SELECT pk FROM {control_table_name} WHERE stream = $1)
+            )
+            SELECT control.record, target.record
+            FROM control FULL OUTER JOIN target ON control.pk = target.pk AND control.pk_occurrence = target.pk_occurrence
+            WHERE control.compared_record IS DISTINCT FROM target.compared_record
+            ORDER BY coalesce(control.pk, target.pk), coalesce(control.pk_occurrence, target.pk_occurrence)
+            """,
+            [stream],
+        ).fetchall()
+        control_records = [json.loads(control_record) for control_record, _ in rows if control_record is not None]
+        target_records = [json.loads(target_record) for _, target_record in rows if target_record is not None]
+        return control_records, target_records
+
+    def get_unmatched_records(self, control_table_name: str, target_table_name: str, stream: str) -> tuple[list[dict], list[dict]]:
+        """The records of a stream without a primary key which don't appear the same number of times in both tables,
+        in the order they were emitted.
+
+        All the records of a stream without a configured primary key have a NULL primary key.
+        """
+        unmatched_records_query = f"""
+            WITH control_counts AS (
+                SELECT compared_record, count(*) AS records_count FROM {control_table_name}
+                WHERE stream = $1 AND pk IS NULL GROUP BY compared_record
+            ), target_counts AS (
+                SELECT compared_record, count(*) AS records_count FROM {target_table_name}
+                WHERE stream = $1 AND pk IS NULL GROUP BY compared_record
+            )
+            SELECT coalesce(control_counts.compared_record, target_counts.compared_record) AS compared_record
+            FROM control_counts FULL OUTER JOIN target_counts ON control_counts.compared_record = target_counts.compared_record
+            WHERE control_counts.records_count IS DISTINCT FROM target_counts.records_count
+        """
+        records_query = f"""
+            SELECT record FROM {{table_name}}
+            WHERE stream = $1 AND pk IS NULL AND compared_record IN ({unmatched_records_query})
+            ORDER BY position
+        """
+        control_records = self._fetch_records(records_query.format(table_name=control_table_name), [stream])
+        target_records = self._fetch_records(records_query.format(table_name=target_table_name), [stream])
+        return control_records, target_records
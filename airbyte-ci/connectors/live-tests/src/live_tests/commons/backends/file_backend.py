@@ -124,13 +124,15 @@ class FileBackend(BaseBackend):
             stream_file_path_data_only = self.record_per_stream_directory / f"{sanitize_stream_name(stream_name)}_data_only.jsonl"
             self.record_per_stream_paths[stream_name] = stream_file_path
             self.record_per_stream_paths_data_only[stream_name] = stream_file_path_data_only
+            # The message is serialized once for both the records file and the stream file
+            serialized_message = message.json(sort_keys=True)
             return (
                 self.RELATIVE_RECORDS_PATH,
                 str(stream_file_path),
                 str(stream_file_path_data_only),
             ), (
-                message.json(sort_keys=True),
-                message.json(sort_keys=True),
+                serialized_message,
+                serialized_message,
                 json.dumps(message.record.data, sort_keys=True),
             )
 
@@ -7,11 +7,11 @@ import hashlib
 import json
 import logging
 import tempfile
+from array import array
 from collections import defaultdict
 from collections.abc import Iterable, Iterator, MutableMapping
 from dataclasses import dataclass, field
 from enum import Enum
-from functools import cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -22,6 +22,7 @@ from airbyte_protocol.models import (
     AirbyteMessage,  # type: ignore
     AirbyteStateMessage,  # type: ignore
     AirbyteStreamStatusTraceMessage,  # type: ignore
+    AirbyteTraceMessage,  # type: ignore
     ConfiguredAirbyteCatalog,  # type: ignore
     TraceType,  # type: ignore
 )
@@ -30,7 +31,7 @@ from genson import SchemaBuilder  # type: ignore
 from mitmproxy import http
 from pydantic import ValidationError
 
-from live_tests.commons.backends import DuckDbBackend, FileBackend
+from live_tests.commons.backends import DuckDbBackend, DuckDbRecordStore, FileBackend
 from live_tests.commons.secret_access import get_airbyte_api_key
 from live_tests.commons.utils import (
     get_connector_container,
@@ -255,6 +256,64 @@ class ExecutionInputs:
         return output_dir
 
 
+@dataclass
+class AirbyteMessagesIndex:
+    """The messages of a command output grouped by type and stream, built in a single pass over the output.
+
+    Records are not kept in memory: only their offset in the output is stored, by stream.
+    """
+
+    message_count_per_type: dict[AirbyteMessageType, int] = field(default_factory=lambda: defaultdict(int))
+    record_offsets_per_stream: dict[str, array] = field(default_factory=lambda: defaultdict(lambda: array("q")))
+    states_per_stream: dict[str, list[AirbyteStateMessage]] = field(default_factory=lambda: defaultdict(list))
+    statuses_per_stream: dict[str, list[AirbyteStreamStatusTraceMessage]] = field(default_factory=lambda: defaultdict(list))
+    traces_per_stream: dict[str, list[AirbyteTraceMessage]] = field(default_factory=lambda: defaultdict(list))
+
+    @classmethod
+    def from_command_output(cls: type[AirbyteMessagesIndex], command_output_path: Path) -> AirbyteMessagesIndex:
+        index = cls()
+        offset = 0
+        with open(command_output_path, "rb") as command_output:
+            for line in command_output:
+                index._add_line(line, offset)
+                offset += len(line)
+        return index
+
+    def _add_line(self, line: bytes, offset: int) -> None:
+        try:
+            raw_message = json.loads(line)
+            message_type = AirbyteMessageType(raw_message["type"])
+            if message_type is AirbyteMessageType.RECORD:
+                # Records are only parsed when they are read
+                self.record_offsets_per_stream[raw_message["record"]["stream"]].append(offset)
+            else:
+                self._add_message(AirbyteMessage.parse_obj(raw_message))
+        except (ValueError, TypeError, KeyError):
+            # Not an Airbyte message, like a log line of the connector entrypoint
+            return
+        self.message_count_per_type[message_type] += 1
+
+    def _add_message(self, message: AirbyteMessage) -> None:
+        if message.type is AirbyteMessageType.STATE:
+            if message.state.stream:
+                self.states_per_stream[message.state.stream.stream_descriptor.name].append(message.state)
+        elif message.type is AirbyteMessageType.TRACE:
+            if stream := self._get_trace_stream(message.trace):
+                self.traces_per_stream[stream].append(message.trace)
+            if message.trace.type == TraceType.STREAM_STATUS:
+                self.statuses_per_stream[message.trace.stream_status.stream_descriptor.name].append(message.trace.stream_status)
+
+    @staticmethod
+    def _get_trace_stream(trace: AirbyteTraceMessage) -> Optional[str]:
+        if trace.type == TraceType.STREAM_STATUS:
+            return trace.stream_status.stream_descriptor.name
+        if trace.type == TraceType.ERROR and trace.error.stream_descriptor:
+            return trace.error.stream_descriptor.name
+        if trace.type == TraceType.ESTIMATE:
+            return trace.estimate.name
+        return None
+
+
 @dataclass
 class ExecutionResult:
     hashed_connection_id: str
@@ -271,6 +330,7 @@ class ExecutionResult:
     http_flows: list[http.HTTPFlow] = field(default_factory=list)
     stream_schemas: Optional[dict[str, Any]] = None
     backend: Optional[FileBackend] = None
+    _messages_index: Optional[AirbyteMessagesIndex] = field(default=None, repr=False)
 
     HTTP_DUMP_FILE_NAME = "http_dump.mitm"
     HAR_FILE_NAME = "http_dump.har"
@@ -283,6 +343,13 @@ class ExecutionResult:
     def airbyte_messages(self) -> Iterable[AirbyteMessage]:
         return self.parse_airbyte_messages_from_command_output(self.stdout_file_path)
 
+    @property
+    def messages_index(self) -> AirbyteMessagesIndex:
+        if self._messages_index is None:
+            self.index_airbyte_messages()
+        assert self._messages_index is not None
+        return self._messages_index
+
     @property
     def duckdb_schema(self) -> Iterable[str]:
         return (self.connector_under_test.target_or_control.value, self.command.value, self.hashed_connection_id)
@@ -323,9 +390,14 @@ class ExecutionResult:
             config,
             http_dump,
         )
+        execution_result.index_airbyte_messages()
         await execution_result.load_http_flows()
         return execution_result
 
+    def index_airbyte_messages(self) -> None:
+        self.logger.info("Indexing Airbyte messages")
+        self._messages_index = AirbyteMessagesIndex.from_command_output(self.stdout_file_path)
+
     async def load_http_flows(self) -> None:
         if not self.http_dump:
             return
@@ -392,9 +464,11 @@ class ExecutionResult:
         return types
 
     def get_records_per_stream(self, stream: str) -> Iterator[AirbyteMessage]:
-        assert self.backend is not None, "Backend must be set to get records per stream"
         self.logger.info(f"Reading records for stream {stream}")
-        if stream not in self.backend.record_per_stream_paths:
+        if self.backend is None:
+            # The records are read from the command output, at the offsets where they were found when indexing it
+            yield from self._read_airbyte_messages_at_offsets(self.messages_index.record_offsets_per_stream.get(stream, ()))
+        elif stream not in self.backend.record_per_stream_paths:
             self.logger.warning(f"No records found for stream {stream}")
             yield from []
         else:
@@ -404,28 +478,33 @@ class ExecutionResult:
                 if message.type is AirbyteMessageType.RECORD:
                     yield message
 
+    def _read_airbyte_messages_at_offsets(self, offsets: Iterable[int]) -> Iterator[AirbyteMessage]:
+        with open(self.stdout_file_path, "rb") as command_output:
+            for offset in offsets:
+                command_output.seek(offset)
+                try:
+                    yield AirbyteMessage.parse_raw(command_output.readline())
+                except ValidationError as e:
+                    self.logger.warning(f"Error parsing AirbyteMessage: {e}")
+
+    def load_records(self, record_store: DuckDbRecordStore) -> str:
+        """Load the records of the execution in the record store and return the name of their table."""
+        assert self.backend is not None, "Backend must be set to load records"
+        return record_store.load(self.duckdb_schema, self.backend.record_per_stream_paths, self.primary_keys_per_stream)
+
     def get_states_per_stream(self, stream: str) -> Dict[str, List[AirbyteStateMessage]]:
         self.logger.info(f"Reading state messages for stream {stream}")
-        states = defaultdict(list)
-        for message in self.airbyte_messages:
-            if message.type is AirbyteMessageType.STATE:
-                states[message.state.stream.stream_descriptor.name].append(message.state)
-        return states
+        return self.messages_index.states_per_stream
 
     def get_status_messages_per_stream(self, stream: str) -> Dict[str, List[AirbyteStreamStatusTraceMessage]]:
         self.logger.info(f"Reading state messages for stream {stream}")
-        statuses = defaultdict(list)
-        for message in self.airbyte_messages:
-            if message.type is AirbyteMessageType.TRACE and message.trace.type == TraceType.STREAM_STATUS:
-                statuses[message.trace.stream_status.stream_descriptor.name].append(message.trace.stream_status)
-        return statuses
+        return self.messages_index.statuses_per_stream
+
+    def get_traces_per_stream(self, stream: str) -> List[AirbyteTraceMessage]:
+        return self.messages_index.traces_per_stream.get(stream, [])
 
-    @cache
     def get_message_count_per_type(self) -> dict[AirbyteMessageType, int]:
-        message_count: dict[AirbyteMessageType, int] = defaultdict(int)
-        for message in self.airbyte_messages:
-            message_count[message.type] += 1
-        return message_count
+        return self.messages_index.message_count_per_type
 
     async def save_http_dump(self, output_dir: Path) -> None:
         if self.http_dump:
@@ -23,6 +23,7 @@ from connection_retriever.retrieval import ConnectionNotFoundError, get_current_
 from rich.prompt import Confirm, Prompt
 
 from live_tests import stash_keys
+from live_tests.commons.backends import DuckDbRecordStore
 from live_tests.commons.connection_objects_retrieval import ConnectionObject, InvalidConnectionError, get_connection_objects
 from live_tests.commons.connector_runner import ConnectorRunner, Proxy
 from live_tests.commons.evaluation_modes import TestEvaluationMode
@@ -448,6 +449,13 @@ def duckdb_path(request: SubRequest) -> Path:
     return request.config.stash[stash_keys.DUCKDB_PATH]
 
 
+@pytest.fixture(scope="session")
+def record_store(request: SubRequest) -> Generator[DuckDbRecordStore, None, None]:
+    record_store = DuckDbRecordStore(request.config.stash[stash_keys.TEST_ARTIFACT_DIRECTORY] / "records.duckdb")
+    yield record_store
+    record_store.close()
+
+
 def get_execution_inputs_for_command(
     command: Command,
     connection_objects: ConnectionObjects,
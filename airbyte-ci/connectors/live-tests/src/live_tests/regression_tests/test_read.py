@@ -2,13 +2,13 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Callable, Generator, Iterable
-from typing import TYPE_CHECKING, Any, Optional
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Optional
 
 import pytest
-from airbyte_protocol.models import AirbyteMessage  # type: ignore
 from deepdiff import DeepDiff  # type: ignore
 
+from live_tests.commons.backends import DuckDbRecordStore
 from live_tests.commons.models import ExecutionResult
 from live_tests.utils import fail_test_on_failing_execution_results, get_and_write_diff, get_test_logger, write_string_to_test_artifact
 
@@ -38,6 +38,7 @@ class TestDataIntegrity:
         self,
         request: SubRequest,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         read_with_state_control_execution_result: ExecutionResult,
         read_with_state_target_execution_result: ExecutionResult,
     ) -> None:
@@ -46,8 +47,7 @@ class TestDataIntegrity:
         Args:
             request (SubRequest): The test request.
             record_property (Callable): A callable for stashing information on the report.
-            streams: (Iterable[str]): The list of streams configured for the connection.
-            primary_keys_per_stream (Dict[str, Optional[List[str]]]): The primary keys for each stream.
+            record_store (DuckDbRecordStore): The store in which the records of both versions are loaded to be compared.
             read_with_state_control_execution_result (ExecutionResult): The control version execution result.
             read_with_state_target_execution_result (ExecutionResult): The target version execution result.
         """
@@ -55,6 +55,8 @@ class TestDataIntegrity:
             pytest.skip("No primary keys provided on any stream. Skipping the test.")
 
         logger = get_test_logger(request)
+        control_records_table = read_with_state_control_execution_result.load_records(record_store)
+        target_records_table = read_with_state_target_execution_result.load_records(record_store)
         streams_with_missing_records = set()
         for stream_name in read_with_state_control_execution_result.configured_streams:
             _primary_key = read_with_state_control_execution_result.primary_keys_per_stream[stream_name]
@@ -63,26 +65,12 @@ class TestDataIntegrity:
                 logger.warning(f"No primary keys provided on stream {stream_name}.")
                 continue
 
-            primary_key = _primary_key[0] if isinstance(_primary_key, list) else _primary_key
-
-            control_pks = set()
-            target_pks = set()
-            logger.info(f"Retrieving primary keys for stream {stream_name} on control version.")
-            for control_record in read_with_state_control_execution_result.get_records_per_stream(stream_name):
-                control_pks.add(control_record.record.data[primary_key])
-
-            logger.info(f"Retrieving primary keys for stream {stream_name} on target version.")
-            for target_record in read_with_state_target_execution_result.get_records_per_stream(stream_name):
-                target_pks.add(target_record.record.data[primary_key])
-
-            if missing_pks := control_pks - target_pks:
-                logger.warning(f"Found {len(missing_pks)} primary keys for stream {stream_name}. Retrieving missing records.")
+            logger.info(f"Retrieving the records of stream {stream_name} whose primary key is missing on target version.")
+            if missing_records := record_store.get_records_with_missing_primary_keys(
+                control_records_table, target_records_table, stream_name
+            ):
+                logger.warning(f"Found {len(missing_records)} missing primary keys for stream {stream_name}.")
                 streams_with_missing_records.add(stream_name)
-                missing_records = [
-                    r
-                    for r in read_with_state_control_execution_result.get_records_per_stream(stream_name)
-                    if r.record.data[primary_key] in missing_pks
-                ]
                 record_property(
                     f"Missing records on stream {stream_name}",
                     json.dumps(missing_records),
@@ -100,13 +88,16 @@ class TestDataIntegrity:
     async def _check_record_counts(
         self,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         read_control_execution_result: ExecutionResult,
         read_target_execution_result: ExecutionResult,
     ) -> None:
         record_count_difference_per_stream: dict[str, dict[str, int]] = {}
+        control_records_count_per_stream = record_store.count_records_per_stream(read_control_execution_result.load_records(record_store))
+        target_records_count_per_stream = record_store.count_records_per_stream(read_target_execution_result.load_records(record_store))
         for stream_name in read_control_execution_result.configured_streams:
-            control_records_count = sum(1 for _ in read_control_execution_result.get_records_per_stream(stream_name))
-            target_records_count = sum(1 for _ in read_target_execution_result.get_records_per_stream(stream_name))
+            control_records_count = control_records_count_per_stream.get(stream_name, 0)
+            target_records_count = target_records_count_per_stream.get(stream_name, 0)
 
             difference = {
                 "delta": target_records_count - control_records_count,
@@ -134,42 +125,47 @@ class TestDataIntegrity:
         self,
         request: SubRequest,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         read_control_execution_result: ExecutionResult,
         read_target_execution_result: ExecutionResult,
     ) -> None:
         """This test checks if all records in the control version are present in the target version for each stream.
         If there are mismatches, the test fails and the missing records are stored in the test artifacts.
         It will catch differences in record schemas, missing records, and extra records.
+        The records are matched in the record store, only the ones which differ are diffed.
 
         Args:
             request (SubRequest): The test request.
+            record_store (DuckDbRecordStore): The store in which the records of both versions are loaded to be compared.
             read_control_execution_result (ExecutionResult): The control version execution result.
             read_target_execution_result (ExecutionResult): The target version execution result.
         """
+        control_records_table = read_control_execution_result.load_records(record_store)
+        target_records_table = read_target_execution_result.load_records(record_store)
+        control_records_count_per_stream = record_store.count_records_per_stream(control_records_table)
+        target_records_count_per_stream = record_store.count_records_per_stream(target_records_table)
         streams_with_diff = set()
         for stream in read_control_execution_result.configured_streams:
-            control_records = list(read_control_execution_result.get_records_per_stream(stream))
-            target_records = list(read_target_execution_result.get_records_per_stream(stream))
-
-            if control_records and not target_records:
+            if control_records_count_per_stream.get(stream) and not target_records_count_per_stream.get(stream):
                 pytest.fail(f"Stream {stream} is missing in the target version.")
 
-            if primary_key := read_control_execution_result.primary_keys_per_stream.get(stream):
+            if read_control_execution_result.primary_keys_per_stream.get(stream):
                 diffs = self._get_diff_on_stream_with_pk(
                     request,
                     record_property,
+                    record_store,
                     stream,
-                    control_records,
-                    target_records,
-                    primary_key,
+                    control_records_table,
+                    target_records_table,
                 )
             else:
                 diffs = self._get_diff_on_stream_without_pk(
                     request,
                     record_property,
+                    record_store,
                     stream,
-                    control_records,
-                    target_records,
+                    control_records_table,
+                    target_records_table,
                 )
 
             if diffs:
@@ -237,6 +233,7 @@ class TestDataIntegrity:
     async def test_record_count_with_state(
         self,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         read_with_state_control_execution_result: ExecutionResult,
         read_with_state_target_execution_result: ExecutionResult,
     ) -> None:
@@ -258,6 +255,7 @@ class TestDataIntegrity:
         )
         await self._check_record_counts(
             record_property,
+            record_store,
             read_with_state_control_execution_result,
             read_with_state_target_execution_result,
         )
@@ -266,6 +264,7 @@ class TestDataIntegrity:
     async def test_record_count_without_state(
         self,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         read_control_execution_result: ExecutionResult,
         read_target_execution_result: ExecutionResult,
     ) -> None:
@@ -287,6 +286,7 @@ class TestDataIntegrity:
         )
         await self._check_record_counts(
             record_property,
+            record_store,
             read_control_execution_result,
             read_target_execution_result,
         )
@@ -296,6 +296,7 @@ class TestDataIntegrity:
         self,
         request: SubRequest,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         read_with_state_control_execution_result: ExecutionResult,
         read_with_state_target_execution_result: ExecutionResult,
     ) -> None:
@@ -313,6 +314,7 @@ class TestDataIntegrity:
         await self._check_all_pks_are_produced_in_target_version(
             request,
             record_property,
+            record_store,
             read_with_state_control_execution_result,
             read_with_state_target_execution_result,
         )
@@ -322,6 +324,7 @@ class TestDataIntegrity:
         self,
         request: SubRequest,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         read_control_execution_result: ExecutionResult,
         read_target_execution_result: ExecutionResult,
     ) -> None:
@@ -339,6 +342,7 @@ class TestDataIntegrity:
         await self._check_all_pks_are_produced_in_target_version(
             request,
             record_property,
+            record_store,
             read_control_execution_result,
             read_target_execution_result,
         )
@@ -389,6 +393,7 @@ class TestDataIntegrity:
         self,
         request: SubRequest,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         read_with_state_control_execution_result: ExecutionResult,
         read_with_state_target_execution_result: ExecutionResult,
     ) -> None:
@@ -407,6 +412,7 @@ class TestDataIntegrity:
         await self._check_all_records_are_the_same(
             request,
             record_property,
+            record_store,
             read_with_state_control_execution_result,
             read_with_state_target_execution_result,
         )
@@ -417,6 +423,7 @@ class TestDataIntegrity:
         self,
         request: SubRequest,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         read_control_execution_result: ExecutionResult,
         read_target_execution_result: ExecutionResult,
     ) -> None:
@@ -435,6 +442,7 @@ class TestDataIntegrity:
         await self._check_all_records_are_the_same(
             request,
             record_property,
+            record_store,
             read_control_execution_result,
             read_target_execution_result,
         )
@@ -443,20 +451,16 @@ class TestDataIntegrity:
         self,
         request: SubRequest,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         stream: str,
-        control_records: list[AirbyteMessage],
-        target_records: list[AirbyteMessage],
-        primary_key: list[str],
+        control_records_table: str,
+        target_records_table: str,
     ) -> Optional[Iterable[str]]:
-        control_pks = {r.record.data[primary_key[0]] for r in control_records}
-        target_pks = {r.record.data[primary_key[0]] for r in target_records}
-
-        # Compare the diff for all records whose primary key is in
+        # Compare the diff for all records whose primary key is in both versions but whose values differ
         record_diff_path_prefix = f"{stream}_record_diff"
         record_diff = get_and_write_diff(
             request,
-            _get_filtered_sorted_records(control_records, target_pks, True, primary_key),
-            _get_filtered_sorted_records(target_records, control_pks, True, primary_key),
+            *record_store.get_differing_records_by_primary_key(control_records_table, target_records_table, stream),
             record_diff_path_prefix,
             ignore_order=False,
             exclude_paths=EXCLUDE_PATHS,
@@ -465,7 +469,7 @@ class TestDataIntegrity:
         control_records_diff_path_prefix = f"{stream}_control_records_diff"
         control_records_diff = get_and_write_diff(
             request,
-            _get_filtered_sorted_records(control_records, target_pks, False, primary_key),
+            record_store.get_records_with_missing_primary_keys(control_records_table, target_records_table, stream),
             [],
             control_records_diff_path_prefix,
             ignore_order=False,
@@ -476,13 +480,23 @@ class TestDataIntegrity:
         target_records_diff = get_and_write_diff(
             request,
             [],
-            _get_filtered_sorted_records(target_records, control_pks, False, primary_key),
+            record_store.get_records_with_missing_primary_keys(target_records_table, control_records_table, stream),
             target_records_diff_path_prefix,
             ignore_order=False,
             exclude_paths=EXCLUDE_PATHS,
         )
 
-        has_diff = record_diff or control_records_diff or target_records_diff
+        # Records without a primary key value can't be matched, they are compared like the records of a stream without primary key
+        records_without_pk_diff_path_prefix = f"{stream}_records_without_pk_diff"
+        records_without_pk_diff = get_and_write_diff(
+            request,
+            *record_store.get_unmatched_records(control_records_table, target_records_table, stream),
+            records_without_pk_diff_path_prefix,
+            ignore_order=True,
+            exclude_paths=EXCLUDE_PATHS,
+        )
+
+        has_diff = record_diff or control_records_diff or target_records_diff or records_without_pk_diff
 
         if has_diff:
             record_property(
@@ -497,22 +511,27 @@ class TestDataIntegrity:
                 f"{stream} stream: records in target but not control",
                 target_records_diff,
             )
+            record_property(
+                f"{stream} stream: records without primary key in target & control which differ",
+                records_without_pk_diff,
+            )
 
-            return (record_diff, control_records_diff, target_records_diff)
+            return (record_diff, control_records_diff, target_records_diff, records_without_pk_diff)
         return None
 
     def _get_diff_on_stream_without_pk(
         self,
         request: SubRequest,
         record_property: Callable,
+        record_store: DuckDbRecordStore,
         stream: str,
-        control_records: list[AirbyteMessage],
-        target_records: list[AirbyteMessage],
+        control_records_table: str,
+        target_records_table: str,
     ) -> Optional[Iterable[str]]:
+        # Records appearing as many times in both versions are left out of the diff
         diff = get_and_write_diff(
             request,
-            [json.loads(r.record.json(sort_keys=True)) for r in control_records],
-            [json.loads(r.record.json(sort_keys=True)) for r in target_records],
+            *record_store.get_unmatched_records(control_records_table, target_records_table, stream),
             f"{stream}_diff",
             ignore_order=True,
             exclude_paths=EXCLUDE_PATHS,
@@ -521,31 +540,3 @@ class TestDataIntegrity:
             record_property(f"Diff for stream {stream}", diff)
             return (diff,)
         return None
-
-
-def _get_filtered_sorted_records(
-    records: list[AirbyteMessage],
-    primary_key_set: set[Generator[Any, Any, None]],
-    include_target: bool,
-    primary_key: list[str],
-) -> list[dict]:
-    """
-    Get a list of records sorted by primary key, and filtered as specified.
-
-    For example, if `include_target` is true, we filter the records such that
-    only those whose primary key is in `primary_key_set` are returned.
-    If `include_target` is false, we only return records whose primary key
-    is not in `primary_key_set`.
-    """
-    if include_target:
-        _filter = lambda x: x["data"].get(primary_key[0]) in primary_key_set
-    else:
-        _filter = lambda x: x["data"].get(primary_key[0]) not in primary_key_set
-
-    return sorted(
-        filter(
-            _filter,
-            [json.loads(s.record.json(sort_keys=True)) for s in records],
-        ),
-        key=lambda x: x["data"][primary_key[0]],
-    )
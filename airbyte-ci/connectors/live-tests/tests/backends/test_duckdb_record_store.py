@@ -0,0 +1,117 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+import json
+
+import pytest
+from airbyte_protocol.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage
+from airbyte_protocol.models import Type as AirbyteMessageType
+
+from live_tests.commons.backends import DuckDbRecordStore, FileBackend
+
+
+def get_record_message(stream: str, data: dict, emitted_at: int = 1) -> AirbyteMessage:
+    return AirbyteMessage(type=AirbyteMessageType.RECORD, record=AirbyteRecordMessage(stream=stream, data=data, emitted_at=emitted_at))
+
+
+def get_record(stream: str, data: dict, emitted_at: int) -> dict:
+    return json.loads(get_record_message(stream, data, emitted_at).record.json())
+
+
+@pytest.fixture
+def record_store():
+    record_store = DuckDbRecordStore()
+    yield record_store
+    record_store.close()
+
+
+@pytest.fixture
+def records_tables(tmp_path, record_store):
+    control_backend = FileBackend(tmp_path / "control")
+    control_backend.write(
+        [
+            get_record_message("users", {"id": 1, "name": "a"}),
+            get_record_message("users", {"id": 2, "name": "b"}),
+            get_record_message("users", {"id": 3, "name": "c"}),
+            AirbyteMessage(type=AirbyteMessageType.STATE, state=AirbyteStateMessage(data={"cursor": 3})),
+            get_record_message("events", {"name": "x"}),
+            get_record_message("events", {"name": "x"}),
+            get_record_message("events", {"name": "y"}),
+        ]
+    )
+    target_backend = FileBackend(tmp_path / "target")
+    target_backend.write(
+        [
+            # only emitted_at differs
+            get_record_message("users", {"id": 1, "name": "a"}, emitted_at=2),
+            get_record_message("users", {"id": 3, "name": "changed"}, emitted_at=2),
+            get_record_message("users", {"id": 4, "name": "d"}, emitted_at=2),
+            get_record_message("events", {"name": "y"}, emitted_at=2),
+            get_record_message("events", {"name": "x"}, emitted_at=2),
+        ]
+    )
+    primary_keys_per_stream = {"users": ["id"], "events": None}
+    control_table = record_store.load(("control", "read"), control_backend.record_per_stream_paths, primary_keys_per_stream)
+    target_table = record_store.load(("target", "read"), target_backend.record_per_stream_paths, primary_keys_per_stream)
+    return control_table, target_table
+
+
+def test_load_is_done_once_per_name(tmp_path, record_store, records_tables):
+    control_table, target_table = records_tables
+    assert control_table != target_table
+    assert record_store.load(("control", "read"), {}, {}) == control_table
+    assert record_store.count_records_per_stream(control_table) == {"users": 3, "events": 3}
+    assert record_store.count_records_per_stream(target_table) == {"users": 3, "events": 2}
+
+
+def test_get_records_with_missing_primary_keys(record_store, records_tables):
+    control_table, target_table = records_tables
+    assert record_store.get_records_with_missing_primary_keys(control_table, target_table, "users") == [
+        get_record("users", {"id": 2, "name": "b"}, 1)
+    ]
+    assert record_store.get_records_with_missing_primary_keys(target_table, control_table, "users") == [
+        get_record("users", {"id": 4, "name": "d"}, 2)
+    ]
+    assert record_store.get_records_with_missing_primary_keys(control_table, target_table, "events") == []
+
+
+def test_get_differing_records_by_primary_key(record_store, records_tables):
+    control_table, target_table = records_tables
+    assert record_store.get_differing_records_by_primary_key(control_table, target_table, "users") == (
+        [get_record("users", {"id": 3, "name": "c"}, 1)],
+        [get_record("users", {"id": 3, "name": "changed"}, 2)],
+    )
+
+
+def test_get_unmatched_records(record_store, records_tables):
+    control_table, target_table = records_tables
+    assert record_store.get_unmatched_records(control_table, target_table, "events") == (
+        [get_record("events", {"name": "x"}, 1), get_record("events", {"name": "x"}, 1)],
+        [get_record("events", {"name": "x"}, 2)],
+    )
+
+
+def test_records_without_primary_key_are_not_matched_by_primary_key(tmp_path, record_store):
+    control_backend = FileBackend(tmp_path / "control")
+    control_backend.write(
+        [
+            get_record_message("users", {"name": "a"}),
+            get_record_message("users", {"id": None, "name": "b"}),
+        ]
+    )
+    target_backend = FileBackend(tmp_path / "target")
+    target_backend.write(
+        [
+            get_record_message("users", {"name": "a"}, emitted_at=2),
+            get_record_message("users", {"name": "c"}, emitted_at=2),
+        ]
+    )
+    primary_keys_per_stream = {"users": ["id"]}
+    control_table = record_store.load(("control", "read"), control_backend.record_per_stream_paths, primary_keys_per_stream)
+    target_table = record_store.load(("target", "read"), target_backend.record_per_stream_paths, primary_keys_per_stream)
+
+    assert record_store.get_records_with_missing_primary_keys(control_table, target_table, "users") == []
+    assert record_store.get_differing_records_by_primary_key(control_table, target_table, "users") == ([], [])
+    assert record_store.get_unmatched_records(control_table, target_table, "users") == (
+        [get_record("users", {"id": None, "name": "b"}, 1)],
+        [get_record("users", {"name": "c"}, 2)],
+    )
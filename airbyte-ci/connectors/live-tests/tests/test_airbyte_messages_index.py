@@ -0,0 +1,79 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+from airbyte_protocol.models import (
+    AirbyteLogMessage,
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStateType,
+    AirbyteStreamState,
+    AirbyteStreamStatus,
+    AirbyteStreamStatusTraceMessage,
+    AirbyteTraceMessage,
+    Level,
+    StreamDescriptor,
+    TraceType,
+)
+from airbyte_protocol.models import Type as AirbyteMessageType
+
+from live_tests.commons.models import AirbyteMessagesIndex
+
+
+def get_record_message(stream: str, index: int) -> AirbyteMessage:
+    return AirbyteMessage(type=AirbyteMessageType.RECORD, record=AirbyteRecordMessage(stream=stream, data={"id": index}, emitted_at=1))
+
+
+def get_state_message(stream: str) -> AirbyteMessage:
+    return AirbyteMessage(
+        type=AirbyteMessageType.STATE,
+        state=AirbyteStateMessage(
+            type=AirbyteStateType.STREAM,
+            stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name=stream), stream_state={"cursor": 1}),
+        ),
+    )
+
+
+def get_status_message(stream: str, status: AirbyteStreamStatus) -> AirbyteMessage:
+    return AirbyteMessage(
+        type=AirbyteMessageType.TRACE,
+        trace=AirbyteTraceMessage(
+            type=TraceType.STREAM_STATUS,
+            emitted_at=1,
+            stream_status=AirbyteStreamStatusTraceMessage(stream_descriptor=StreamDescriptor(name=stream), status=status),
+        ),
+    )
+
+
+def test_from_command_output(tmp_path):
+    messages = [
+        AirbyteMessage(type=AirbyteMessageType.LOG, log=AirbyteLogMessage(level=Level.INFO, message="Starting the sync")),
+        get_status_message("users", AirbyteStreamStatus.STARTED),
+        get_record_message("users", 1),
+        get_record_message("events", 1),
+        get_record_message("users", 2),
+        get_state_message("users"),
+        get_status_message("users", AirbyteStreamStatus.COMPLETE),
+    ]
+    lines = [message.json(exclude_unset=True) for message in messages]
+    lines.insert(1, "not an Airbyte message")
+    command_output_path = tmp_path / "stdout.log"
+    command_output_path.write_text("\n".join(lines) + "\n")
+
+    index = AirbyteMessagesIndex.from_command_output(command_output_path)
+
+    assert index.message_count_per_type == {
+        AirbyteMessageType.LOG: 1,
+        AirbyteMessageType.TRACE: 2,
+        AirbyteMessageType.RECORD: 3,
+        AirbyteMessageType.STATE: 1,
+    }
+    with open(command_output_path, "rb") as command_output:
+        records_per_stream = {}
+        for stream, offsets in index.record_offsets_per_stream.items():
+            for offset in offsets:
+                command_output.seek(offset)
+                records_per_stream.setdefault(stream, []).append(AirbyteMessage.parse_raw(command_output.readline()))
+    assert records_per_stream == {"users": [messages[2], messages[4]], "events": [messages[3]]}
+    assert index.states_per_stream == {"users": [messages[5].state]}
+    assert index.statuses_per_stream == {"users": [messages[1].trace.stream_status, messages[6].trace.stream_status]}
+    assert index.traces_per_stream == {"users": [messages[1].trace, messages[6].trace]}
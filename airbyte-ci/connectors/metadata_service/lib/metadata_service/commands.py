@@ -69,18 +69,27 @@ def validate(metadata_file_path: pathlib.Path, docs_path: pathlib.Path):
 @click.argument("bucket-name", type=click.STRING, required=True)
 @click.option("--prerelease", type=click.STRING, required=False, default=None, help="The prerelease tag of the connector.")
 @click.option("--disable-dockerhub-checks", is_flag=True, help="Disable 'image exists on DockerHub' validations.", default=False)
-def upload(metadata_file_path: pathlib.Path, docs_path: pathlib.Path, bucket_name: str, prerelease: str, disable_dockerhub_checks: bool):
+@click.option("--dry-run", is_flag=True, help="Print the files that would be uploaded, without uploading them.", default=False)
+def upload(
+    metadata_file_path: pathlib.Path,
+    docs_path: pathlib.Path,
+    bucket_name: str,
+    prerelease: str,
+    disable_dockerhub_checks: bool,
+    dry_run: bool,
+):
     metadata_file_path = metadata_file_path if not metadata_file_path.is_dir() else metadata_file_path / METADATA_FILE_NAME
     validator_opts = ValidatorOptions(
         docs_path=str(docs_path), prerelease_tag=prerelease, disable_dockerhub_checks=disable_dockerhub_checks
     )
     try:
-        upload_info = upload_metadata_to_gcs(bucket_name, metadata_file_path, validator_opts)
-        log_metadata_upload_info(upload_info)
+        upload_info = upload_metadata_to_gcs(bucket_name, metadata_file_path, validator_opts, dry_run=dry_run)
+        if not dry_run:
+            log_metadata_upload_info(upload_info)
     except (ValidationError, FileNotFoundError) as e:
         click.secho(f"The metadata file could not be uploaded: {str(e)}", fg="red")
         exit(1)
-    if upload_info.metadata_uploaded:
+    if dry_run or upload_info.metadata_uploaded:
         exit(0)
     else:
         exit(5)
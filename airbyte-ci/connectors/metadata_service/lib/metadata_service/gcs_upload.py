@@ -7,9 +7,10 @@ import logging
 import os
 import re
 import tempfile
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, NamedTuple, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import git
 import requests
@@ -69,9 +70,33 @@ class MetadataDeleteInfo:
     deleted_files: List[DeletedFile]
 
 
-class MaybeUpload(NamedTuple):
-    uploaded: bool
-    blob_id: str
+@dataclass(frozen=True)
+class PlannedUpload:
+    file_id: str
+    local_file_path: Path
+    blob_path: str
+    disable_cache: bool = False
+    local_md5_hash: Optional[str] = None
+    remote_md5_hash: Optional[str] = None
+    remote_blob_id: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class UploadPlan:
+    """The files to upload, compared by md5 hash with the blobs already in the bucket."""
+
+    to_upload: List[PlannedUpload] = field(default_factory=list)
+    unchanged: List[PlannedUpload] = field(default_factory=list)
+
+    def diff(self) -> str:
+        """A dry-run diff of the plan: `+` for new blobs, `~` for changed blobs and `=` for unchanged blobs."""
+        lines = []
+        for planned_upload in self.to_upload:
+            status = "+" if planned_upload.remote_md5_hash is None else "~"
+            lines.append(f"{status} {planned_upload.blob_path} ({planned_upload.local_file_path})")
+        for planned_upload in self.unchanged:
+            lines.append(f"= {planned_upload.blob_path} ({planned_upload.local_file_path})")
+        return "\n".join(lines)
 
 
 @dataclass
@@ -218,33 +243,92 @@ def _save_blob_to_gcs(blob_to_save: storage.blob.Blob, file_path: Path, disable_
     return True
 
 
-def upload_file_if_changed(
-    local_file_path: Path, bucket: storage.bucket.Bucket, blob_path: str, disable_cache: bool = False
-) -> MaybeUpload:
-    """Upload a file to GCS if it has changed."""
-    local_file_md5_hash = compute_gcs_md5(local_file_path)
-    remote_blob = bucket.blob(blob_path)
+class UploadPlanner:
+    """Plan and run the uploads of files to a GCS bucket, skipping the blobs whose md5 hash did not change.
 
-    # reload the blob to get the md5_hash
-    if remote_blob.exists():
-        remote_blob.reload()
-
-    remote_blob_md5_hash = remote_blob.md5_hash if remote_blob.exists() else None
-
-    print(f"Local {local_file_path} md5_hash: {local_file_md5_hash}")
-    print(f"Remote {blob_path} md5_hash: {remote_blob_md5_hash}")
+    The md5 hashes of the local files are computed once per file and compared with the md5 hashes
+    of the remote blobs, fetched with a single listing of the prefix all the blobs are under.
+    The changed files are then uploaded by a bounded pool of threads.
+    """
 
-    if local_file_md5_hash != remote_blob_md5_hash:
-        uploaded = _save_blob_to_gcs(remote_blob, local_file_path, disable_cache=disable_cache)
-        return MaybeUpload(uploaded, remote_blob.id)
+    def __init__(self, bucket: storage.bucket.Bucket, prefix: str, max_workers: int = 8):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.max_workers = max_workers
+        self._planned_uploads: List[PlannedUpload] = []
+
+    def add(self, file_id: str, local_file_path: Path, blob_path: str, disable_cache: bool = False) -> None:
+        if not blob_path.startswith(self.prefix):
+            raise ValueError(f"The blob path {blob_path} is not under the prefix {self.prefix} of the upload planner.")
+        self._planned_uploads.append(
+            PlannedUpload(file_id=file_id, local_file_path=local_file_path, blob_path=blob_path, disable_cache=disable_cache)
+        )
 
-    return MaybeUpload(False, remote_blob.id)
+    def get_local_manifest(self) -> Dict[str, str]:
+        """The md5 hash of the local file to upload to each blob path."""
+        md5_hashes_per_local_file = {}
+        local_manifest = {}
+        for planned_upload in self._planned_uploads:
+            local_file_path = planned_upload.local_file_path
+            if local_file_path not in md5_hashes_per_local_file:
+                md5_hashes_per_local_file[local_file_path] = compute_gcs_md5(local_file_path)
+            local_manifest[planned_upload.blob_path] = md5_hashes_per_local_file[local_file_path]
+        return local_manifest
+
+    def get_remote_blobs(self) -> Dict[str, storage.blob.Blob]:
+        """The blobs under the prefix of the planner, with their md5 hash, listed at once."""
+        return {blob.name: blob for blob in self.bucket.list_blobs(prefix=self.prefix)}
+
+    def plan(self) -> UploadPlan:
+        local_manifest = self.get_local_manifest()
+        remote_blobs = self.get_remote_blobs()
+        plan = UploadPlan()
+        for planned_upload in self._planned_uploads:
+            remote_blob = remote_blobs.get(planned_upload.blob_path)
+            planned_upload = PlannedUpload(
+                file_id=planned_upload.file_id,
+                local_file_path=planned_upload.local_file_path,
+                blob_path=planned_upload.blob_path,
+                disable_cache=planned_upload.disable_cache,
+                local_md5_hash=local_manifest[planned_upload.blob_path],
+                remote_md5_hash=remote_blob.md5_hash if remote_blob else None,
+                remote_blob_id=remote_blob.id if remote_blob else None,
+            )
+            print(f"Local {planned_upload.local_file_path} md5_hash: {planned_upload.local_md5_hash}")
+            print(f"Remote {planned_upload.blob_path} md5_hash: {planned_upload.remote_md5_hash}")
+            if planned_upload.local_md5_hash != planned_upload.remote_md5_hash:
+                plan.to_upload.append(planned_upload)
+            else:
+                plan.unchanged.append(planned_upload)
+        return plan
+
+    def _upload(self, planned_upload: PlannedUpload) -> UploadedFile:
+        blob = self.bucket.blob(planned_upload.blob_path)
+        uploaded = _save_blob_to_gcs(blob, planned_upload.local_file_path, disable_cache=planned_upload.disable_cache)
+        return UploadedFile(id=planned_upload.file_id, uploaded=uploaded, blob_id=blob.id)
+
+    def upload(self, plan: UploadPlan, dry_run: bool = False) -> Dict[str, UploadedFile]:
+        """Upload the changed files of a plan and return the upload result of each planned file id.
+
+        On a dry run, the diff of the plan is printed and nothing is uploaded.
+        """
+        uploaded_files = {
+            planned_upload.file_id: UploadedFile(id=planned_upload.file_id, uploaded=False, blob_id=planned_upload.remote_blob_id)
+            for planned_upload in plan.to_upload + plan.unchanged
+        }
+        if dry_run:
+            print(f"Dry run, the following files would be uploaded to {self.prefix}:\n{plan.diff()}")
+            return uploaded_files
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for uploaded_file in executor.map(self._upload, plan.to_upload):
+                uploaded_files[uploaded_file.id] = uploaded_file
+        return uploaded_files
 
 
 def _file_upload(
     local_path: Path | None,
     gcp_connector_dir: str,
-    bucket: storage.bucket.Bucket,
+    upload_planner: UploadPlanner,
     file_key: str,
     *,
     upload_as_version: bool,
@@ -253,8 +337,8 @@ def _file_upload(
     disable_cache: bool = False,
     version_folder: Optional[str] = None,
     override_destination_file_name: str | None = None,
-) -> tuple[UploadedFile, UploadedFile]:
-    """Upload a file to GCS.
+) -> tuple[str, str]:
+    """Plan the upload of a file to GCS.
 
     Optionally upload it as a versioned file and/or as the latest version.
 
@@ -262,29 +346,25 @@ def _file_upload(
         local_path: Path to the file to upload.
         gcp_connector_dir: Path to the connector folder in GCS. This is the parent folder,
             containing the versioned and "latest" folders as its subdirectories.
-        bucket: GCS bucket to upload the file to.
+        upload_planner: The planner of the uploads to the GCS bucket.
         upload_as_version: The version to upload the file as or 'False' to skip uploading
             the versioned copy.
         upload_as_latest: Whether to upload the file as the latest version.
         skip_if_not_exists: Whether to skip the upload if the file does not exist. Otherwise,
             an exception will be raised if the file does not exist.
 
-    Returns: Tuple of two UploadInfo objects, each containing a boolean indicating whether the file was
-        uploaded, the blob id, and the description. The first tuple is for the versioned file, the second for the
-        latest file.
+    Returns: Tuple of the ids of the versioned file and of the latest file, whether their upload was planned or not.
     """
     if upload_as_version and not version_folder:
         raise ValueError("version_folder must be provided if upload_as_version is True")
 
     latest_file_key = f"latest_{file_key}"
     versioned_file_key = f"versioned_{file_key}"
-    versioned_file_info = UploadedFile(id=versioned_file_key, uploaded=False, blob_id=None)
-    latest_file_info = UploadedFile(id=latest_file_key, uploaded=False, blob_id=None)
     if not local_path or not local_path.exists():
         msg = f"Expected to find file at {local_path}, but none was found."
         if skip_if_not_exists:
             logging.warning(msg)
-            return versioned_file_info, latest_file_info
+            return versioned_file_key, latest_file_key
 
         raise FileNotFoundError(msg)
 
@@ -292,25 +372,23 @@ def _file_upload(
 
     if upload_as_version:
         remote_upload_path = f"{gcp_connector_dir}/{version_folder}"
-        versioned_uploaded, versioned_blob_id = upload_file_if_changed(
+        upload_planner.add(
+            file_id=versioned_file_key,
             local_file_path=local_path,
-            bucket=bucket,
             blob_path=f"{remote_upload_path}/{file_name}",
             disable_cache=disable_cache,
         )
-        versioned_file_info = UploadedFile(id=versioned_file_key, uploaded=versioned_uploaded, blob_id=versioned_blob_id)
 
     if upload_as_latest:
         remote_upload_path = f"{gcp_connector_dir}/{LATEST_GCS_FOLDER_NAME}"
-        latest_uploaded, latest_blob_id = upload_file_if_changed(
+        upload_planner.add(
+            file_id=latest_file_key,
             local_file_path=local_path,
-            bucket=bucket,
             blob_path=f"{remote_upload_path}/{file_name}",
             disable_cache=disable_cache,
         )
-        latest_file_info = UploadedFile(id=latest_file_key, uploaded=latest_uploaded, blob_id=latest_blob_id)
 
-    return versioned_file_info, latest_file_info
+    return versioned_file_key, latest_file_key
 
 
 # 🔧 METADATA MODIFICATIONS
@@ -401,7 +479,9 @@ def _apply_modifications_to_metadata_file(
 # 💎 Main Logic
 
 
-def upload_metadata_to_gcs(bucket_name: str, metadata_file_path: Path, validator_opts: ValidatorOptions) -> MetadataUploadInfo:
+def upload_metadata_to_gcs(
+    bucket_name: str, metadata_file_path: Path, validator_opts: ValidatorOptions, dry_run: bool = False
+) -> MetadataUploadInfo:
     """Upload a metadata file to a GCS bucket.
 
     If the per 'version' key already exists it won't be overwritten.
@@ -412,6 +492,7 @@ def upload_metadata_to_gcs(bucket_name: str, metadata_file_path: Path, validator
         metadata_file_path (Path): Path to the metadata file.
         service_account_file_path (Path): Path to the JSON file with the service account allowed to read and write on the bucket.
         prerelease_tag (Optional[str]): Whether the connector is a prerelease_tag or not.
+        dry_run (bool): Whether to only print the diff of the files to upload, without uploading them.
     Returns:
         Tuple[bool, str]: Whether the metadata file was uploaded and its blob id.
     """
@@ -444,117 +525,122 @@ def upload_metadata_to_gcs(bucket_name: str, metadata_file_path: Path, validator
     # Otherwise, we use the dockerImageTag from the metadata
     version_folder = metadata.data.dockerImageTag if not is_pre_release else validator_opts.prerelease_tag
 
-    # Start uploading files
-    uploaded_files = []
+    # Start planning the uploads of the files, all under the connector folder
+    upload_planner = UploadPlanner(bucket, prefix=f"{gcp_connector_dir}/")
+    file_ids = []
 
     # Metadata upload
-    metadata_files_uploaded = _file_upload(
+    metadata_file_ids = _file_upload(
         file_key="metadata",
         local_path=metadata_file_path,
         gcp_connector_dir=gcp_connector_dir,
-        bucket=bucket,
+        upload_planner=upload_planner,
         version_folder=version_folder,
         upload_as_version=True,
         upload_as_latest=should_upload_latest,
         disable_cache=True,
         override_destination_file_name=METADATA_FILE_NAME,
     )
-    uploaded_files.extend(metadata_files_uploaded)
+    file_ids.extend(metadata_file_ids)
 
     # Release candidate upload
     # We just upload the current metadata to the "release_candidate" path
     # The doc and inapp doc are not uploaded, which means that the release candidate will still point to the latest doc
     if should_upload_release_candidate:
-        release_candidate_files_uploaded = _file_upload(
+        release_candidate_file_ids = _file_upload(
             file_key="release_candidate",
             local_path=metadata_file_path,
             gcp_connector_dir=gcp_connector_dir,
-            bucket=bucket,
+            upload_planner=upload_planner,
             version_folder=RELEASE_CANDIDATE_GCS_FOLDER_NAME,
             upload_as_version=True,
             upload_as_latest=False,
             disable_cache=True,
             override_destination_file_name=METADATA_FILE_NAME,
         )
-        uploaded_files.extend(release_candidate_files_uploaded)
+        file_ids.extend(release_candidate_file_ids)
 
     # Icon upload
 
-    icon_files_uploaded = _file_upload(
+    icon_file_ids = _file_upload(
         file_key="icon",
         local_path=working_directory / ICON_FILE_NAME,
         gcp_connector_dir=gcp_connector_dir,
-        bucket=bucket,
+        upload_planner=upload_planner,
         upload_as_version=False,
         upload_as_latest=should_upload_latest,
     )
-    uploaded_files.extend(icon_files_uploaded)
+    file_ids.extend(icon_file_ids)
 
     # Doc upload
 
     local_doc_path = get_doc_local_file_path(metadata, docs_path, inapp=False)
-    doc_files_uploaded = _file_upload(
+    doc_file_ids = _file_upload(
         file_key="doc",
         local_path=local_doc_path,
         gcp_connector_dir=gcp_connector_dir,
-        bucket=bucket,
+        upload_planner=upload_planner,
         upload_as_version=True,
         version_folder=version_folder,
         upload_as_latest=should_upload_latest,
         override_destination_file_name=DOC_FILE_NAME,
     )
-    uploaded_files.extend(doc_files_uploaded)
+    file_ids.extend(doc_file_ids)
 
     local_inapp_doc_path = get_doc_local_file_path(metadata, docs_path, inapp=True)
-    inapp_doc_files_uploaded = _file_upload(
+    inapp_doc_file_ids = _file_upload(
         file_key="inapp_doc",
         local_path=local_inapp_doc_path,
         gcp_connector_dir=gcp_connector_dir,
-        bucket=bucket,
+        upload_planner=upload_planner,
         upload_as_version=True,
         version_folder=version_folder,
         upload_as_latest=should_upload_latest,
         override_destination_file_name=DOC_INAPP_FILE_NAME,
     )
-    uploaded_files.extend(inapp_doc_files_uploaded)
+    file_ids.extend(inapp_doc_file_ids)
 
     # Manifest and components upload
 
-    manifest_files_uploaded = _file_upload(
+    manifest_file_ids = _file_upload(
         file_key="manifest",
         local_path=manifest_only_file_info.manifest_file_path,
         gcp_connector_dir=gcp_connector_dir,
-        bucket=bucket,
+        upload_planner=upload_planner,
         upload_as_version=True,
         version_folder=version_folder,
         upload_as_latest=should_upload_latest,
         override_destination_file_name=MANIFEST_FILE_NAME,
     )
-    uploaded_files.extend(manifest_files_uploaded)
+    file_ids.extend(manifest_file_ids)
 
-    components_zip_sha256_files_uploaded = _file_upload(
+    components_zip_sha256_file_ids = _file_upload(
         file_key="components_zip_sha256",
         local_path=manifest_only_file_info.sha256_file_path,
         gcp_connector_dir=gcp_connector_dir,
-        bucket=bucket,
+        upload_planner=upload_planner,
         upload_as_version=True,
         version_folder=version_folder,
         upload_as_latest=should_upload_latest,
         override_destination_file_name=COMPONENTS_ZIP_SHA256_FILE_NAME,
     )
-    uploaded_files.extend(components_zip_sha256_files_uploaded)
+    file_ids.extend(components_zip_sha256_file_ids)
 
-    components_zip_files_uploaded = _file_upload(
+    components_zip_file_ids = _file_upload(
         file_key="components_zip",
         local_path=manifest_only_file_info.zip_file_path,
         gcp_connector_dir=gcp_connector_dir,
-        bucket=bucket,
+        upload_planner=upload_planner,
         upload_as_version=True,
         version_folder=version_folder,
         upload_as_latest=should_upload_latest,
         override_destination_file_name=COMPONENTS_ZIP_FILE_NAME,
     )
-    uploaded_files.extend(components_zip_files_uploaded)
+    file_ids.extend(components_zip_file_ids)
+
+    # Upload the changed files
+    uploaded_files_per_id = upload_planner.upload(upload_planner.plan(), dry_run=dry_run)
+    uploaded_files = [uploaded_files_per_id.get(file_id, UploadedFile(id=file_id, uploaded=False, blob_id=None)) for file_id in file_ids]
 
     return MetadataUploadInfo(
         uploaded_files=uploaded_files,
@@ -5,7 +5,8 @@
 import json
 from dataclasses import dataclass
 from enum import Enum
-from typing import List
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from google.cloud import storage
 
@@ -75,32 +76,75 @@ def get_docker_info_from_spec_cache_path(spec_cache_path: str) -> CachedSpec:
     )
 
 
-class SpecCache:
+class GcsSpecCacheBackend:
+    """Reads the spec cache from a GCS bucket, anonymously."""
+
     def __init__(self, bucket_name: str = PROD_SPEC_CACHE_BUCKET_NAME):
         self.client = storage.Client.create_anonymous_client()
         self.bucket = self.client.bucket(bucket_name)
-        self.cached_specs = self.get_all_cached_specs()
+
+    def list_blobs(self, prefix: str) -> Iterable[str]:
+        return (blob.name for blob in self.bucket.list_blobs(prefix=prefix))
+
+    def download(self, name: str) -> bytes:
+        return self.bucket.blob(name).download_as_string()
+
+
+class LocalSpecCacheBackend:
+    """Reads the spec cache from a local directory with the same layout as the bucket, e.g. to work offline."""
+
+    def __init__(self, root_directory: Path):
+        self.root_directory = Path(root_directory)
+
+    def list_blobs(self, prefix: str) -> Iterable[str]:
+        # only walk the deepest directory containing the prefix
+        prefix_directory = self.root_directory / prefix.rsplit("/", 1)[0] if "/" in prefix else self.root_directory
+        for path in sorted(prefix_directory.rglob("*")):
+            name = path.relative_to(self.root_directory).as_posix()
+            if path.is_file() and name.startswith(prefix):
+                yield name
+
+    def download(self, name: str) -> bytes:
+        return (self.root_directory / name).read_bytes()
+
+
+class SpecCache:
+    """Finds and downloads the cached specs of connector images.
+
+    The specs of a docker repository are only listed the first time one of its images is looked up,
+    and indexed by docker repository, tag and registry.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str = PROD_SPEC_CACHE_BUCKET_NAME,
+        backend: Optional[Union[GcsSpecCacheBackend, LocalSpecCacheBackend]] = None,
+    ):
+        self.backend = backend or GcsSpecCacheBackend(bucket_name)
+        self._index: Dict[Tuple[str, str, Registries], CachedSpec] = {}
+        self._listed_repositories: Set[str] = set()
+
+    def _list_cached_specs(self, prefix: str) -> List[CachedSpec]:
+        return [get_docker_info_from_spec_cache_path(name) for name in self.backend.list_blobs(prefix) if name.endswith(".json")]
 
     def get_all_cached_specs(self) -> List[CachedSpec]:
         """Returns a list of all the specs in the spec cache bucket."""
 
-        blobs = self.bucket.list_blobs(prefix=CACHE_FOLDER)
+        return self._list_cached_specs(CACHE_FOLDER)
 
-        return [get_docker_info_from_spec_cache_path(blob.name) for blob in blobs if blob.name.endswith(".json")]
+    def _index_repository(self, docker_repository: str) -> None:
+        """Lists and indexes the specs of a docker repository, once."""
+        if docker_repository in self._listed_repositories:
+            return
+        for cached_spec in self._list_cached_specs(f"{CACHE_FOLDER}/{docker_repository}/"):
+            self._index[(cached_spec.docker_repository, cached_spec.docker_image_tag, cached_spec.registry)] = cached_spec
+        self._listed_repositories.add(docker_repository)
 
     def _find_spec_cache(self, docker_repository: str, docker_image_tag: str, registry: Registries) -> CachedSpec:
         """Returns the spec cache path for a given docker repository and tag."""
 
-        # find the spec cache path for the given docker repository and tag
-        for cached_spec in self.cached_specs:
-            if (
-                cached_spec.docker_repository == docker_repository
-                and cached_spec.registry == registry
-                and cached_spec.docker_image_tag == docker_image_tag
-            ):
-                return cached_spec
-
-        return None
+        self._index_repository(docker_repository)
+        return self._index.get((docker_repository, docker_image_tag, registry))
 
     def find_spec_cache_with_fallback(self, docker_repository: str, docker_image_tag: str, registry_str: str) -> CachedSpec:
         """Returns the spec cache path for a given docker repository and tag and fallback to OSS if none found"""
@@ -117,4 +161,4 @@ class SpecCache:
 
     def download_spec(self, spec: CachedSpec) -> dict:
         """Downloads the spec from the spec cache bucket."""
-        return json.loads(self.bucket.blob(spec.spec_cache_path).download_as_string())
+        return json.loads(self.backend.download(spec.spec_cache_path))
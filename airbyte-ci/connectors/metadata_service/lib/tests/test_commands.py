@@ -242,7 +242,26 @@ def test_upload_prerelease(mocker, valid_metadata_yaml_files, tmp_path):
         commands.upload, [metadata_file_path, str(tmp_path), bucket, "--prerelease", prerelease_tag]
     )  # Using valid_metadata_yaml_files[0] as SA because it exists...
 
-    commands.upload_metadata_to_gcs.assert_has_calls([mocker.call(bucket, pathlib.Path(metadata_file_path), validator_opts)])
+    commands.upload_metadata_to_gcs.assert_has_calls([mocker.call(bucket, pathlib.Path(metadata_file_path), validator_opts, dry_run=False)])
+    assert result.exit_code == 0
+
+
+def test_upload_dry_run(mocker, valid_metadata_yaml_files, tmp_path):
+    runner = CliRunner()
+    mocker.patch.object(commands.click, "secho")
+    mocker.patch.object(commands, "upload_metadata_to_gcs")
+
+    bucket = "my-bucket"
+    metadata_file_path = valid_metadata_yaml_files[0]
+    validator_opts = ValidatorOptions(docs_path=str(tmp_path))
+
+    upload_info = mock_metadata_upload_info(False, False, False, False, False, False, False, metadata_file_path)
+    commands.upload_metadata_to_gcs.return_value = upload_info
+    result = runner.invoke(commands.upload, [metadata_file_path, str(tmp_path), bucket, "--dry-run"])
+
+    commands.upload_metadata_to_gcs.assert_called_once_with(bucket, pathlib.Path(metadata_file_path), validator_opts, dry_run=True)
+    # Nothing is uploaded on a dry run, so there is nothing to report as skipped
+    commands.click.secho.assert_not_called()
     assert result.exit_code == 0
 
 
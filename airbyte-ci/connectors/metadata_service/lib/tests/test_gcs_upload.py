@@ -3,7 +3,7 @@
 #
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import pytest
 import yaml
@@ -12,12 +12,17 @@ from pydash.objects import get
 from metadata_service import gcs_upload
 from metadata_service.constants import (
     COMPONENTS_PY_FILE_NAME,
+    COMPONENTS_ZIP_FILE_NAME,
+    COMPONENTS_ZIP_SHA256_FILE_NAME,
     DOC_FILE_NAME,
+    DOC_INAPP_FILE_NAME,
+    ICON_FILE_NAME,
     LATEST_GCS_FOLDER_NAME,
     MANIFEST_FILE_NAME,
     METADATA_FILE_NAME,
     RELEASE_CANDIDATE_GCS_FOLDER_NAME,
 )
+from metadata_service.helpers.files import compute_gcs_md5
 from metadata_service.models.generated.ConnectorMetadataDefinitionV0 import ConnectorMetadataDefinitionV0
 from metadata_service.models.transform import to_json_sanitized_dict
 from metadata_service.validators.metadata_validator import ValidatorOptions
@@ -201,6 +206,34 @@ def setup_upload_mocks(
 
     mock_bucket.blob.side_effect = side_effect_bucket_blob
 
+    # Mock bucket listing, with the existing blobs of the version, latest and release candidate folders
+
+    def side_effect_bucket_list_blobs(prefix):
+        version_folders = [LATEST_GCS_FOLDER_NAME, RELEASE_CANDIDATE_GCS_FOLDER_NAME]
+        if metadata_file_path:
+            version_folders.append(yaml.safe_load(Path(metadata_file_path).read_text())["data"]["dockerImageTag"])
+        file_names = [
+            METADATA_FILE_NAME,
+            DOC_FILE_NAME,
+            DOC_INAPP_FILE_NAME,
+            ICON_FILE_NAME,
+            MANIFEST_FILE_NAME,
+            COMPONENTS_ZIP_FILE_NAME,
+            COMPONENTS_ZIP_SHA256_FILE_NAME,
+        ]
+        listed_blobs = []
+        for version_folder in version_folders:
+            for file_name in file_names:
+                blob_path = f"{prefix}{version_folder}/{file_name}"
+                blob = side_effect_bucket_blob(blob_path)
+                if blob.exists():
+                    listed_blob = mocker.Mock(md5_hash=blob.md5_hash, id=blob.id)
+                    listed_blob.name = blob_path
+                    listed_blobs.append(listed_blob)
+        return listed_blobs
+
+    mock_bucket.list_blobs.side_effect = side_effect_bucket_list_blobs
+
     # Mock md5 hash
     def side_effect_compute_gcs_md5(file_path):
         if str(file_path) == str(metadata_file_path):
@@ -349,7 +382,7 @@ def test_upload_metadata_to_gcs_valid_metadata(
     doc_latest_blob_md5_hash,
 ):
     mocker.spy(gcs_upload, "_file_upload")
-    mocker.spy(gcs_upload, "upload_file_if_changed")
+    mocker.spy(gcs_upload.UploadPlanner, "add")
     for valid_metadata_upload_file in valid_metadata_upload_files:
         print("\nTesting upload of valid metadata file: " + valid_metadata_upload_file)
         metadata_file_path = Path(valid_metadata_upload_file)
@@ -388,12 +421,17 @@ def test_upload_metadata_to_gcs_valid_metadata(
         expected_calls = [
             # Always upload the versioned metadata
             mocker.call(
-                local_file_path=metadata_file_path, bucket=mocks["mock_bucket"], blob_path=expected_version_key, disable_cache=True
+                mocker.ANY,
+                file_id="versioned_metadata",
+                local_file_path=metadata_file_path,
+                blob_path=expected_version_key,
+                disable_cache=True,
             ),
             # Always upload the versioned doc
             mocker.call(
+                mocker.ANY,
+                file_id="versioned_doc",
                 local_file_path=VALID_DOC_FILE_PATH,
-                bucket=mocks["mock_bucket"],
                 blob_path=expected_version_doc_key,
                 disable_cache=False,
             ),
@@ -402,8 +440,9 @@ def test_upload_metadata_to_gcs_valid_metadata(
         if is_release_candidate:
             expected_calls.append(
                 mocker.call(
+                    mocker.ANY,
+                    file_id="versioned_release_candidate",
                     local_file_path=metadata_file_path,
-                    bucket=mocks["mock_bucket"],
                     blob_path=expected_release_candidate_key,
                     disable_cache=True,
                 )
@@ -411,16 +450,24 @@ def test_upload_metadata_to_gcs_valid_metadata(
         else:
             expected_calls.append(
                 mocker.call(
-                    local_file_path=VALID_DOC_FILE_PATH, bucket=mocks["mock_bucket"], blob_path=expected_latest_doc_key, disable_cache=False
+                    mocker.ANY,
+                    file_id="latest_doc",
+                    local_file_path=VALID_DOC_FILE_PATH,
+                    blob_path=expected_latest_doc_key,
+                    disable_cache=False,
                 )
             )
             expected_calls.append(
                 mocker.call(
-                    local_file_path=metadata_file_path, bucket=mocks["mock_bucket"], blob_path=expected_latest_key, disable_cache=True
+                    mocker.ANY,
+                    file_id="latest_metadata",
+                    local_file_path=metadata_file_path,
+                    blob_path=expected_latest_key,
+                    disable_cache=True,
                 )
             )
 
-        gcs_upload.upload_file_if_changed.assert_has_calls(expected_calls, any_order=True)
+        gcs_upload.UploadPlanner.add.assert_has_calls(expected_calls, any_order=True)
 
         # Assert correct files were uploaded
 
@@ -470,7 +517,7 @@ def test_upload_metadata_to_gcs_valid_metadata(
         )
 
         # clear the call count
-        gcs_upload.upload_file_if_changed.reset_mock()
+        gcs_upload.UploadPlanner.add.reset_mock()
 
 
 def test_upload_metadata_to_gcs_non_existent_metadata_file():
@@ -525,7 +572,7 @@ def test_upload_metadata_to_gcs_invalid_docker_images(mocker, invalid_metadata_u
 
 def test_upload_metadata_to_gcs_with_prerelease(mocker, valid_metadata_upload_files, tmp_path):
     mocker.spy(gcs_upload, "_file_upload")
-    mocker.spy(gcs_upload, "upload_file_if_changed")
+    mocker.spy(gcs_upload.UploadPlanner, "add")
     prerelease_image_tag = "1.5.6-dev.f80318f754"
 
     for valid_metadata_upload_file in valid_metadata_upload_files:
@@ -567,11 +614,15 @@ def test_upload_metadata_to_gcs_with_prerelease(mocker, valid_metadata_upload_fi
 
         expected_calls = [
             mocker.call(
-                local_file_path=tmp_metadata_file_path, bucket=mocks["mock_bucket"], blob_path=expected_version_key, disable_cache=True
+                mocker.ANY,
+                file_id="versioned_metadata",
+                local_file_path=tmp_metadata_file_path,
+                blob_path=expected_version_key,
+                disable_cache=True,
             ),
         ]
 
-        gcs_upload.upload_file_if_changed.assert_has_calls(expected_calls, any_order=True)
+        gcs_upload.UploadPlanner.add.assert_has_calls(expected_calls, any_order=True)
 
         # Assert versioned uploads happened
 
@@ -615,13 +666,13 @@ def test_upload_metadata_to_gcs_with_prerelease(mocker, valid_metadata_upload_fi
 
         # clear the call count
         gcs_upload._file_upload.reset_mock()
-        gcs_upload.upload_file_if_changed.reset_mock()
+        gcs_upload.UploadPlanner.add.reset_mock()
 
 
 @pytest.mark.parametrize("prerelease", [True, False])
 def test_upload_metadata_to_gcs_release_candidate(mocker, get_fixture_path, tmp_path, prerelease):
     mocker.spy(gcs_upload, "_file_upload")
-    mocker.spy(gcs_upload, "upload_file_if_changed")
+    mocker.spy(gcs_upload.UploadPlanner, "add")
     release_candidate_metadata_file = get_fixture_path(
         "metadata_upload/valid/referenced_image_in_dockerhub/metadata_release_candidate.yaml"
     )
@@ -706,7 +757,7 @@ def test_upload_metadata_to_gcs_with_manifest_files(
     mocker, valid_metadata_upload_files, tmp_path, monkeypatch, manifest_exists, components_py_exists
 ):
     mocker.spy(gcs_upload, "_file_upload")
-    mocker.spy(gcs_upload, "upload_file_if_changed")
+    mocker.spy(gcs_upload.UploadPlanner, "add")
     valid_metadata_upload_file = valid_metadata_upload_files[0]
 
     metadata_file_path = Path(valid_metadata_upload_file)
@@ -798,4 +849,149 @@ def test_upload_metadata_to_gcs_with_manifest_files(
 
     # clear the call count
     gcs_upload._file_upload.reset_mock()
-    gcs_upload.upload_file_if_changed.reset_mock()
+    gcs_upload.UploadPlanner.add.reset_mock()
+
+
+# Upload planner
+
+
+class FakeBlob:
+    """A GCS blob stored as a file in the directory of a FakeBucket."""
+
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.id = f"{bucket.name}/{name}"
+        self.cache_control = None
+
+    @property
+    def path(self) -> Path:
+        return self.bucket.root_directory / self.name
+
+    @property
+    def md5_hash(self) -> Optional[str]:
+        return compute_gcs_md5(self.path) if self.path.exists() else None
+
+    def upload_from_filename(self, file_path: Path):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(Path(file_path).read_bytes())
+        self.bucket.uploaded_blob_names.append(self.name)
+
+
+class FakeBucket:
+    """A GCS bucket backed by a local directory, listing its blobs like GCS does."""
+
+    def __init__(self, root_directory: Path, name: str = "my_bucket"):
+        self.root_directory = root_directory
+        self.name = name
+        self.list_blobs_calls = 0
+        self.uploaded_blob_names = []
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+    def list_blobs(self, prefix: str) -> List[FakeBlob]:
+        self.list_blobs_calls += 1
+        blob_names = sorted(str(path.relative_to(self.root_directory)) for path in self.root_directory.rglob("*") if path.is_file())
+        return [self.blob(blob_name) for blob_name in blob_names if blob_name.startswith(prefix)]
+
+
+@pytest.fixture
+def fake_bucket(tmp_path):
+    bucket_directory = tmp_path / "bucket"
+    bucket_directory.mkdir()
+    return FakeBucket(bucket_directory)
+
+
+@pytest.fixture
+def upload_planner(tmp_path, fake_bucket):
+    local_directory = tmp_path / "local"
+    local_directory.mkdir()
+    (local_directory / METADATA_FILE_NAME).write_text("dockerImageTag: 1.0.1")
+    (local_directory / "doc.md").write_text("# Source")
+    (local_directory / ICON_FILE_NAME).write_text("<svg/>")
+
+    # The doc didn't change, the metadata did and the icon was never uploaded
+    for version_folder in ["1.0.1", LATEST_GCS_FOLDER_NAME]:
+        fake_bucket.blob(f"metadata/airbyte/source-exists/{version_folder}/{METADATA_FILE_NAME}").upload_from_filename(
+            local_directory / "doc.md"
+        )
+        fake_bucket.blob(f"metadata/airbyte/source-exists/{version_folder}/{DOC_FILE_NAME}").upload_from_filename(
+            local_directory / "doc.md"
+        )
+    # A blob of another connector sharing the name prefix is not listed
+    fake_bucket.blob(f"metadata/airbyte/source-exists-1/{LATEST_GCS_FOLDER_NAME}/{ICON_FILE_NAME}").upload_from_filename(
+        local_directory / ICON_FILE_NAME
+    )
+    fake_bucket.uploaded_blob_names.clear()
+
+    upload_planner = gcs_upload.UploadPlanner(fake_bucket, prefix="metadata/airbyte/source-exists/", max_workers=2)
+    for version_folder in ["1.0.1", LATEST_GCS_FOLDER_NAME]:
+        upload_planner.add(
+            file_id=f"{version_folder}_metadata",
+            local_file_path=local_directory / METADATA_FILE_NAME,
+            blob_path=f"metadata/airbyte/source-exists/{version_folder}/{METADATA_FILE_NAME}",
+            disable_cache=True,
+        )
+        upload_planner.add(
+            file_id=f"{version_folder}_doc",
+            local_file_path=local_directory / "doc.md",
+            blob_path=f"metadata/airbyte/source-exists/{version_folder}/{DOC_FILE_NAME}",
+        )
+    upload_planner.add(
+        file_id="latest_icon",
+        local_file_path=local_directory / ICON_FILE_NAME,
+        blob_path=f"metadata/airbyte/source-exists/{LATEST_GCS_FOLDER_NAME}/{ICON_FILE_NAME}",
+    )
+    return upload_planner
+
+
+def test_upload_planner_plan(tmp_path, fake_bucket, upload_planner):
+    local_directory = tmp_path / "local"
+    plan = upload_planner.plan()
+
+    assert fake_bucket.list_blobs_calls == 1
+    assert [planned_upload.file_id for planned_upload in plan.to_upload] == ["1.0.1_metadata", "latest_metadata", "latest_icon"]
+    assert [planned_upload.file_id for planned_upload in plan.unchanged] == ["1.0.1_doc", "latest_doc"]
+    assert plan.diff().splitlines() == [
+        f"~ metadata/airbyte/source-exists/1.0.1/{METADATA_FILE_NAME} ({local_directory / METADATA_FILE_NAME})",
+        f"~ metadata/airbyte/source-exists/latest/{METADATA_FILE_NAME} ({local_directory / METADATA_FILE_NAME})",
+        f"+ metadata/airbyte/source-exists/latest/{ICON_FILE_NAME} ({local_directory / ICON_FILE_NAME})",
+        f"= metadata/airbyte/source-exists/1.0.1/{DOC_FILE_NAME} ({local_directory / 'doc.md'})",
+        f"= metadata/airbyte/source-exists/latest/{DOC_FILE_NAME} ({local_directory / 'doc.md'})",
+    ]
+
+
+def test_upload_planner_upload(fake_bucket, upload_planner):
+    uploaded_files = upload_planner.upload(upload_planner.plan())
+
+    assert sorted(fake_bucket.uploaded_blob_names) == [
+        f"metadata/airbyte/source-exists/1.0.1/{METADATA_FILE_NAME}",
+        f"metadata/airbyte/source-exists/latest/{ICON_FILE_NAME}",
+        f"metadata/airbyte/source-exists/latest/{METADATA_FILE_NAME}",
+    ]
+    assert {file_id: uploaded_file.uploaded for file_id, uploaded_file in uploaded_files.items()} == {
+        "1.0.1_metadata": True,
+        "latest_metadata": True,
+        "latest_icon": True,
+        "1.0.1_doc": False,
+        "latest_doc": False,
+    }
+    assert uploaded_files["latest_doc"].blob_id == f"my_bucket/metadata/airbyte/source-exists/latest/{DOC_FILE_NAME}"
+    # Everything is up to date once uploaded
+    assert upload_planner.plan().to_upload == []
+
+
+def test_upload_planner_dry_run(fake_bucket, upload_planner):
+    uploaded_files = upload_planner.upload(upload_planner.plan(), dry_run=True)
+
+    assert fake_bucket.uploaded_blob_names == []
+    assert not any(uploaded_file.uploaded for uploaded_file in uploaded_files.values())
+    assert len(upload_planner.plan().to_upload) == 3
+
+
+def test_upload_planner_rejects_blob_outside_of_prefix(upload_planner):
+    with pytest.raises(ValueError, match="is not under the prefix"):
+        upload_planner.add(
+            file_id="other_icon", local_file_path=Path("icon.svg"), blob_path=f"metadata/airbyte/source-other/{ICON_FILE_NAME}"
+        )
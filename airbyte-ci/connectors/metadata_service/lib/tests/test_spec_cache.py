@@ -2,34 +2,40 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import json
 from unittest.mock import patch
 
 import pytest
 
-from metadata_service.spec_cache import CachedSpec, Registries, SpecCache, get_docker_info_from_spec_cache_path
+from metadata_service.spec_cache import (
+    CachedSpec,
+    GcsSpecCacheBackend,
+    LocalSpecCacheBackend,
+    Registries,
+    SpecCache,
+    get_docker_info_from_spec_cache_path,
+)
+
+
+def write_spec(root_directory, spec_cache_path, spec):
+    path = root_directory / spec_cache_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(spec))
+    return path
 
 
 @pytest.fixture
-def mock_spec_cache():
-    with (
-        patch("google.cloud.storage.Client.create_anonymous_client") as MockClient,
-        patch("google.cloud.storage.Client.bucket") as MockBucket,
-    ):
-        # Create stub mock client and bucket
-        MockClient.return_value
-        MockBucket.return_value
-
-        # Create a list of 4 test CachedSpecs
-        test_specs = [
-            CachedSpec("image1", "tag-has-override", "path1", Registries.OSS),
-            CachedSpec("image1", "tag-has-override", "path2", Registries.CLOUD),
-            CachedSpec("image2", "tag-no-override", "path3", Registries.OSS),
-            CachedSpec("image3", "tag-no-override", "path4", Registries.CLOUD),
-        ]
-
-        # Mock get_all_cached_specs to return test_specs
-        with patch.object(SpecCache, "get_all_cached_specs", return_value=test_specs):
-            yield SpecCache()
+def mock_spec_cache(tmp_path):
+    # Create 4 test specs in a local spec cache
+    for spec_cache_path in [
+        "specs/image1/tag-has-override/spec.json",
+        "specs/image1/tag-has-override/spec.cloud.json",
+        "specs/image2/tag-no-override/spec.json",
+        "specs/image3/tag-no-override/spec.cloud.json",
+    ]:
+        write_spec(tmp_path, spec_cache_path, {"path": spec_cache_path})
+
+    yield SpecCache(backend=LocalSpecCacheBackend(tmp_path))
 
 
 @pytest.mark.parametrize(
@@ -100,3 +106,33 @@ def test_get_docker_info_from_spec_cache_path(spec_cache_path, expected_spec):
 def test_get_docker_info_from_spec_cache_path_invalid():
     with pytest.raises(Exception):
         get_docker_info_from_spec_cache_path("specs/airbyte/destination-azure-blob-storage/0.1.1/spec")
+
+
+def test_find_spec_cache_lists_only_the_looked_up_repositories(mock_spec_cache, mocker):
+    list_blobs = mocker.spy(mock_spec_cache.backend, "list_blobs")
+
+    assert mock_spec_cache.find_spec_cache_with_fallback("image1", "tag-has-override", "CLOUD").registry == Registries.CLOUD
+    assert mock_spec_cache.find_spec_cache_with_fallback("image1", "tag-has-override", "OSS").registry == Registries.OSS
+    assert mock_spec_cache.find_spec_cache_with_fallback("image2", "tag-no-override", "OSS").registry == Registries.OSS
+
+    assert [call.args for call in list_blobs.call_args_list] == [("specs/image1/",), ("specs/image2/",)]
+
+
+def test_download_spec(mock_spec_cache):
+    spec = mock_spec_cache.find_spec_cache_with_fallback("image1", "tag-has-override", "CLOUD")
+
+    assert mock_spec_cache.download_spec(spec) == {"path": "specs/image1/tag-has-override/spec.cloud.json"}
+
+
+def test_gcs_spec_cache_backend(mocker):
+    with patch("google.cloud.storage.Client.create_anonymous_client") as MockClient:
+        bucket = MockClient.return_value.bucket.return_value
+        bucket.list_blobs.return_value = [mocker.Mock()]
+        bucket.list_blobs.return_value[0].name = "specs/image1/1.0.0/spec.json"
+        bucket.blob.return_value.download_as_string.return_value = b"{}"
+        backend = GcsSpecCacheBackend("bucket")
+
+        assert list(backend.list_blobs("specs/image1/")) == ["specs/image1/1.0.0/spec.json"]
+        bucket.list_blobs.assert_called_once_with(prefix="specs/image1/")
+        assert backend.download("specs/image1/1.0.0/spec.json") == b"{}"
+        bucket.blob.assert_called_once_with("specs/image1/1.0.0/spec.json")
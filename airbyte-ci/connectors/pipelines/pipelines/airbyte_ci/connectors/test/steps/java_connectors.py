@@ -82,12 +82,17 @@ def _get_acceptance_test_steps(context: ConnectorTestContext) -> List[StepToRun]
     Generate the steps to run the acceptance tests for a Java connector.
     """
 
+    # The integration tests use the connector and normalization images loaded to the docker host
+    integration_tests_dependencies = [CONNECTOR_TEST_STEP_ID.BUILD, CONNECTOR_TEST_STEP_ID.LOAD_IMAGE_TO_LOCAL_DOCKER_HOST]
+    if context.connector.supports_normalization:
+        integration_tests_dependencies.append(CONNECTOR_TEST_STEP_ID.BUILD_NORMALIZATION)
+
     # Run tests in parallel
     return [
         StepToRun(
             id=CONNECTOR_TEST_STEP_ID.INTEGRATION,
             step=IntegrationTests(context, secrets=context.get_secrets_for_step_id(CONNECTOR_TEST_STEP_ID.INTEGRATION)),
-            depends_on=[CONNECTOR_TEST_STEP_ID.BUILD],
+            depends_on=integration_tests_dependencies,
         ),
         StepToRun(
             id=CONNECTOR_TEST_STEP_ID.ACCEPTANCE,
@@ -6,11 +6,14 @@
 
 from __future__ import annotations
 
+import heapq
 import inspect
+import time
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import anyio
+import anyio.lowlevel
 import asyncer
 import dpath
 
@@ -146,23 +149,6 @@ async def evaluate_run_args(args: ARGS_TYPE, results: RESULTS_DICT) -> Dict:
     raise TypeError(f"Unexpected args type: {type(args)}")
 
 
-def _skip_remaining_steps(remaining_steps: STEP_TREE) -> RESULTS_DICT:
-    """
-    Skip all remaining steps.
-    """
-    skipped_results: Dict[str, StepResult] = {}
-    for runnable_step in remaining_steps:
-        if isinstance(runnable_step, StepToRun):
-            skipped_results[runnable_step.id] = runnable_step.step.skip()
-        elif isinstance(runnable_step, list):
-            nested_skipped_results = _skip_remaining_steps(list(runnable_step))
-            skipped_results = {**skipped_results, **nested_skipped_results}
-        else:
-            raise Exception(f"Unexpected step type: {type(runnable_step)}")
-
-    return skipped_results
-
-
 def _step_dependencies_succeeded(step_to_eval: StepToRun, results: RESULTS_DICT) -> bool:
     """
     Check if all dependencies of a step have succeeded.
@@ -184,37 +170,6 @@ def _step_dependencies_succeeded(step_to_eval: StepToRun, results: RESULTS_DICT)
     )
 
 
-def _filter_skipped_steps(steps_to_evaluate: STEP_TREE, skip_steps: List[str], results: RESULTS_DICT) -> Tuple[STEP_TREE, RESULTS_DICT]:
-    """
-    Filter out steps that should be skipped.
-
-    Either because they are in the skip list or because one of their dependencies failed.
-    """
-    steps_to_run: STEP_TREE = []
-    for step_to_eval in steps_to_evaluate:
-        # ignore nested steps
-        if isinstance(step_to_eval, list):
-            steps_to_run.append(step_to_eval)
-            continue
-
-        # skip step if its id is in the skip list
-        if step_to_eval.id in skip_steps:
-            main_logger.info(f"Skipping step {step_to_eval.id}")
-            results[step_to_eval.id] = step_to_eval.step.skip("Skipped by user")
-
-        # skip step if a dependency failed
-        elif not _step_dependencies_succeeded(step_to_eval, results):
-            main_logger.info(
-                f"Skipping step {step_to_eval.id} because one of the dependencies have not been met: {step_to_eval.depends_on}"
-            )
-            results[step_to_eval.id] = step_to_eval.step.skip("Skipped because a dependency was not met")
-
-        else:
-            steps_to_run.append(step_to_eval)
-
-    return steps_to_run, results
-
-
 def _get_next_step_group(steps: STEP_TREE) -> Tuple[STEP_TREE, STEP_TREE]:
     """
     Get the next group of steps to run concurrently.
@@ -253,12 +208,232 @@ def _log_step_tree(step_tree: STEP_TREE, options: RunStepOptions, depth: int = 0
                 main_logger.info(f"{indent * depth}- {steps.id}")
 
 
+@dataclass
+class StepTiming:
+    """The timing of a step run by a StepScheduler, in seconds since the scheduler started."""
+
+    step_id: str
+    ready_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # The index of the prerequisite which finished last, the one the step waited for
+    ready_after: Optional[int] = None
+
+    @property
+    def queue_duration(self) -> float:
+        """How long the step waited for the concurrency semaphore once its prerequisites were done."""
+        if self.started_at is None:
+            return 0.0
+        return self.started_at - self.ready_at
+
+    @property
+    def run_duration(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+class _OrderedSemaphore:
+    """A semaphore handing its slots to the waiting steps by index, in the order of the step tree.
+
+    Steps getting ready at the same time are admitted in tree order whatever the order the event loop runs their tasks in.
+    """
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiting: List[Tuple[int, anyio.Event]] = []
+
+    def _admit(self) -> None:
+        while self._value > 0 and self._waiting:
+            self._value -= 1
+            _, event = heapq.heappop(self._waiting)
+            event.set()
+
+    async def acquire(self, index: int) -> None:
+        event = anyio.Event()
+        heapq.heappush(self._waiting, (index, event))
+        try:
+            # Let the steps getting ready at the same time queue up before a slot is handed out
+            await anyio.lowlevel.checkpoint()
+            self._admit()
+            await event.wait()
+        except BaseException:
+            if event.is_set():
+                self.release()
+            else:
+                self._waiting.remove((index, event))
+                heapq.heapify(self._waiting)
+            raise
+
+    def release(self) -> None:
+        self._value += 1
+        self._admit()
+
+
+class StepScheduler:
+    """Run the steps of a step tree as soon as their prerequisites are done.
+
+    The prerequisites of a step are the steps listed in its `depends_on`, which must come before it in the tree.
+    A step without `depends_on`, or any step when fail_fast is enabled, waits for all the steps of the groups preceding it in the tree,
+    like in a sequential run of the groups, so that a failure skips all the steps of the following groups.
+    The number of steps running at the same time is bounded by the concurrency option, steps are admitted in tree order.
+    """
+
+    def __init__(self, runnables: STEP_TREE, options: RunStepOptions):
+        self.runnables = runnables
+        self.options = options
+        self.steps: List[StepToRun] = []
+        # The indexes of the steps of the groups preceding each step in the tree
+        self._preceding_steps: List[List[int]] = []
+        self.timings: Dict[int, StepTiming] = {}
+        self._started_at = 0.0
+        self._add_step_tree(runnables, preceding_steps=[])
+
+    def _add_step_tree(self, steps: STEP_TREE, preceding_steps: List[int]) -> List[int]:
+        """Add the steps of a tree, run after the preceding steps, and return the indexes of the added steps."""
+        added_steps: List[int] = []
+        remaining_steps = steps
+        while remaining_steps:
+            step_group, remaining_steps = _get_next_step_group(remaining_steps)
+            group_steps: List[int] = []
+            for step in step_group:
+                if isinstance(step, StepToRun):
+                    group_steps.append(len(self.steps))
+                    self.steps.append(step)
+                    self._preceding_steps.append(preceding_steps)
+                elif isinstance(step, list):
+                    group_steps.extend(self._add_step_tree(list(step), preceding_steps))
+                else:
+                    raise Exception(f"Unexpected step type: {type(step)}")
+            preceding_steps = preceding_steps + group_steps
+            added_steps.extend(group_steps)
+        return added_steps
+
+    def _get_prerequisites(self, index: int, results: RESULTS_DICT) -> List[int]:
+        step_to_run = self.steps[index]
+        preceding_steps = self._preceding_steps[index]
+
+        prerequisites = []
+        for step_id in step_to_run.depends_on:
+            dependencies = [preceding_step for preceding_step in preceding_steps if self.steps[preceding_step].id == step_id]
+            if not dependencies and step_id not in results:
+                raise InvalidStepConfiguration(
+                    f"Step {step_to_run.id} depends on {step_id} which has not been run yet. This implies that the order of the steps is not correct. Please check that the steps are in the correct order."
+                )
+            prerequisites.extend(dependencies)
+        if not step_to_run.depends_on or self.options.fail_fast:
+            return preceding_steps
+        return prerequisites
+
+    def _now(self) -> float:
+        return time.monotonic() - self._started_at
+
+    def _get_skipped_result(self, step_to_run: StepToRun, step_ids_to_skip: List[str], results: RESULTS_DICT) -> Optional[StepResult]:
+        # If any of the previous steps failed, skip the remaining steps
+        if self.options.fail_fast and any(
+            result.status is StepStatus.FAILURE and result.consider_in_overall_status for result in results.values()
+        ):
+            return step_to_run.step.skip()
+
+        # skip step if its id is in the skip list
+        if step_to_run.id in step_ids_to_skip:
+            main_logger.info(f"Skipping step {step_to_run.id}")
+            return step_to_run.step.skip("Skipped by user")
+
+        # skip step if a dependency failed
+        if not _step_dependencies_succeeded(step_to_run, results):
+            main_logger.info(f"Skipping step {step_to_run.id} because one of the dependencies have not been met: {step_to_run.depends_on}")
+            return step_to_run.step.skip("Skipped because a dependency was not met")
+
+        return None
+
+    async def _run_step(
+        self,
+        index: int,
+        prerequisites: List[int],
+        done_events: List[anyio.Event],
+        semaphore: _OrderedSemaphore,
+        step_ids_to_skip: List[str],
+        results: RESULTS_DICT,
+    ) -> StepResult:
+        step_to_run = self.steps[index]
+        for prerequisite in prerequisites:
+            await done_events[prerequisite].wait()
+
+        timing = StepTiming(
+            step_id=step_to_run.id,
+            ready_at=self._now(),
+            ready_after=max(prerequisites, key=lambda prerequisite: self.timings[prerequisite].finished_at or 0.0, default=None),
+        )
+        self.timings[index] = timing
+        result = self._get_skipped_result(step_to_run, step_ids_to_skip, results)
+        if result is None:
+            main_logger.info(f"QUEUING STEP {step_to_run.id}")
+            await semaphore.acquire(index)
+            try:
+                timing.started_at = self._now()
+                step_args = await evaluate_run_args(step_to_run.args, results)
+                step_to_run.step.extra_params = self.options.step_params.get(step_to_run.id, {})
+                result = await step_to_run.step.run(**step_args)
+            finally:
+                semaphore.release()
+
+        timing.finished_at = self._now()
+        results[step_to_run.id] = result
+        done_events[index].set()
+        return result
+
+    async def run(self, results: Optional[RESULTS_DICT] = None) -> RESULTS_DICT:
+        """Run the steps and return the results of the previous steps and of the steps, in the order of the tree."""
+        previous_results = dict(results or {})
+        results = dict(previous_results)
+        step_ids_to_skip = self.options.get_step_ids_to_skip(self.runnables)
+        prerequisites = [self._get_prerequisites(index, results) for index in range(len(self.steps))]
+
+        self._started_at = time.monotonic()
+        self.timings = {}
+        done_events = [anyio.Event() for _ in self.steps]
+        semaphore = _OrderedSemaphore(self.options.concurrency)
+        async with asyncer.create_task_group() as task_group:
+            tasks = [
+                task_group.soonify(self._run_step)(index, prerequisites[index], done_events, semaphore, step_ids_to_skip, results)
+                for index in range(len(self.steps))
+            ]
+
+        step_results = {**previous_results}
+        for step_to_run, task in zip(self.steps, tasks):
+            step_results[step_to_run.id] = task.value
+        return step_results
+
+    def get_critical_path(self) -> List[StepTiming]:
+        """The chain of steps which the last step to finish waited for, from the first step to the last one."""
+        if not self.timings:
+            return []
+        timing = max(self.timings.values(), key=lambda step_timing: step_timing.finished_at or 0.0)
+        critical_path = [timing]
+        while timing.ready_after is not None:
+            timing = self.timings[timing.ready_after]
+            critical_path.append(timing)
+        return critical_path[::-1]
+
+    def log_critical_path(self) -> None:
+        critical_path = self.get_critical_path()
+        if not critical_path:
+            return
+        main_logger.info(f"CRITICAL PATH: {critical_path[-1].finished_at:.2f}s")
+        for timing in critical_path:
+            main_logger.info(f"- {timing.step_id}: queued for {timing.queue_duration:.2f}s, ran for {timing.run_duration:.2f}s")
+
+
 async def run_steps(
     runnables: STEP_TREE,
-    results: RESULTS_DICT = {},
+    results: Optional[RESULTS_DICT] = None,
     options: RunStepOptions = RunStepOptions(),
 ) -> RESULTS_DICT:
-    """Run multiple steps sequentially, or in parallel if steps are wrapped into a sublist.
+    """Run multiple steps, each one as soon as the steps it depends on are done.
+
+    Steps are run sequentially, or in parallel if they are wrapped into a sublist.
+    A step with `depends_on` only waits for the steps it depends on, unless fail_fast is enabled, see StepScheduler.
 
     Examples
     --------
@@ -287,59 +462,22 @@ async def run_steps(
 
     Args:
         runnables (List[StepToRun]): List of steps to run.
-        results (RESULTS_DICT, optional): Dictionary of step results, used for recursion.
+        results (RESULTS_DICT, optional): Dictionary of the results of steps which already ran.
 
     Returns:
         RESULTS_DICT: Dictionary of step results.
     """
     # If there are no steps to run, return the results
     if not runnables:
-        return results
+        return results or {}
 
-    step_ids_to_skip = options.get_step_ids_to_skip(runnables)
     # Log the step tree
     if options.log_step_tree:
         main_logger.info(f"STEP TREE: {runnables}")
         _log_step_tree(runnables, options)
         options.log_step_tree = False
 
-    # If any of the previous steps failed, skip the remaining steps
-    if options.fail_fast and any(result.status is StepStatus.FAILURE and result.consider_in_overall_status for result in results.values()):
-        skipped_results = _skip_remaining_steps(runnables)
-        return {**results, **skipped_results}
-
-    # Pop the next step to run
-    steps_to_evaluate, remaining_steps = _get_next_step_group(runnables)
-
-    # Remove any skipped steps
-    steps_to_run, results = _filter_skipped_steps(steps_to_evaluate, step_ids_to_skip, results)
-
-    # Run all steps in list concurrently
-    semaphore = anyio.Semaphore(options.concurrency)
-    async with semaphore:
-        async with asyncer.create_task_group() as task_group:
-            tasks = []
-            for step_to_run in steps_to_run:
-                # if the step to run is a list, run it in parallel
-                if isinstance(step_to_run, list):
-                    tasks.append(task_group.soonify(run_steps)(list(step_to_run), results, options))
-                else:
-                    step_args = await evaluate_run_args(step_to_run.args, results)
-                    step_to_run.step.extra_params = options.step_params.get(step_to_run.id, {})
-                    main_logger.info(f"QUEUING STEP {step_to_run.id}")
-                    tasks.append(task_group.soonify(step_to_run.step.run)(**step_args))
-
-    # Apply new results
-    new_results: Dict[str, Any] = {}
-    for i, task in enumerate(tasks):
-        step_to_run = steps_to_run[i]
-        if isinstance(step_to_run, list):
-            new_results = {**new_results, **task.value}
-        else:
-            new_results[step_to_run.id] = task.value
-
-    return await run_steps(
-        runnables=remaining_steps,
-        results={**results, **new_results},
-        options=options,
-    )
+    step_scheduler = StepScheduler(runnables, options)
+    step_results = await step_scheduler.run(results)
+    step_scheduler.log_critical_path()
+    return step_results
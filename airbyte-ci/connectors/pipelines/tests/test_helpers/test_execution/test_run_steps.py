@@ -6,7 +6,7 @@ import anyio
 import pytest
 from exceptiongroup import ExceptionGroup
 
-from pipelines.helpers.execution.run_steps import InvalidStepConfiguration, RunStepOptions, StepToRun, run_steps
+from pipelines.helpers.execution.run_steps import InvalidStepConfiguration, RunStepOptions, StepScheduler, StepToRun, run_steps
 from pipelines.models.contexts.pipeline_context import PipelineContext
 from pipelines.models.steps import Step, StepResult, StepStatus
 
@@ -21,6 +21,12 @@ test_context = PipelineContext(
 )
 
 
+# The scheduling must not depend on the order the event loop runs the tasks in
+@pytest.fixture(scope="module", params=["asyncio", "trio"])
+def anyio_backend(request):
+    return request.param
+
+
 class TestStep(Step):
     title = "Test Step"
 
@@ -296,6 +302,111 @@ async def test_run_steps_sequential():
     assert ran_at["step3"] < ran_at["step4"]
 
 
+@pytest.mark.anyio
+async def test_run_steps_starts_steps_when_their_dependencies_are_done():
+    ran_at = {}
+
+    class SleepStep(Step):
+        title = "Sleep Step"
+
+        async def _run(self, name, sleep) -> StepResult:
+            await anyio.sleep(sleep)
+            ran_at[name] = time.time()
+            return StepResult(step=self, status=StepStatus.SUCCESS)
+
+    steps = [
+        [StepToRun(id="build", step=SleepStep(test_context), args={"name": "build", "sleep": 0})],
+        [StepToRun(id="unit", step=SleepStep(test_context), args={"name": "unit", "sleep": 2}, depends_on=["build"])],
+        [
+            StepToRun(id="acceptance", step=SleepStep(test_context), args={"name": "acceptance", "sleep": 0}, depends_on=["build"]),
+            StepToRun(id="qa", step=SleepStep(test_context), args={"name": "qa", "sleep": 0}),
+        ],
+    ]
+
+    results = await run_steps(steps, options=RunStepOptions(fail_fast=False))
+
+    assert list(results) == ["build", "unit", "acceptance", "qa"]
+    # acceptance only depends on build, it does not wait for the unit tests of the previous group
+    assert ran_at["acceptance"] < ran_at["unit"]
+    # qa has no dependencies declared, it waits for all the steps of the previous groups
+    assert ran_at["qa"] > ran_at["unit"]
+
+
+@pytest.mark.anyio
+async def test_run_steps_with_fail_fast_waits_for_the_previous_groups():
+    steps = [
+        [StepToRun(id="build", step=TestStep(test_context))],
+        [StepToRun(id="unit", step=TestStep(test_context), args={"result_status": StepStatus.FAILURE}, depends_on=["build"])],
+        [StepToRun(id="acceptance", step=TestStep(test_context), depends_on=["build"])],
+    ]
+
+    results = await run_steps(steps, options=RunStepOptions(fail_fast=True))
+
+    # acceptance only depends on build, but it is skipped after the failure of the unit tests
+    assert {step_id: result.status for step_id, result in results.items()} == {
+        "build": StepStatus.SUCCESS,
+        "unit": StepStatus.FAILURE,
+        "acceptance": StepStatus.SKIPPED,
+    }
+
+
+@pytest.mark.anyio
+async def test_step_scheduler_critical_path():
+    class SleepStep(Step):
+        title = "Sleep Step"
+
+        async def _run(self, sleep) -> StepResult:
+            await anyio.sleep(sleep)
+            return StepResult(step=self, status=StepStatus.SUCCESS)
+
+    steps = [
+        [StepToRun(id="step1", step=SleepStep(test_context), args={"sleep": 0})],
+        [
+            StepToRun(id="step2", step=SleepStep(test_context), args={"sleep": 3}, depends_on=["step1"]),
+            StepToRun(id="step3", step=SleepStep(test_context), args={"sleep": 0}, depends_on=["step1"]),
+            StepToRun(id="step4", step=SleepStep(test_context), args={"sleep": 0}, depends_on=["step1"]),
+        ],
+        [StepToRun(id="step5", step=SleepStep(test_context), args={"sleep": 0})],
+    ]
+    step_scheduler = StepScheduler(steps, RunStepOptions(fail_fast=False, concurrency=2))
+
+    await step_scheduler.run()
+
+    assert [timing.step_id for timing in step_scheduler.get_critical_path()] == ["step1", "step2", "step5"]
+    timings = {timing.step_id: timing for timing in step_scheduler.timings.values()}
+    assert timings["step2"].run_duration >= 3
+    # step3 and step4 become ready at the same time, but only one of them can run alongside step2
+    assert max(timings["step3"].queue_duration, timings["step4"].queue_duration) > 0.5
+    assert timings["step5"].ready_at >= timings["step2"].finished_at
+
+
+@pytest.mark.anyio
+async def test_run_steps_concurrency_is_shared_by_nested_steps():
+    running_steps = set()
+    max_running_steps = 0
+
+    class CountingStep(Step):
+        title = "Counting Step"
+
+        async def _run(self, name) -> StepResult:
+            nonlocal max_running_steps
+            running_steps.add(name)
+            max_running_steps = max(max_running_steps, len(running_steps))
+            await anyio.sleep(0.1)
+            running_steps.remove(name)
+            return StepResult(step=self, status=StepStatus.SUCCESS)
+
+    steps = [
+        [StepToRun(id=f"step{index}", step=CountingStep(test_context), args={"name": f"step{index}"}) for index in range(3)],
+        [StepToRun(id=f"step{index}", step=CountingStep(test_context), args={"name": f"step{index}"}) for index in range(3, 6)],
+    ]
+
+    results = await run_steps([steps], options=RunStepOptions(concurrency=2))
+
+    assert all(result.status is StepStatus.SUCCESS for result in results.values())
+    assert max_running_steps == 2
+
+
 @pytest.mark.anyio
 async def test_run_steps_passes_results():
     """
@@ -3,10 +3,13 @@
 #
 
 
+import hashlib
+import itertools
 import json
 import os
 import re
-from typing import Any, Dict, List, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode, SyncMode  # type: ignore
@@ -16,6 +19,9 @@ from normalization.transform_catalog.destination_name_transformer import Destina
 from normalization.transform_catalog.stream_processor import StreamProcessor
 from normalization.transform_catalog.table_name_registry import TableNameRegistry
 
+# Records the fingerprint and the generated files of each stream in the output directory, see CatalogProcessor.generate_models()
+MODELS_MANIFEST_FILE = ".models_manifest.json"
+
 
 class CatalogProcessor:
     """
@@ -28,21 +34,36 @@ class CatalogProcessor:
     This is relying on a StreamProcessor to handle the conversion of a stream to a table one at a time.
     """
 
-    def __init__(self, output_directory: str, destination_type: DestinationType):
+    def __init__(
+        self, output_directory: str, destination_type: DestinationType, incremental: bool = False, max_workers: Optional[int] = None
+    ):
         """
         @param output_directory is the path to the directory where this processor should write the resulting SQL files (DBT models)
         @param destination_type is the destination type of warehouse
+        @param incremental is a flag to reuse the models generated in output_directory by an earlier run for the streams that
+        didn't change, and to generate the models of the other streams in a process pool
+        @param max_workers is the number of processes generating models in incremental mode (defaults to the number of CPUs)
         """
         self.output_directory: str = output_directory
         self.destination_type: DestinationType = destination_type
+        self.incremental: bool = incremental
+        self.max_workers: Optional[int] = max_workers
         self.name_transformer: DestinationNameTransformer = DestinationNameTransformer(destination_type)
         self.models_to_source: Dict[str, str] = {}
+        # manifest entries of the streams handled by generate_models() across the catalogs processed by this instance
+        self.generated_streams: Dict[str, Dict] = {}
+        # manifest of the earlier run, read once for all the catalogs, the manifest file is only rewritten by finalize()
+        self.previous_manifest: Optional[Dict[str, Dict]] = None
 
     def process(self, catalog_file: str, json_column_name: str, default_schema: str):
         """
         This method first parse and build models to handle top-level streams.
         In a second loop will go over the substreams that were nested in a breadth-first traversal manner.
 
+        In incremental mode, streams are handled together with their substreams by generate_models() instead.
+        Table names are still resolved for the whole catalog before any model is generated.
+        Once all the catalogs are processed, finalize() must be called to remove the models that were not generated again.
+
         @param catalog_file input AirbyteCatalog file in JSON Schema describing the structure of the raw data
         @param json_column_name is the column name containing the JSON Blob with the raw data
         @param default_schema is the final schema where to output the final transformed data to
@@ -60,13 +81,14 @@ class CatalogProcessor:
             destination_type=self.destination_type,
             tables_registry=tables_registry,
         )
-        for stream_processor in stream_processors:
-            stream_processor.collect_table_names()
+        registered_processors = [stream_processor.collect_table_names() for stream_processor in stream_processors]
         for conflict in tables_registry.resolve_names():
             print(
                 f"WARN: Resolving conflict: {conflict.schema}.{conflict.table_name_conflict} "
                 f"from '{'.'.join(conflict.json_path)}' into {conflict.table_name_resolved}"
             )
+        if self.incremental:
+            self.generate_models(catalog, stream_processors, registered_processors, tables_registry, json_column_name, default_schema)
         for stream_processor in stream_processors:
             # MySQL table names need to be manually truncated, because it does not do it automatically
             truncate = (
@@ -76,6 +98,8 @@ class CatalogProcessor:
             )
             raw_table_name = self.name_transformer.normalize_table_name(f"_airbyte_raw_{stream_processor.stream_name}", truncate=truncate)
             add_table_to_sources(schema_to_source_tables, stream_processor.schema, raw_table_name)
+            if self.incremental:
+                continue
 
             nested_processors = stream_processor.process()
             self.models_to_source.update(stream_processor.models_to_source)
@@ -181,6 +205,116 @@ class CatalogProcessor:
                 for file in substream.sql_outputs:
                     output_sql_file(os.path.join(self.output_directory, file), substream.sql_outputs[file])
 
+    def generate_models(
+        self,
+        catalog: Dict,
+        stream_processors: List[StreamProcessor],
+        registered_processors: List[List[StreamProcessor]],
+        tables_registry: TableNameRegistry,
+        json_column_name: str,
+        default_schema: str,
+    ):
+        """
+        Generate the models of each stream and its substreams, reusing the models of an earlier run when the stream fingerprint
+        didn't change. The other streams are generated in a process pool, see generate_stream_models().
+
+        The fingerprint covers the configured stream (json schema, sync modes, cursor and primary key) and the resolved
+        names of its tables, so streams are generated again when a name conflict with another stream appears or disappears.
+        """
+        if self.previous_manifest is None:
+            manifest_file = os.path.join(self.output_directory, MODELS_MANIFEST_FILE)
+            self.previous_manifest = read_json(manifest_file) if os.path.exists(manifest_file) else {}
+        manifest = self.previous_manifest
+        generator_fingerprint = get_generator_fingerprint()
+
+        streams = {}
+        changed_streams = []
+        for configured_stream, stream_processor, processors in zip(catalog["streams"], stream_processors, registered_processors):
+            key = f"{stream_processor.schema}.{stream_processor.stream_name}"
+            resolved_names = [
+                [
+                    processor.json_path,
+                    tables_registry.get_table_name(processor.get_schema(is_intermediate), processor.json_path, processor.stream_name, ""),
+                    tables_registry.get_file_name(processor.get_schema(is_intermediate), processor.json_path, processor.stream_name, ""),
+                ]
+                for processor in processors
+                for is_intermediate in [True, False]
+            ]
+            fingerprint = hash_json(
+                {
+                    "generator": generator_fingerprint,
+                    "destination_type": self.destination_type.value,
+                    "json_column_name": json_column_name,
+                    "default_schema": default_schema,
+                    "configured_stream": configured_stream,
+                    "resolved_names": resolved_names,
+                }
+            )
+            previous = manifest.get(key)
+            if (
+                previous
+                and previous["fingerprint"] == fingerprint
+                and all(os.path.exists(os.path.join(self.output_directory, file)) for file in previous["files"])
+            ):
+                print(f"  Reusing models of unchanged stream '{stream_processor.stream_name}'")
+                streams[key] = previous
+            else:
+                streams[key] = {"fingerprint": fingerprint}
+                changed_streams.append((key, stream_processor))
+
+        changed_results = self.generate_stream_models([stream_processor for _, stream_processor in changed_streams], tables_registry)
+        for (key, _), (files, models_to_source) in zip(changed_streams, changed_results):
+            streams[key]["files"] = files
+            streams[key]["models_to_source"] = models_to_source
+
+        self.generated_streams.update(streams)
+
+        # keep the breadth-first order of models_to_source from process_substreams()
+        for depth in range(max([len(stream["models_to_source"]) for stream in streams.values()], default=0)):
+            for stream in streams.values():
+                if depth < len(stream["models_to_source"]):
+                    self.models_to_source.update(stream["models_to_source"][depth])
+
+    def finalize(self):
+        """
+        In incremental mode, remove the models of the earlier run that were not generated again by any of the processed catalogs,
+        including those of streams removed from the catalogs, and write the manifest of the generated streams.
+
+        Files are compared across all streams, as a name collision may move a file from one stream to another.
+        """
+        if not self.incremental or self.previous_manifest is None:
+            return
+        generated_files = {file for stream in self.generated_streams.values() for file in stream["files"]}
+        for file in {file for stream in self.previous_manifest.values() for file in stream["files"]} - generated_files:
+            if os.path.exists(os.path.join(self.output_directory, file)):
+                os.remove(os.path.join(self.output_directory, file))
+
+        if not os.path.exists(self.output_directory):
+            os.makedirs(self.output_directory)
+        with open(os.path.join(self.output_directory, MODELS_MANIFEST_FILE), "w") as fh:
+            fh.write(json.dumps(self.generated_streams))
+
+    def generate_stream_models(
+        self, stream_processors: List[StreamProcessor], tables_registry: TableNameRegistry
+    ) -> List[Tuple[List[str], List[Dict[str, str]]]]:
+        """
+        Generate the models of the streams in a process pool, each worker handles a stream with all of its substreams.
+        """
+        max_workers = self.max_workers or os.cpu_count() or 1
+        if max_workers == 1 or len(stream_processors) <= 1:
+            return [
+                generate_stream_models(stream_processor, tables_registry, self.output_directory) for stream_processor in stream_processors
+            ]
+
+        # the registry is sent once to each worker instead of being pickled with every stream processor
+        for stream_processor in stream_processors:
+            stream_processor.tables_registry = None
+        chunksize = max(1, len(stream_processors) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker_tables_registry, initargs=(tables_registry,)) as executor:
+            return list(
+                executor.map(generate_worker_stream_models, stream_processors, itertools.repeat(self.output_directory), chunksize=chunksize)
+            )
+
     def write_yaml_sources_file(self, schema_to_source_tables: Dict[str, Set[str]]):
         """
         Generate the sources.yaml file as described in https://docs.getdbt.com/docs/building-a-dbt-project/using-sources/
@@ -284,14 +418,68 @@ def add_table_to_sources(schema_to_source_tables: Dict[str, Set[str]], schema_na
         raise KeyError(f"Duplicate table {table_name} in {schema_name}")
 
 
+def hash_json(content: Any) -> str:
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_generator_fingerprint() -> str:
+    """
+    Hash of the code generating the models, so that models generated by another version of normalization are not reused
+    """
+    h = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for file in sorted(os.listdir(directory)):
+        if file.endswith(".py"):
+            with open(os.path.join(directory, file), "rb") as fh:
+                h.update(fh.read())
+    return h.hexdigest()
+
+
+def generate_stream_models(
+    stream_processor: StreamProcessor, tables_registry: TableNameRegistry, output_directory: str
+) -> Tuple[List[str], List[Dict[str, str]]]:
+    """
+    Generate and write the models of a stream and its substreams, in the same breadth-first traversal as process_substreams()
+    @return the list of written files and the models_to_source mapping of each nesting level
+    """
+    files = []
+    models_to_source = []
+    processors = [stream_processor]
+    while processors:
+        level_models_to_source = {}
+        children = []
+        for processor in processors:
+            processor.tables_registry = tables_registry
+            children += processor.process()
+            level_models_to_source.update(processor.models_to_source)
+            for file in processor.sql_outputs:
+                output_sql_file(os.path.join(output_directory, file), processor.sql_outputs[file])
+                files.append(file)
+        models_to_source.append(level_models_to_source)
+        processors = children
+    return files, models_to_source
+
+
+worker_tables_registry: Optional[TableNameRegistry] = None
+
+
+def init_worker_tables_registry(tables_registry: TableNameRegistry):
+    global worker_tables_registry
+    worker_tables_registry = tables_registry
+
+
+def generate_worker_stream_models(stream_processor: StreamProcessor, output_directory: str) -> Tuple[List[str], List[Dict[str, str]]]:
+    return generate_stream_models(stream_processor, worker_tables_registry, output_directory)
+
+
 def output_sql_file(file: str, sql: str):
     """
     @param file is the path to filename to be written
     @param sql is the dbt sql content to be written in the generated model file
     """
     output_dir = os.path.dirname(file)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    # the models of different streams can be written to the same directory concurrently by generate_stream_models()
+    os.makedirs(output_dir, exist_ok=True)
     with open(file, "w") as f:
         for line in sql.splitlines():
             if line.strip():
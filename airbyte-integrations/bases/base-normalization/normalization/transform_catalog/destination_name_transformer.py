@@ -4,6 +4,7 @@
 
 
 import unicodedata as ud
+from functools import lru_cache
 from re import match, sub
 
 from normalization.destination_type import DestinationType
@@ -40,6 +41,9 @@ TRUNCATE_DBT_RESERVED_SIZE = 12
 # we keep 4 characters for 1 underscore and 3 characters hash (of the schema)
 TRUNCATE_RESERVED_SIZE = 8
 
+# Size of the memoized results of each normalization method, shared by the transformers of the same destination type
+NORMALIZATION_CACHE_SIZE = 65536
+
 
 class DestinationNameTransformer:
     """
@@ -55,8 +59,17 @@ class DestinationNameTransformer:
         """
         self.destination_type: DestinationType = destination_type
 
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DestinationNameTransformer) and self.destination_type == other.destination_type
+
+    def __hash__(self) -> int:
+        # Transformers are stateless besides the destination type, so the memoized normalization methods
+        # are shared by all the stream processors of a catalog instead of being recomputed for each of them
+        return hash(self.destination_type)
+
     # Public methods
 
+    @lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
     def needs_quotes(self, input_name: str) -> bool:
         """
         @param input_name to test if it needs to manipulated with quotes or not
@@ -71,6 +84,7 @@ class DestinationNameTransformer:
         contains_non_alphanumeric = match(".*[^A-Za-z0-9_].*", input_name) is not None
         return doesnt_start_with_alphaunderscore or contains_non_alphanumeric
 
+    @lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
     def normalize_schema_name(self, schema_name: str, in_jinja: bool = False, truncate: bool = True) -> str:
         """
         @param schema_name is the schema to normalize
@@ -82,6 +96,7 @@ class DestinationNameTransformer:
             schema_name = schema_name[1:]
         return self.__normalize_non_column_identifier_name(input_name=schema_name, in_jinja=in_jinja, truncate=truncate)
 
+    @lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
     def normalize_table_name(
         self, table_name: str, in_jinja: bool = False, truncate: bool = True, conflict: bool = False, conflict_level: int = 0
     ) -> str:
@@ -99,6 +114,7 @@ class DestinationNameTransformer:
             input_name=table_name, in_jinja=in_jinja, truncate=truncate, conflict=conflict, conflict_level=conflict_level
         )
 
+    @lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
     def normalize_column_name(
         self, column_name: str, in_jinja: bool = False, truncate: bool = True, conflict: bool = False, conflict_level: int = 0
     ) -> str:
@@ -114,6 +130,7 @@ class DestinationNameTransformer:
             column_name=column_name, in_jinja=in_jinja, truncate=truncate, conflict=conflict, conflict_level=conflict_level
         )
 
+    @lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
     def truncate_identifier_name(self, input_name: str, custom_limit: int = -1, conflict: bool = False, conflict_level: int = 0) -> str:
         """
         @param input_name is the identifier name to middle truncate
@@ -217,6 +234,7 @@ class DestinationNameTransformer:
                 result = f"_{result}"
         return result
 
+    @lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
     def __normalize_identifier_case(self, input_name: str, is_quoted: bool = False) -> str:
         result = input_name
         if self.destination_type.value == DestinationType.BIGQUERY.value:
@@ -253,6 +271,7 @@ class DestinationNameTransformer:
             raise KeyError(f"Unknown destination type {self.destination_type}")
         return result
 
+    @lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
     def normalize_column_identifier_case_for_lookup(self, input_name: str, is_quoted: bool = False) -> str:
         """
         This function adds an additional normalization regarding the column name casing to determine if multiple columns
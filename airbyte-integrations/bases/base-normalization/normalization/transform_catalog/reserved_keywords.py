@@ -3,7 +3,7 @@
 #
 
 
-from typing import Set
+from typing import Dict, FrozenSet, Set
 
 from normalization import DestinationType
 
@@ -3271,6 +3271,12 @@ RESERVED_KEYWORDS = {
     DestinationType.DUCKDB.value: DUCKDB,
 }
 
+# Uppercase keywords indexed by destination type, precomputed once for is_reserved_keyword()
+UPPERCASE_RESERVED_KEYWORDS: Dict[DestinationType, FrozenSet[str]] = {
+    DestinationType(integration_type): frozenset(keyword.upper() for keyword in keywords)
+    for integration_type, keywords in RESERVED_KEYWORDS.items()
+}
+
 
 def is_reserved_keyword(token: str, integration_type: DestinationType) -> bool:
-    return token.upper() in RESERVED_KEYWORDS[integration_type.value]
+    return token.upper() in UPPERCASE_RESERVED_KEYWORDS[integration_type]
@@ -42,6 +42,12 @@ python3 main_dev_transform_catalog.py \
         parser.add_argument("--catalog", nargs="+", type=str, required=True, help="path to Catalog (JSON Schema) file")
         parser.add_argument("--out", type=str, required=True, help="path to output generated DBT Models to")
         parser.add_argument("--json-column", type=str, required=False, help="name of the column containing the json blob")
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="reuse the models generated by an earlier run in --out for unchanged streams, and generate the others in parallel",
+        )
+        parser.add_argument("--max-workers", type=int, required=False, help="number of processes generating models with --incremental")
         parsed_args = parser.parse_args(args)
         profiles_yml = read_profiles_yml(parsed_args.profile_config_dir)
         self.config = {
@@ -51,6 +57,8 @@ python3 main_dev_transform_catalog.py \
             "output_path": parsed_args.out,
             "json_column": parsed_args.json_column,
             "profile_config_dir": parsed_args.profile_config_dir,
+            "incremental": parsed_args.incremental,
+            "max_workers": parsed_args.max_workers,
         }
 
     def process_catalog(self) -> None:
@@ -58,10 +66,16 @@ python3 main_dev_transform_catalog.py \
         schema = self.config["schema"]
         output = self.config["output_path"]
         json_col = self.config["json_column"]
-        processor = CatalogProcessor(output_directory=output, destination_type=destination_type)
+        processor = CatalogProcessor(
+            output_directory=output,
+            destination_type=destination_type,
+            incremental=self.config.get("incremental", False),
+            max_workers=self.config.get("max_workers"),
+        )
         for catalog_file in self.config["catalog"]:
             print(f"Processing {catalog_file}...")
             processor.process(catalog_file=catalog_file, json_column_name=json_col, default_schema=schema)
+        processor.finalize()
         self.update_dbt_project_vars(json_column=self.config["json_column"], models_to_source=processor.models_to_source)
 
     def update_dbt_project_vars(self, **vars_config: Dict[str, Any]):
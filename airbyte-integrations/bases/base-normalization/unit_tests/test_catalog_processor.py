@@ -0,0 +1,161 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+
+import json
+import os
+from typing import Dict
+from unittest.mock import patch
+
+import pytest
+from normalization.destination_type import DestinationType
+from normalization.transform_catalog import catalog_processor
+from normalization.transform_catalog.catalog_processor import MODELS_MANIFEST_FILE, CatalogProcessor
+
+
+@pytest.fixture(scope="function", autouse=True)
+def before_tests(request):
+    # This makes the test run whether it is executed from the tests folder (with pytest/gradle)
+    # or from the base-normalization folder (through pycharm)
+    unit_tests_dir = os.path.join(request.fspath.dirname, "unit_tests")
+    if os.path.exists(unit_tests_dir):
+        os.chdir(unit_tests_dir)
+    else:
+        os.chdir(request.fspath.dirname)
+    yield
+    os.chdir(request.config.invocation_dir)
+
+
+def read_models(output_directory: str) -> Dict[str, str]:
+    models = {}
+    for root, _, files in os.walk(output_directory):
+        for file in files:
+            if file != MODELS_MANIFEST_FILE:
+                with open(os.path.join(root, file), "r") as f:
+                    models[os.path.relpath(os.path.join(root, file), output_directory)] = f.read()
+    return models
+
+
+def process(catalog_file: str, output_directory: str, destination_type: DestinationType, **kwargs) -> CatalogProcessor:
+    processor = CatalogProcessor(output_directory=output_directory, destination_type=destination_type, **kwargs)
+    processor.process(catalog_file=catalog_file, json_column_name="'json_column_name_test'", default_schema="schema_test")
+    processor.finalize()
+    return processor
+
+
+@pytest.mark.parametrize(
+    "catalog_file",
+    [
+        "long_name_truncate_collisions_catalog",
+        "un-nesting_collisions_catalog",
+        "nested_catalog",
+    ],
+)
+@pytest.mark.parametrize("destination_type", [DestinationType.POSTGRES, DestinationType.BIGQUERY, DestinationType.SNOWFLAKE])
+def test_incremental_generates_the_same_models(tmp_path, destination_type: DestinationType, catalog_file: str):
+    expected = process(f"resources/{catalog_file}.json", str(tmp_path / "expected"), destination_type)
+    result = process(f"resources/{catalog_file}.json", str(tmp_path / "result"), destination_type, incremental=True, max_workers=2)
+
+    assert read_models(str(tmp_path / "result")) == read_models(str(tmp_path / "expected"))
+    assert list(result.models_to_source.items()) == list(expected.models_to_source.items())
+
+
+def test_incremental_reuses_unchanged_streams(tmp_path):
+    output_directory = str(tmp_path / "models")
+    with open("resources/un-nesting_collisions_catalog.json", "r") as f:
+        catalog = json.loads(f.read())
+    catalog_file = str(tmp_path / "catalog.json")
+    with open(catalog_file, "w") as f:
+        f.write(json.dumps(catalog))
+    expected_models_to_source = process(catalog_file, output_directory, DestinationType.POSTGRES, incremental=True).models_to_source
+
+    with patch.object(catalog_processor, "output_sql_file", wraps=catalog_processor.output_sql_file) as output_sql_file:
+        result = process(catalog_file, output_directory, DestinationType.POSTGRES, incremental=True, max_workers=1)
+        assert output_sql_file.call_count == 0
+        assert list(result.models_to_source.items()) == list(expected_models_to_source.items())
+
+        catalog["streams"][1]["stream"]["json_schema"]["properties"]["updated_at"] = {"type": ["null", "string"]}
+        with open(catalog_file, "w") as f:
+            f.write(json.dumps(catalog))
+        process(catalog_file, output_directory, DestinationType.POSTGRES, incremental=True, max_workers=1)
+    written_models = {os.path.relpath(call.args[0], output_directory) for call in output_sql_file.call_args_list}
+    # only the models of the changed stream and of its nested stream are written again
+    assert written_models == {
+        "airbyte_ctes/namespace/simple_ab1.sql",
+        "airbyte_ctes/namespace/simple_ab2.sql",
+        "airbyte_ctes/namespace/simple_ab3.sql",
+        "airbyte_incremental/namespace/simple.sql",
+        "airbyte_ctes/namespace/_airbyte_namespace_simple_b94_stream_name_ab1.sql",
+        "airbyte_ctes/namespace/_airbyte_namespace_simple_b94_stream_name_ab2.sql",
+        "airbyte_ctes/namespace/_airbyte_namespace_simple_b94_stream_name_ab3.sql",
+        "airbyte_incremental/namespace/namespace_simple_b94_stream_name.sql",
+    }
+    assert "updated_at" in read_models(output_directory)["airbyte_incremental/namespace/simple.sql"]
+
+
+def test_incremental_removes_models_not_generated_again(tmp_path):
+    output_directory = str(tmp_path / "models")
+    with open("resources/nested_catalog.json", "r") as f:
+        catalog = json.loads(f.read())
+    catalog_file = str(tmp_path / "catalog.json")
+    with open(catalog_file, "w") as f:
+        f.write(json.dumps(catalog))
+    process(catalog_file, output_directory, DestinationType.POSTGRES, incremental=True)
+    nested_models = {model for model in read_models(output_directory) if "object_story_spec" in model}
+    assert nested_models
+
+    del catalog["streams"][0]["stream"]["json_schema"]["properties"]["object_story_spec"]
+    with open(catalog_file, "w") as f:
+        f.write(json.dumps(catalog))
+    process(catalog_file, output_directory, DestinationType.POSTGRES, incremental=True)
+
+    models = read_models(output_directory)
+    assert not nested_models.intersection(models)
+    assert models == read_models(str(process(catalog_file, str(tmp_path / "expected"), DestinationType.POSTGRES).output_directory))
+
+
+def test_incremental_removes_models_of_removed_streams(tmp_path):
+    output_directory = str(tmp_path / "models")
+    with open("resources/un-nesting_collisions_catalog.json", "r") as f:
+        catalog = json.loads(f.read())
+    catalog_file = str(tmp_path / "catalog.json")
+    with open(catalog_file, "w") as f:
+        f.write(json.dumps(catalog))
+    process(catalog_file, output_directory, DestinationType.POSTGRES, incremental=True)
+
+    catalog["streams"] = catalog["streams"][-1:]
+    with open(catalog_file, "w") as f:
+        f.write(json.dumps(catalog))
+    process(catalog_file, output_directory, DestinationType.POSTGRES, incremental=True)
+
+    assert read_models(output_directory) == read_models(
+        str(process(catalog_file, str(tmp_path / "expected"), DestinationType.POSTGRES).output_directory)
+    )
+    with open(os.path.join(output_directory, MODELS_MANIFEST_FILE), "r") as f:
+        assert len(json.loads(f.read())) == 1
+
+
+def test_incremental_reuses_streams_of_all_catalogs(tmp_path, capsys):
+    output_directory = str(tmp_path / "models")
+    catalog_files = ["resources/nested_catalog.json", "resources/un-nesting_collisions_catalog.json"]
+
+    def process_catalogs() -> CatalogProcessor:
+        processor = CatalogProcessor(output_directory=output_directory, destination_type=DestinationType.POSTGRES, incremental=True)
+        for catalog_file in catalog_files:
+            processor.process(catalog_file=catalog_file, json_column_name="'json_column_name_test'", default_schema="schema_test")
+        processor.finalize()
+        return processor
+
+    process_catalogs()
+    expected_models = read_models(output_directory)
+    with open(os.path.join(output_directory, MODELS_MANIFEST_FILE), "r") as f:
+        streams_count = len(json.loads(f.read()))
+    capsys.readouterr()
+
+    # the models of the second catalog are neither removed nor forgotten by the manifest while the first catalog is processed
+    with patch.object(catalog_processor, "output_sql_file", wraps=catalog_processor.output_sql_file) as output_sql_file:
+        process_catalogs()
+        assert output_sql_file.call_count == 0
+    assert capsys.readouterr().out.count("Reusing models of unchanged stream") == streams_count
+    assert read_models(output_directory) == expected_models
@@ -135,6 +135,15 @@ def test_normalize_column_name(input_str: str, destination_type: str, expected:
     assert DestinationNameTransformer(t).normalize_column_name(input_str, in_jinja=True) == expected_in_jinja
 
 
+def test_normalize_column_name_is_shared_between_transformers():
+    DestinationNameTransformer.normalize_column_name.cache_clear()
+    for _ in range(3):
+        assert DestinationNameTransformer(DestinationType.POSTGRES).normalize_column_name("Groups") == "groups"
+    assert DestinationNameTransformer(DestinationType.SNOWFLAKE).normalize_column_name("Groups") == "GROUPS"
+    cache_info = DestinationNameTransformer.normalize_column_name.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (2, 2)
+
+
 @pytest.mark.parametrize(
     "input_str, expected",
     [
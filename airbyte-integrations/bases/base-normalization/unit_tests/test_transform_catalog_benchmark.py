@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+"""
+The benchmark of `TransformCatalog.process_catalog()` over a synthetic catalog, from the catalog file to the dbt models.
+
+Skipped by default, to run:
+    NORMALIZATION_TRANSFORM_BENCHMARK=1 pytest -s unit_tests/test_transform_catalog_benchmark.py
+
+The number of streams could be overridden with `NORMALIZATION_TRANSFORM_BENCHMARK_STREAMS` (default: 5000) and the destination
+with `NORMALIZATION_TRANSFORM_BENCHMARK_DESTINATION` (default: postgres). The streams share most of their column names, like
+the streams of a real source do.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict
+
+import pytest
+from normalization.transform_catalog.transform import TransformCatalog
+
+BENCHMARK_STREAMS = int(os.getenv("NORMALIZATION_TRANSFORM_BENCHMARK_STREAMS", 5000))
+BENCHMARK_DESTINATION = os.getenv("NORMALIZATION_TRANSFORM_BENCHMARK_DESTINATION", "postgres")
+COLUMNS = ["id", "name", "email", "status", "type", "user", "order", "group", "amount", "currency", "Description", "Customer Name"]
+
+
+def get_configured_stream(index: int) -> Dict[str, Any]:
+    properties = {column: {"type": ["null", "string"]} for column in COLUMNS}
+    properties["created_at"] = {"type": ["null", "string"], "format": "date-time"}
+    properties["updated_at"] = {"type": ["null", "string"], "format": "date-time"}
+    properties[f"custom_field_{index}"] = {"type": ["null", "integer"]}
+    properties["address"] = {
+        "type": ["null", "object"],
+        "properties": {"city": {"type": ["null", "string"]}, "zip": {"type": ["null", "string"]}, "country": {"type": ["null", "string"]}},
+    }
+    return {
+        "stream": {
+            "name": f"stream_{index}",
+            "namespace": f"namespace_{index % 10}",
+            "json_schema": {"type": ["null", "object"], "properties": properties},
+            "supported_sync_modes": ["incremental"],
+        },
+        "sync_mode": "incremental",
+        "destination_sync_mode": "append_dedup",
+        "cursor_field": ["updated_at"],
+        "primary_key": [["id"]],
+    }
+
+
+@pytest.mark.skipif(
+    not os.getenv("NORMALIZATION_TRANSFORM_BENCHMARK"), reason="The benchmark is enabled with `NORMALIZATION_TRANSFORM_BENCHMARK=1`"
+)
+def test_transform_catalog_streams_per_second(tmp_path, capsys):
+    catalog_file = str(tmp_path / "catalog.json")
+    with open(catalog_file, "w") as f:
+        f.write(json.dumps({"streams": [get_configured_stream(index) for index in range(BENCHMARK_STREAMS)]}))
+    with open(tmp_path / TransformCatalog.DBT_PROJECT, "w") as f:
+        f.write("name: airbyte_utils\n")
+    transform_catalog = TransformCatalog()
+    transform_catalog.config = {
+        "integration_type": BENCHMARK_DESTINATION,
+        "schema": "benchmark",
+        "catalog": [catalog_file],
+        "output_path": str(tmp_path / "models" / "generated"),
+        "json_column": "_airbyte_data",
+        "profile_config_dir": str(tmp_path),
+    }
+
+    started_at = time.perf_counter()
+    transform_catalog.process_catalog()
+    elapsed = time.perf_counter() - started_at
+
+    models = sum(len(files) for _, _, files in os.walk(tmp_path / "models" / "generated"))
+    with capsys.disabled():
+        print(
+            f"\nTransformed {BENCHMARK_STREAMS:,} streams into {models:,} {BENCHMARK_DESTINATION} models in {elapsed:.2f}s: "
+            f"{BENCHMARK_STREAMS / elapsed:,.1f} streams/s"
+        )
+    assert models > BENCHMARK_STREAMS
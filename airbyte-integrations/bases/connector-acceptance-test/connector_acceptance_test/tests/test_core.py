@@ -5,7 +5,8 @@
 import json
 import logging
 import re
-from collections import Counter, defaultdict
+from abc import ABC, abstractmethod
+from collections import defaultdict
 from functools import reduce
 from logging import Logger
 from os.path import splitext
@@ -51,7 +52,8 @@ from connector_acceptance_test.config import (
     SpecTestConfig,
     UnsupportedFileTypeConfig,
 )
-from connector_acceptance_test.utils import ConnectorRunner, SecretDict, filter_output, make_hashable, verify_records_schema
+from connector_acceptance_test.utils import ConnectorRunner, SecretDict, diff_records, filter_output, iterate_output
+from connector_acceptance_test.utils.asserts import RecordsSchemaVerifier
 from connector_acceptance_test.utils.backward_compatibility import CatalogDiffChecker, SpecDiffChecker, validate_previous_configs
 from connector_acceptance_test.utils.common import (
     build_configured_catalog_from_custom_catalog,
@@ -873,15 +875,6 @@ class TestDiscovery(BaseTest):
         assert not errors, "\n".join(errors)
 
 
-def primary_keys_for_records(streams, records):
-    streams_with_primary_key = [stream for stream in streams if stream.stream.source_defined_primary_key]
-    for stream in streams_with_primary_key:
-        stream_records = [r for r in records if r.stream == stream.stream.name]
-        for stream_record in stream_records:
-            pk_values = _extract_primary_key_value(stream_record.data, stream.stream.source_defined_primary_key)
-            yield pk_values, stream_record
-
-
 def _extract_pk_values(records: Iterable[Mapping[str, Any]], primary_key: List[List[str]]) -> Iterable[dict[Tuple[str], Any]]:
     for record in records:
         yield _extract_primary_key_value(record, primary_key)
@@ -895,11 +888,173 @@ def _extract_primary_key_value(record: Mapping[str, Any], primary_key: List[List
     return pk_values
 
 
+class RecordsValidator(ABC):
+    """Validate the records of a read in a single pass over the connector output.
+    consume() is called with each record in the order they were emitted, then validate() fails the test if needed.
+    """
+
+    @abstractmethod
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        pass
+
+    @abstractmethod
+    def validate(self) -> None:
+        pass
+
+
+def validate_records(records: Iterable[AirbyteRecordMessage], validators: List[RecordsValidator]) -> None:
+    for record in records:
+        for validator in validators:
+            validator.consume(record)
+    for validator in validators:
+        validator.validate()
+
+
+class RecordsStructureValidator(RecordsValidator):
+    """Check that every record has some of the fields of its stream schema, see TestBasicRead._validate_records_structure"""
+
+    def __init__(self, configured_catalog: ConfiguredAirbyteCatalog):
+        self.schemas: Dict[str, Set] = {}
+        for stream in configured_catalog.streams:
+            self.schemas[stream.stream.name] = set(get_expected_schema_structure(stream.stream.json_schema))
+        self.error: Optional[str] = None
+
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        schema_paths = self.schemas.get(record.stream)
+        if self.error or not schema_paths:
+            return
+        record_fields = set(get_object_structure(record.data))
+        common_fields = set.intersection(record_fields, schema_paths)
+        if not common_fields:
+            self.error = f" Record {record} from {record.stream} stream with fields {record_fields} should have some fields mentioned by json schema: {schema_paths}"
+
+    def validate(self) -> None:
+        assert not self.error, self.error
+
+
+class RecordsSchemaValidator(RecordsValidator):
+    """Check if data type and structure in records matches the one in json_schema of the stream in catalog"""
+
+    def __init__(self, configured_catalog: ConfiguredAirbyteCatalog):
+        self.verifier = RecordsSchemaVerifier(configured_catalog)
+
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        self.verifier.verify(record)
+
+    def validate(self) -> None:
+        bar = "-" * 80
+        streams_errors = self.verifier.stream_errors
+        for stream_name, errors in streams_errors.items():
+            errors = map(str, errors.values())
+            str_errors = f"\n{bar}\n".join(errors)
+            logging.error(f"\nThe {stream_name} stream has the following schema errors:\n{str_errors}")
+
+        if streams_errors:
+            pytest.fail(f"Please check your json_schema in selected streams {tuple(streams_errors.keys())}.")
+
+
+class EmptyStreamsValidator(RecordsValidator):
+    """Only certain streams allowed to be empty"""
+
+    def __init__(self, configured_catalog: ConfiguredAirbyteCatalog, allowed_empty_streams: Set[EmptyStreamConfiguration]):
+        allowed_empty_stream_names = set([allowed_empty_stream.name for allowed_empty_stream in allowed_empty_streams])
+        all_streams = set(stream.stream.name for stream in configured_catalog.streams)
+        self.streams_without_records = all_streams - allowed_empty_stream_names
+
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        self.streams_without_records.discard(record.stream)
+
+    def validate(self) -> None:
+        assert (
+            not self.streams_without_records
+        ), f"All streams should return some records, streams without records: {self.streams_without_records}"
+
+
+class PrimaryKeysDataTypeValidator(RecordsValidator):
+    """Check that primary keys are neither objects nor arrays, and are not null in all their parts"""
+
+    data_types_mapping = {"dict": "object", "list": "array"}
+
+    def __init__(self, streams: List[ConfiguredAirbyteStream]):
+        self.primary_keys = {
+            stream.stream.name: stream.stream.source_defined_primary_key for stream in streams if stream.stream.source_defined_primary_key
+        }
+        # the first error of each stream, reported in the order of the catalog
+        self.errors: Dict[str, str] = {}
+
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        stream_name = record.stream
+        if stream_name not in self.primary_keys or stream_name in self.errors:
+            return
+        primary_keys = _extract_primary_key_value(record.data, self.primary_keys[stream_name])
+        non_nullable_key_part_found = False
+        for primary_key_path, primary_key_value in primary_keys.items():
+            if primary_key_value is not None:
+                non_nullable_key_part_found = True
+
+            if isinstance(primary_key_value, (list, dict)):
+                self.errors[stream_name] = (
+                    f"Stream {stream_name} contains primary key with forbidden type "
+                    f"of '{self.data_types_mapping.get(primary_key_value.__class__.__name__)}'"
+                )
+                return
+
+        if not non_nullable_key_part_found:
+            self.errors[stream_name] = f"Stream {stream_name} contains primary key with null values in all its parts"
+
+    def validate(self) -> None:
+        for stream_name in self.primary_keys:
+            assert stream_name not in self.errors, self.errors[stream_name]
+
+
+class FieldsAppearAtLeastOnceValidator(RecordsValidator):
+    """Validate if each field in a stream has appeared at least once in some record."""
+
+    def __init__(self, configured_catalog: ConfiguredAirbyteCatalog):
+        self.expected_paths = {
+            stream.stream.name: self.get_expected_paths(stream.stream.json_schema) for stream in configured_catalog.streams
+        }
+
+    @staticmethod
+    def get_expected_paths(schema: Dict) -> Set[str]:
+        expected_paths = get_expected_schema_structure(schema, annotate_one_of=True)
+        return set(flatten_tuples(tuple(expected_paths)))
+
+    @staticmethod
+    def remove_record_paths(expected_paths: Set[str], record: Mapping[str, Any]) -> None:
+        """
+        Remove the paths of the record from the expected paths.
+        In case of `oneOf` or `anyOf` schema props, compare only choice which is present in records.
+        """
+        record_paths = set(get_object_structure(record))
+        paths_to_remove = {path for path in expected_paths if re.sub(r"\([0-9]*\)", "", path) in record_paths}
+        for path in paths_to_remove:
+            path_parts = re.split(r"\([0-9]*\)", path)
+            if len(path_parts) > 1:
+                expected_paths.difference_update({path for path in expected_paths if path_parts[0] in path})
+        expected_paths.difference_update(paths_to_remove)
+
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        expected_paths = self.expected_paths.get(record.stream)
+        if expected_paths:
+            self.remove_record_paths(expected_paths, record.data)
+
+    def validate(self) -> None:
+        stream_name_to_empty_fields_mapping = {
+            stream_name: sorted(list(expected_paths)) for stream_name, expected_paths in self.expected_paths.items() if expected_paths
+        }
+
+        msg = "Following streams has records with fields, that are either null or not present in each output record:\n"
+        for stream_name, fields in stream_name_to_empty_fields_mapping.items():
+            msg += f"`{stream_name}` stream has `{fields}` empty fields\n"
+        assert not stream_name_to_empty_fields_mapping, msg
+
+
 @pytest.mark.default_timeout(TEN_MINUTES)
 @pytest.mark.usefixtures("final_teardown")
 class TestBasicRead(BaseTest):
     @staticmethod
-    def _validate_records_structure(records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
+    def _validate_records_structure(records: Iterable[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
         """
         Check object structure similar to one expected by schema. Sometimes
         just running schema validation is not enough case schema could have
@@ -912,89 +1067,37 @@ class TestBasicRead(BaseTest):
         :param records: List of airbyte record messages gathered from connector instances.
         :param configured_catalog: Testcase parameters parsed from yaml file
         """
-        schemas: Dict[str, Set] = {}
-        for stream in configured_catalog.streams:
-            schemas[stream.stream.name] = set(get_expected_schema_structure(stream.stream.json_schema))
-
-        for record in records:
-            schema_paths = schemas.get(record.stream)
-            if not schema_paths:
-                continue
-            record_fields = set(get_object_structure(record.data))
-            common_fields = set.intersection(record_fields, schema_paths)
-
-            assert (
-                common_fields
-            ), f" Record {record} from {record.stream} stream with fields {record_fields} should have some fields mentioned by json schema: {schema_paths}"
+        validate_records(records, [RecordsStructureValidator(configured_catalog)])
 
     @staticmethod
-    def _validate_schema(records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
+    def _validate_schema(records: Iterable[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
         """
         Check if data type and structure in records matches the one in json_schema of the stream in catalog
         """
-        TestBasicRead._validate_records_structure(records, configured_catalog)
-        bar = "-" * 80
-        streams_errors = verify_records_schema(records, configured_catalog)
-        for stream_name, errors in streams_errors.items():
-            errors = map(str, errors.values())
-            str_errors = f"\n{bar}\n".join(errors)
-            logging.error(f"\nThe {stream_name} stream has the following schema errors:\n{str_errors}")
-
-        if streams_errors:
-            pytest.fail(f"Please check your json_schema in selected streams {tuple(streams_errors.keys())}.")
+        validate_records(records, [RecordsStructureValidator(configured_catalog), RecordsSchemaValidator(configured_catalog)])
 
     def _validate_empty_streams(self, records, configured_catalog, allowed_empty_streams):
         """
         Only certain streams allowed to be empty
         """
-        allowed_empty_stream_names = set([allowed_empty_stream.name for allowed_empty_stream in allowed_empty_streams])
-        counter = Counter(record.stream for record in records)
-
-        all_streams = set(stream.stream.name for stream in configured_catalog.streams)
-        streams_with_records = set(counter.keys())
-        streams_without_records = all_streams - streams_with_records
-
-        streams_without_records = streams_without_records - allowed_empty_stream_names
-        assert not streams_without_records, f"All streams should return some records, streams without records: {streams_without_records}"
+        validate_records(records, [EmptyStreamsValidator(configured_catalog, allowed_empty_streams)])
 
-    def _validate_field_appears_at_least_once_in_stream(self, records: List, schema: Dict):
+    def _validate_field_appears_at_least_once_in_stream(self, records: Iterable, schema: Dict):
         """
         Get all possible schema paths, then diff with existing record paths.
         In case of `oneOf` or `anyOf` schema props, compare only choice which is present in records.
         """
-        expected_paths = get_expected_schema_structure(schema, annotate_one_of=True)
-        expected_paths = set(flatten_tuples(tuple(expected_paths)))
-
+        expected_paths = FieldsAppearAtLeastOnceValidator.get_expected_paths(schema)
         for record in records:
-            record_paths = set(get_object_structure(record))
-            paths_to_remove = {path for path in expected_paths if re.sub(r"\([0-9]*\)", "", path) in record_paths}
-            for path in paths_to_remove:
-                path_parts = re.split(r"\([0-9]*\)", path)
-                if len(path_parts) > 1:
-                    expected_paths -= {path for path in expected_paths if path_parts[0] in path}
-            expected_paths -= paths_to_remove
+            FieldsAppearAtLeastOnceValidator.remove_record_paths(expected_paths, record)
 
         return sorted(list(expected_paths))
 
-    def _validate_field_appears_at_least_once(self, records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
+    def _validate_field_appears_at_least_once(self, records: Iterable[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
         """
         Validate if each field in a stream has appeared at least once in some record.
         """
-
-        stream_name_to_empty_fields_mapping = {}
-        for stream in configured_catalog.streams:
-            stream_records = [record.data for record in records if record.stream == stream.stream.name]
-
-            empty_field_paths = self._validate_field_appears_at_least_once_in_stream(
-                records=stream_records, schema=stream.stream.json_schema
-            )
-            if empty_field_paths:
-                stream_name_to_empty_fields_mapping[stream.stream.name] = empty_field_paths
-
-        msg = "Following streams has records with fields, that are either null or not present in each output record:\n"
-        for stream_name, fields in stream_name_to_empty_fields_mapping.items():
-            msg += f"`{stream_name}` stream has `{fields}` empty fields\n"
-        assert not stream_name_to_empty_fields_mapping, msg
+        validate_records(records, [FieldsAppearAtLeastOnceValidator(configured_catalog)])
 
     def _validate_expected_records(
         self,
@@ -1021,6 +1124,7 @@ class TestBasicRead(BaseTest):
                 exact_order=flags.exact_order,
                 detailed_logger=detailed_logger,
                 configured_catalog=configured_catalog,
+                ignored_fields=ignored_field_names,
             )
 
     @pytest.fixture(name="should_validate_schema")
@@ -1110,29 +1214,39 @@ class TestBasicRead(BaseTest):
     ):
         output = await docker_runner.call_read(connector_config, configured_catalog)
 
-        records = [message.record for message in filter_output(output, Type.RECORD)]
         state_messages = [message for message in filter_output(output, Type.STATE)]
 
-        if certified_file_based_connector:
-            self._file_types.update(self._get_actual_file_types(records))
-
-        assert records, "At least one record should be read using provided catalog"
-
+        validators: List[RecordsValidator] = []
         if should_validate_schema:
-            self._validate_schema(records=records, configured_catalog=configured_catalog)
-
-        self._validate_empty_streams(records=records, configured_catalog=configured_catalog, allowed_empty_streams=empty_streams)
-
+            validators += [RecordsStructureValidator(configured_catalog), RecordsSchemaValidator(configured_catalog)]
+        validators.append(EmptyStreamsValidator(configured_catalog, allowed_empty_streams=empty_streams))
         if should_validate_primary_keys_data_type:
-            self._validate_primary_keys_data_type(streams=configured_catalog.streams, records=records)
-
+            validators.append(PrimaryKeysDataTypeValidator(configured_catalog.streams))
         # TODO: remove this condition after https://github.com/airbytehq/airbyte/issues/8312 is done
         if should_validate_data_points:
-            self._validate_field_appears_at_least_once(records=records, configured_catalog=configured_catalog)
+            validators.append(FieldsAppearAtLeastOnceValidator(configured_catalog))
+
+        # The records are validated in a single pass over the output, only the records of the streams with expected records are kept
+        records_count = 0
+        expected_streams_records = []
+        for message in iterate_output(output, Type.RECORD):
+            record = message.record
+            records_count += 1
+            if certified_file_based_connector:
+                self._file_types.add(self._get_actual_file_type(record))
+            if expected_records_by_stream and record.stream in expected_records_by_stream:
+                expected_streams_records.append(record)
+            for validator in validators:
+                validator.consume(record)
+
+        assert records_count, "At least one record should be read using provided catalog"
+
+        for validator in validators:
+            validator.validate()
 
         if expected_records_by_stream:
             self._validate_expected_records(
-                records=records,
+                records=expected_streams_records,
                 expected_records_by_stream=expected_records_by_stream,
                 flags=expect_records_config,
                 ignored_fields=ignored_fields,
@@ -1187,8 +1301,9 @@ class TestBasicRead(BaseTest):
         exact_order: bool,
         detailed_logger: Logger,
         configured_catalog: ConfiguredAirbyteCatalog,
+        ignored_fields: Optional[List[str]] = None,
     ):
-        """Compare records using combination of restrictions"""
+        """Compare records using combination of restrictions, records are compared by fingerprint"""
         configured_streams = [stream for stream in configured_catalog.streams if stream.stream.name == stream_name]
         if len(configured_streams) != 1:
             raise ValueError(f"Expected exactly one stream matching name {stream_name} but got {len(configured_streams)}")
@@ -1203,9 +1318,7 @@ class TestBasicRead(BaseTest):
                     actual_primary_keys[: len(expected_primary_keys)] == expected_primary_keys
                 ), f"Expected to see those primary keys in order in the actual response for stream {stream_name}."
             else:
-                expected_but_not_found = set(map(make_hashable, expected_primary_keys)).difference(
-                    set(map(make_hashable, actual_primary_keys))
-                )
+                expected_but_not_found = diff_records(expected_primary_keys, actual_primary_keys).missing
                 assert (
                     not expected_but_not_found
                 ), f"Expected to see those primary keys in the actual response for stream {stream_name} but they were not found."
@@ -1213,21 +1326,17 @@ class TestBasicRead(BaseTest):
             if exact_order:
                 detailed_logger.warning("exact_order is `True` but validation without primary key does not consider order")
 
-            expected = set(map(make_hashable, expected))
-            actual = set(map(make_hashable, actual))
-            missing_expected = set(expected) - set(actual)
-
-            extra = set(actual) - set(expected)
+            records_diff = diff_records(expected, actual, ignored_fields=ignored_fields, multiset=True)
             msg = f"Expected to have at least as many records than expected for stream {stream_name}."
             detailed_logger.info(msg)
             detailed_logger.info("missing:")
-            detailed_logger.log_json_list(sorted(missing_expected))
+            detailed_logger.log_json_list(records_diff.missing)
             detailed_logger.info("expected:")
-            detailed_logger.log_json_list(sorted(expected))
+            detailed_logger.log_json_list(records_diff.expected)
             detailed_logger.info("actual:")
-            detailed_logger.log_json_list(sorted(actual))
+            detailed_logger.log_json_list(records_diff.actual)
             detailed_logger.info("extra:")
-            detailed_logger.log_json_list(sorted(extra))
+            detailed_logger.log_json_list(records_diff.extra)
             pytest.fail(msg)
 
     @staticmethod
@@ -1253,8 +1362,11 @@ class TestBasicRead(BaseTest):
         _, file_extension = splitext(file_name)
         return file_extension.casefold()
 
-    def _get_actual_file_types(self, records: List[AirbyteRecordMessage]) -> Set[str]:
-        return {self._get_file_extension(record.data.get("_ab_source_file_url", "")) for record in records}
+    def _get_actual_file_type(self, record: AirbyteRecordMessage) -> str:
+        return self._get_file_extension(record.data.get("_ab_source_file_url", ""))
+
+    def _get_actual_file_types(self, records: Iterable[AirbyteRecordMessage]) -> Set[str]:
+        return {self._get_actual_file_type(record) for record in records}
 
     @staticmethod
     def _get_unsupported_file_types(config: List[UnsupportedFileTypeConfig]) -> Set[str]:
@@ -1329,21 +1441,8 @@ class TestBasicRead(BaseTest):
             assert isinstance(state.sourceStats, AirbyteStateStats), "Source stats should be in state message."
 
     @staticmethod
-    def _validate_primary_keys_data_type(streams: List[ConfiguredAirbyteStream], records: List[AirbyteRecordMessage]):
-        data_types_mapping = {"dict": "object", "list": "array"}
-        for primary_keys, record in primary_keys_for_records(streams=streams, records=records):
-            stream_name = record.stream
-            non_nullable_key_part_found = False
-            for primary_key_path, primary_key_value in primary_keys.items():
-                if primary_key_value is not None:
-                    non_nullable_key_part_found = True
-
-                assert not isinstance(primary_key_value, (list, dict)), (
-                    f"Stream {stream_name} contains primary key with forbidden type "
-                    f"of '{data_types_mapping.get(primary_key_value.__class__.__name__)}'"
-                )
-
-            assert non_nullable_key_part_found, f"Stream {stream_name} contains primary key with null values in all its parts"
+    def _validate_primary_keys_data_type(streams: List[ConfiguredAirbyteStream], records: Iterable[AirbyteRecordMessage]):
+        validate_records(records, [PrimaryKeysDataTypeValidator(streams)])
 
 
 @pytest.mark.default_timeout(TEN_MINUTES)
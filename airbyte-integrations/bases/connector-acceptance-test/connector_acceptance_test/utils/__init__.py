@@ -9,10 +9,12 @@ from .common import (
     filter_output,
     full_refresh_only_catalog,
     incremental_only_catalog,
+    iterate_output,
     load_config,
     load_yaml_or_json_path,
 )
-from .compare import diff_dicts, make_hashable
+from .compare import diff_dicts, diff_records, make_hashable, record_fingerprint
+from .connector_output import ConnectorOutput
 from .connector_runner import ConnectorRunner
 from .json_schema_helper import JsonSchemaHelper
 from .manifest_helper import is_manifest_file, parse_manifest_spec
@@ -22,12 +24,16 @@ __all__ = [
     "load_config",
     "load_yaml_or_json_path",
     "filter_output",
+    "iterate_output",
     "full_refresh_only_catalog",
     "incremental_only_catalog",
     "SecretDict",
+    "ConnectorOutput",
     "ConnectorRunner",
     "diff_dicts",
+    "diff_records",
     "make_hashable",
+    "record_fingerprint",
     "verify_records_schema",
     "build_configured_catalog_from_custom_catalog",
     "build_configured_catalog_from_discovered_catalog_and_empty_streams",
@@ -3,15 +3,19 @@
 #
 
 import copy
+import hashlib
+import json
 import logging
 import re
 from collections import defaultdict
-from typing import Any, Dict, List, Mapping
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Mapping, NamedTuple, Optional
 
 import pendulum
 from jsonschema import Draft7Validator, FormatChecker, FormatError, ValidationError, validators
 
 from airbyte_protocol.models import AirbyteRecordMessage, ConfiguredAirbyteCatalog
+from connector_acceptance_test.utils.common import find_all_values_for_key_in_schema
 
 
 # fmt: off
@@ -64,14 +68,20 @@ class NoAdditionalPropertiesValidator(Draft7Validator):
 class CustomFormatChecker(FormatChecker):
     @staticmethod
     def check_datetime(value: str) -> bool:
-        valid_format = timestamp_regex.match(value)
+        if not timestamp_regex.match(value):
+            return False
+        # most of the timestamps are ISO 8601, which doesn't need the generic parser of pendulum
         try:
-            pendulum.parse(value, strict=False)
+            datetime.fromisoformat(value)
         except ValueError:
-            valid_time = False
+            pass
         else:
-            valid_time = True
-        return valid_format and valid_time
+            return True
+        try:
+            pendulum.parse(value, strict=False)
+        except ValueError:
+            return False
+        return True
 
     def check(self, instance, format):
         if instance is not None and format == "date-time":
@@ -81,29 +91,143 @@ class CustomFormatChecker(FormatChecker):
             return super().check(instance, format)
 
 
-def verify_records_schema(
-    records: List[AirbyteRecordMessage], catalog: ConfiguredAirbyteCatalog
-) -> Mapping[str, Mapping[str, ValidationError]]:
-    """Check records against their schemas from the catalog, yield error messages.
-    Only first record with error will be yielded for each stream.
+# The Python types of the values which are valid for each JSON schema type, with strict integers.
+# Instances of other types, like subclasses, are left to jsonschema.
+PYTHON_TYPES_BY_JSON_SCHEMA_TYPE = {
+    "null": frozenset((type(None),)),
+    "boolean": frozenset((bool,)),
+    "integer": frozenset((int, bool)),
+    "number": frozenset((int, float)),
+    "string": frozenset((str,)),
+    "object": frozenset((dict,)),
+    "array": frozenset((list,)),
+}
+
+
+class ColumnCheck(NamedTuple):
+    """How a top-level property of the records is checked: by the type of its values, or by a validator of its schema"""
+
+    python_types: Optional[FrozenSet[type]] = None
+    check_datetime: bool = False
+    validator: Optional[Draft7Validator] = None
+
+
+class RecordSchemaValidator:
+    """Validate records against a stream schema.
+
+    A record is first checked column by column: the properties whose schema is only a type, with an optional date-time
+    format, are checked by the type of their value, the other properties by a validator of their own schema.
+    The records which fail this pre-check, and all the records of the schemas which can't be checked column by column,
+    are validated by jsonschema against the whole schema, so the errors are the same as without the pre-check.
     """
-    stream_validators = {}
-    for stream in catalog.streams:
-        schema_to_validate_against = stream.stream.json_schema
-        # We will be disabling strict `NoAdditionalPropertiesValidator` until we have a better plan for schema validation. The consequence
-        # is that we will lack visibility on new fields that are not added on the root level (root level is validated by Datadog)
-        #   validator = NoAdditionalPropertiesValidator if fail_on_extra_columns else Draft7ValidatorWithStrictInteger
-        validator = Draft7ValidatorWithStrictInteger
-        stream_validators[stream.stream.name] = validator(schema_to_validate_against, format_checker=CustomFormatChecker())
-    stream_errors = defaultdict(dict)
-    for record in records:
-        validator = stream_validators.get(record.stream)
+
+    def __init__(self, schema: Mapping[str, Any]):
+        self.format_checker = CustomFormatChecker()
+        self.validator = Draft7ValidatorWithStrictInteger(schema, format_checker=self.format_checker)
+        self.column_checks = self._get_column_checks(schema)
+
+    def _get_column_checks(self, schema: Mapping[str, Any]) -> Optional[Dict[str, ColumnCheck]]:
+        """The checks of the top-level properties, None if the records can't be checked column by column"""
+        if not isinstance(schema, dict) or any(True for _ in find_all_values_for_key_in_schema(schema, "$ref")):
+            return None
+        root_keywords = set(schema).intersection(Draft7Validator.VALIDATORS)
+        if not root_keywords.issubset({"type", "properties", "additionalProperties"}):
+            return None
+        if schema.get("additionalProperties", True) not in (True, {}):
+            return None
+        if "type" in schema and "object" not in self._get_json_schema_types(schema["type"]):
+            return None
+        properties = schema.get("properties", {})
+        if not isinstance(properties, dict):
+            return None
+        return {column: self._get_column_check(property_schema) for column, property_schema in properties.items()}
+
+    def _get_column_check(self, property_schema: Any) -> ColumnCheck:
+        if isinstance(property_schema, dict):
+            keywords = set(property_schema).intersection(Draft7Validator.VALIDATORS)
+            if keywords in ({"type"}, {"type", "format"}) and property_schema.get("format", "date-time") == "date-time":
+                python_types = set()
+                for json_schema_type in self._get_json_schema_types(property_schema["type"]):
+                    if json_schema_type not in PYTHON_TYPES_BY_JSON_SCHEMA_TYPE:
+                        break
+                    python_types.update(PYTHON_TYPES_BY_JSON_SCHEMA_TYPE[json_schema_type])
+                else:
+                    return ColumnCheck(python_types=frozenset(python_types), check_datetime="format" in keywords)
+        return ColumnCheck(validator=Draft7ValidatorWithStrictInteger(property_schema, format_checker=self.format_checker))
+
+    @staticmethod
+    def _get_json_schema_types(json_schema_type: Any) -> list:
+        return json_schema_type if isinstance(json_schema_type, list) else [json_schema_type]
+
+    def is_valid_by_column(self, data: Any) -> bool:
+        """The pre-check: True only if the data is valid, False if it has to be validated against the whole schema"""
+        if self.column_checks is None or type(data) is not dict:
+            return False
+        for column, value in data.items():
+            column_check = self.column_checks.get(column)
+            if column_check is None:
+                # not a top-level property, additional properties are allowed
+                continue
+            python_types, check_datetime, validator = column_check
+            if validator is not None:
+                if not validator.is_valid(value):
+                    return False
+            elif type(value) not in python_types:
+                return False
+            elif check_datetime and value is not None and (type(value) is not str or not CustomFormatChecker.check_datetime(value)):
+                return False
+        return True
+
+    def iter_errors(self, data: Any) -> Iterator[ValidationError]:
+        if self.is_valid_by_column(data):
+            return iter(())
+        return self.validator.iter_errors(data)
+
+
+# The validators are shared by all the tests of the session, the streams of a connector are read by several tests
+_record_schema_validators: Dict[str, RecordSchemaValidator] = {}
+
+
+def get_record_schema_validator(schema: Mapping[str, Any]) -> RecordSchemaValidator:
+    """Get the validator of a stream schema, validators are cached by the hash of their schema"""
+    schema_hash = hashlib.sha256(json.dumps(schema, sort_keys=True, default=str).encode()).hexdigest()
+    if schema_hash not in _record_schema_validators:
+        _record_schema_validators[schema_hash] = RecordSchemaValidator(schema)
+    return _record_schema_validators[schema_hash]
+
+
+class RecordsSchemaVerifier:
+    """Check records against their schemas from the catalog one at a time, keep the errors of each stream."""
+
+    def __init__(self, catalog: ConfiguredAirbyteCatalog):
+        self.stream_validators = {}
+        for stream in catalog.streams:
+            schema_to_validate_against = stream.stream.json_schema
+            # We will be disabling strict `NoAdditionalPropertiesValidator` until we have a better plan for schema validation. The consequence
+            # is that we will lack visibility on new fields that are not added on the root level (root level is validated by Datadog)
+            #   validator = NoAdditionalPropertiesValidator if fail_on_extra_columns else Draft7ValidatorWithStrictInteger
+            self.stream_validators[stream.stream.name] = get_record_schema_validator(schema_to_validate_against)
+        self.stream_errors = defaultdict(dict)
+
+    def verify(self, record: AirbyteRecordMessage) -> None:
+        validator = self.stream_validators.get(record.stream)
         if not validator:
             logging.error(f"Received record from the `{record.stream}` stream, which is not in the catalog.")
-            continue
+            return
 
         errors = list(validator.iter_errors(record.data))
         for error in errors:
-            stream_errors[record.stream][str(error.schema_path)] = error
+            self.stream_errors[record.stream][str(error.schema_path)] = error
+
+
+def verify_records_schema(
+    records: Iterable[AirbyteRecordMessage], catalog: ConfiguredAirbyteCatalog
+) -> Mapping[str, Mapping[str, ValidationError]]:
+    """Check records against their schemas from the catalog, yield error messages.
+    Only first record with error will be yielded for each stream.
+    """
+    verifier = RecordsSchemaVerifier(catalog)
+    for record in records:
+        verifier.verify(record)
 
-    return stream_errors
+    return verifier.stream_errors
@@ -6,7 +6,7 @@ import json
 import logging
 from collections import UserDict
 from pathlib import Path
-from typing import Iterable, List, MutableMapping, Set, Union
+from typing import Iterable, Iterator, List, MutableMapping, Set, Union
 
 import pytest
 from yaml import load
@@ -26,6 +26,7 @@ from airbyte_protocol.models import (
     SyncMode,
 )
 from connector_acceptance_test.config import Config, EmptyStreamConfiguration
+from connector_acceptance_test.utils.connector_output import ConnectorOutput
 
 
 def load_config(path: str) -> Config:
@@ -63,9 +64,16 @@ def incremental_only_catalog(configured_catalog: ConfiguredAirbyteCatalog) -> Co
     return configured_catalog
 
 
+def iterate_output(records: Iterable[AirbyteMessage], type_) -> Iterator[AirbyteMessage]:
+    """Lazily filter messages to match specific type, a ConnectorOutput only parses the messages of this type"""
+    if isinstance(records, ConnectorOutput):
+        return records.messages(type_)
+    return filter(lambda x: x.type == type_, records)
+
+
 def filter_output(records: Iterable[AirbyteMessage], type_) -> List[AirbyteMessage]:
     """Filter messages to match specific type"""
-    return list(filter(lambda x: x.type == type_, records))
+    return list(iterate_output(records, type_))
 
 
 class SecretDict(UserDict):
@@ -3,7 +3,12 @@
 #
 
 import functools
-from typing import List, Mapping, Optional
+import hashlib
+import json
+import operator
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import Any, Iterable, List, Mapping, NamedTuple, Optional, Tuple
 
 import dpath.exceptions
 import dpath.util
@@ -92,3 +97,153 @@ def make_hashable(obj) -> str:
     if isinstance(obj, List):
         return ListWithHashMixin(obj)
     return obj
+
+
+IgnoredPaths = Tuple[Tuple[str, ...], ...]
+
+# booleans are not kept as they are, they become integers like in HashMixin, where True == 1 == 1.0
+_SCALAR_TYPES = frozenset((str, int, type(None)))
+_encode_canonical_json = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str).encode
+
+
+def _compile_ignored_fields(ignored_fields: Optional[Iterable[str]]) -> IgnoredPaths:
+    """Split the ignored fields paths, like "object_key/*/object_key2", into their segments"""
+    return tuple(tuple(field.strip("/").split("/")) for field in ignored_fields or ())
+
+
+def _advance_ignored_paths(ignored_paths: IgnoredPaths, key: str) -> IgnoredPaths:
+    """The remaining segments of the ignored paths once they matched the key, an empty path means the key is ignored.
+    Segments are glob patterns, `**` matches any number of keys like in dpath.
+    """
+    remaining_paths = []
+    for path in ignored_paths:
+        if path[0] == "**":
+            remaining_paths.append(path)
+            if len(path) == 1:
+                remaining_paths.append(())
+            elif fnmatchcase(key, path[1]):
+                remaining_paths.append(path[2:])
+        elif fnmatchcase(key, path[0]):
+            remaining_paths.append(path[1:])
+    return tuple(remaining_paths)
+
+
+def _canonical_value(value: Any, ignored_paths: IgnoredPaths) -> Any:
+    """
+    Make value serialize to the same JSON whatever the order of its arrays items, like HashMixin compares them:
+    arrays are sorted, booleans and integral floats become integers and ignored fields are removed.
+    Objects and arrays are copied only if they change.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return _canonical_object(value, ignored_paths)
+    if value_type is list:
+        return _canonical_array(value, ignored_paths)
+    if value_type is float:
+        return int(value) if value.is_integer() else value
+    if value_type is bool:
+        return int(value)
+    if value_type in _SCALAR_TYPES:
+        return value
+    if isinstance(value, Mapping):
+        return _canonical_object(value, ignored_paths)
+    if isinstance(value, List):
+        return _canonical_array(value, ignored_paths)
+    return value
+
+
+def _canonical_object(obj: Mapping, ignored_paths: IgnoredPaths) -> dict:
+    canonical = None if type(obj) is dict else dict(obj)
+    for key, value in obj.items():
+        canonical_key = key if type(key) is str else str(key)
+        value_ignored_paths = ()
+        if ignored_paths:
+            value_ignored_paths = _advance_ignored_paths(ignored_paths, canonical_key)
+            if () in value_ignored_paths:
+                if canonical is None:
+                    canonical = dict(obj)
+                del canonical[key]
+                continue
+        # scalars are kept as they are, the serialization of the canonical object takes care of them
+        canonical_value = value if type(value) in _SCALAR_TYPES else _canonical_value(value, value_ignored_paths)
+        if canonical_value is not value or canonical_key is not key:
+            if canonical is None:
+                canonical = dict(obj)
+            del canonical[key]
+            canonical[canonical_key] = canonical_value
+    return obj if canonical is None else canonical
+
+
+def _canonical_array(array: List, ignored_paths: IgnoredPaths) -> list:
+    canonical = []
+    for index, item in enumerate(array):
+        item_ignored_paths = ()
+        if ignored_paths:
+            item_ignored_paths = _advance_ignored_paths(ignored_paths, str(index))
+            if () in item_ignored_paths:
+                continue
+        canonical.append(_canonical_value(item, item_ignored_paths))
+    if len(canonical) > 1:
+        if all(type(item) is str for item in canonical):
+            canonical.sort()
+        else:
+            canonical.sort(key=_encode_canonical_json)
+    if type(array) is list and len(canonical) == len(array) and all(map(operator.is_, canonical, array)):
+        return array
+    return canonical
+
+
+def record_fingerprint(obj: Any, ignored_fields: Optional[Iterable[str]] = None) -> bytes:
+    """
+    Compute a digest of the record, equal for the records make_hashable considers equal.
+    Unlike make_hashable the digest is computed once, so comparing and sorting records by fingerprint is cheap.
+    :param obj value for comparison
+    :param ignored_fields paths of the fields to exclude from the comparison, in the format "object_key/*/object_key2"
+    """
+    return _fingerprint(obj, _compile_ignored_fields(ignored_fields))
+
+
+def _fingerprint(obj: Any, ignored_paths: IgnoredPaths) -> bytes:
+    return hashlib.blake2b(_encode_canonical_json(_canonical_value(obj, ignored_paths)).encode(), digest_size=16).digest()
+
+
+class RecordsDiff(NamedTuple):
+    """The expected records missing from the actual records and the unexpected actual records, ordered by fingerprint"""
+
+    missing: List[Any]
+    extra: List[Any]
+    expected: List[Any]
+    actual: List[Any]
+
+
+def diff_records(
+    expected: Iterable[Any], actual: Iterable[Any], ignored_fields: Optional[Iterable[str]] = None, multiset: bool = False
+) -> RecordsDiff:
+    """
+    Compare the expected and the actual records by their fingerprint, each record is serialized once.
+    :param ignored_fields paths of the fields to exclude from the comparison, in the format "object_key/*/object_key2"
+    :param multiset if True, a record expected n times is missing unless the actual records contain it n times,
+    otherwise duplicated records are compared once like sets
+    """
+    ignored_paths = _compile_ignored_fields(ignored_fields)
+    expected_records, expected_counts = _fingerprint_records(expected, ignored_paths, multiset)
+    actual_records, actual_counts = _fingerprint_records(actual, ignored_paths, multiset)
+
+    def records(counts: Counter, by_fingerprint: Mapping[bytes, Any]) -> List[Any]:
+        return [by_fingerprint[fingerprint] for fingerprint in sorted(counts) for _ in range(counts[fingerprint])]
+
+    return RecordsDiff(
+        missing=records(expected_counts - actual_counts, expected_records),
+        extra=records(actual_counts - expected_counts, actual_records),
+        expected=records(expected_counts, expected_records),
+        actual=records(actual_counts, actual_records),
+    )
+
+
+def _fingerprint_records(records: Iterable[Any], ignored_paths: IgnoredPaths, multiset: bool) -> Tuple[Mapping[bytes, Any], Counter]:
+    by_fingerprint, counts = {}, Counter()
+    for record in records:
+        fingerprint = _fingerprint(record, ignored_paths)
+        by_fingerprint.setdefault(fingerprint, record)
+        counts[fingerprint] = counts[fingerprint] + 1 if multiset else 1
+    return by_fingerprint, counts
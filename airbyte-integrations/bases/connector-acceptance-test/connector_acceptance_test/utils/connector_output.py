@@ -0,0 +1,90 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import heapq
+import json
+import logging
+import os
+import weakref
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+
+from airbyte_protocol.models import AirbyteMessage
+from airbyte_protocol.models import Type as AirbyteMessageType
+
+
+def _remove_file(path: Path) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ConnectorOutput:
+    """The AirbyteMessages emitted by a connector command, streamed from the file its output was written to.
+
+    The file is indexed in a single pass when the output is created: only the offset of each message is kept, by message type.
+    Messages are parsed when they are iterated, so the memory used doesn't depend on the size of the output.
+    Iterating the output again reads the file again, consumers are expected to go through the messages they need in one pass.
+    """
+
+    def __init__(self, path: Path, delete: bool = False):
+        """
+        Args:
+            path (Path): The path of the file containing the connector output, one message per line.
+            delete (bool, optional): Whether the file should be removed once the output is garbage collected. Defaults to False.
+        """
+        self.path = path
+        self._offsets: Dict[AirbyteMessageType, array] = defaultdict(lambda: array("q"))
+        if delete:
+            weakref.finalize(self, _remove_file, path)
+        self._index()
+
+    def _index(self) -> None:
+        offset = 0
+        with open(self.path, "rb") as output_file:
+            for line in output_file:
+                message_type = self._get_message_type(line)
+                if message_type is not None:
+                    self._offsets[message_type].append(offset)
+                offset += len(line)
+
+    @staticmethod
+    def _get_message_type(line: bytes) -> Optional[AirbyteMessageType]:
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError(f"{message} is not an object")
+            return AirbyteMessageType(message.get("type"))
+        except ValueError as exc:
+            logging.warning("Unable to parse connector's output %s, error: %s", line.decode(errors="replace").rstrip("\n"), str(exc))
+            return None
+
+    def _read_messages(self, offsets: Iterable[int]) -> Iterator[AirbyteMessage]:
+        with open(self.path, "rb") as output_file:
+            for offset in offsets:
+                output_file.seek(offset)
+                line = output_file.readline()
+                try:
+                    yield AirbyteMessage.parse_raw(line)
+                except ValidationError as exc:
+                    logging.warning(
+                        "Unable to parse connector's output %s, error: %s", line.decode(errors="replace").rstrip("\n"), str(exc)
+                    )
+
+    def __iter__(self) -> Iterator[AirbyteMessage]:
+        """Iterate over all the messages, in the order they were emitted."""
+        return self._read_messages(heapq.merge(*self._offsets.values()))
+
+    def messages(self, type_: AirbyteMessageType) -> Iterator[AirbyteMessage]:
+        """Iterate over the messages of a type, in the order they were emitted."""
+        return self._read_messages(self._offsets.get(type_, ()))
+
+    def count(self, type_: AirbyteMessageType) -> int:
+        """The number of messages of a type, without parsing them."""
+        return len(self._offsets.get(type_, ()))
@@ -9,17 +9,17 @@ import logging
 import os
 import uuid
 from pathlib import Path
-from typing import Any, List, Mapping, Optional, Union
+from typing import Any, Iterable, List, Mapping, Optional, Union
 
 import dagger
 import docker
 import pytest
-from anyio import Path as AnyioPath
 from pydantic import ValidationError
 
 from airbyte_protocol.models import AirbyteMessage, ConfiguredAirbyteCatalog, OrchestratorType
 from airbyte_protocol.models import Type as AirbyteMessageType
 from connector_acceptance_test.utils import SecretDict
+from connector_acceptance_test.utils.connector_output import ConnectorOutput
 
 
 def splitlines_generator(input_string: str):
@@ -164,17 +164,17 @@ class ConnectorRunner:
             container = container.with_env_variable(k, str(v))
         return container
 
-    async def call_spec(self, raise_container_error=False) -> List[AirbyteMessage]:
+    async def call_spec(self, raise_container_error=False) -> Iterable[AirbyteMessage]:
         return await self._run(["spec"], raise_container_error)
 
-    async def call_check(self, config: SecretDict, raise_container_error: bool = False) -> List[AirbyteMessage]:
+    async def call_check(self, config: SecretDict, raise_container_error: bool = False) -> Iterable[AirbyteMessage]:
         return await self._run(
             ["check", "--config", self.IN_CONTAINER_CONFIG_PATH],
             raise_container_error,
             config=config,
         )
 
-    async def call_discover(self, config: SecretDict, raise_container_error: bool = False) -> List[AirbyteMessage]:
+    async def call_discover(self, config: SecretDict, raise_container_error: bool = False) -> Iterable[AirbyteMessage]:
         return await self._run(
             ["discover", "--config", self.IN_CONTAINER_CONFIG_PATH],
             raise_container_error,
@@ -183,7 +183,7 @@ class ConnectorRunner:
 
     async def call_read(
         self, config: SecretDict, catalog: ConfiguredAirbyteCatalog, raise_container_error: bool = False, enable_caching: bool = True
-    ) -> List[AirbyteMessage]:
+    ) -> Iterable[AirbyteMessage]:
         return await self._run(
             ["read", "--config", self.IN_CONTAINER_CONFIG_PATH, "--catalog", self.IN_CONTAINER_CATALOG_PATH],
             raise_container_error,
@@ -199,7 +199,7 @@ class ConnectorRunner:
         state: dict,
         raise_container_error: bool = False,
         enable_caching: bool = True,
-    ) -> List[AirbyteMessage]:
+    ) -> Iterable[AirbyteMessage]:
         return await self._run(
             [
                 "read",
@@ -235,8 +235,8 @@ class ConnectorRunner:
         catalog: dict = None,
         state: Union[dict, list] = None,
         enable_caching=True,
-    ) -> List[AirbyteMessage]:
-        """Run a command in the connector container and return the list of AirbyteMessages emitted by the connector.
+    ) -> Iterable[AirbyteMessage]:
+        """Run a command in the connector container and return the AirbyteMessages emitted by the connector.
 
         Args:
             airbyte_command (List[str]): The command to run in the connector container.
@@ -247,7 +247,8 @@ class ConnectorRunner:
             enable_caching (bool, optional): Whether to enable command output caching. Defaults to True.
 
         Returns:
-            List[AirbyteMessage]: The list of AirbyteMessages emitted by the connector.
+            Iterable[AirbyteMessage]: The AirbyteMessages emitted by the connector, streamed from the exported output file
+            unless the command failed.
         """
         container = self._connector_under_test_container
         current_user = (await container.with_exec(["whoami"]).stdout()).strip()
@@ -262,24 +263,24 @@ class ConnectorRunner:
         if catalog:
             container = container.with_new_file(self.IN_CONTAINER_CATALOG_PATH, contents=catalog.json(), owner=current_user)
         try:
-            output = await self._read_output_from_file(airbyte_command, container)
+            output_file_path = await self._read_output_from_file(airbyte_command, container)
         except dagger.QueryError as e:
             output_too_big = bool([error for error in e.errors if error.message.startswith("file size")])
             if output_too_big:
-                output = await self._read_output_from_file(airbyte_command, container)
+                output_file_path = await self._read_output_from_file(airbyte_command, container)
             elif raise_container_error:
                 raise e
             else:
                 if isinstance(e, dagger.ExecError):
-                    output = e.stdout + e.stderr
+                    return self.parse_airbyte_messages_from_command_output(e.stdout + e.stderr)
                 else:
                     pytest.fail(f"Failed to run command {airbyte_command} in container {self.image_tag} with error: {e}")
-        return self.parse_airbyte_messages_from_command_output(output)
+        return self.read_airbyte_messages_from_output_file(output_file_path)
 
     async def _read_output_from_stdout(self, airbyte_command: list, container: dagger.Container) -> str:
         return await container.with_exec(airbyte_command, use_entrypoint=True).stdout()
 
-    async def _read_output_from_file(self, airbyte_command: list, container: dagger.Container) -> str:
+    async def _read_output_from_file(self, airbyte_command: list, container: dagger.Container) -> Path:
         local_output_file_path = f"/tmp/{str(uuid.uuid4())}"
         entrypoint = await container.entrypoint()
         airbyte_command = entrypoint + airbyte_command
@@ -288,22 +289,32 @@ class ConnectorRunner:
             ["sh", "-c", " ".join(airbyte_command) + f" > {self.IN_CONTAINER_OUTPUT_PATH} 2>&1 | tee -a {self.IN_CONTAINER_OUTPUT_PATH}"]
         )
         await container.file(self.IN_CONTAINER_OUTPUT_PATH).export(local_output_file_path)
-        output = await AnyioPath(local_output_file_path).read_text()
-        await AnyioPath(local_output_file_path).unlink()
-        return output
+        return Path(local_output_file_path)
 
     def parse_airbyte_messages_from_command_output(self, command_output: str) -> List[AirbyteMessage]:
         airbyte_messages = []
         for line in splitlines_generator(command_output):
             try:
                 airbyte_message = AirbyteMessage.parse_raw(line)
-                if airbyte_message.type is AirbyteMessageType.CONTROL and airbyte_message.control.type is OrchestratorType.CONNECTOR_CONFIG:
-                    self._persist_new_configuration(airbyte_message.control.connectorConfig.config, int(airbyte_message.control.emitted_at))
+                self._handle_control_message(airbyte_message)
                 airbyte_messages.append(airbyte_message)
             except ValidationError as exc:
                 logging.warning("Unable to parse connector's output %s, error: %s", line, exc)
         return airbyte_messages
 
+    def read_airbyte_messages_from_output_file(self, output_file_path: Path) -> ConnectorOutput:
+        """Index the output file exported from the container, its messages are only parsed when they are iterated.
+        The file is removed once the returned output is garbage collected.
+        """
+        output = ConnectorOutput(output_file_path, delete=True)
+        for airbyte_message in output.messages(AirbyteMessageType.CONTROL):
+            self._handle_control_message(airbyte_message)
+        return output
+
+    def _handle_control_message(self, airbyte_message: AirbyteMessage) -> None:
+        if airbyte_message.type is AirbyteMessageType.CONTROL and airbyte_message.control.type is OrchestratorType.CONNECTOR_CONFIG:
+            self._persist_new_configuration(airbyte_message.control.connectorConfig.config, int(airbyte_message.control.emitted_at))
+
     def _persist_new_configuration(self, new_configuration: dict, configuration_emitted_at: int) -> Optional[Path]:
         """Store new configuration values to an updated_configurations subdir under the original configuration path.
         N.B. The new configuration will not be stored if no configuration path was passed to the ConnectorRunner.
@@ -2,8 +2,16 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import copy
+
 import pytest
-from connector_acceptance_test.utils.asserts import verify_records_schema
+from connector_acceptance_test.utils.asserts import (
+    CustomFormatChecker,
+    Draft7ValidatorWithStrictInteger,
+    RecordSchemaValidator,
+    get_record_schema_validator,
+    verify_records_schema,
+)
 
 from airbyte_protocol.models import (
     AirbyteRecordMessage,
@@ -120,3 +128,88 @@ def test_validate_records_format(record, configured_catalog, valid):
         assert not streams_with_errors
     else:
         assert streams_with_errors, f"Record {record} should produce errors against {configured_catalog.streams[0].stream.json_schema}"
+
+
+def test_record_schema_validators_are_cached_by_schema(record_schema):
+    validator = get_record_schema_validator(record_schema)
+
+    assert get_record_schema_validator(copy.deepcopy(record_schema)) is validator
+    assert get_record_schema_validator({**record_schema, "required": ["text"]}) is not validator
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        pytest.param(
+            {
+                "type": ["null", "object"],
+                "properties": {
+                    "integer": {"type": "integer", "description": "not a validation keyword"},
+                    "number_or_null": {"type": ["null", "number"]},
+                    "text": {"type": "string"},
+                    "updated_at": {"type": ["null", "string"], "format": "date-time"},
+                    "created_at": {"type": "string", "format": "date"},
+                    "object": {"type": "object", "properties": {"text": {"type": "string"}}},
+                    "array": {"type": ["null", "array"], "items": {"type": "integer"}},
+                },
+            },
+            id="checked_by_column",
+        ),
+        pytest.param(
+            {"type": "object", "required": ["text"], "properties": {"text": {"type": "string"}}},
+            id="required_properties",
+        ),
+        pytest.param(
+            {"type": "object", "additionalProperties": False, "properties": {"text": {"type": "string"}}},
+            id="no_additional_properties",
+        ),
+        pytest.param(
+            {"type": "object", "definitions": {"text": {"type": "string"}}, "properties": {"text": {"$ref": "#/definitions/text"}}},
+            id="references",
+        ),
+    ],
+)
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"integer": 1, "number_or_null": None, "text": "text", "updated_at": "2021-08-10T12:43:15Z", "created_at": "2020-12-20"},
+        {"integer": True, "number_or_null": 1, "text": "text", "updated_at": "2018-11-13 20:20:39", "another_field": {"a": [1]}},
+        {"integer": 1.0, "text": "text"},
+        {"number_or_null": True},
+        {"text": 1},
+        {"extra": "value"},
+        {"updated_at": "2018-21-13T20:20:39+00:00"},
+        {"updated_at": "12:11:00"},
+        {"created_at": "2020-20-20"},
+        {"object": {"text": "text"}, "array": [1, 2]},
+        {"object": {"text": 1}, "array": None},
+        {"object": None},
+        {"array": ["text"]},
+    ],
+)
+def test_record_schema_validator_has_the_errors_of_jsonschema(schema, record):
+    expected_errors = Draft7ValidatorWithStrictInteger(schema, format_checker=CustomFormatChecker()).iter_errors(record)
+
+    errors = RecordSchemaValidator(schema).iter_errors(record)
+
+    assert [(error.message, list(error.schema_path)) for error in errors] == [
+        (error.message, list(error.schema_path)) for error in expected_errors
+    ]
+
+
+@pytest.mark.parametrize(
+    "record, validated_by_schema",
+    [
+        ({"text_or_null": "text", "number": 1, "another_field": [1]}, False),
+        ({"text": "text", "integer_or_null": None}, False),
+        ({"text": 1}, True),
+        ({"number": "1"}, True),
+    ],
+)
+def test_record_schema_validator_validates_by_schema_only_records_failing_the_pre_check(mocker, record_schema, record, validated_by_schema):
+    validator = RecordSchemaValidator(record_schema)
+    validator.validator = mocker.Mock(wraps=validator.validator)
+
+    list(validator.iter_errors(record))
+
+    assert validator.validator.iter_errors.called is validated_by_schema
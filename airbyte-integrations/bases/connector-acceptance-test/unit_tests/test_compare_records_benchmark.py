@@ -0,0 +1,93 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+"""
+The benchmark of `TestBasicRead.compare_records()` over nested records, like the ones of a large expected records file.
+
+Skipped by default, to run:
+    CAT_COMPARE_RECORDS_BENCHMARK=1 pytest -s -o addopts="" unit_tests/test_compare_records_benchmark.py
+
+The number of the expected records could be overridden with `CAT_COMPARE_RECORDS_BENCHMARK_RECORDS` (default: 1_000_000).
+The actual records are the expected ones with their keys and arrays in another order, without the last 1% of them.
+"""
+
+import os
+import time
+from typing import Any, Dict
+from unittest.mock import MagicMock
+
+import pytest
+from connector_acceptance_test.tests import test_core
+
+from airbyte_protocol.models import AirbyteStream, ConfiguredAirbyteCatalog, ConfiguredAirbyteStream
+
+
+BENCHMARK_RECORDS = int(os.getenv("CAT_COMPARE_RECORDS_BENCHMARK_RECORDS", 1_000_000))
+
+
+def get_record(index: int) -> Dict[str, Any]:
+    return {
+        "id": index,
+        "name": f"name {index}",
+        "updated_at": f"2024-01-{index % 28 + 1:02d}T10:{index % 60:02d}:00Z",
+        "amount": index / 100,
+        "tags": ["a", "b", f"tag {index % 7}"],
+        "address": {"city": "Berlin", "zip": f"{index % 100000:05d}", "geo": {"lat": 52.52, "lng": 13.405}},
+        "line_items": [{"sku": f"sku {index % 13}", "quantity": index % 5}, {"sku": "shipping", "quantity": 1}],
+    }
+
+
+def reorder(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {key: reorder(obj[key]) for key in reversed(list(obj))}
+    if isinstance(obj, list):
+        return [reorder(item) for item in reversed(obj)]
+    return obj
+
+
+@pytest.mark.skipif(
+    not os.getenv("CAT_COMPARE_RECORDS_BENCHMARK"), reason="The benchmark is enabled with `CAT_COMPARE_RECORDS_BENCHMARK=1`"
+)
+@pytest.mark.parametrize("primary_key", [None, [["id"]]], ids=["without_primary_key", "with_primary_key"])
+def test_compare_records_per_second(primary_key, capsys):
+    configured_catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(
+                    name="benchmark_stream",
+                    json_schema={"type": "object"},
+                    supported_sync_modes=["full_refresh"],
+                    source_defined_primary_key=primary_key,
+                ),
+                sync_mode="full_refresh",
+                destination_sync_mode="overwrite",
+            )
+        ]
+    )
+    expected = [get_record(index) for index in range(BENCHMARK_RECORDS)]
+    actual = [reorder(record) for record in expected[: BENCHMARK_RECORDS - BENCHMARK_RECORDS // 100]]
+    if primary_key:
+        # all the expected primary keys are found in the actual records
+        actual += expected[len(actual) :]
+    detailed_logger = MagicMock()
+
+    started_at = time.perf_counter()
+    try:
+        test_core.TestBasicRead.compare_records(
+            stream_name="benchmark_stream",
+            actual=actual,
+            expected=expected,
+            exact_order=False,
+            detailed_logger=detailed_logger,
+            configured_catalog=configured_catalog,
+            ignored_fields=["updated_at"],
+        )
+        failed = False
+    except pytest.fail.Exception:
+        failed = True
+    elapsed = time.perf_counter() - started_at
+
+    with capsys.disabled():
+        print(f"\nCompared {BENCHMARK_RECORDS:,} expected records in {elapsed:.2f}s: {BENCHMARK_RECORDS / elapsed:,.0f} records/s")
+    assert failed is (primary_key is None)
@@ -0,0 +1,77 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import gc
+
+import pytest
+from connector_acceptance_test.utils import connector_output
+from connector_acceptance_test.utils.common import filter_output
+
+from airbyte_protocol.models import AirbyteLogMessage, AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, Level, Type
+
+
+def get_record_message(stream: str, index: int) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=stream, data={"id": index}, emitted_at=111))
+
+
+@pytest.fixture
+def messages():
+    return [
+        AirbyteMessage(type=Type.LOG, log=AirbyteLogMessage(level=Level.INFO, message="Starting the sync")),
+        get_record_message("stream_a", 1),
+        get_record_message("stream_b", 2),
+        AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"cursor": 2})),
+        get_record_message("stream_a", 3),
+    ]
+
+
+@pytest.fixture
+def output_path(tmp_path, messages):
+    path = tmp_path / "output.txt"
+    lines = [message.json(exclude_unset=True) for message in messages]
+    # the output also contains lines which are not Airbyte messages, like the logs of the entrypoint
+    lines.insert(2, "invalid message")
+    lines.insert(4, '{"type": "UNKNOWN"}')
+    lines.insert(5, "[1, 2]")
+    path.write_text("\n".join(lines))
+    return path
+
+
+def test_connector_output_iterates_messages_in_order(mocker, output_path, messages):
+    mock_logging = mocker.patch.object(connector_output, "logging")
+    output = connector_output.ConnectorOutput(output_path)
+
+    assert list(output) == messages
+    assert list(output) == messages
+    assert mock_logging.warning.call_count == 3
+
+
+def test_connector_output_messages_by_type(output_path, messages):
+    output = connector_output.ConnectorOutput(output_path)
+
+    assert list(output.messages(Type.RECORD)) == [messages[1], messages[2], messages[4]]
+    assert filter_output(output, Type.STATE) == [messages[3]]
+    assert list(output.messages(Type.CATALOG)) == []
+    assert [output.count(Type.RECORD), output.count(Type.STATE), output.count(Type.CATALOG)] == [3, 1, 0]
+
+
+def test_connector_output_skips_invalid_messages(mocker, tmp_path):
+    mock_logging = mocker.patch.object(connector_output, "logging")
+    path = tmp_path / "output.txt"
+    path.write_text('{"type": "RECORD", "record": {"stream": "stream_a"}}\n' + get_record_message("stream_a", 1).json())
+    output = connector_output.ConnectorOutput(path)
+
+    assert output.count(Type.RECORD) == 2
+    assert list(output.messages(Type.RECORD)) == [get_record_message("stream_a", 1)]
+    mock_logging.warning.assert_called_once()
+
+
+@pytest.mark.parametrize("delete", [True, False])
+def test_connector_output_deletes_its_file(output_path, delete):
+    output = connector_output.ConnectorOutput(output_path, delete=delete)
+    assert output_path.exists()
+
+    del output
+    gc.collect()
+    assert output_path.exists() is not delete
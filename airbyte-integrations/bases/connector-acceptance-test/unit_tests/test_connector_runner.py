@@ -73,6 +73,31 @@ class TestContainerRunner:
         runner._persist_new_configuration.assert_called_once_with(new_configuration, 1)
         mock_logging.warning.assert_called_once()
 
+    def test_read_airbyte_messages_from_output_file(self, mocker, tmp_path):
+        new_configuration = {"field_a": "new_value_a"}
+        messages = [
+            AirbyteMessage(
+                type=AirbyteMessageType.RECORD, record=AirbyteRecordMessage(stream="test_stream", data={"foo": "bar"}, emitted_at=1.0)
+            ),
+            AirbyteMessage(
+                type=AirbyteMessageType.CONTROL,
+                control=AirbyteControlMessage(
+                    type=OrchestratorType.CONNECTOR_CONFIG,
+                    emitted_at=1.0,
+                    connectorConfig=AirbyteControlConnectorConfigMessage(config=new_configuration),
+                ),
+            ),
+        ]
+        output_file_path = tmp_path / "output.txt"
+        output_file_path.write_text("\n".join(message.json(exclude_unset=False) for message in messages))
+
+        mocker.patch.object(connector_runner.ConnectorRunner, "_persist_new_configuration")
+        runner = connector_runner.ConnectorRunner(mocker.Mock(), connector_configuration_path=tmp_path / "config.json")
+        output = runner.read_airbyte_messages_from_output_file(output_file_path)
+        runner._persist_new_configuration.assert_called_once_with(new_configuration, 1)
+        assert list(output) == messages
+        assert [message.record for message in output.messages(AirbyteMessageType.RECORD)] == [messages[0].record]
+
     @pytest.mark.parametrize(
         "pass_configuration_path, old_configuration, new_configuration, new_configuration_emitted_at, expect_new_configuration",
         [
@@ -0,0 +1,86 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+"""
+The benchmark of `verify_records_schema()`, the validation of the records read by the basic read test against their stream schema.
+
+Skipped by default, to run:
+    CAT_RECORDS_SCHEMA_BENCHMARK=1 pytest -s -o addopts="" unit_tests/test_records_schema_benchmark.py
+
+The number of the records could be overridden with `CAT_RECORDS_SCHEMA_BENCHMARK_RECORDS` (default: 200_000).
+About one record out of a thousand doesn't match the schema of its stream.
+"""
+
+import os
+import time
+from typing import Any, Dict
+
+import pytest
+from connector_acceptance_test.utils.asserts import verify_records_schema
+
+from airbyte_protocol.models import AirbyteRecordMessage, AirbyteStream, ConfiguredAirbyteCatalog, ConfiguredAirbyteStream
+
+
+BENCHMARK_RECORDS = int(os.getenv("CAT_RECORDS_SCHEMA_BENCHMARK_RECORDS", 200_000))
+STREAMS = 5
+INVALID_RECORDS_INTERVAL = 997
+
+
+def get_stream_schema() -> Dict[str, Any]:
+    return {
+        "type": ["null", "object"],
+        "properties": {
+            "id": {"type": "integer"},
+            "name": {"type": ["null", "string"], "description": "The name of the customer"},
+            "email": {"type": ["null", "string"]},
+            "amount": {"type": ["null", "number"]},
+            "active": {"type": ["null", "boolean"]},
+            "created_at": {"type": ["null", "string"], "format": "date-time"},
+            "updated_at": {"type": ["null", "string"], "format": "date-time"},
+            "tags": {"type": ["null", "array"], "items": {"type": "string"}},
+            "address": {"type": ["null", "object"], "properties": {"city": {"type": "string"}, "zip": {"type": "string"}}},
+            "metadata": {"type": ["null", "object"]},
+        },
+    }
+
+
+def get_record(index: int) -> AirbyteRecordMessage:
+    data = {
+        "id": index,
+        "name": f"name {index}",
+        "email": f"user{index}@example.com" if index % 10 else None,
+        "amount": index / 100,
+        "active": index % 3 == 0,
+        "created_at": f"2023-12-{index % 28 + 1:02d}T08:{index % 60:02d}:00Z",
+        "updated_at": f"2024-01-{index % 28 + 1:02d} 10:{index % 60:02d}:00.123+02:00",
+        "tags": ["a", "b"],
+        "address": {"city": "Berlin", "zip": f"{index % 100000:05d}"},
+        "metadata": {"source": "benchmark", "index": index},
+    }
+    if index % INVALID_RECORDS_INTERVAL == 0:
+        data["amount"] = str(data["amount"])
+    return AirbyteRecordMessage(stream=f"stream_{index % STREAMS}", data=data, emitted_at=111)
+
+
+@pytest.mark.skipif(not os.getenv("CAT_RECORDS_SCHEMA_BENCHMARK"), reason="The benchmark is enabled with `CAT_RECORDS_SCHEMA_BENCHMARK=1`")
+def test_verify_records_schema_records_per_second(capsys):
+    configured_catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=f"stream_{index}", json_schema=get_stream_schema(), supported_sync_modes=["full_refresh"]),
+                sync_mode="full_refresh",
+                destination_sync_mode="overwrite",
+            )
+            for index in range(STREAMS)
+        ]
+    )
+    records = [get_record(index) for index in range(BENCHMARK_RECORDS)]
+
+    started_at = time.perf_counter()
+    streams_errors = verify_records_schema(records, configured_catalog)
+    elapsed = time.perf_counter() - started_at
+
+    with capsys.disabled():
+        print(f"\nValidated {BENCHMARK_RECORDS:,} records in {elapsed:.2f}s: {BENCHMARK_RECORDS / elapsed:,.0f} records/s")
+    assert set(streams_errors) == {f"stream_{index % STREAMS}" for index in range(0, BENCHMARK_RECORDS, INVALID_RECORDS_INTERVAL)}
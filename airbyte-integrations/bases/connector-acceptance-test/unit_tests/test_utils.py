@@ -16,7 +16,7 @@ import pytest
 import yaml
 from connector_acceptance_test.config import EmptyStreamConfiguration
 from connector_acceptance_test.utils import common
-from connector_acceptance_test.utils.compare import make_hashable
+from connector_acceptance_test.utils.compare import diff_records, make_hashable, record_fingerprint
 
 from airbyte_protocol.models import AirbyteStream, ConfiguredAirbyteCatalog, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode
 
@@ -154,6 +154,8 @@ def sorted_data():
         ({"a": 1, "b": 2}, {"b": 2, "a": 1}, True),
         ({"a": 1, "b": 2, "c": {"d": [1, 2]}}, {"b": 2, "a": 1, "c": {"d": [2, 1]}}, True),
         ({"a": 1, "b": 2, "c": {"d": [1, 2]}}, {"b": 2, "a": 1, "c": {"d": [3, 4]}}, False),
+        ({"a": True, "b": {"c": [False, 2]}}, {"a": 1.0, "b": {"c": [2, 0]}}, True),
+        ({"a": True}, {"a": "true"}, False),
     ],
 )
 def test_compare_two_records_nested_with_different_orders(obj1, obj2, is_same):
@@ -163,6 +165,46 @@ def test_compare_two_records_nested_with_different_orders(obj1, obj2, is_same):
         assert not output_diff, f"{obj1} should be equal to {obj2}"
     else:
         assert output_diff, f"{obj1} shouldnt be equal to {obj2}"
+    assert (record_fingerprint(obj1) == record_fingerprint(obj2)) is is_same
+
+
+@pytest.mark.parametrize(
+    "obj1,obj2,ignored_fields,is_same",
+    [
+        ({"a": 1, "b": 2}, {"a": 1, "b": 3}, ["b"], True),
+        ({"a": 1, "b": 2}, {"a": 1, "b": 3}, ["c"], False),
+        ({"a": [{"b": 1, "c": 1}, {"b": 2, "c": 2}]}, {"a": [{"b": 3, "c": 2}, {"b": 4, "c": 1}]}, ["a/*/b"], True),
+        ({"a": [{"b": 1, "c": 1}]}, {"a": [{"b": 1, "c": 2}]}, ["a/*/b"], False),
+        ({"a": {"b": {"updated_at": 1}}, "updated_at": 1}, {"a": {"b": {"updated_at": 2}}, "updated_at": 2}, ["**/updated_at"], True),
+        ({"a": {"updated_1": 1, "updated_2": 1}}, {"a": {"updated_1": 2, "updated_2": 2}}, ["a/updated_*"], True),
+        ({"a": 1.0, "b": [1, 2.5]}, {"a": 1, "b": [2.5, 1.0]}, [], True),
+        ({"a": "1"}, {"a": 1}, [], False),
+        ({"a": True}, {"a": "true"}, [], False),
+    ],
+)
+def test_record_fingerprint_ignored_fields(obj1, obj2, ignored_fields, is_same):
+    assert (record_fingerprint(obj1, ignored_fields) == record_fingerprint(obj2, ignored_fields)) is is_same
+
+
+@pytest.mark.parametrize(
+    "multiset, missing_ids, expected_count",
+    [
+        # duplicated records are compared once
+        (False, [3], 3),
+        # the record with id 1 is expected twice but read once
+        (True, [1, 3], 4),
+    ],
+)
+def test_diff_records(multiset, missing_ids, expected_count):
+    expected = [{"id": 1, "tags": ["a", "b"]}, {"id": 1, "tags": ["b", "a"]}, {"id": 2}, {"id": 3}]
+    actual = [{"id": 2, "updated_at": 1}, {"id": 1, "tags": ["a", "b"], "updated_at": 2}, {"id": 4}]
+
+    records_diff = diff_records(expected, actual, ignored_fields=["updated_at"], multiset=multiset)
+
+    assert sorted(record["id"] for record in records_diff.missing) == missing_ids
+    assert records_diff.extra == [{"id": 4}]
+    assert len(records_diff.expected) == expected_count
+    assert len(records_diff.actual) == 3
 
 
 class MockContainer:
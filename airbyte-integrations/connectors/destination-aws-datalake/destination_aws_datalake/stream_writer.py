@@ -4,16 +4,20 @@
 
 import json
 import logging
+import re
 from datetime import date, datetime
 from decimal import Decimal, getcontext
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from airbyte_cdk.models import ConfiguredAirbyteStream, DestinationSyncMode
 
 from .aws import AwsHandler
-from .config_reader import ConnectorConfig, PartitionOptions
+from .config_reader import ConnectorConfig, OutputFormat, PartitionOptions
 from .constants import EMPTY_VALUES, GLUE_TYPE_MAPPING_DECIMAL, GLUE_TYPE_MAPPING_DOUBLE, PANDAS_TYPE_MAPPING
 
 
@@ -22,6 +26,74 @@ from .constants import EMPTY_VALUES, GLUE_TYPE_MAPPING_DECIMAL, GLUE_TYPE_MAPPIN
 getcontext().prec = 25
 logger = logging.getLogger("airbyte")
 
+# Date and date-time columns are written as UTC timestamps, like the pandas columns of `StreamWriter._get_dataframe`
+ARROW_TIMESTAMP_TYPE = pa.timestamp("ns", tz="UTC")
+
+# The pandas dtypes awswrangler expects for the glue types, so it doesn't cast the columns again
+ARROW_TO_PANDAS_TYPES = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+    pa.string(): pd.StringDtype("pyarrow"),
+}
+
+
+# The arrow types of the primitive glue types `StreamWriter._get_glue_dtypes_from_json_schema` produces
+GLUE_TO_ARROW_TYPES = {
+    "string": pa.string(),
+    "bigint": pa.int64(),
+    "double": pa.float64(),
+    "boolean": pa.bool_(),
+    "timestamp": pa.timestamp("ns"),
+    "date": pa.date32(),
+}
+GLUE_DECIMAL_PATTERN = re.compile(r"^decimal\(\s*(\d+)\s*,\s*(\d+)\s*\)$")
+
+
+def _split_glue_type_args(args: str) -> List[str]:
+    """
+    Split the comma separated arguments of a glue `struct<...>`, ignoring the commas of the nested types.
+    """
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(args):
+        if char in "<(":
+            depth += 1
+        elif char in ">)":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(args[start:i])
+            start = i + 1
+    parts.append(args[start:])
+    return [part.strip() for part in parts]
+
+
+def _glue_type_to_arrow(glue_type: str) -> pa.DataType:
+    """
+    Convert a glue type to an arrow type, raises `pa.ArrowNotImplementedError` for the types that are not mapped.
+    """
+    glue_type = glue_type.strip()
+    if glue_type in GLUE_TO_ARROW_TYPES:
+        return GLUE_TO_ARROW_TYPES[glue_type]
+    decimal = GLUE_DECIMAL_PATTERN.match(glue_type)
+    if decimal:
+        return pa.decimal128(int(decimal.group(1)), int(decimal.group(2)))
+    if glue_type.startswith("array<") and glue_type.endswith(">"):
+        return pa.list_(_glue_type_to_arrow(glue_type[len("array<") : -1]))
+    if glue_type.startswith("struct<") and glue_type.endswith(">"):
+        fields = []
+        for field in _split_glue_type_args(glue_type[len("struct<") : -1]):
+            name, _, typ = field.partition(":")
+            fields.append(pa.field(name, _glue_type_to_arrow(typ)))
+        return pa.struct(fields)
+    raise pa.ArrowNotImplementedError(f"Glue type {glue_type} is not mapped to an arrow type")
+
+
+def _get_pandas_dtype(typ: pa.DataType) -> Optional[Any]:
+    # awswrangler doesn't cast structs and arrays, they are kept in arrow memory
+    if pa.types.is_nested(typ):
+        return pd.ArrowDtype(typ)
+
+    return ARROW_TO_PANDAS_TYPES.get(typ)
+
 
 class DictEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -365,11 +437,44 @@ class StreamWriter:
 
         return column_types, json_columns
 
+    @cached_property
+    def _glue_dtypes(self) -> Tuple[Dict[str, str], List[str]]:
+        return self._get_glue_dtypes_from_json_schema(self._schema)
+
+    @cached_property
+    def _arrow_schema(self) -> pa.Schema:
+        """
+        Helper that derives the arrow schema of the flushed records from their glue dtypes.
+        A glue type without an arrow type makes the flush fall back to pandas, see `_get_arrow_dataframe`.
+        """
+        dtype, json_casts = self._glue_dtypes
+
+        fields = []
+        for col, glue_type in dtype.items():
+            if col in json_casts:
+                typ = pa.string()
+            elif glue_type in ["timestamp", "date"]:
+                typ = ARROW_TIMESTAMP_TYPE
+            else:
+                typ = _glue_type_to_arrow(glue_type)
+            fields.append(pa.field(col, typ))
+
+        return pa.schema(fields)
+
     @property
     def _cursor_fields(self) -> Optional[List[str]]:
         return self._configured_stream.cursor_field
 
+    @property
+    def _is_arrow_flush(self) -> bool:
+        return self._config.format_type == OutputFormat.PARQUET
+
     def append_message(self, message: Dict[str, Any]):
+        if self._is_arrow_flush:
+            # records are casted column by column when flushing, see `_get_arrow_table`
+            self._messages.append(message)
+            return
+
         clean_message = self._drop_additional_top_level_properties(message)
         clean_message = self._json_schema_cast(clean_message)
         self._messages.append(clean_message)
@@ -381,17 +486,90 @@ class StreamWriter:
         if not success:
             logger.warning(f"Failed to reset table {self._database}:{self._table}")
 
-    def flush(self, partial: bool = False):
-        logger.debug(f"Flushing {len(self._messages)} messages to table {self._database}:{self._table}")
+    def _get_arrow_column(self, col: str, values: List[Any], typ: pa.DataType, json_cast: bool) -> pa.Array:
+        """
+        Helper that casts the values of a column to an arrow array.
+        Values of primitive columns are converted at once, only when some of them don't match the
+        json schema type they are casted one by one with `_json_schema_cast_value`.
+        """
+        schema_entry = self._schema[col]
+        json_typ = self._get_json_schema_type(schema_entry.get("type"))
+
+        # Make sure complex types that can't be converted
+        # to a struct or array are converted to a json string
+        # so they can be queried with json_extract
+        if json_cast:
+            encode = DictEncoder().encode
+            return pa.array([encode(self._json_schema_cast_value(value, schema_entry)) for value in values], type=typ)
+
+        if typ == ARROW_TIMESTAMP_TYPE:
+            return self._get_arrow_timestamp_column(values, schema_entry.get("format"))
+
+        if json_typ == "null":
+            return pa.nulls(len(values), type=typ)
+
+        if json_typ in ["string", "integer", "number", "boolean"] and not pa.types.is_decimal(typ):
+            try:
+                array = pa.array(values, type=typ, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                array = pa.array([self._json_schema_cast_value(value, schema_entry) for value in values], type=typ, from_pandas=True)
+
+            if json_typ == "string":
+                return pc.if_else(pc.equal(array, ""), pa.scalar(None, type=typ), array)
+            if json_typ == "boolean":
+                return array.fill_null(False)
+            return array
+
+        return pa.array([self._json_schema_cast_value(value, schema_entry) for value in values], type=typ, from_pandas=True)
+
+    def _get_arrow_timestamp_column(self, values: List[Any], format: Optional[str]) -> pa.Array:
+        try:
+            strings = pa.array(values, type=pa.string())
+            strings = pc.if_else(pc.equal(strings, ""), pa.scalar(None, type=pa.string()), strings)
+            try:
+                return strings.cast(ARROW_TIMESTAMP_TYPE)
+            except pa.ArrowInvalid:
+                # timestamps without a zone offset are in UTC
+                return pc.assume_timezone(strings.cast(pa.timestamp("ns")), "UTC")
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            errors = "coerce" if format == "date-time" else "raise"
+            timestamps = pd.to_datetime(pd.Series(values, dtype="object"), errors=errors, format="mixed", utc=True)
+            return pa.array(timestamps, type=ARROW_TIMESTAMP_TYPE)
+
+    def _get_arrow_table(self) -> pa.Table:
+        _, json_casts = self._glue_dtypes
+
+        columns = []
+        for field in self._arrow_schema:
+            values = [message.get(field.name) for message in self._messages]
+            columns.append(self._get_arrow_column(field.name, values, field.type, field.name in json_casts))
+
+        return pa.Table.from_arrays(columns, schema=self._arrow_schema)
+
+    def _get_arrow_dataframe(self) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        try:
+            table = self._get_arrow_table()
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            logger.warning(f"Could not convert records of {self._database}:{self._table} to arrow, falling back to pandas: {repr(e)}")
+            self._messages = [self._json_schema_cast(self._drop_additional_top_level_properties(message)) for message in self._messages]
+            return self._get_dataframe()
+
+        df = table.to_pandas(types_mapper=_get_pandas_dtype, split_blocks=True, self_destruct=True)
+        del table
+
+        partition_fields = {}
+        for col in self._get_date_columns():
+            # Create date column for partitioning
+            if self._cursor_fields and col in self._cursor_fields:
+                partition_fields.update(self._add_partition_column(col, df))
+
+        return df, partition_fields
 
+    def _get_dataframe(self) -> Tuple[pd.DataFrame, Dict[str, str]]:
         df = pd.DataFrame(self._messages)
         # best effort to convert pandas types
         df = df.astype(self._get_pandas_dtypes_from_json_schema(df), errors="ignore")
 
-        if len(df) < 1:
-            logger.info(f"No messages to write to {self._database}:{self._table}")
-            return
-
         partition_fields = {}
         date_columns = self._get_date_columns()
         for col in date_columns:
@@ -403,17 +581,32 @@ class StreamWriter:
                     fields = self._add_partition_column(col, df)
                     partition_fields.update(fields)
 
-        dtype, json_casts = self._get_glue_dtypes_from_json_schema(self._schema)
-        dtype = {**dtype, **partition_fields}
-        partition_fields = list(partition_fields.keys())
-
         # Make sure complex types that can't be converted
         # to a struct or array are converted to a json string
         # so they can be queried with json_extract
+        _, json_casts = self._glue_dtypes
         for col in json_casts:
             if col in df.columns:
                 df[col] = df[col].apply(lambda x: json.dumps(x, cls=DictEncoder))
 
+        return df, partition_fields
+
+    def flush(self, partial: bool = False):
+        logger.debug(f"Flushing {len(self._messages)} messages to table {self._database}:{self._table}")
+
+        if len(self._messages) < 1:
+            logger.info(f"No messages to write to {self._database}:{self._table}")
+            return
+
+        if self._is_arrow_flush:
+            df, partition_fields = self._get_arrow_dataframe()
+        else:
+            df, partition_fields = self._get_dataframe()
+
+        dtype, _ = self._glue_dtypes
+        dtype = {**dtype, **partition_fields}
+        partition_fields = list(partition_fields.keys())
+
         if self._sync_mode == DestinationSyncMode.overwrite and self._partial_flush_count < 1:
             logger.debug(f"Overwriting {len(df)} records to {self._database}:{self._table}")
             self._aws_handler.write(
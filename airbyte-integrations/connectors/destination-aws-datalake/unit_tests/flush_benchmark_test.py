@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+"""
+The benchmark of `StreamWriter.append_message()` and `StreamWriter.flush()`, with the AWS calls mocked out.
+
+Skipped by default, to run:
+    AWS_DATALAKE_FLUSH_BENCHMARK=1 pytest -s unit_tests/flush_benchmark_test.py
+
+The number of the records could be overridden with `AWS_DATALAKE_FLUSH_BENCHMARK_RECORDS` (default: 250_000),
+they are flushed every `RECORD_FLUSH_INTERVAL` records like in `DestinationAwsDatalake.write()`.
+"""
+
+import json
+import os
+import resource
+import time
+from typing import Any, Dict
+from unittest.mock import patch
+
+import pytest
+from destination_aws_datalake import DestinationAwsDatalake
+from destination_aws_datalake.aws import AwsHandler
+from destination_aws_datalake.config_reader import ConnectorConfig
+from destination_aws_datalake.destination import RECORD_FLUSH_INTERVAL
+from destination_aws_datalake.stream_writer import StreamWriter
+
+from airbyte_cdk.models import AirbyteStream, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode
+
+
+BENCHMARK_RECORDS = int(os.getenv("AWS_DATALAKE_FLUSH_BENCHMARK_RECORDS", 250_000))
+
+
+def get_configured_stream() -> ConfiguredAirbyteStream:
+    stream_schema = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer"},
+            "name": {"type": ["null", "string"]},
+            "email": {"type": ["null", "string"]},
+            "amount": {"type": ["null", "number"]},
+            "active": {"type": ["null", "boolean"]},
+            "updated_at": {"type": ["null", "string"], "format": "date-time"},
+            "created_date": {"type": ["null", "string"], "format": "date"},
+            "tags": {"type": ["null", "array"], "items": {"type": "string"}},
+            "address": {"type": ["null", "object"], "properties": {"city": {"type": "string"}, "zip": {"type": "string"}}},
+            "metadata": {"type": ["null", "object"]},
+        },
+    }
+    return ConfiguredAirbyteStream(
+        stream=AirbyteStream(name="benchmark_stream", json_schema=stream_schema, supported_sync_modes=[SyncMode.incremental]),
+        sync_mode=SyncMode.incremental,
+        destination_sync_mode=DestinationSyncMode.append,
+        cursor_field=["updated_at"],
+    )
+
+
+def get_record(index: int) -> Dict[str, Any]:
+    return {
+        "id": index,
+        "name": f"name {index}",
+        "email": f"user{index}@example.com" if index % 10 else "",
+        "amount": index / 100,
+        "active": index % 3 == 0,
+        "updated_at": f"2024-01-{index % 28 + 1:02d}T10:{index % 60:02d}:00Z",
+        "created_date": f"2023-12-{index % 28 + 1:02d}",
+        "tags": ["a", "b"],
+        "address": {"city": "Berlin", "zip": f"{index % 100000:05d}"},
+        "metadata": {"source": "benchmark", "index": index},
+    }
+
+
+@pytest.mark.skipif(not os.getenv("AWS_DATALAKE_FLUSH_BENCHMARK"), reason="The benchmark is enabled with `AWS_DATALAKE_FLUSH_BENCHMARK=1`")
+def test_flush_records_per_second():
+    with open("unit_tests/fixtures/config.json", "r") as f:
+        connector_config = ConnectorConfig(**json.loads(f.read()))
+    writer = StreamWriter(AwsHandler(connector_config, DestinationAwsDatalake()), connector_config, get_configured_stream())
+
+    written = []
+    with patch.object(AwsHandler, "append", side_effect=lambda df, *args: written.append(len(df))):
+        started_at = time.perf_counter()
+        for index in range(BENCHMARK_RECORDS):
+            writer.append_message(get_record(index))
+            if len(writer._messages) >= RECORD_FLUSH_INTERVAL:
+                writer.flush(partial=True)
+        writer.flush()
+        elapsed = time.perf_counter() - started_at
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"\nFlushed {BENCHMARK_RECORDS:,} records in {elapsed:.2f}s: {BENCHMARK_RECORDS / elapsed:,.0f} records/s, peak RSS {peak_rss_mb:,.0f} MB"
+    )
+    assert sum(written) == BENCHMARK_RECORDS
@@ -6,13 +6,16 @@ import json
 from datetime import datetime
 from decimal import Decimal
 from typing import Any, Dict, Mapping
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pytest
 from destination_aws_datalake import DestinationAwsDatalake
 from destination_aws_datalake.aws import AwsHandler
 from destination_aws_datalake.config_reader import ConnectorConfig
-from destination_aws_datalake.stream_writer import DictEncoder, StreamWriter
+from destination_aws_datalake.stream_writer import DictEncoder, StreamWriter, _glue_type_to_arrow
 
 from airbyte_cdk.models import AirbyteStream, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode
 
@@ -756,3 +759,123 @@ def test_json_dict_encoder():
         json.dumps(input, cls=DictEncoder)
         == '{"boolean": false, "integer": 1, "float": 2.0, "decimal": "13.232", "datetime": "2023-08-01T23:32:11Z", "date": "2023-08-01", "timestamp": "2023-08-01T23:32:11Z", "nested": {"boolean": false, "datetime": "2023-08-01T23:32:11Z", "very_nested": {"boolean": false, "datetime": "2023-08-01T23:32:11Z"}}}'
     )
+
+
+def test_get_arrow_table():
+    writer = get_writer(get_config())
+    writer.append_message(
+        {"string_col": "test", "int_col": 1, "datetime_col": "2021-01-01T10:00:00+02:00", "date_col": "2021-01-01", "extra": 1}
+    )
+    writer.append_message({"string_col": "", "int_col": "2", "datetime_col": "not a date"})
+
+    table = writer._get_arrow_table()
+
+    assert table.schema == pa.schema(
+        [
+            ("string_col", pa.string()),
+            ("int_col", pa.int64()),
+            ("datetime_col", pa.timestamp("ns", tz="UTC")),
+            ("date_col", pa.timestamp("ns", tz="UTC")),
+        ]
+    )
+    assert table.to_pydict() == {
+        "string_col": ["test", ""],
+        "int_col": [1, 2],
+        "datetime_col": [pd.Timestamp("2021-01-01T08:00:00Z"), None],
+        "date_col": [pd.Timestamp("2021-01-01T00:00:00Z"), None],
+    }
+
+
+@pytest.mark.parametrize(
+    "glue_type, expected",
+    [
+        ("string", pa.string()),
+        ("bigint", pa.int64()),
+        ("double", pa.float64()),
+        ("boolean", pa.bool_()),
+        ("decimal(38, 25)", pa.decimal128(38, 25)),
+        ("array<bigint>", pa.list_(pa.int64())),
+        (
+            "struct<city:string,latitude:decimal(38, 25),tags:array<string>,address:struct<zipcode:bigint>>",
+            pa.struct(
+                [
+                    ("city", pa.string()),
+                    ("latitude", pa.decimal128(38, 25)),
+                    ("tags", pa.list_(pa.string())),
+                    ("address", pa.struct([("zipcode", pa.int64())])),
+                ]
+            ),
+        ),
+        ("array<struct<id:bigint,updated_at:timestamp>>", pa.list_(pa.struct([("id", pa.int64()), ("updated_at", pa.timestamp("ns"))]))),
+    ],
+)
+def test_glue_type_to_arrow(glue_type, expected):
+    assert _glue_type_to_arrow(glue_type) == expected
+
+
+def test_glue_type_to_arrow_not_mapped():
+    with pytest.raises(pa.ArrowNotImplementedError):
+        _glue_type_to_arrow("map<string,string>")
+
+
+def test_get_arrow_table_json_casts():
+    connector_config = ConnectorConfig(**get_config())
+    aws_handler = AwsHandler(connector_config, DestinationAwsDatalake())
+    writer = StreamWriter(aws_handler, connector_config, get_big_schema_configured_stream())
+    writer.append_message(
+        {
+            "bounced": None,
+            "mixed_type_simple": 12,
+            "airbyte_type_object": 1.0,
+            "object_with_additional_properties": {"id": 1, "other": "a"},
+            "location": {"city": "Berlin", "latitude": "52.52"},
+        }
+    )
+
+    record = writer._get_arrow_table().to_pylist()[0]
+
+    assert record["bounced"] is False
+    assert record["mixed_type_simple"] == "12"
+    assert record["airbyte_type_object"] == 1
+    assert record["object_with_additional_properties"] == '{"id": 1, "other": "a"}'
+    assert record["empty_array"] == "null"
+    assert record["location"] == {
+        "city": "Berlin",
+        "country": None,
+        "latitude": 52.52,
+        "longitude": None,
+        "state": None,
+        "zipcode": None,
+    }
+
+
+def test_flush_arrow_dataframe():
+    config = get_config()
+    config["partitioning"] = "YEAR/MONTH"
+    writer = get_writer(config)
+    writer.append_message({"string_col": "test", "int_col": 1, "datetime_col": "2021-03-01T00:00:00Z", "date_col": "2021-01-01"})
+
+    with patch.object(AwsHandler, "append") as append:
+        writer.flush()
+
+    df, database, table, dtype, partition_cols = append.call_args.args
+    assert (database, table) == ("test", "append_stream")
+    assert dtype == {
+        "string_col": "string",
+        "int_col": "bigint",
+        "datetime_col": "timestamp",
+        "date_col": "date",
+        "datetime_col_year": "bigint",
+        "datetime_col_month": "bigint",
+    }
+    assert partition_cols == ["datetime_col_year", "datetime_col_month"]
+    assert df.dtypes.astype(str).to_dict() == {
+        "string_col": "string",
+        "int_col": "Int64",
+        "datetime_col": "datetime64[ns, UTC]",
+        "date_col": "datetime64[ns, UTC]",
+        "datetime_col_year": "Int64",
+        "datetime_col_month": "Int64",
+    }
+    assert df.to_dict("records")[0]["datetime_col_month"] == 3
+    assert writer._messages == []
@@ -1,12 +1,8 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 
-import datetime
-import json
 import logging
 import os
 import re
-import uuid
-from collections import defaultdict
 from logging import getLogger
 from typing import Any, Dict, Iterable, List, Mapping
 
@@ -15,6 +11,7 @@ import pyarrow as pa
 
 from airbyte_cdk.destinations import Destination
 from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, DestinationSyncMode, Status, Type
+from destination_duckdb.writer import BackgroundWriter, StreamBuffer
 
 
 logger = getLogger("airbyte")
@@ -110,35 +107,50 @@ class DestinationDuckdb(Destination):
 
             con.execute(query)
 
-        buffer = defaultdict(lambda: defaultdict(list))
+        def write_buffer(writer_con: duckdb.DuckDBPyConnection, buffer: StreamBuffer) -> None:
+            DestinationDuckdb._safe_write(
+                con=writer_con, buffer={buffer.stream_name: buffer.columns}, schema_name=schema_name, stream_name=buffer.stream_name
+            )
+
+        writer = BackgroundWriter(con=con, write_buffer=write_buffer)
+        buffers: Dict[str, StreamBuffer] = {}
 
-        for message in input_messages:
-            if message.type == Type.STATE:
-                # flush the buffer
-                for stream_name in buffer.keys():
+        try:
+            for message in input_messages:
+                if message.type == Type.STATE:
+                    # hand over all the buffers, the state message is emitted once they are written
                     logger.info(f"flushing buffer for state: {message}")
-                    DestinationDuckdb._safe_write(con=con, buffer=buffer, schema_name=schema_name, stream_name=stream_name)
-
-                buffer = defaultdict(lambda: defaultdict(list))
-
-                yield message
-            elif message.type == Type.RECORD:
-                data = message.record.data
-                stream_name = message.record.stream
-                if stream_name not in streams:
-                    logger.debug(f"Stream {stream_name} was not present in configured streams, skipping")
-                    continue
-                # add to buffer
-                buffer[stream_name]["_airbyte_ab_id"].append(str(uuid.uuid4()))
-                buffer[stream_name]["_airbyte_emitted_at"].append(datetime.datetime.now().isoformat())
-                buffer[stream_name]["_airbyte_data"].append(json.dumps(data))
-
-            else:
-                logger.info(f"Message type {message.type} not supported, skipping")
-
-        # flush any remaining messages
-        for stream_name in buffer.keys():
-            DestinationDuckdb._safe_write(con=con, buffer=buffer, schema_name=schema_name, stream_name=stream_name)
+                    for buffer in buffers.values():
+                        writer.write(buffer)
+                    buffers = {}
+                    writer.checkpoint(message)
+                    yield from writer.pop_committed_states()
+                elif message.type == Type.RECORD:
+                    data = message.record.data
+                    stream_name = message.record.stream
+                    if stream_name not in streams:
+                        logger.debug(f"Stream {stream_name} was not present in configured streams, skipping")
+                        continue
+                    # add to buffer
+                    buffer = buffers.get(stream_name)
+                    if buffer is None:
+                        buffer = buffers[stream_name] = StreamBuffer(stream_name)
+                    buffer.append(data)
+                    if buffer.is_full:
+                        writer.write(buffers.pop(stream_name))
+                        # the states are committed by the writer thread, they are checked once something is handed over to it
+                        yield from writer.pop_committed_states()
+
+                else:
+                    logger.info(f"Message type {message.type} not supported, skipping")
+
+            # flush any remaining messages
+            for buffer in buffers.values():
+                writer.write(buffer)
+            yield from writer.close()
+        finally:
+            # the writer thread and its cursor are released even if the input or a write fails, no-op once closed
+            writer.abort()
 
     @staticmethod
     def _safe_write(*, con: duckdb.DuckDBPyConnection, buffer: Dict[str, Dict[str, List[Any]]], schema_name: str, stream_name: str):
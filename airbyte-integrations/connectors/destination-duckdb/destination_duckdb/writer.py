@@ -0,0 +1,163 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+import datetime
+import json
+import queue
+import threading
+import uuid
+from collections import deque
+from logging import getLogger
+from typing import Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import duckdb
+
+from airbyte_cdk.models import AirbyteMessage
+
+
+logger = getLogger("airbyte")
+
+MAX_STREAM_BUFFER_BYTES = 64 * 1024 * 1024
+"""The size of the records buffered for a stream, before they are handed to the writer thread."""
+
+WRITE_QUEUE_SIZE = 2
+"""The number of full buffers waiting for the writer thread, before reading the input blocks."""
+
+# The size of the `_airbyte_ab_id` and `_airbyte_emitted_at` values, and the list entries
+RECORD_OVERHEAD_BYTES = 128
+
+_STOP = object()
+
+
+class StreamBuffer:
+    """
+    Buffers the records of a stream in the `_airbyte_raw_*` table columns, keeping track of their size in bytes.
+    """
+
+    def __init__(self, stream_name: str):
+        self.stream_name = stream_name
+        self.columns: Dict[str, List[Any]] = {"_airbyte_ab_id": [], "_airbyte_emitted_at": [], "_airbyte_data": []}
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self.columns["_airbyte_ab_id"])
+
+    def append(self, data: Mapping[str, Any]) -> None:
+        serialized_data = json.dumps(data)
+        self.columns["_airbyte_ab_id"].append(str(uuid.uuid4()))
+        self.columns["_airbyte_emitted_at"].append(datetime.datetime.now().isoformat())
+        self.columns["_airbyte_data"].append(serialized_data)
+        self.nbytes += len(serialized_data) + RECORD_OVERHEAD_BYTES
+
+    @property
+    def is_full(self) -> bool:
+        return self.nbytes >= MAX_STREAM_BUFFER_BYTES
+
+
+class BackgroundWriter:
+    """
+    Inserts the full stream buffers from a single writer thread, so reading the input overlaps with the inserts.
+
+    The buffers and the state messages are queued in the order they were received. A state message is
+    committed once the writer thread has inserted all the buffers queued before it, only then it is returned
+    by `pop_committed_states`. The queue is bounded, so at most `WRITE_QUEUE_SIZE` full buffers wait in memory.
+
+    The buffers between two state messages are inserted in a single transaction, committed along with the state,
+    so DuckDB doesn't checkpoint after every buffer.
+
+    If an insert fails, the writer thread keeps draining the queue without writing, so the reading side
+    never blocks on it, and the error is raised by the next call from the reading side.
+    """
+
+    def __init__(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        write_buffer: Callable[[duckdb.DuckDBPyConnection, StreamBuffer], None],
+        queue_size: int = WRITE_QUEUE_SIZE,
+    ):
+        # DuckDB connections shouldn't be shared across threads, the writer thread uses its own cursor
+        self._con = con.cursor()
+        self._write_buffer = write_buffer
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._committed_states: Deque[AirbyteMessage] = deque()
+        self._error: Optional[BaseException] = None
+        self._aborted = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="duckdb-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        # the buffers between two state messages are inserted in a single transaction, committed with the state
+        in_transaction = False
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    if in_transaction:
+                        if self._aborted.is_set():
+                            self._rollback()
+                        else:
+                            self._con.commit()
+                    return
+                if self._error is not None or self._aborted.is_set():
+                    continue
+                if isinstance(item, StreamBuffer):
+                    if not in_transaction:
+                        self._con.begin()
+                        in_transaction = True
+                    self._write_buffer(self._con, item)
+                else:
+                    if in_transaction:
+                        self._con.commit()
+                        in_transaction = False
+                    self._committed_states.append(item)
+            except BaseException as error:
+                self._error = error
+                if in_transaction:
+                    self._rollback()
+                    in_transaction = False
+            finally:
+                self._queue.task_done()
+
+    def _rollback(self) -> None:
+        try:
+            self._con.rollback()
+        except duckdb.Error:
+            logger.exception("Rolling back the inserts of the failed write failed.")
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def write(self, buffer: StreamBuffer) -> None:
+        """Queue the buffer to be inserted, blocking while the queue is full."""
+        self._raise_error()
+        self._queue.put(buffer)
+
+    def checkpoint(self, message: AirbyteMessage) -> None:
+        """Queue the state message, it is committed once the buffers queued before it are inserted."""
+        self._raise_error()
+        self._queue.put(message)
+
+    def pop_committed_states(self) -> Iterator[AirbyteMessage]:
+        """Yield the state messages committed so far, without waiting for the writer thread."""
+        self._raise_error()
+        while self._committed_states:
+            yield self._committed_states.popleft()
+
+    def _stop(self) -> None:
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._con.close()
+
+    def close(self) -> Tuple[AirbyteMessage, ...]:
+        """Wait for the queued buffers to be inserted and return the state messages committed since the last call."""
+        self._stop()
+        return tuple(self.pop_committed_states())
+
+    def abort(self) -> None:
+        """Stop the writer thread without inserting the queued buffers, the inserts since the last state message are rolled back."""
+        if self._closed:
+            return
+        self._aborted.set()
+        self._stop()
@@ -0,0 +1,89 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+"""
+The benchmark piping synthetic records through `DestinationDuckdb.write()` into a local DuckDB file.
+
+Skipped by default, to run:
+    DUCKDB_WRITE_BENCHMARK=1 pytest -s unit_tests/test_write_benchmark.py
+
+The size of the records could be overridden with `DUCKDB_WRITE_BENCHMARK_BYTES` (default: 3 GB). The source emits a
+single state message at the end, so the peak memory shows whether the buffers are bounded.
+"""
+
+from __future__ import annotations
+
+import os
+import resource
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import duckdb
+import pytest
+from destination_duckdb.destination import DestinationDuckdb
+
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStream,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    SyncMode,
+    Type,
+)
+
+
+BENCHMARK_BYTES: int = int(os.getenv("DUCKDB_WRITE_BENCHMARK_BYTES", 3 * 1024**3))
+STREAMS = ["users", "orders"]
+PAYLOAD = "x" * 900
+
+
+def _configured_catalog() -> ConfiguredAirbyteCatalog:
+    return ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=stream_name, json_schema={"type": "object"}, supported_sync_modes=[SyncMode.full_refresh]),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.overwrite,
+            )
+            for stream_name in STREAMS
+        ]
+    )
+
+
+def _messages(records: int) -> Iterator[AirbyteMessage]:
+    for index in range(records):
+        yield AirbyteMessage(
+            type=Type.RECORD,
+            record=AirbyteRecordMessage(
+                stream=STREAMS[index % len(STREAMS)],
+                data={"id": index, "name": f"name {index}", "payload": PAYLOAD},
+                emitted_at=0,
+            ),
+        )
+    yield AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"records": records}))
+
+
+@pytest.mark.skipif(not os.getenv("DUCKDB_WRITE_BENCHMARK"), reason="The benchmark is enabled with `DUCKDB_WRITE_BENCHMARK=1`")
+def test_write_throughput() -> None:
+    record_bytes = len(f'{{"id": 0, "name": "name 0", "payload": "{PAYLOAD}"}}')
+    records = BENCHMARK_BYTES // record_bytes
+    db_path = str(Path(tempfile.mkdtemp()) / "benchmark.duckdb")
+
+    with patch.object(DestinationDuckdb, "_get_destination_path", staticmethod(lambda path: path)):
+        started_at = time.perf_counter()
+        state_messages = list(DestinationDuckdb().write({"destination_path": db_path}, _configured_catalog(), _messages(records)))
+        elapsed = time.perf_counter() - started_at
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"\nWritten {records:,} records ({records * record_bytes / 1024**2:,.0f} MB) in {elapsed:.2f}s: "
+        f"{records / elapsed:,.0f} records/s, {records * record_bytes / 1024**2 / elapsed:,.1f} MB/s, peak RSS {peak_rss_mb:,.0f} MB"
+    )
+    assert len(state_messages) == 1
+    with duckdb.connect(db_path) as con:
+        written = sum(con.execute(f"SELECT count(*) FROM main._airbyte_raw_{stream_name}").fetchone()[0] for stream_name in STREAMS)
+    assert written == records
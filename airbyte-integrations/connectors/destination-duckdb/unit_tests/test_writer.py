@@ -0,0 +1,135 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import duckdb
+import pytest
+from destination_duckdb import writer
+from destination_duckdb.destination import DestinationDuckdb
+from destination_duckdb.writer import BackgroundWriter, StreamBuffer
+
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStream,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    SyncMode,
+    Type,
+)
+
+
+def _state(state: str) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"state": state}))
+
+
+def _record(stream_name: str, index: int) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=stream_name, data={"id": index}, emitted_at=0))
+
+
+def test_stream_buffer_is_full(monkeypatch) -> None:
+    monkeypatch.setattr(writer, "MAX_STREAM_BUFFER_BYTES", 2 * (writer.RECORD_OVERHEAD_BYTES + len('{"id": 1}')))
+    buffer = StreamBuffer("users")
+
+    buffer.append({"id": 1})
+    assert not buffer.is_full
+    buffer.append({"id": 2})
+    assert buffer.is_full
+    assert len(buffer) == 2
+    assert buffer.columns["_airbyte_data"] == ['{"id": 1}', '{"id": 2}']
+
+
+def test_state_is_committed_after_earlier_buffers_are_written() -> None:
+    written = []
+    unblock = threading.Event()
+
+    def write_buffer(con, buffer):
+        unblock.wait(timeout=10)
+        written.append(buffer.stream_name)
+
+    background_writer = BackgroundWriter(con=MagicMock(), write_buffer=write_buffer)
+    background_writer.write(StreamBuffer("users"))
+    state = _state("1")
+    background_writer.checkpoint(state)
+
+    assert list(background_writer.pop_committed_states()) == []
+    unblock.set()
+    assert background_writer.close() == (state,)
+    assert written == ["users"]
+
+
+def test_write_error_is_raised_on_the_reading_side() -> None:
+    def write_buffer(con, buffer):
+        raise ValueError("insert failed")
+
+    background_writer = BackgroundWriter(con=MagicMock(), write_buffer=write_buffer, queue_size=1)
+    background_writer.write(StreamBuffer("users"))
+
+    with pytest.raises(ValueError, match="insert failed"):
+        # the error is raised by whichever call follows the failed insert
+        background_writer.checkpoint(_state("1"))
+        background_writer.close()
+
+
+def test_write_flushes_full_buffers_before_the_state(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(writer, "MAX_STREAM_BUFFER_BYTES", 1)
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=stream_name, json_schema={"type": "object"}, supported_sync_modes=[SyncMode.full_refresh]),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.overwrite,
+            )
+            for stream_name in ["users", "orders"]
+        ]
+    )
+    db_path = str(tmp_path / "test.duckdb")
+    messages = [_record("users", 1), _record("orders", 1), _state("1"), _record("users", 2), _state("2"), _record("orders", 2)]
+
+    with patch.object(DestinationDuckdb, "_get_destination_path", staticmethod(lambda path: path)):
+        result = list(DestinationDuckdb().write({"destination_path": db_path}, catalog, messages))
+
+    assert [message.state.data for message in result] == [{"state": "1"}, {"state": "2"}]
+    with duckdb.connect(db_path) as con:
+        assert con.execute("SELECT count(*) FROM main._airbyte_raw_users").fetchone()[0] == 2
+        assert con.execute("SELECT count(*) FROM main._airbyte_raw_orders").fetchone()[0] == 2
+
+
+def test_writer_is_aborted_when_the_input_fails(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(writer, "MAX_STREAM_BUFFER_BYTES", 1)
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name="users", json_schema={"type": "object"}, supported_sync_modes=[SyncMode.full_refresh]),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.overwrite,
+            )
+        ]
+    )
+    db_path = str(tmp_path / "test.duckdb")
+
+    def messages():
+        yield _record("users", 1)
+        yield _state("1")
+        yield _record("users", 2)
+        raise ValueError("source failed")
+
+    abort = MagicMock(side_effect=BackgroundWriter.abort)
+    with (
+        patch.object(DestinationDuckdb, "_get_destination_path", staticmethod(lambda path: path)),
+        patch.object(BackgroundWriter, "abort", lambda self: abort(self)),
+    ):
+        with pytest.raises(ValueError, match="source failed"):
+            list(DestinationDuckdb().write({"destination_path": db_path}, catalog, messages()))
+
+    abort.assert_called_once()
+    (background_writer,) = abort.call_args.args
+    assert not background_writer._thread.is_alive()
+    with duckdb.connect(db_path) as con:
+        # the records inserted after the last state are rolled back
+        assert con.execute("SELECT count(*) FROM main._airbyte_raw_users WHERE _airbyte_data->>'id' = '2'").fetchone()[0] == 0
@@ -1,24 +1,21 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 from __future__ import annotations
 
-import datetime
 import io
-import json
 import logging
 import os
 import re
-import uuid
 from collections import defaultdict
 from dataclasses import dataclass
 from logging import getLogger
-from typing import Any, Dict, Iterable, List, Mapping, cast
+from typing import Any, Iterable, Mapping, cast
 from urllib.parse import urlparse
 
 import orjson
 from serpyco_rs import Serializer
 from typing_extensions import override
 
-from airbyte_cdk import AirbyteStream, ConfiguredAirbyteStream, SyncMode
+from airbyte_cdk import AirbyteStream, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode
 from airbyte_cdk.destinations import Destination
 from airbyte_cdk.exception_handler import init_uncaught_exception_handler
 from airbyte_cdk.models import (
@@ -33,12 +30,12 @@ from airbyte_cdk.models import (
 from airbyte_cdk.models.airbyte_protocol_serializers import custom_type_resolver
 from airbyte_cdk.sql import exceptions as exc
 from airbyte_cdk.sql._util.name_normalizers import LowerCaseNormalizer
-from airbyte_cdk.sql.constants import AB_EXTRACTED_AT_COLUMN, AB_INTERNAL_COLUMNS, AB_META_COLUMN, AB_RAW_ID_COLUMN
 from airbyte_cdk.sql.secrets import SecretString
 from airbyte_cdk.sql.shared.catalog_providers import CatalogProvider
 from airbyte_cdk.sql.types import SQLTypeConverter
 from destination_motherduck.processors.duckdb import DuckDBConfig, DuckDBSqlProcessor
 from destination_motherduck.processors.motherduck import MotherDuckConfig, MotherDuckSqlProcessor
+from destination_motherduck.stream_buffer import StreamBuffer
 
 
 logger = getLogger("airbyte")
@@ -46,6 +43,7 @@ logger = getLogger("airbyte")
 CONFIG_MOTHERDUCK_API_KEY = "motherduck_api_key"
 CONFIG_DEFAULT_SCHEMA = "main"
 MAX_STREAM_BATCH_SIZE = 50_000
+MAX_STREAM_BATCH_BYTES = 256 * 1024 * 1024
 
 
 @dataclass
@@ -230,11 +228,27 @@ class DestinationMotherDuck(Destination):
             motherduck_token=motherduck_api_key,
         )
 
-        for configured_stream in configured_catalog.streams:
-            processor.prepare_stream_table(stream_name=configured_stream.stream.name, sync_mode=configured_stream.destination_sync_mode)
+        try:
+            yield from self._write_messages(processor, configured_catalog, input_messages)
+        finally:
+            processor.close()
+
+    def _write_messages(
+        self,
+        processor: DuckDBSqlProcessor,
+        configured_catalog: ConfiguredAirbyteCatalog,
+        input_messages: Iterable[AirbyteMessage],
+    ) -> Iterable[AirbyteMessage]:
+        """
+        Buffer the records per stream with a single processor, flushing the buffer of a stream before its state message is emitted.
+        """
+        sync_modes = {
+            configured_stream.stream.name: configured_stream.destination_sync_mode for configured_stream in configured_catalog.streams
+        }
+        for stream_name, sync_mode in sync_modes.items():
+            processor.prepare_stream_table(stream_name=stream_name, sync_mode=sync_mode)
 
-        buffer: dict[str, dict[str, list[Any]]] = defaultdict(lambda: defaultdict(list))
-        records_buffered: dict[str, int] = defaultdict(int)
+        buffers: dict[str, StreamBuffer] = {}
         records_processed: dict[str, int] = defaultdict(int)
         records_since_last_checkpoint: dict[str, int] = defaultdict(int)
         legacy_state_messages: list[AirbyteMessage] = []
@@ -247,17 +261,9 @@ class DestinationMotherDuck(Destination):
                     continue
                 stream_name = message.state.stream.stream_descriptor.name
                 _ = message.state.stream.stream_descriptor.namespace  # Unused currently
-                # flush the buffer
-                self._flush_buffer(
-                    buffer=buffer,
-                    configured_catalog=configured_catalog,
-                    db_path=path,
-                    schema_name=schema_name,
-                    motherduck_api_key=motherduck_api_key,
-                    stream_name=stream_name,
-                )
-                buffer = defaultdict(lambda: defaultdict(list))
-                records_buffered[stream_name] = 0
+                # flush the buffer of the stream, the buffers of the other streams are kept
+                if stream_name in buffers:
+                    self._flush_buffer(processor, buffers.pop(stream_name), sync_modes[stream_name])
 
                 # Annotate the state message with the number of records processed
                 message.state.destinationStats = AirbyteStateStats(
@@ -267,40 +273,23 @@ class DestinationMotherDuck(Destination):
 
                 yield message
             elif message.type == Type.RECORD and message.record is not None:
-                data = message.record.data
                 stream_name = message.record.stream
-                if stream_name not in streams:
-                    logger.debug(f"Stream {stream_name} was not present in configured streams, skipping")
-                    continue
-                # add to buffer
-                record_meta: dict[str, str] = {}
-                for column_name in processor._get_sql_column_definitions(stream_name):
-                    if column_name in data:
-                        buffer[stream_name][column_name].append(data[column_name])
-                    elif column_name not in AB_INTERNAL_COLUMNS:
-                        buffer[stream_name][column_name].append(None)
-
-                buffer[stream_name][AB_RAW_ID_COLUMN].append(str(uuid.uuid4()))
-                buffer[stream_name][AB_EXTRACTED_AT_COLUMN].append(datetime.datetime.now().isoformat())
-                buffer[stream_name][AB_META_COLUMN].append(json.dumps(record_meta))
-                records_buffered[stream_name] += 1
+                buffer = buffers.get(stream_name)
+                if buffer is None:
+                    if stream_name not in sync_modes:
+                        logger.debug(f"Stream {stream_name} was not present in configured streams, skipping")
+                        continue
+                    # the columns are resolved once per buffer
+                    buffer = buffers[stream_name] = StreamBuffer(stream_name, list(processor._get_sql_column_definitions(stream_name)))
+                buffer.append(message.record.data)
                 records_since_last_checkpoint[stream_name] += 1
 
-                if records_buffered[stream_name] >= MAX_STREAM_BATCH_SIZE:
+                if len(buffer) >= MAX_STREAM_BATCH_SIZE or buffer.nbytes >= MAX_STREAM_BATCH_BYTES:
                     logger.info(
-                        f"Loading {records_buffered[stream_name]:,} records from '{stream_name}' stream buffer...",
-                    )
-                    self._flush_buffer(
-                        buffer=buffer,
-                        configured_catalog=configured_catalog,
-                        db_path=path,
-                        schema_name=schema_name,
-                        motherduck_api_key=motherduck_api_key,
-                        stream_name=stream_name,
+                        f"Loading {len(buffer):,} records ({buffer.nbytes:,} bytes) from '{stream_name}' stream buffer...",
                     )
-                    buffer = defaultdict(lambda: defaultdict(list))
-                    records_processed[stream_name] += records_buffered[stream_name]
-                    records_buffered[stream_name] = 0
+                    self._flush_buffer(processor, buffers.pop(stream_name), sync_modes[stream_name])
+                    records_processed[stream_name] += len(buffer)
                     logger.info(
                         f"Records loaded successfully. Total '{stream_name}' records processed: {records_processed[stream_name]:,}",
                     )
@@ -309,31 +298,26 @@ class DestinationMotherDuck(Destination):
                 logger.info(f"Message type {message.type} not supported, skipping")
 
         # flush any remaining messages
-        self._flush_buffer(buffer, configured_catalog, path, schema_name, motherduck_api_key)
+        for stream_name, buffer in buffers.items():
+            self._flush_buffer(processor, buffer, sync_modes[stream_name])
         if legacy_state_messages:
             # Save to emit these now, since we've finished processing the stream.
             yield from legacy_state_messages
 
+    @staticmethod
     def _flush_buffer(
-        self,
-        buffer: Dict[str, Dict[str, List[Any]]],
-        configured_catalog: ConfiguredAirbyteCatalog,
-        db_path: str,
-        schema_name: str,
-        motherduck_api_key: str,
-        stream_name: str | None = None,
+        processor: DuckDBSqlProcessor,
+        buffer: StreamBuffer,
+        sync_mode: DestinationSyncMode,
     ) -> None:
         """
-        Flush the buffer to the destination.
-
-        If no stream name is provided, then all streams will be flushed.
+        Flush the buffer of a stream to the destination.
         """
-        for configured_stream in configured_catalog.streams:
-            if (stream_name is None or stream_name == configured_stream.stream.name) and buffer.get(configured_stream.stream.name):
-                processor = self._get_sql_processor(
-                    configured_catalog=configured_catalog, schema_name=schema_name, db_path=db_path, motherduck_token=motherduck_api_key
-                )
-                processor.write_stream_data_from_buffer(buffer, configured_stream.stream.name, configured_stream.destination_sync_mode)
+        pa_table = buffer.to_arrow()
+        if pa_table is not None:
+            processor.write_stream_data_from_table(pa_table, buffer.stream_name, sync_mode)
+        else:
+            processor.write_stream_data_from_buffer({buffer.stream_name: buffer.to_pydict()}, buffer.stream_name, sync_mode)
 
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
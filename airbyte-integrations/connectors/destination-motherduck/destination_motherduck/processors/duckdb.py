@@ -5,8 +5,10 @@ from __future__ import annotations
 
 import logging
 import warnings
+from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Literal, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Generator, List, Literal, Sequence
 from urllib.parse import parse_qsl, urlparse
 
 import pyarrow as pa
@@ -125,6 +127,29 @@ class DuckDBSqlProcessor(SqlProcessorBase):
     supports_merge_insert = False
     sql_config: DuckDBConfig
 
+    @cached_property
+    def _sql_engine(self) -> Engine:
+        return self.sql_config.get_sql_engine()
+
+    @contextmanager
+    def get_sql_connection(self) -> Generator[Connection, None, None]:
+        """
+        A context manager which returns a SQL connection for running queries.
+
+        Unlike the base implementation, the engine is created once and reused by all the
+        statements of the processor, so its pooled connection lives as long as the processor,
+        instead of reconnecting for every statement.
+        """
+        with self._sql_engine.begin() as connection:
+            self._init_connection_settings(connection)
+            yield connection
+
+    def close(self) -> None:
+        """Close the pooled connections of the SQL engine."""
+        if "_sql_engine" in self.__dict__:
+            self._sql_engine.dispose()
+            del self._sql_engine
+
     def _execute_sql(self, sql: str | TextClause | Executable) -> Sequence[Any]:
         """Execute the given SQL statement."""
         if isinstance(sql, str):
@@ -369,6 +394,25 @@ class DuckDBSqlProcessor(SqlProcessorBase):
             # local variable defined above.
             self._write_from_pa_table(temp_table_name, stream_name, pa_table)
 
+        self._write_loaded_temp_table(stream_name, temp_table_name, sync_mode)
+
+    def write_stream_data_from_table(
+        self,
+        pa_table: pa.Table,
+        stream_name: str,
+        sync_mode: DestinationSyncMode,
+    ) -> None:
+        """Write the records already buffered as an Arrow table."""
+        temp_table_name = self._create_table_for_loading(stream_name, batch_id=None)
+        self._write_from_pa_table(temp_table_name, stream_name, pa_table)
+        self._write_loaded_temp_table(stream_name, temp_table_name, sync_mode)
+
+    def _write_loaded_temp_table(
+        self,
+        stream_name: str,
+        temp_table_name: str,
+        sync_mode: DestinationSyncMode,
+    ) -> None:
         temp_table_name_dedup = self._drop_duplicates(temp_table_name, stream_name)
 
         try:
@@ -0,0 +1,122 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+"""Columnar buffers of the records received for a stream, before they are loaded."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import uuid
+from typing import Any, Dict, List, Mapping
+
+import pyarrow as pa
+
+from airbyte_cdk.sql.constants import AB_EXTRACTED_AT_COLUMN, AB_INTERNAL_COLUMNS, AB_META_COLUMN, AB_RAW_ID_COLUMN
+
+
+logger = logging.getLogger("airbyte")
+
+RECORD_BATCH_SIZE = 10_000
+"""The number of records converted to an Arrow record batch at once."""
+
+EMPTY_RECORD_META = json.dumps({})
+
+
+class StreamBuffer:
+    """Buffers the records of a single stream as Arrow record batches.
+
+    The columns are resolved once, when the buffer is created. The records are appended to
+    per-column lists, which are converted to an Arrow record batch every `RECORD_BATCH_SIZE`
+    records, so the size of the buffer is known in bytes.
+
+    If the values of a column can't be converted to Arrow (e.g. inconsistent types across
+    records), the buffer falls back to keeping the records as Python lists, which are loaded
+    with `executemany` instead.
+    """
+
+    def __init__(self, stream_name: str, column_names: List[str]) -> None:
+        self.stream_name = stream_name
+        self.data_column_names = [column_name for column_name in column_names if column_name not in AB_INTERNAL_COLUMNS]
+        self.column_names = [*self.data_column_names, AB_RAW_ID_COLUMN, AB_EXTRACTED_AT_COLUMN, AB_META_COLUMN]
+        self.record_count = 0
+        self._columns: Dict[str, List[Any]] = {column_name: [] for column_name in self.column_names}
+        self._batches: List[pa.RecordBatch] = []
+        self._batches_nbytes = 0
+        self._arrow_compatible = True
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the buffered records, estimated for the records not converted yet."""
+        if not self._batches:
+            return 0
+        pending_records = len(self._columns[AB_RAW_ID_COLUMN])
+        return self._batches_nbytes + self._batches_nbytes * pending_records // (self.record_count - pending_records)
+
+    def append(self, data: Mapping[str, Any]) -> None:
+        """Append the record data, along with the Airbyte internal columns."""
+        columns = self._columns
+        for column_name in self.data_column_names:
+            columns[column_name].append(data.get(column_name))
+        columns[AB_RAW_ID_COLUMN].append(str(uuid.uuid4()))
+        columns[AB_EXTRACTED_AT_COLUMN].append(datetime.datetime.now().isoformat())
+        columns[AB_META_COLUMN].append(EMPTY_RECORD_META)
+        self.record_count += 1
+
+        if self._arrow_compatible and len(columns[AB_RAW_ID_COLUMN]) >= RECORD_BATCH_SIZE:
+            self._convert_pending_records()
+
+    def _fall_back_to_python_columns(self) -> None:
+        logger.exception(
+            f"Buffering '{self.stream_name}' records with PyArrow failed, falling back to Python lists. "
+            "Expect some performance degradation."
+        )
+        self._arrow_compatible = False
+        self._restore_python_columns()
+
+    def _convert_pending_records(self) -> None:
+        try:
+            batch = pa.RecordBatch.from_pydict(self._columns)
+        except Exception:
+            self._fall_back_to_python_columns()
+            return
+
+        self._batches.append(batch)
+        self._batches_nbytes += batch.nbytes
+        self._columns = {column_name: [] for column_name in self.column_names}
+
+    def _restore_python_columns(self) -> None:
+        """Move the records already converted to Arrow back into the per-column lists."""
+        columns: Dict[str, List[Any]] = {column_name: [] for column_name in self.column_names}
+        for batch in self._batches:
+            for column_name, values in batch.to_pydict().items():
+                columns[column_name].extend(values)
+        for column_name, values in self._columns.items():
+            columns[column_name].extend(values)
+        self._columns = columns
+        self._batches = []
+        self._batches_nbytes = 0
+
+    def to_arrow(self) -> pa.Table | None:
+        """Return the buffered records as an Arrow table, or None if they can't be converted."""
+        if self._arrow_compatible and self._columns[AB_RAW_ID_COLUMN]:
+            self._convert_pending_records()
+        if not self._arrow_compatible:
+            return None
+        try:
+            # The types are inferred per batch, e.g. a column with only nulls in the first batch
+            return pa.concat_tables(
+                [pa.Table.from_batches([batch]) for batch in self._batches],
+                promote_options="permissive",
+            )
+        except Exception:
+            self._fall_back_to_python_columns()
+            return None
+
+    def to_pydict(self) -> Dict[str, List[Any]]:
+        """Return the buffered records as Python lists, one per column."""
+        if self._batches:
+            self._restore_python_columns()
+        return self._columns
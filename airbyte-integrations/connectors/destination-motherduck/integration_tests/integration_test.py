@@ -22,11 +22,14 @@ from airbyte_cdk.models import (
     AirbyteMessage,
     AirbyteRecordMessage,
     AirbyteStateMessage,
+    AirbyteStateType,
     AirbyteStream,
+    AirbyteStreamState,
     ConfiguredAirbyteCatalog,
     ConfiguredAirbyteStream,
     DestinationSyncMode,
     Status,
+    StreamDescriptor,
     SyncMode,
     Type,
 )
@@ -357,6 +360,43 @@ def test_write(
     assert sql_result[1][1] == "777-54-0664"
 
 
+def test_write_keeps_buffers_of_other_streams(
+    config: Dict[str, str],
+    request,
+    configured_catalogue: ConfiguredAirbyteCatalog,
+    airbyte_message1: AirbyteMessage,
+    airbyte_message2: AirbyteMessage,
+    airbyte_message4: AirbyteMessage,
+    airbyte_message5: AirbyteMessage,
+    test_table_name: str,
+    other_test_table_name: str,
+    test_schema_name: str,
+    sql_processor,
+):
+    stream_state = AirbyteMessage(
+        type=Type.STATE,
+        state=AirbyteStateMessage(
+            type=AirbyteStateType.STREAM,
+            stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name=test_table_name), stream_state={"state": "1"}),
+        ),
+    )
+    destination = DestinationMotherDuck()
+    generator = destination.write(
+        config,
+        configured_catalogue,
+        [airbyte_message1, airbyte_message4, stream_state, airbyte_message2, airbyte_message5],
+    )
+
+    result = list(generator)
+    assert len(result) == 1
+    assert result[0].state.destinationStats.recordCount == 1
+
+    sql_result = sql_processor._execute_sql(f"SELECT key1 FROM {test_schema_name}.{test_table_name} ORDER BY key1")
+    assert [row[0] for row in sql_result] == ["Dennis", "Megan"]
+    sql_result = sql_processor._execute_sql(f"SELECT key3 FROM {test_schema_name}.{other_test_table_name} ORDER BY key3")
+    assert [row[0] for row in sql_result] == ["Dennis", "Megan"]
+
+
 def test_write_dupe(
     config: Dict[str, str],
     request,
@@ -0,0 +1,64 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+import pyarrow as pa
+import pytest
+from destination_motherduck import stream_buffer
+from destination_motherduck.stream_buffer import StreamBuffer
+
+from airbyte_cdk.sql.constants import AB_EXTRACTED_AT_COLUMN, AB_META_COLUMN, AB_RAW_ID_COLUMN
+
+
+@pytest.fixture(autouse=True)
+def small_record_batches(monkeypatch):
+    monkeypatch.setattr(stream_buffer, "RECORD_BATCH_SIZE", 2)
+
+
+def test_columns_are_resolved_once():
+    buffer = StreamBuffer("users", ["id", "name", AB_RAW_ID_COLUMN, AB_EXTRACTED_AT_COLUMN, AB_META_COLUMN])
+    buffer.append({"id": 1, "name": "a", "ignored": True})
+    buffer.append({"id": 2})
+    buffer.append({"name": "c"})
+
+    table = buffer.to_arrow()
+
+    assert len(buffer) == 3
+    assert table.column_names == ["id", "name", AB_RAW_ID_COLUMN, AB_EXTRACTED_AT_COLUMN, AB_META_COLUMN]
+    assert table.column("id").to_pylist() == [1, 2, None]
+    assert table.column("name").to_pylist() == ["a", None, "c"]
+    assert table.column(AB_META_COLUMN).to_pylist() == ["{}"] * 3
+
+
+def test_nbytes_is_counted_from_record_batches():
+    buffer = StreamBuffer("users", ["id"])
+    buffer.append({"id": 1})
+    assert buffer.nbytes == 0
+
+    buffer.append({"id": 2})
+    batch_nbytes = buffer.nbytes
+    assert batch_nbytes > 0
+
+    buffer.append({"id": 3})
+    assert buffer.nbytes == batch_nbytes + batch_nbytes // 2
+
+
+def test_types_are_promoted_across_record_batches():
+    buffer = StreamBuffer("users", ["id", "score"])
+    for record in [{"id": 1}, {"id": 2}, {"id": 3, "score": 1.5}, {"id": 4, "score": 2}]:
+        buffer.append(record)
+
+    table = buffer.to_arrow()
+
+    assert table.schema.field("score").type == pa.float64()
+    assert table.column("score").to_pylist() == [None, None, 1.5, 2.0]
+
+
+def test_falls_back_to_python_lists():
+    buffer = StreamBuffer("users", ["id", "value"])
+    for record in [{"id": 1, "value": "a"}, {"id": 2, "value": "b"}, {"id": 3, "value": {"nested": True}}, {"id": 4, "value": 4}]:
+        buffer.append(record)
+
+    assert buffer.to_arrow() is None
+    columns = buffer.to_pydict()
+    assert columns["id"] == [1, 2, 3, 4]
+    assert columns["value"] == ["a", "b", {"nested": True}, 4]
+    assert len(columns[AB_RAW_ID_COLUMN]) == 4
@@ -0,0 +1,111 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+"""
+The throughput benchmark of `DestinationMotherDuck.write()`, writing to a local DuckDB file.
+
+Skipped by default, to run:
+    MOTHERDUCK_WRITE_BENCHMARK=1 pytest -s unit_tests/test_write_benchmark.py
+
+The number of the written records could be overridden with `MOTHERDUCK_WRITE_BENCHMARK_RECORDS` (default: 1_000_000).
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+from destination_motherduck import DestinationMotherDuck
+
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStateType,
+    AirbyteStream,
+    AirbyteStreamState,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    StreamDescriptor,
+    SyncMode,
+    Type,
+)
+
+
+BENCHMARK_RECORDS: int = int(os.getenv("MOTHERDUCK_WRITE_BENCHMARK_RECORDS", 1_000_000))
+STREAMS = ["users", "orders"]
+STATE_INTERVAL = 20_000
+
+
+def _configured_catalog() -> ConfiguredAirbyteCatalog:
+    json_schema = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer"},
+            "name": {"type": ["null", "string"]},
+            "email": {"type": ["null", "string"]},
+            "amount": {"type": ["null", "number"]},
+            "active": {"type": ["null", "boolean"]},
+            "updated_at": {"type": ["null", "string"], "format": "date-time"},
+        },
+    }
+    return ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=stream_name, json_schema=json_schema, supported_sync_modes=[SyncMode.full_refresh]),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.append,
+            )
+            for stream_name in STREAMS
+        ]
+    )
+
+
+def _messages(records: int) -> Iterator[AirbyteMessage]:
+    """Yields the records of the streams interleaved, with a state message per stream every `STATE_INTERVAL` records."""
+    for index in range(records):
+        stream_name = STREAMS[index % len(STREAMS)]
+        yield AirbyteMessage(
+            type=Type.RECORD,
+            record=AirbyteRecordMessage(
+                stream=stream_name,
+                data={
+                    "id": index,
+                    "name": f"name {index}",
+                    "email": f"user{index}@example.com",
+                    "amount": index / 100,
+                    "active": index % 3 == 0,
+                    "updated_at": "2024-01-01T00:00:00+00:00",
+                },
+                emitted_at=0,
+            ),
+        )
+        if index % STATE_INTERVAL == STATE_INTERVAL - 1:
+            yield AirbyteMessage(
+                type=Type.STATE,
+                state=AirbyteStateMessage(
+                    type=AirbyteStateType.STREAM,
+                    stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name=stream_name), stream_state={"id": index}),
+                ),
+            )
+
+
+@pytest.mark.skipif(not os.getenv("MOTHERDUCK_WRITE_BENCHMARK"), reason="The benchmark is enabled with `MOTHERDUCK_WRITE_BENCHMARK=1`")
+def test_write_records_per_second() -> None:
+    db_path = str(Path(tempfile.mkdtemp()) / "benchmark.duckdb")
+    config = {"destination_path": db_path, "schema": "main"}
+
+    with patch.object(DestinationMotherDuck, "_get_destination_path", staticmethod(lambda path: path)):
+        started_at = time.perf_counter()
+        state_messages = list(DestinationMotherDuck().write(config, _configured_catalog(), _messages(BENCHMARK_RECORDS)))
+        elapsed = time.perf_counter() - started_at
+
+    print(f"\nWritten {BENCHMARK_RECORDS:,} records in {elapsed:.2f}s: {BENCHMARK_RECORDS / elapsed:,.0f} records/s")
+    assert state_messages
+    processor = DestinationMotherDuck()._get_sql_processor(configured_catalog=_configured_catalog(), schema_name="main", db_path=db_path)
+    written = sum(processor._execute_sql(f"SELECT count(*) FROM main.{stream_name}")[0][0] for stream_name in STREAMS)
+    assert written == BENCHMARK_RECORDS
@@ -23,8 +23,7 @@ from airbyte_cdk.models import (
 from destination_pgvector import pgvector_processor
 from destination_pgvector.common.catalog.catalog_providers import CatalogProvider
 from destination_pgvector.config import ConfigModel
-
-BATCH_SIZE = 150
+from destination_pgvector.globals import BATCH_SIZE
 
 
 class DestinationPGVector(Destination):
@@ -47,6 +46,7 @@ class DestinationPGVector(Destination):
             catalog_provider=CatalogProvider(configured_catalog),
             temp_dir=Path(tempfile.mkdtemp()),
             temp_file_cleanup=True,
+            embedding_batch_size=BATCH_SIZE,
         )
 
     def write(
@@ -8,3 +8,7 @@ CHUNK_ID_COLUMN = "chunk_id"
 METADATA_COLUMN = "metadata"
 DOCUMENT_CONTENT_COLUMN = "document_content"
 EMBEDDING_COLUMN = "embedding"
+
+# Chunks from many records are embedded together, up to these budgets per embedding call
+BATCH_SIZE = 150
+DEFAULT_EMBEDDING_BATCH_MAX_CHARACTERS = 1_000_000
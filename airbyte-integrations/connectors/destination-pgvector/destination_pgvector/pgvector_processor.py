@@ -3,16 +3,25 @@
 
 from __future__ import annotations
 
+import gzip
 import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from textwrap import dedent
 from typing import Any
 
 import dpath
+import orjson
 import sqlalchemy
 from airbyte._processors.file.jsonl import JsonlWriter
 from airbyte.secrets import SecretString
+from airbyte.strategies import WriteStrategy
 from airbyte_cdk.destinations.vector_db_based import embedder
+from airbyte_cdk.destinations.vector_db_based.document_processor import (
+    Chunk,
+)
 from airbyte_cdk.destinations.vector_db_based.document_processor import (
     DocumentProcessor as DocumentSplitter,
 )
@@ -27,13 +36,33 @@ from typing_extensions import Protocol
 from destination_pgvector.common.catalog.catalog_providers import CatalogProvider
 from destination_pgvector.common.sql.sql_processor import SqlConfig, SqlProcessorBase
 from destination_pgvector.globals import (
+    BATCH_SIZE,
     CHUNK_ID_COLUMN,
+    DEFAULT_EMBEDDING_BATCH_MAX_CHARACTERS,
     DOCUMENT_CONTENT_COLUMN,
     DOCUMENT_ID_COLUMN,
     EMBEDDING_COLUMN,
     METADATA_COLUMN,
 )
 
+CHUNK_STREAM_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        DOCUMENT_ID_COLUMN: {"type": "string"},
+        CHUNK_ID_COLUMN: {"type": "string"},
+        METADATA_COLUMN: {"type": "object"},
+        DOCUMENT_CONTENT_COLUMN: {"type": "string"},
+        EMBEDDING_COLUMN: {
+            "type": "array",
+            "items": {"type": "float"},
+        },
+    },
+}
+"""The schema of the chunk records written to the local files."""
+
+COPY_READ_SIZE = 1024 * 1024
+"""The number of characters handed to `COPY` on every read."""
+
 
 class PostgresConfig(SqlConfig):
     """Configuration for the Postgres cache.
@@ -70,6 +99,68 @@ class EmbeddingConfig(Protocol):
     mode: str
 
 
+class CopySource:
+    """A file-like object, which renders a JSONL batch file in the `COPY` text format while
+    `COPY` is reading it.
+
+    The rows are produced lazily, so a batch file is never fully loaded into memory. The JSON
+    objects and arrays, including the embeddings, are loaded from their JSON text, which is also
+    the text format of the `vector` type.
+    """
+
+    NULL = "\\N"
+    SPECIAL_CHARACTERS = "\\\t\n\r"
+    ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+    def __init__(self, file_path: Path, column_names: list[str]) -> None:
+        self.file_path = file_path
+        self.column_names = column_names
+        self._lines = self._iter_lines()
+
+    def _iter_lines(self) -> Iterator[str]:
+        opener = gzip.open if self.file_path.suffix == ".gz" else open
+        with opener(self.file_path, "rb") as file:
+            for line in file:
+                record = orjson.loads(line)
+                yield "\t".join([
+                    self._to_copy_value(record.get(name)) for name in self.column_names
+                ])
+
+    def _to_copy_value(self, value: Any) -> str:  # noqa: ANN401  # Any JSON value
+        if value is None:
+            return self.NULL
+        if isinstance(value, str):
+            special_characters = self.SPECIAL_CHARACTERS
+        else:
+            # Serialized JSON has the control characters escaped, only the backslashes are left
+            value = orjson.dumps(value).decode()
+            special_characters = "\\"
+        # Most of the values, e.g. the embeddings, have nothing to escape
+        if any(character in value for character in special_characters):
+            return value.translate(self.ESCAPES)
+        return value
+
+    def read(self, size: int = -1) -> str:
+        """Return the next rows, at least `size` characters unless the file is exhausted."""
+        lines: list[str] = []
+        read_size = 0
+        for line in self._lines:
+            lines.append(line)
+            read_size += len(line) + 1
+            if 0 < size <= read_size:
+                break
+        return "".join(f"{line}\n" for line in lines)
+
+
+@dataclass
+class PendingChunk:
+    """A document chunk waiting to be embedded, along with the record it was split from."""
+
+    record_msg: AirbyteRecordMessage
+    document_id: str
+    chunk: Chunk
+
+
 class PGVectorProcessor(SqlProcessorBase):
     """A PGVector implementation of the SQL Processor."""
 
@@ -94,10 +185,20 @@ class PGVectorProcessor(SqlProcessorBase):
         catalog_provider: CatalogProvider,
         temp_dir: Path,
         temp_file_cleanup: bool = True,
+        embedding_batch_size: int = BATCH_SIZE,
+        embedding_batch_max_characters: int = DEFAULT_EMBEDDING_BATCH_MAX_CHARACTERS,
     ) -> None:
-        """Initialize the PGVector processor."""
+        """Initialize the PGVector processor.
+
+        Chunks are embedded in batches across records: a batch is embedded once it reaches
+        `embedding_batch_size` chunks or `embedding_batch_max_characters` characters of content.
+        """
         self.splitter_config = splitter_config
         self.embedder_config = embedder_config
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_batch_max_characters = embedding_batch_max_characters
+        self._pending_chunks: list[PendingChunk] = []
+        self._pending_characters = 0
         super().__init__(
             sql_config=sql_config,
             catalog_provider=catalog_provider,
@@ -174,21 +275,47 @@ class PGVectorProcessor(SqlProcessorBase):
         We override the SQLProcessor implementation in order to handle chunking, embedding, etc.
 
         This method is called for each record message, before the record is written to local file.
+        The chunks are queued for embedding and written to the local file once their batch is embedded.
         """
         document_chunks, id_to_delete = self.splitter.process(record_msg)
 
         _ = id_to_delete  # unused
 
+        if not document_chunks:
+            return
+
+        document_id = self._create_document_id(record_msg)
+        for chunk in document_chunks:
+            self._pending_chunks.append(
+                PendingChunk(record_msg=record_msg, document_id=document_id, chunk=chunk)
+            )
+            self._pending_characters += len(chunk.page_content or "")
+
+        if (
+            len(self._pending_chunks) >= self.embedding_batch_size
+            or self._pending_characters >= self.embedding_batch_max_characters
+        ):
+            self._embed_pending_chunks()
+
+    def _embed_pending_chunks(self) -> None:
+        """Embed all pending chunks with a single call and write them to the local files."""
+        if not self._pending_chunks:
+            return
+
+        pending_chunks, self._pending_chunks = self._pending_chunks, []
+        self._pending_characters = 0
+
         embeddings = self.embedder.embed_documents(
-            documents=document_chunks,
+            documents=[pending.chunk for pending in pending_chunks],
         )
-        for i, chunk in enumerate(document_chunks, start=0):
+        for pending, embedding in zip(pending_chunks, embeddings):
+            record_msg = pending.record_msg
             new_data: dict[str, Any] = {
-                DOCUMENT_ID_COLUMN: self._create_document_id(record_msg),
+                DOCUMENT_ID_COLUMN: pending.document_id,
                 CHUNK_ID_COLUMN: str(uuid.uuid4().int),
-                METADATA_COLUMN: chunk.metadata,
-                DOCUMENT_CONTENT_COLUMN: chunk.page_content,
-                EMBEDDING_COLUMN: embeddings[i],
+                METADATA_COLUMN: pending.chunk.metadata,
+                DOCUMENT_CONTENT_COLUMN: pending.chunk.page_content,
+                EMBEDDING_COLUMN: embedding,
             }
 
             self.file_writer.process_record_message(
@@ -198,21 +325,45 @@ class PGVectorProcessor(SqlProcessorBase):
                     data=new_data,
                     emitted_at=record_msg.emitted_at,
                 ),
-                stream_schema={
-                    "type": "object",
-                    "properties": {
-                        DOCUMENT_ID_COLUMN: {"type": "string"},
-                        CHUNK_ID_COLUMN: {"type": "string"},
-                        METADATA_COLUMN: {"type": "object"},
-                        DOCUMENT_CONTENT_COLUMN: {"type": "string"},
-                        EMBEDDING_COLUMN: {
-                            "type": "array",
-                            "items": {"type": "float"},
-                        },
-                    },
-                },
+                stream_schema=CHUNK_STREAM_SCHEMA,
             )
 
+    @overrides
+    def write_all_stream_data(self, write_strategy: WriteStrategy) -> None:
+        """Embed the remaining chunks, before the pending writes are finalized."""
+        self._embed_pending_chunks()
+        super().write_all_stream_data(write_strategy=write_strategy)
+
+    @overrides
+    def _write_files_to_new_table(
+        self,
+        files: list[Path],
+        stream_name: str,
+        batch_id: str,
+    ) -> str:
+        """Write the files to a new table, using `COPY ... FROM STDIN`.
+
+        The JSONL batch files are converted to the `COPY` text format on the fly and streamed into the table over
+        a single connection, instead of being loaded into a DataFrame and inserted with
+        `DataFrame.to_sql`.
+        """
+        temp_table_name = self._create_table_for_loading(stream_name, batch_id)
+        column_names = list(self._get_sql_column_definitions(stream_name))
+        copy_statement = (
+            f"COPY {self._fully_qualified(temp_table_name)} "
+            f"({', '.join(self._quote_identifier(name) for name in column_names)}) "
+            "FROM STDIN"
+        )
+        with self.get_sql_connection() as connection:
+            cursor = connection.connection.cursor()
+            for file_path in files:
+                cursor.copy_expert(
+                    copy_statement,
+                    CopySource(file_path, column_names),
+                    size=COPY_READ_SIZE,
+                )
+        return temp_table_name
+
     def _add_missing_columns_to_table(
         self,
         stream_name: str,
@@ -224,8 +375,9 @@ class PGVectorProcessor(SqlProcessorBase):
         """
         pass
 
-    @property
+    @cached_property
     def embedder(self) -> embedder.Embedder:
+        """Return the embedder, which is created once and reused for the whole sync."""
         return embedder.create_from_config(
             embedding_config=self.embedder_config,  # type: ignore [arg-type]  # No common base class
             processing_config=self.splitter_config,
@@ -236,8 +388,9 @@ class PGVectorProcessor(SqlProcessorBase):
         """Return the number of dimensions for the embeddings."""
         return self.embedder.embedding_dimensions
 
-    @property
+    @cached_property
     def splitter(self) -> DocumentSplitter:
+        """Return the document splitter, which is created once and reused for the whole sync."""
         return DocumentSplitter(
             config=self.splitter_config,
             catalog=self.catalog_provider.configured_catalog,
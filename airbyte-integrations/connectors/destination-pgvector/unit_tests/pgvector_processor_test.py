@@ -0,0 +1,192 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from airbyte.strategies import WriteStrategy
+from airbyte_cdk.destinations.vector_db_based.document_processor import Chunk
+from airbyte_cdk.models import AirbyteRecordMessage, ConfiguredAirbyteCatalog
+
+from destination_pgvector.common.catalog.catalog_providers import CatalogProvider
+from destination_pgvector.config import ConfigModel
+from destination_pgvector.globals import DOCUMENT_ID_COLUMN, EMBEDDING_COLUMN
+from destination_pgvector.pgvector_processor import (
+    CopySource,
+    PGVectorProcessor,
+    PostgresConfig,
+)
+
+
+class TestPGVectorProcessor(unittest.TestCase):
+    def setUp(self):
+        config_model = ConfigModel.parse_obj({
+            "processing": {"text_fields": ["str_col"], "metadata_fields": [], "chunk_size": 1000},
+            "embedding": {"mode": "fake"},
+            "indexing": {
+                "host": "MYACCOUNT",
+                "port": 5432,
+                "database": "MYDATABASE",
+                "default_schema": "MYSCHEMA",
+                "username": "MYUSERNAME",
+                "credentials": {"password": "xxxxxxx"},
+            },
+        })
+        catalog = ConfiguredAirbyteCatalog.parse_obj({
+            "streams": [
+                {
+                    "stream": {
+                        "name": "mystream",
+                        "json_schema": {
+                            "type": "object",
+                            "properties": {"str_col": {"type": "string"}},
+                        },
+                        "supported_sync_modes": ["full_refresh"],
+                    },
+                    "sync_mode": "full_refresh",
+                    "destination_sync_mode": "overwrite",
+                    "primary_key": [["id"]],
+                }
+            ]
+        })
+        with patch.object(PGVectorProcessor, "_ensure_schema_exists"):
+            self.processor = PGVectorProcessor(
+                sql_config=PostgresConfig(
+                    host="MYACCOUNT",
+                    port=5432,
+                    database="MYDATABASE",
+                    schema_name="MYSCHEMA",
+                    username="MYUSERNAME",
+                    password="xxxxxxx",
+                ),
+                splitter_config=config_model.processing,
+                embedder_config=config_model.embedding,
+                catalog_provider=CatalogProvider(catalog),
+                temp_dir=Path(tempfile.mkdtemp()),
+                embedding_batch_size=4,
+                embedding_batch_max_characters=100,
+            )
+        self.processor.splitter = MagicMock()
+        self.processor.splitter.process.side_effect = lambda record: (
+            [
+                Chunk(page_content=text, metadata={}, record=record)
+                for text in record.data["chunks"]
+            ],
+            None,
+        )
+        self.processor.embedder = MagicMock()
+        self.processor.embedder.embed_documents.side_effect = lambda documents: [
+            [float(len(chunk.page_content))] for chunk in documents
+        ]
+        self.processor.file_writer = MagicMock()
+
+    def _record(self, record_id, chunks):
+        return AirbyteRecordMessage(
+            stream="mystream", data={"id": record_id, "chunks": chunks}, emitted_at=0
+        )
+
+    def _written_records(self):
+        return [
+            call.kwargs["record_msg"].data
+            for call in self.processor.file_writer.process_record_message.call_args_list
+        ]
+
+    @patch("destination_pgvector.pgvector_processor.DocumentSplitter")
+    def test_embedder_and_splitter_are_created_once(self, MockedDocumentSplitter):
+        with patch.object(PGVectorProcessor, "_ensure_schema_exists"):
+            processor = PGVectorProcessor(
+                sql_config=self.processor.sql_config,
+                splitter_config=self.processor.splitter_config,
+                embedder_config=self.processor.embedder_config,
+                catalog_provider=self.processor.catalog_provider,
+                temp_dir=Path(tempfile.mkdtemp()),
+            )
+
+        self.assertIs(processor.embedder, processor.embedder)
+        self.assertIs(processor.splitter, processor.splitter)
+        MockedDocumentSplitter.assert_called_once()
+
+    def test_chunks_are_embedded_in_batches_across_records(self):
+        for record_id in range(3):
+            self.processor.process_record_message(
+                self._record(record_id, ["a", "bb"]), stream_schema={}
+            )
+
+        # the first 2 records fill the batch of 4 chunks, the last record is pending
+        self.processor.embedder.embed_documents.assert_called_once()
+        self.assertEqual(
+            [
+                (data[DOCUMENT_ID_COLUMN], data[EMBEDDING_COLUMN])
+                for data in self._written_records()
+            ],
+            [
+                ("Stream_mystream_Key_0", [1.0]),
+                ("Stream_mystream_Key_0", [2.0]),
+                ("Stream_mystream_Key_1", [1.0]),
+                ("Stream_mystream_Key_1", [2.0]),
+            ],
+        )
+
+        with patch(
+            "destination_pgvector.common.sql.sql_processor.SqlProcessorBase.write_all_stream_data"
+        ) as mock_write:
+            self.processor.write_all_stream_data(write_strategy=WriteStrategy.AUTO)
+
+        mock_write.assert_called_once_with(write_strategy=WriteStrategy.AUTO)
+        self.assertEqual(self.processor.embedder.embed_documents.call_count, 2)
+        self.assertEqual(
+            [data[DOCUMENT_ID_COLUMN] for data in self._written_records()[4:]],
+            ["Stream_mystream_Key_2"] * 2,
+        )
+
+    def test_batch_is_embedded_once_the_character_budget_is_reached(self):
+        self.processor.process_record_message(self._record(0, ["x" * 60]), stream_schema={})
+        self.processor.embedder.embed_documents.assert_not_called()
+
+        self.processor.process_record_message(self._record(1, ["y" * 60]), stream_schema={})
+        self.processor.embedder.embed_documents.assert_called_once()
+        self.assertEqual(
+            [data[EMBEDDING_COLUMN] for data in self._written_records()], [[60.0], [60.0]]
+        )
+
+    def test_records_without_chunks_are_skipped(self):
+        self.processor.process_record_message(self._record(0, []), stream_schema={})
+
+        with patch(
+            "destination_pgvector.common.sql.sql_processor.SqlProcessorBase.write_all_stream_data"
+        ):
+            self.processor.write_all_stream_data(write_strategy=WriteStrategy.AUTO)
+
+        self.processor.embedder.embed_documents.assert_not_called()
+        self.processor.file_writer.process_record_message.assert_not_called()
+
+
+class TestCopySource(unittest.TestCase):
+    def setUp(self):
+        self.file_path = Path(tempfile.mkdtemp()) / "batch.jsonl.gz"
+        with gzip.open(self.file_path, "wt") as file:
+            file.write(
+                '{"document_id": "1", "metadata": {"a": "b"}, "document_content": "x,\\"y\\"\\nz", '
+                '"embedding": [0.5, 1.0], "_airbyte_extra": "skipped"}\n'
+            )
+            file.write('{"document_id": "2", "metadata": null, "document_content": ""}\n')
+
+    def test_read(self):
+        source = CopySource(
+            self.file_path, ["document_id", "metadata", "document_content", "embedding"]
+        )
+
+        self.assertEqual(
+            source.read(),
+            '1\t{"a":"b"}\tx,"y"\\nz\t[0.5,1.0]\n2\t\\N\t\t\\N\n',
+        )
+        self.assertEqual(source.read(), "")
+
+    def test_read_in_chunks(self):
+        source = CopySource(self.file_path, ["document_id"])
+
+        self.assertEqual(source.read(size=1), "1\n")
+        self.assertEqual(source.read(size=1), "2\n")
+        self.assertEqual(source.read(size=1), "")
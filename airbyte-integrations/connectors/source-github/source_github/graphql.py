@@ -4,165 +4,52 @@
 
 import heapq
 import itertools
-from typing import Optional
+import json
+from string import Template
+from typing import Any, Optional
 
-import sgqlc.operation
-from sgqlc.operation import Selector
+from .graphql_templates import QUERY_TEMPLATES
 
-from . import github_schema
 
+ORDER_DIRECTIONS = ("ASC", "DESC")
 
-_schema = github_schema
-_schema_root = _schema.github_schema
 
-
-def select_user_fields(user):
-    user.__fields__(
-        id="node_id",
-        database_id="id",
-        login=True,
-        avatar_url="avatar_url",
-        url="html_url",
-        is_site_admin="site_admin",
+def render_query(template_name: str, direction: Optional[str] = None, **arguments: Any) -> str:
+    """
+    Render a query from its template, see `graphql_builder.py` for the sgqlc builders of the templates.
+    The arguments are rendered like sgqlc does: strings and integers as JSON, the order direction as an enum value.
+    """
+    if direction is not None and direction not in ORDER_DIRECTIONS:
+        raise ValueError(f"Invalid order direction {direction}, expected one of {ORDER_DIRECTIONS}.")
+    return Template(QUERY_TEMPLATES[template_name]).substitute(
+        {name: json.dumps(value) for name, value in arguments.items()}, direction=direction or ""
     )
 
 
 def get_query_pull_requests(owner, name, first, after, direction):
-    kwargs = {"first": first, "order_by": {"field": "UPDATED_AT", "direction": direction}}
     if after:
-        kwargs["after"] = after
-
-    op = sgqlc.operation.Operation(_schema_root.query_type)
-    repository = op.repository(owner=owner, name=name)
-    repository.name()
-    repository.owner.login()
-    pull_requests = repository.pull_requests(**kwargs)
-    pull_requests.nodes.__fields__(
-        id="node_id",
-        database_id="id",
-        number=True,
-        updated_at="updated_at",
-        changed_files="changed_files",
-        deletions=True,
-        additions=True,
-        merged=True,
-        mergeable=True,
-        can_be_rebased="can_be_rebased",
-        maintainer_can_modify="maintainer_can_modify",
-        merge_state_status="merge_state_status",
-    )
-    pull_requests.nodes.comments.__fields__(total_count=True)
-    pull_requests.nodes.commits.__fields__(total_count=True)
-    reviews = pull_requests.nodes.reviews(first=100, __alias__="review_comments")
-    reviews.total_count()
-    reviews.nodes.comments.__fields__(total_count=True)
-    user = pull_requests.nodes.merged_by(__alias__="merged_by").__as__(_schema_root.User)
-    select_user_fields(user)
-    pull_requests.page_info.__fields__(has_next_page=True, end_cursor=True)
-    return str(op)
+        return render_query("pull_requests_after", owner=owner, name=name, first=first, after=after, direction=direction)
+    return render_query("pull_requests", owner=owner, name=name, first=first, direction=direction)
 
 
 def get_query_projectsV2(owner, name, first, after, direction):
-    kwargs = {"first": first, "order_by": {"field": "UPDATED_AT", "direction": direction}}
     if after:
-        kwargs["after"] = after
-
-    op = sgqlc.operation.Operation(_schema_root.query_type)
-    repository = op.repository(owner=owner, name=name)
-    repository.name()
-    repository.owner.login()
-    projects_v2 = repository.projects_v2(**kwargs)
-    projects_v2.nodes.__fields__(
-        closed=True,
-        created_at="created_at",
-        closed_at="closed_at",
-        updated_at="updated_at",
-        creator="creator",
-        id="node_id",
-        database_id="id",
-        number=True,
-        public=True,
-        readme="readme",
-        short_description="short_description",
-        template=True,
-        title="title",
-        url="url",
-        viewer_can_close=True,
-        viewer_can_reopen=True,
-        viewer_can_update=True,
-    )
-    projects_v2.nodes.owner.__fields__(id="id")
-    projects_v2.page_info.__fields__(has_next_page=True, end_cursor=True)
-    return str(op)
+        return render_query("projects_v2_after", owner=owner, name=name, first=first, after=after, direction=direction)
+    return render_query("projects_v2", owner=owner, name=name, first=first, direction=direction)
 
 
 def get_query_reviews(owner, name, first, after, number=None):
-    op = sgqlc.operation.Operation(_schema_root.query_type)
-    repository = op.repository(owner=owner, name=name)
-    repository.name()
-    repository.owner.login()
-    if number:
-        pull_request = repository.pull_request(number=number)
-    else:
-        kwargs = {"first": first, "order_by": {"field": "UPDATED_AT", "direction": "ASC"}}
-        if after:
-            kwargs["after"] = after
-        pull_requests = repository.pull_requests(**kwargs)
-        pull_requests.page_info.__fields__(has_next_page=True, end_cursor=True)
-        pull_request = pull_requests.nodes
-
-    pull_request.__fields__(number=True, url=True)
-    kwargs = {"first": first}
-    if number and after:
-        kwargs["after"] = after
-    reviews = pull_request.reviews(**kwargs)
-    reviews.page_info.__fields__(has_next_page=True, end_cursor=True)
-    reviews.nodes.__fields__(
-        id="node_id",
-        database_id="id",
-        body=True,
-        state=True,
-        url="html_url",
-        author_association="author_association",
-        submitted_at="submitted_at",
-        created_at="created_at",
-        updated_at="updated_at",
-    )
-    reviews.nodes.commit.oid()
-    user = reviews.nodes.author(__alias__="user").__as__(_schema_root.User)
-    select_user_fields(user)
-    return str(op)
+    template_name = "reviews_number" if number else "reviews"
+    if after:
+        return render_query(f"{template_name}_after", owner=owner, name=name, first=first, after=after, number=number)
+    return render_query(template_name, owner=owner, name=name, first=first, number=number)
 
 
 def get_query_issue_reactions(owner, name, first, after, number=None):
-    op = sgqlc.operation.Operation(_schema_root.query_type)
-    repository = op.repository(owner=owner, name=name)
-    repository.name()
-    repository.owner.login()
-    if number:
-        issue = repository.issue(number=number)
-    else:
-        kwargs = {"first": first}
-        if after:
-            kwargs["after"] = after
-        issues = repository.issues(**kwargs)
-        issues.page_info.__fields__(has_next_page=True, end_cursor=True)
-        issue = issues.nodes
-
-    issue.__fields__(number=True)
-    kwargs = {"first": first}
-    if number and after:
-        kwargs["after"] = after
-    reactions = issue.reactions(**kwargs)
-    reactions.page_info.__fields__(has_next_page=True, end_cursor=True)
-    reactions.nodes.__fields__(
-        id="node_id",
-        database_id="id",
-        content=True,
-        created_at="created_at",
-    )
-    select_user_fields(reactions.nodes.user())
-    return str(op)
+    template_name = "issue_reactions_number" if number else "issue_reactions"
+    if after:
+        return render_query(f"{template_name}_after", owner=owner, name=name, first=first, after=after, number=number)
+    return render_query(template_name, owner=owner, name=name, first=first, number=number)
 
 
 class QueryReactions:
@@ -190,23 +77,9 @@ class QueryReactions:
           }
         }
         """
-        op = self._get_operation()
-        repository = op.repository(owner=owner, name=name)
-        repository.name()
-        repository.owner.login()
-
-        kwargs = {"first": first}
         if after:
-            kwargs["after"] = after
-        pull_requests = repository.pull_requests(**kwargs)
-        pull_requests.page_info.__fields__(has_next_page=True, end_cursor=True)
-        pull_requests.total_count()
-        pull_requests.nodes.id(__alias__="node_id")
-
-        reviews = self._select_reviews(pull_requests.nodes, first=self.AVERAGE_REVIEWS)
-        comments = self._select_comments(reviews.nodes, first=self.AVERAGE_COMMENTS)
-        self._select_reactions(comments.nodes, first=self.AVERAGE_REACTIONS)
-        return str(op)
+            return render_query("reactions_root_repository_after", owner=owner, name=name, first=first, after=after)
+        return render_query("reactions_root_repository", owner=owner, name=name, first=first)
 
     def get_query_root_pull_request(self, node_id: str, first: int, after: str):
         """
@@ -222,16 +95,7 @@ class QueryReactions:
           }
         }
         """
-        op = self._get_operation()
-        pull_request = op.node(id=node_id).__as__(_schema_root.PullRequest)
-        pull_request.id(__alias__="node_id")
-        pull_request.repository.name()
-        pull_request.repository.owner.login()
-
-        reviews = self._select_reviews(pull_request, first, after)
-        comments = self._select_comments(reviews.nodes, first=self.AVERAGE_COMMENTS)
-        self._select_reactions(comments.nodes, first=self.AVERAGE_REACTIONS)
-        return str(op)
+        return self._render_query_root("reactions_root_pull_request", node_id, first, after)
 
     def get_query_root_review(self, node_id: str, first: int, after: str):
         """
@@ -245,15 +109,7 @@ class QueryReactions:
           }
         }
         """
-        op = self._get_operation()
-        review = op.node(id=node_id).__as__(_schema_root.PullRequestReview)
-        review.id(__alias__="node_id")
-        review.repository.name()
-        review.repository.owner.login()
-
-        comments = self._select_comments(review, first, after)
-        self._select_reactions(comments.nodes, first=self.AVERAGE_REACTIONS)
-        return str(op)
+        return self._render_query_root("reactions_root_review", node_id, first, after)
 
     def get_query_root_comment(self, node_id: str, first: int, after: str):
         """
@@ -265,50 +121,12 @@ class QueryReactions:
           }
         }
         """
-        op = self._get_operation()
-        comment = op.node(id=node_id).__as__(_schema_root.PullRequestReviewComment)
-        comment.id(__alias__="node_id")
-        comment.database_id(__alias__="id")
-        comment.repository.name()
-        comment.repository.owner.login()
-        self._select_reactions(comment, first, after)
-        return str(op)
+        return self._render_query_root("reactions_root_comment", node_id, first, after)
 
-    def _select_reactions(self, comment: Selector, first: int, after: Optional[str] = None):
-        kwargs = {"first": first}
+    def _render_query_root(self, template_name: str, node_id: str, first: int, after: str):
         if after:
-            kwargs["after"] = after
-        reactions = comment.reactions(**kwargs)
-        reactions.page_info.__fields__(has_next_page=True, end_cursor=True)
-        reactions.total_count()
-        reactions.nodes.__fields__(id="node_id", database_id="id", content=True, created_at="created_at")
-        select_user_fields(reactions.nodes.user())
-        return reactions
-
-    def _select_comments(self, review: Selector, first: int, after: Optional[str] = None):
-        kwargs = {"first": first}
-        if after:
-            kwargs["after"] = after
-        comments = review.comments(**kwargs)
-        comments.page_info.__fields__(has_next_page=True, end_cursor=True)
-        comments.total_count()
-        comments.nodes.id(__alias__="node_id")
-        comments.nodes.database_id(__alias__="id")
-        return comments
-
-    def _select_reviews(self, pull_request: Selector, first: int, after: Optional[str] = None):
-        kwargs = {"first": first}
-        if after:
-            kwargs["after"] = after
-        reviews = pull_request.reviews(**kwargs)
-        reviews.page_info.__fields__(has_next_page=True, end_cursor=True)
-        reviews.total_count()
-        reviews.nodes.id(__alias__="node_id")
-        reviews.nodes.database_id(__alias__="id")
-        return reviews
-
-    def _get_operation(self):
-        return sgqlc.operation.Operation(_schema_root.query_type)
+            return render_query(f"{template_name}_after", node_id=node_id, first=first, after=after)
+        return render_query(template_name, node_id=node_id, first=first)
 
 
 class CursorStorage:
@@ -0,0 +1,920 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+"""
+The GraphQL queries of the streams, as `string.Template` strings.
+
+Generated by `python -m source_github.graphql_builder`, do not edit.
+"""
+
+QUERY_TEMPLATES = {
+    "issue_reactions": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    issues(first: $first) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        number
+        reactions(first: $first) {
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+          nodes {
+            node_id: id
+            id: databaseId
+            content
+            created_at: createdAt
+            user {
+              node_id: id
+              id: databaseId
+              login
+              avatar_url: avatarUrl
+              html_url: url
+              site_admin: isSiteAdmin
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "issue_reactions_after": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    issues(first: $first, after: $after) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        number
+        reactions(first: $first) {
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+          nodes {
+            node_id: id
+            id: databaseId
+            content
+            created_at: createdAt
+            user {
+              node_id: id
+              id: databaseId
+              login
+              avatar_url: avatarUrl
+              html_url: url
+              site_admin: isSiteAdmin
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "issue_reactions_number": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    issue(number: $number) {
+      number
+      reactions(first: $first) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          node_id: id
+          id: databaseId
+          content
+          created_at: createdAt
+          user {
+            node_id: id
+            id: databaseId
+            login
+            avatar_url: avatarUrl
+            html_url: url
+            site_admin: isSiteAdmin
+          }
+        }
+      }
+    }
+  }
+}""",
+    "issue_reactions_number_after": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    issue(number: $number) {
+      number
+      reactions(first: $first, after: $after) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          node_id: id
+          id: databaseId
+          content
+          created_at: createdAt
+          user {
+            node_id: id
+            id: databaseId
+            login
+            avatar_url: avatarUrl
+            html_url: url
+            site_admin: isSiteAdmin
+          }
+        }
+      }
+    }
+  }
+}""",
+    "projects_v2": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    projectsV2(first: $first, orderBy: {field: UPDATED_AT, direction: $direction}) {
+      nodes {
+        closed
+        created_at: createdAt
+        closed_at: closedAt
+        updated_at: updatedAt
+        creator: creator {
+          avatarUrl
+          login
+          resourcePath
+          url
+        }
+        node_id: id
+        id: databaseId
+        number
+        public
+        readme: readme
+        short_description: shortDescription
+        template
+        title: title
+        url: url
+        viewerCanClose
+        viewerCanReopen
+        viewerCanUpdate
+        owner {
+          id: id
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+  }
+}""",
+    "projects_v2_after": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    projectsV2(first: $first, orderBy: {field: UPDATED_AT, direction: $direction}, after: $after) {
+      nodes {
+        closed
+        created_at: createdAt
+        closed_at: closedAt
+        updated_at: updatedAt
+        creator: creator {
+          avatarUrl
+          login
+          resourcePath
+          url
+        }
+        node_id: id
+        id: databaseId
+        number
+        public
+        readme: readme
+        short_description: shortDescription
+        template
+        title: title
+        url: url
+        viewerCanClose
+        viewerCanReopen
+        viewerCanUpdate
+        owner {
+          id: id
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+  }
+}""",
+    "pull_requests": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    pullRequests(first: $first, orderBy: {field: UPDATED_AT, direction: $direction}) {
+      nodes {
+        node_id: id
+        id: databaseId
+        number
+        updated_at: updatedAt
+        changed_files: changedFiles
+        deletions
+        additions
+        merged
+        mergeable
+        can_be_rebased: canBeRebased
+        maintainer_can_modify: maintainerCanModify
+        merge_state_status: mergeStateStatus
+        comments {
+          totalCount
+        }
+        commits {
+          totalCount
+        }
+        review_comments: reviews(first: 100) {
+          totalCount
+          nodes {
+            comments {
+              totalCount
+            }
+          }
+        }
+        merged_by: mergedBy {
+          __typename
+          ... on User {
+            node_id: id
+            id: databaseId
+            login
+            avatar_url: avatarUrl
+            html_url: url
+            site_admin: isSiteAdmin
+          }
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+  }
+}""",
+    "pull_requests_after": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    pullRequests(first: $first, orderBy: {field: UPDATED_AT, direction: $direction}, after: $after) {
+      nodes {
+        node_id: id
+        id: databaseId
+        number
+        updated_at: updatedAt
+        changed_files: changedFiles
+        deletions
+        additions
+        merged
+        mergeable
+        can_be_rebased: canBeRebased
+        maintainer_can_modify: maintainerCanModify
+        merge_state_status: mergeStateStatus
+        comments {
+          totalCount
+        }
+        commits {
+          totalCount
+        }
+        review_comments: reviews(first: 100) {
+          totalCount
+          nodes {
+            comments {
+              totalCount
+            }
+          }
+        }
+        merged_by: mergedBy {
+          __typename
+          ... on User {
+            node_id: id
+            id: databaseId
+            login
+            avatar_url: avatarUrl
+            html_url: url
+            site_admin: isSiteAdmin
+          }
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+  }
+}""",
+    "reactions_root_comment": """query {
+  node(id: $node_id) {
+    __typename
+    ... on PullRequestReviewComment {
+      node_id: id
+      id: databaseId
+      repository {
+        name
+        owner {
+          login
+        }
+      }
+      reactions(first: $first) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        totalCount
+        nodes {
+          node_id: id
+          id: databaseId
+          content
+          created_at: createdAt
+          user {
+            node_id: id
+            id: databaseId
+            login
+            avatar_url: avatarUrl
+            html_url: url
+            site_admin: isSiteAdmin
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reactions_root_comment_after": """query {
+  node(id: $node_id) {
+    __typename
+    ... on PullRequestReviewComment {
+      node_id: id
+      id: databaseId
+      repository {
+        name
+        owner {
+          login
+        }
+      }
+      reactions(first: $first, after: $after) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        totalCount
+        nodes {
+          node_id: id
+          id: databaseId
+          content
+          created_at: createdAt
+          user {
+            node_id: id
+            id: databaseId
+            login
+            avatar_url: avatarUrl
+            html_url: url
+            site_admin: isSiteAdmin
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reactions_root_pull_request": """query {
+  node(id: $node_id) {
+    __typename
+    ... on PullRequest {
+      node_id: id
+      repository {
+        name
+        owner {
+          login
+        }
+      }
+      reviews(first: $first) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        totalCount
+        nodes {
+          node_id: id
+          id: databaseId
+          comments(first: 2) {
+            pageInfo {
+              hasNextPage
+              endCursor
+            }
+            totalCount
+            nodes {
+              node_id: id
+              id: databaseId
+              reactions(first: 2) {
+                pageInfo {
+                  hasNextPage
+                  endCursor
+                }
+                totalCount
+                nodes {
+                  node_id: id
+                  id: databaseId
+                  content
+                  created_at: createdAt
+                  user {
+                    node_id: id
+                    id: databaseId
+                    login
+                    avatar_url: avatarUrl
+                    html_url: url
+                    site_admin: isSiteAdmin
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reactions_root_pull_request_after": """query {
+  node(id: $node_id) {
+    __typename
+    ... on PullRequest {
+      node_id: id
+      repository {
+        name
+        owner {
+          login
+        }
+      }
+      reviews(first: $first, after: $after) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        totalCount
+        nodes {
+          node_id: id
+          id: databaseId
+          comments(first: 2) {
+            pageInfo {
+              hasNextPage
+              endCursor
+            }
+            totalCount
+            nodes {
+              node_id: id
+              id: databaseId
+              reactions(first: 2) {
+                pageInfo {
+                  hasNextPage
+                  endCursor
+                }
+                totalCount
+                nodes {
+                  node_id: id
+                  id: databaseId
+                  content
+                  created_at: createdAt
+                  user {
+                    node_id: id
+                    id: databaseId
+                    login
+                    avatar_url: avatarUrl
+                    html_url: url
+                    site_admin: isSiteAdmin
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reactions_root_repository": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    pullRequests(first: $first) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      totalCount
+      nodes {
+        node_id: id
+        reviews(first: 5) {
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+          totalCount
+          nodes {
+            node_id: id
+            id: databaseId
+            comments(first: 2) {
+              pageInfo {
+                hasNextPage
+                endCursor
+              }
+              totalCount
+              nodes {
+                node_id: id
+                id: databaseId
+                reactions(first: 2) {
+                  pageInfo {
+                    hasNextPage
+                    endCursor
+                  }
+                  totalCount
+                  nodes {
+                    node_id: id
+                    id: databaseId
+                    content
+                    created_at: createdAt
+                    user {
+                      node_id: id
+                      id: databaseId
+                      login
+                      avatar_url: avatarUrl
+                      html_url: url
+                      site_admin: isSiteAdmin
+                    }
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reactions_root_repository_after": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    pullRequests(first: $first, after: $after) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      totalCount
+      nodes {
+        node_id: id
+        reviews(first: 5) {
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+          totalCount
+          nodes {
+            node_id: id
+            id: databaseId
+            comments(first: 2) {
+              pageInfo {
+                hasNextPage
+                endCursor
+              }
+              totalCount
+              nodes {
+                node_id: id
+                id: databaseId
+                reactions(first: 2) {
+                  pageInfo {
+                    hasNextPage
+                    endCursor
+                  }
+                  totalCount
+                  nodes {
+                    node_id: id
+                    id: databaseId
+                    content
+                    created_at: createdAt
+                    user {
+                      node_id: id
+                      id: databaseId
+                      login
+                      avatar_url: avatarUrl
+                      html_url: url
+                      site_admin: isSiteAdmin
+                    }
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reactions_root_review": """query {
+  node(id: $node_id) {
+    __typename
+    ... on PullRequestReview {
+      node_id: id
+      repository {
+        name
+        owner {
+          login
+        }
+      }
+      comments(first: $first) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        totalCount
+        nodes {
+          node_id: id
+          id: databaseId
+          reactions(first: 2) {
+            pageInfo {
+              hasNextPage
+              endCursor
+            }
+            totalCount
+            nodes {
+              node_id: id
+              id: databaseId
+              content
+              created_at: createdAt
+              user {
+                node_id: id
+                id: databaseId
+                login
+                avatar_url: avatarUrl
+                html_url: url
+                site_admin: isSiteAdmin
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reactions_root_review_after": """query {
+  node(id: $node_id) {
+    __typename
+    ... on PullRequestReview {
+      node_id: id
+      repository {
+        name
+        owner {
+          login
+        }
+      }
+      comments(first: $first, after: $after) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        totalCount
+        nodes {
+          node_id: id
+          id: databaseId
+          reactions(first: 2) {
+            pageInfo {
+              hasNextPage
+              endCursor
+            }
+            totalCount
+            nodes {
+              node_id: id
+              id: databaseId
+              content
+              created_at: createdAt
+              user {
+                node_id: id
+                id: databaseId
+                login
+                avatar_url: avatarUrl
+                html_url: url
+                site_admin: isSiteAdmin
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reviews": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    pullRequests(first: $first, orderBy: {field: UPDATED_AT, direction: ASC}) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        number
+        url
+        reviews(first: $first) {
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+          nodes {
+            node_id: id
+            id: databaseId
+            body
+            state
+            html_url: url
+            author_association: authorAssociation
+            submitted_at: submittedAt
+            created_at: createdAt
+            updated_at: updatedAt
+            commit {
+              oid
+            }
+            user: author {
+              __typename
+              ... on User {
+                node_id: id
+                id: databaseId
+                login
+                avatar_url: avatarUrl
+                html_url: url
+                site_admin: isSiteAdmin
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reviews_after": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    pullRequests(first: $first, orderBy: {field: UPDATED_AT, direction: ASC}, after: $after) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        number
+        url
+        reviews(first: $first) {
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+          nodes {
+            node_id: id
+            id: databaseId
+            body
+            state
+            html_url: url
+            author_association: authorAssociation
+            submitted_at: submittedAt
+            created_at: createdAt
+            updated_at: updatedAt
+            commit {
+              oid
+            }
+            user: author {
+              __typename
+              ... on User {
+                node_id: id
+                id: databaseId
+                login
+                avatar_url: avatarUrl
+                html_url: url
+                site_admin: isSiteAdmin
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reviews_number": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    pullRequest(number: $number) {
+      number
+      url
+      reviews(first: $first) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          node_id: id
+          id: databaseId
+          body
+          state
+          html_url: url
+          author_association: authorAssociation
+          submitted_at: submittedAt
+          created_at: createdAt
+          updated_at: updatedAt
+          commit {
+            oid
+          }
+          user: author {
+            __typename
+            ... on User {
+              node_id: id
+              id: databaseId
+              login
+              avatar_url: avatarUrl
+              html_url: url
+              site_admin: isSiteAdmin
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+    "reviews_number_after": """query {
+  repository(owner: $owner, name: $name) {
+    name
+    owner {
+      login
+    }
+    pullRequest(number: $number) {
+      number
+      url
+      reviews(first: $first, after: $after) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          node_id: id
+          id: databaseId
+          body
+          state
+          html_url: url
+          author_association: authorAssociation
+          submitted_at: submittedAt
+          created_at: createdAt
+          updated_at: updatedAt
+          commit {
+            oid
+          }
+          user: author {
+            __typename
+            ... on User {
+              node_id: id
+              id: databaseId
+              login
+              avatar_url: avatarUrl
+              html_url: url
+              site_admin: isSiteAdmin
+            }
+          }
+        }
+      }
+    }
+  }
+}""",
+}
@@ -0,0 +1,59 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import subprocess
+import sys
+
+import pytest
+from source_github import graphql, graphql_builder
+from source_github.graphql_templates import QUERY_TEMPLATES
+
+
+def test_query_templates_are_up_to_date():
+    # Render the templates again with `python -m source_github.graphql_builder` if this test fails
+    assert graphql_builder.render_query_templates() == QUERY_TEMPLATES
+
+
+@pytest.mark.parametrize("after", [None, "Y3Vyc29yOnYyOpK5", 'a "quoted" cursor with é'])
+@pytest.mark.parametrize("owner, name", [("airbytehq", "airbyte"), ("owner.with-dash", 'name "quoted" \\ é')])
+def test_rendered_queries_match_builders(owner, name, after):
+    for direction in graphql.ORDER_DIRECTIONS:
+        assert graphql.get_query_pull_requests(owner, name, 10, after, direction) == graphql_builder.get_query_pull_requests(
+            owner, name, 10, after, direction
+        )
+        assert graphql.get_query_projectsV2(owner, name, 10, after, direction) == graphql_builder.get_query_projectsV2(
+            owner, name, 10, after, direction
+        )
+    for number in [None, 42]:
+        assert graphql.get_query_reviews(owner, name, 10, after, number) == graphql_builder.get_query_reviews(
+            owner, name, 10, after, number
+        )
+        assert graphql.get_query_issue_reactions(owner, name, 10, after, number) == graphql_builder.get_query_issue_reactions(
+            owner, name, 10, after, number
+        )
+
+    query_reactions, builder_query_reactions = graphql.QueryReactions(), graphql_builder.QueryReactions()
+    assert query_reactions.get_query_root_repository(owner, name, 10, after) == builder_query_reactions.get_query_root_repository(
+        owner, name, 10, after
+    )
+    for method_name in ["get_query_root_pull_request", "get_query_root_review", "get_query_root_comment"]:
+        node_id = f"PR_{name}"
+        assert getattr(query_reactions, method_name)(node_id, 10, after) == getattr(builder_query_reactions, method_name)(
+            node_id, 10, after
+        )
+
+
+def test_render_query_with_invalid_direction():
+    with pytest.raises(ValueError):
+        graphql.get_query_pull_requests("airbytehq", "airbyte", 10, None, "ASC) { injected }")
+
+
+def test_github_schema_is_not_imported():
+    # Importing the sgqlc schema takes a large part of the connector startup time
+    imported_modules = subprocess.check_output(
+        [sys.executable, "-c", "import sys, source_github.source; print(' '.join(sys.modules))"], text=True
+    ).split()
+    assert "source_github.source" in imported_modules
+    assert "source_github.github_schema" not in imported_modules
+    assert "sgqlc" not in imported_modules
@@ -0,0 +1,47 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+"""
+The benchmark of the connector startup: the time and the memory needed to import the connector and to run `spec`.
+
+Skipped by default, to run:
+    GITHUB_IMPORT_TIME_BENCHMARK=1 pytest -s unit_tests/test_import_time_benchmark.py
+
+The number of the runs of each command could be overridden with `GITHUB_IMPORT_TIME_BENCHMARK_RUNS` (default: 5).
+The import of the sgqlc schema, which the connector no longer needs at runtime, is measured for comparison.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+BENCHMARK_RUNS = int(os.getenv("GITHUB_IMPORT_TIME_BENCHMARK_RUNS", 5))
+MAX_RSS_SCRIPT = "import resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+COMMANDS = {
+    "import source_github": f"import source_github; {MAX_RSS_SCRIPT}",
+    "spec": f"from source_github.run import run; import sys; sys.argv = ['source-github', 'spec']; run(); {MAX_RSS_SCRIPT}",
+    "import source_github + github_schema": f"import source_github.github_schema; {MAX_RSS_SCRIPT}",
+}
+
+
+@pytest.mark.skipif(not os.getenv("GITHUB_IMPORT_TIME_BENCHMARK"), reason="The benchmark is enabled with `GITHUB_IMPORT_TIME_BENCHMARK=1`")
+@pytest.mark.parametrize("command_name", COMMANDS)
+def test_import_time(command_name, capsys):
+    durations, max_rss_kilobytes = [], []
+    for _ in range(BENCHMARK_RUNS):
+        started_at = time.perf_counter()
+        output = subprocess.check_output([sys.executable, "-c", COMMANDS[command_name]], text=True)
+        durations.append(time.perf_counter() - started_at)
+        max_rss_kilobytes.append(int(output.split()[-1]))
+
+    with capsys.disabled():
+        print(
+            f"\n{command_name}: {statistics.median(durations):.2f}s median over {BENCHMARK_RUNS} runs, "
+            f"{statistics.median(max_rss_kilobytes) / 1024:.0f}MB max RSS"
+        )
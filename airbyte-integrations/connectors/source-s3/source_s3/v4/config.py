@@ -65,6 +65,17 @@ class Config(AbstractFileBasedSpec):
         order=5,
     )
 
+    listing_concurrency: int = Field(
+        title="Listing Concurrency",
+        default=1,
+        ge=1,
+        le=32,
+        description="The number of prefixes listed concurrently while looking for the files. Partitioned prefixes "
+        "(e.g. `year=*/month=*/`) are expanded to the leaf prefixes, which are then listed in parallel.",
+        order=7,
+        group="advanced",
+    )
+
     delivery_method: DeliverRecords | DeliverRawFiles = Field(
         title="Delivery Method",
         discriminator="delivery_type",
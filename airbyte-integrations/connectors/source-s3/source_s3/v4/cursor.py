@@ -4,7 +4,7 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any, MutableMapping
+from typing import Any, Dict, Iterable, Iterator, MutableMapping, Optional
 
 from airbyte_cdk.sources.file_based.config.file_based_stream_config import FileBasedStreamConfig
 from airbyte_cdk.sources.file_based.remote_file import RemoteFile
@@ -25,6 +25,8 @@ class Cursor(DefaultFileBasedCursor):
         super().__init__(stream_config)
         self._running_migration = False
         self._v3_migration_start_datetime = None
+        # the history datetimes parsed once per `get_files_to_sync` call, instead of once per listed file
+        self._history_datetimes: Optional[Dict[str, datetime]] = None
 
     def set_initial_state(self, value: StreamState) -> None:
         if self._is_legacy_state(value):
@@ -53,6 +55,16 @@ class Cursor(DefaultFileBasedCursor):
         else:
             return state
 
+    def get_files_to_sync(self, all_files: Iterable[RemoteFile], logger: logging.Logger) -> Iterator[RemoteFile]:
+        self._history_datetimes = {
+            uri: datetime.strptime(last_modified, DefaultFileBasedCursor.DATE_TIME_FORMAT)
+            for uri, last_modified in self._file_to_datetime_history.items()
+        }
+        try:
+            yield from super().get_files_to_sync(all_files, logger)
+        finally:
+            self._history_datetimes = None
+
     def _should_sync_file(self, file: RemoteFile, logger: logging.Logger) -> bool:
         """
         Never sync files earlier than the v3 migration start date. V3 purged the history from the state, so we assume all files were already synced
@@ -63,6 +75,14 @@ class Cursor(DefaultFileBasedCursor):
             return False
         elif self._running_migration:
             return True
+        elif self._history_datetimes is not None and file.uri in self._history_datetimes:
+            # the file is synced already, unless it has been modified since, same as the default logic
+            updated_at_from_history = self._history_datetimes[file.uri]
+            if file.last_modified < updated_at_from_history:
+                logger.warning(
+                    f"The file {file.uri}'s last modified date is older than the last time it was synced. This is unexpected. Skipping the file."
+                )
+            return file.last_modified > updated_at_from_history
         else:
             return super()._should_sync_file(file, logger)
 
@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import re
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Mapping, Optional
+
+import pytz
+from wcmatch.glob import GLOBSTAR, translate
+
+from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+
+
+class ListingFilter:
+    """
+    Precompiled filter of the objects listed from S3, applied in a single pass over each `list_objects_v2` page.
+
+    The globs are compiled into a single regular expression once, the start date is parsed once.
+    The cheap checks go first, so the objects that are going to be skipped are dropped before the `RemoteFile` is built:
+        - folders
+        - objects modified before the start date
+        - objects not matching the globs
+    The ZIP archives are always kept, since the files inside the archive are matched once the archive is expanded.
+    """
+
+    def __init__(self, globs: List[str], start_date: Optional[datetime] = None):
+        """
+        :param globs: The glob patterns of the stream, the object should match any of them.
+        :param start_date: The naive UTC datetime, the objects modified before it are skipped (optional).
+        """
+        self.globs = globs
+        self.start_date = start_date
+        self._start_date_utc = start_date.replace(tzinfo=pytz.utc) if start_date else None
+        # Use the GLOBSTAR flag to enable recursive ** matching, the same way `file_matches_globs` does
+        include_patterns, _ = translate(globs, flags=GLOBSTAR) if globs else ([], [])
+        self._globs_pattern = re.compile("|".join(f"(?:{pattern})" for pattern in include_patterns)) if include_patterns else None
+
+    def matches_globs(self, key: str) -> bool:
+        return bool(self._globs_pattern and self._globs_pattern.match(key))
+
+    def is_modified_after_start_date(self, last_modified: Optional[datetime]) -> bool:
+        """Returns True if given date higher or equal than start date or something is missing"""
+        if not (self.start_date and last_modified):
+            return True
+        if last_modified.tzinfo is None:
+            return last_modified >= self.start_date
+        return last_modified >= self._start_date_utc
+
+    def _is_listed_after_start_date(self, last_modified: Optional[datetime]) -> bool:
+        if self.start_date and last_modified and last_modified.tzinfo is None:
+            # the naive `LastModified` is converted the same way the `RemoteFile.last_modified` is
+            last_modified = last_modified.astimezone(pytz.utc)
+        return self.is_modified_after_start_date(last_modified)
+
+    def filter_page(self, contents: Iterable[Mapping[str, Any]]) -> Iterator[Mapping[str, Any]]:
+        """
+        Yields the listed objects, which could be synced.
+        """
+        for file in contents:
+            key = file["Key"]
+            if key.endswith("/"):
+                continue
+            if key.endswith(".zip"):
+                yield file
+            elif self._is_listed_after_start_date(file.get("LastModified")) and self.matches_globs(key):
+                yield file
+
+    def matches(self, remote_file: RemoteFile) -> bool:
+        """
+        Returns True if the file (e.g. the one inside the archive) matches the globs and the start date.
+        """
+        return self.is_modified_after_start_date(remote_file.last_modified) and self.matches_globs(remote_file.uri)
@@ -3,12 +3,18 @@
 #
 
 import logging
+import re
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import IOBase
 from os import getenv
 from os.path import basename, dirname
-from typing import Dict, Iterable, List, Optional, Set, Tuple, cast
+from queue import Full, Queue
+from threading import Event
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, cast
+from zipfile import ZipInfo
 
 import boto3.session
 import pendulum
@@ -29,11 +35,24 @@ from airbyte_cdk.sources.file_based.file_based_stream_reader import AbstractFile
 from airbyte_cdk.sources.file_based.file_record_data import FileRecordData
 from airbyte_cdk.sources.file_based.remote_file import RemoteFile
 from source_s3.v4.config import Config
-from source_s3.v4.zip_reader import DecompressedStream, RemoteFileInsideArchive, ZipContentReader, ZipFileHandler
+from source_s3.v4.listing_filter import ListingFilter
+from source_s3.v4.zip_reader import DecompressedStream, RemoteFileInsideArchive, ZipCentralDirectoryCache, ZipContentReader, ZipFileHandler
 
 
 AWS_EXTERNAL_ID = getenv("AWS_ASSUME_ROLE_EXTERNAL_ID")
 
+# the glob segment of the partitioned layout, e.g. `year=*`
+PARTITION_SEGMENT_PATTERN = re.compile(r"^[^*?\[\]{}!]+=\*$")
+GLOB_MAGIC_CHARS_PATTERN = re.compile(r"[*?\[{!]")
+# the listed files are handed over from the listing threads in batches
+LISTING_BATCH_SIZE = 1000
+# the number of batches each listing thread could buffer, before the files are consumed
+LISTING_QUEUE_SIZE = 4
+# the end of the prefix listing
+_LISTING_DONE = object()
+# the number of ZIP central directories fetched concurrently, per listed page
+ZIP_FETCH_CONCURRENCY = 8
+
 
 class SourceS3StreamReader(AbstractFileBasedStreamReader):
     FILE_SIZE_LIMIT = 1_500_000_000
@@ -41,6 +60,8 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
     def __init__(self):
         super().__init__()
         self._s3_client = None
+        self._zip_cache = ZipCentralDirectoryCache()
+        self._start_date: Optional[datetime] = None
 
     @property
     def config(self) -> Config:
@@ -59,6 +80,8 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
         """
         assert isinstance(value, Config)
         self._config = value
+        # parse the start date once, instead of once per listed object
+        self._start_date = pendulum.parse(value.start_date).naive() if value.start_date else None
 
     @property
     def s3_client(self) -> BaseClient:
@@ -133,22 +156,41 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
 
         return autorefresh_session.client("s3", **client_kv_args)
 
+    @property
+    def listing_concurrency(self) -> int:
+        return getattr(self.config, "listing_concurrency", 1) or 1
+
     def get_matching_files(self, globs: List[str], prefix: Optional[str], logger: logging.Logger) -> Iterable[RemoteFile]:
         """
         Get all files matching the specified glob patterns.
+
+        With the `listing_concurrency` > 1, the partitioned prefixes (e.g. `year=*/month=*/`) are expanded to the leaf prefixes,
+        which are listed concurrently. The files are yielded in the order of the prefixes, regardless of the concurrency.
         """
         s3 = self.s3_client
-        prefixes = [prefix] if prefix else self.get_prefixes_from_globs(globs)
+        listing_filter = ListingFilter(globs, self._start_date)
         seen = set()
         total_n_keys = 0
+        # the number of keys received from S3, per page
+        listed_keys: List[int] = []
+        start_time = time.time()
 
         try:
-            for current_prefix in prefixes if prefixes else [None]:
-                for remote_file in self._page(s3, globs, self.config.bucket, current_prefix, seen, logger):
-                    total_n_keys += 1
-                    yield remote_file
-
-            logger.info(f"Finished listing objects from S3. Found {total_n_keys} objects total ({len(seen)} unique objects).")
+            prefixes = [prefix] if prefix else self._get_listing_prefixes(s3, globs, logger)
+            for remote_file in self._list_prefixes(s3, listing_filter, prefixes, listed_keys, logger):
+                if remote_file.uri in seen:
+                    continue
+                seen.add(remote_file.uri)
+                total_n_keys += 1
+                yield remote_file
+
+            elapsed_time = time.time() - start_time
+            listing_rate = sum(listed_keys) / elapsed_time if elapsed_time > 0 else 0
+            logger.info(
+                f"Finished listing objects from S3. Found {total_n_keys} objects total ({len(seen)} unique objects). "
+                f"Listed {sum(listed_keys)} objects from {len(prefixes)} prefixes in {elapsed_time:,.2f} seconds "
+                f"({listing_rate:,.2f} objects per second)."
+            )
         except ClientError as exc:
             if exc.response["Error"]["Code"] == "NoSuchBucket":
                 raise CustomFileBasedException(
@@ -158,6 +200,124 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
         except Exception as exc:
             self._raise_error_listing_files(globs, exc)
 
+    def _get_listing_prefixes(self, s3: BaseClient, globs: List[str], logger: logging.Logger) -> List[Optional[str]]:
+        """
+        Returns the sorted prefixes to list the files from, `[None]` to list the whole bucket.
+        The partitioned prefixes are expanded to the leaf prefixes, when the prefixes are listed concurrently.
+        """
+        partitioned_globs = []
+        if self.listing_concurrency > 1:
+            partitioned_globs = [glob for glob in globs if any(PARTITION_SEGMENT_PATTERN.match(segment) for segment in glob.split("/"))]
+        prefixes = set(self.get_prefixes_from_globs([glob for glob in globs if glob not in partitioned_globs]))
+        if partitioned_globs:
+            with ThreadPoolExecutor(max_workers=self.listing_concurrency) as executor:
+                for glob in partitioned_globs:
+                    prefixes.update(self._expand_partitioned_prefixes(s3, glob, executor))
+            logger.info(f"Expanded the partitioned prefixes to {len(prefixes)} prefixes.")
+        elif not prefixes:
+            return [None]
+        # the nested prefixes are covered by the parent ones, which go right before them once sorted
+        listing_prefixes = []
+        for current_prefix in sorted(prefixes):
+            if not listing_prefixes or not current_prefix.startswith(listing_prefixes[-1]):
+                listing_prefixes.append(current_prefix)
+        return listing_prefixes
+
+    def _expand_partitioned_prefixes(self, s3: BaseClient, glob: str, executor: ThreadPoolExecutor) -> List[str]:
+        """
+        Expands the partition segments of the glob (e.g. `data/year=*/month=*/*.csv`) to the existing prefixes
+        (e.g. `data/year=2024/month=01/`), using the delimiter-based listing. The expansion stops at the first segment,
+        which is neither static, nor the partition one.
+        """
+        prefixes = [""]
+        *directories, file_name = glob.split("/")
+        for segment in directories:
+            if PARTITION_SEGMENT_PATTERN.match(segment):
+                partition_prefixes = executor.map(lambda parent: self._list_common_prefixes(s3, parent + segment[:-1]), prefixes)
+                prefixes = [partition_prefix for common_prefixes in partition_prefixes for partition_prefix in common_prefixes]
+            elif GLOB_MAGIC_CHARS_PATTERN.search(segment):
+                return [parent + GLOB_MAGIC_CHARS_PATTERN.split(segment)[0] for parent in prefixes]
+            else:
+                prefixes = [f"{parent}{segment}/" for parent in prefixes]
+        return [parent + GLOB_MAGIC_CHARS_PATTERN.split(file_name)[0] for parent in prefixes]
+
+    def _list_common_prefixes(self, s3: BaseClient, prefix: str) -> List[str]:
+        common_prefixes = []
+        kwargs = {"Bucket": self.config.bucket, "Prefix": prefix, "Delimiter": "/"}
+        while True:
+            response = s3.list_objects_v2(**kwargs)
+            common_prefixes.extend(common_prefix["Prefix"] for common_prefix in response.get("CommonPrefixes", []))
+            if next_token := response.get("NextContinuationToken"):
+                kwargs["ContinuationToken"] = next_token
+            else:
+                return common_prefixes
+
+    def _list_prefixes(
+        self,
+        s3: BaseClient,
+        listing_filter: ListingFilter,
+        prefixes: List[Optional[str]],
+        listed_keys: List[int],
+        logger: logging.Logger,
+    ) -> Iterable[RemoteFile]:
+        """
+        Lists the prefixes one after another, or using up to `listing_concurrency` threads.
+        """
+        if self.listing_concurrency == 1 or len(prefixes) == 1:
+            for current_prefix in prefixes:
+                yield from self._page(s3, listing_filter, self.config.bucket, current_prefix, listed_keys, logger)
+            return
+
+        stopped = Event()
+
+        def put(queue: Queue, item) -> bool:
+            while not stopped.is_set():
+                try:
+                    queue.put(item, timeout=1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def list_prefix(current_prefix: Optional[str], queue: Queue) -> None:
+            try:
+                batch = []
+                for remote_file in self._page(s3, listing_filter, self.config.bucket, current_prefix, listed_keys, logger):
+                    batch.append(remote_file)
+                    if len(batch) >= LISTING_BATCH_SIZE:
+                        if not put(queue, batch):
+                            # the files are not consumed anymore
+                            return
+                        batch = []
+                if put(queue, batch):
+                    put(queue, _LISTING_DONE)
+            except Exception as exc:
+                put(queue, exc)
+
+        def drain(queue: Queue) -> Iterator[RemoteFile]:
+            while True:
+                item = queue.get()
+                if item is _LISTING_DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield from item
+
+        # up to `listing_concurrency` prefixes are listed ahead, the files are consumed in the order of the prefixes
+        queues = deque()
+        with ThreadPoolExecutor(max_workers=self.listing_concurrency, thread_name_prefix="s3-listing") as executor:
+            try:
+                for current_prefix in prefixes:
+                    queue = Queue(maxsize=LISTING_QUEUE_SIZE)
+                    executor.submit(list_prefix, current_prefix, queue)
+                    queues.append(queue)
+                    if len(queues) == self.listing_concurrency:
+                        yield from drain(queues.popleft())
+                while queues:
+                    yield from drain(queues.popleft())
+            finally:
+                stopped.set()
+
     def _raise_error_listing_files(self, globs: List[str], exc: Optional[Exception] = None):
         """Helper method to raise the ErrorListingFiles exception."""
         raise ErrorListingFiles(
@@ -303,10 +463,18 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
         return file["Key"].endswith("/")
 
     def _page(
-        self, s3: BaseClient, globs: List[str], bucket: str, prefix: Optional[str], seen: Set[str], logger: logging.Logger
+        self,
+        s3: BaseClient,
+        listing_filter: ListingFilter,
+        bucket: str,
+        prefix: Optional[str],
+        listed_keys: List[int],
+        logger: logging.Logger,
     ) -> Iterable[RemoteFile]:
         """
         Page through lists of S3 objects.
+        The objects, which are going to be skipped, are dropped by the `listing_filter` in a single pass over each page.
+        The files are de-duplicated by the caller, since the prefixes could be listed concurrently.
         """
         total_n_keys_for_prefix = 0
         kwargs = {"Bucket": bucket}
@@ -314,20 +482,20 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
             response = s3.list_objects_v2(Prefix=prefix, **kwargs) if prefix else s3.list_objects_v2(**kwargs)
             key_count = response.get("KeyCount")
             total_n_keys_for_prefix += key_count
+            listed_keys.append(key_count)
             logger.info(f"Received {key_count} objects from S3 for prefix '{prefix}'.")
 
             if "Contents" in response:
-                for file in response["Contents"]:
-                    if self._is_folder(file):
+                files = list(listing_filter.filter_page(response["Contents"]))
+                zip_files = self._get_zip_files(files)
+                for file in files:
+                    if not file["Key"].endswith(".zip"):
+                        # the regular file is matched by the `listing_filter` already
+                        yield self._handle_regular_file(file)
                         continue
 
-                    for remote_file in self._handle_file(file):
-                        if (
-                            self.file_matches_globs(remote_file, globs)
-                            and self.is_modified_after_start_date(remote_file.last_modified)
-                            and remote_file.uri not in seen
-                        ):
-                            seen.add(remote_file.uri)
+                    for remote_file in self._handle_zip_file(file, zip_files.get(file["Key"])):
+                        if listing_filter.matches(remote_file):
                             yield remote_file
             else:
                 logger.warning(f"Invalid response from S3; missing 'Contents' key. kwargs={kwargs}.")
@@ -340,19 +508,37 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
 
     def is_modified_after_start_date(self, last_modified_date: Optional[datetime]) -> bool:
         """Returns True if given date higher or equal than start date or something is missing"""
-        if not (self.config.start_date and last_modified_date):
+        if not (self._start_date and last_modified_date):
             return True
-        return last_modified_date >= pendulum.parse(self.config.start_date).naive()
+        return last_modified_date >= self._start_date
 
-    def _handle_file(self, file):
+    def _handle_file(self, file, zip_files: Optional[Tuple[List[ZipInfo], int]] = None):
         if file["Key"].endswith(".zip"):
-            yield from self._handle_zip_file(file)
+            yield from self._handle_zip_file(file, zip_files)
         else:
             yield self._handle_regular_file(file)
 
-    def _handle_zip_file(self, file):
-        zip_handler = ZipFileHandler(self.s3_client, self.config)
-        zip_members, cd_start = zip_handler.get_zip_files(file["Key"])
+    @property
+    def zip_handler(self) -> ZipFileHandler:
+        return ZipFileHandler(self.s3_client, self.config, self._zip_cache)
+
+    def _get_zip_files(self, files: List[dict]) -> Dict[str, Tuple[List[ZipInfo], int]]:
+        """
+        Fetch the central directories of the listed ZIP archives concurrently.
+        """
+        zip_files = [file for file in files if file["Key"].endswith(".zip")]
+        if len(zip_files) <= 1:
+            # nothing to fetch concurrently, the archive is handled on it's own
+            return {}
+        zip_handler = self.zip_handler
+        with ThreadPoolExecutor(max_workers=ZIP_FETCH_CONCURRENCY, thread_name_prefix="s3-zip") as executor:
+            results = executor.map(lambda file: zip_handler.get_zip_files(file["Key"], file.get("ETag"), file.get("Size")), zip_files)
+            return {file["Key"]: result for file, result in zip(zip_files, results)}
+
+    def _handle_zip_file(self, file, zip_files: Optional[Tuple[List[ZipInfo], int]] = None):
+        if zip_files is None:
+            zip_files = self.zip_handler.get_zip_files(file["Key"], file.get("ETag"), file.get("Size"))
+        zip_members, cd_start = zip_files
 
         for zip_member in zip_members:
             remote_file = RemoteFileInsideArchive(
@@ -1,9 +1,14 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 
+import hashlib
 import io
+import os
+import re
 import struct
+import tempfile
 import zipfile
-from typing import IO, List, Optional, Tuple, Union
+from threading import Lock
+from typing import IO, Dict, List, Optional, Tuple, Union
 
 from botocore.client import BaseClient
 
@@ -15,6 +20,17 @@ from source_s3.v4.config import Config
 BUFFER_SIZE_DEFAULT = 1024 * 1024
 MAX_BUFFER_SIZE_DEFAULT: int = 16 * BUFFER_SIZE_DEFAULT
 
+# Decompressor checkpoints are taken every `CHECKPOINT_INTERVAL_DEFAULT` bytes of the uncompressed data
+CHECKPOINT_INTERVAL_DEFAULT: int = 32 * BUFFER_SIZE_DEFAULT
+# Matches any line ending character, to find the end of line in the buffered data
+NEWLINE_PATTERN = re.compile(rb"[\r\n]")
+
+# Central directory cache constants
+# The temporary directory of the container is discarded once the sync is over, so by default the cache lives for a single sync
+ZIP_CACHE_DIR_DEFAULT = os.getenv("S3_ZIP_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "source-s3-zip-cache")
+ZIP_CACHE_MAX_BYTES_DEFAULT: int = 512 * BUFFER_SIZE_DEFAULT
+ZIP_CACHE_MAX_ENTRIES_DEFAULT: int = 10_000
+
 
 class RemoteFileInsideArchive(RemoteFile):
     """
@@ -27,6 +43,117 @@ class RemoteFileInsideArchive(RemoteFile):
     compression_method: int
 
 
+class ZipCentralDirectoryCache:
+    """
+    On-disk LRU cache of the ZIP central directories, keyed by the archive key, ETag and size.
+
+    The archive is immutable for the given ETag and size, so the cached central directory stays valid
+    for as long as the archive is not changed. Only the listing of the archives uses the cache: the files inside
+    the archive are read at the offsets found by the listing, without the central directory. So the cache spares
+    the fetch of the central directory when the same archive is listed again. It is kept across the syncs only if `S3_ZIP_CACHE_DIR`
+    points to the storage that outlives the container, which is not the case for the syncs run by the platform.
+    The least recently used entries are evicted once `max_entries` or `max_bytes` is exceeded.
+    """
+
+    HEADER_FORMAT: str = "<Q"
+
+    def __init__(
+        self,
+        cache_dir: str = ZIP_CACHE_DIR_DEFAULT,
+        max_entries: int = ZIP_CACHE_MAX_ENTRIES_DEFAULT,
+        max_bytes: int = ZIP_CACHE_MAX_BYTES_DEFAULT,
+    ):
+        """
+        Initialize the ZipCentralDirectoryCache.
+
+        :param cache_dir: The directory to keep the cached central directories in.
+        :param max_entries: The max number of the cached central directories.
+        :param max_bytes: The max total size of the cached central directories.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        # entry file name > (last access time, size), loaded from the cache directory on the first use
+        self._entries: Optional[Dict[str, Tuple[float, int]]] = None
+
+    @staticmethod
+    def _entry_name(bucket: str, key: str, etag: str, size: int) -> str:
+        return hashlib.sha256(f"{bucket}/{key}:{etag}:{size}".encode()).hexdigest()
+
+    def _load_entries(self) -> Dict[str, Tuple[float, int]]:
+        if self._entries is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._entries = {}
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    self._entries[entry.name] = (stat.st_mtime, stat.st_size)
+        return self._entries
+
+    def get(self, bucket: str, key: str, etag: str, size: int) -> Optional[Tuple[bytes, int]]:
+        """
+        Return the cached central directory data and it's starting position in the archive, or None if it's not cached.
+        """
+        name = self._entry_name(bucket, key, etag, size)
+        path = os.path.join(self.cache_dir, name)
+        try:
+            with self._lock:
+                entries = self._load_entries()
+                if name not in entries:
+                    return None
+                with open(path, "rb") as entry:
+                    data = entry.read()
+                try:
+                    (central_dir_start,) = struct.unpack_from(self.HEADER_FORMAT, data)
+                except struct.error:
+                    # the truncated or corrupted entry is dropped, the central directory is fetched again
+                    os.remove(path)
+                    entries.pop(name)
+                    return None
+                # mark the entry as recently used
+                os.utime(path)
+                entries[name] = (os.path.getmtime(path), len(data))
+        except OSError:
+            return None
+        return data[struct.calcsize(self.HEADER_FORMAT) :], central_dir_start
+
+    def put(self, bucket: str, key: str, etag: str, size: int, central_dir_data: bytes, central_dir_start: int) -> None:
+        """
+        Cache the central directory data of the archive, evicting the least recently used entries if needed.
+        """
+        name = self._entry_name(bucket, key, etag, size)
+        path = os.path.join(self.cache_dir, name)
+        data = struct.pack(self.HEADER_FORMAT, central_dir_start) + central_dir_data
+        if len(data) > self.max_bytes:
+            return
+        try:
+            with self._lock:
+                entries = self._load_entries()
+                # write to the temporary file first, so the concurrent readers never see the partial entry
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as entry:
+                    entry.write(data)
+                os.replace(tmp_path, path)
+                entries[name] = (os.path.getmtime(path), len(data))
+                self._evict(entries)
+        except OSError:
+            # the cache is the optimization only, the central directory is fetched again next time
+            pass
+
+    def _evict(self, entries: Dict[str, Tuple[float, int]]) -> None:
+        total_bytes = sum(entry_size for _, entry_size in entries.values())
+        for name, (_, entry_size) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if len(entries) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            entries.pop(name)
+            total_bytes -= entry_size
+
+
 class ZipFileHandler:
     """
     Handler class for extracting information from ZIP files stored in AWS S3.
@@ -44,15 +171,17 @@ class ZipFileHandler:
     ZIP64_EOCD_SIZE: int = 56
     ZIP64_CENTRAL_DIR_START_OFFSET: int = 48
 
-    def __init__(self, s3_client: BaseClient, config: Config):
+    def __init__(self, s3_client: BaseClient, config: Config, cache: Optional[ZipCentralDirectoryCache] = None):
         """
         Initialize the ZipFileHandler with an S3 client and configuration.
 
         :param s3_client: The AWS S3 client.
         :param config: Configuration containing bucket and other details.
+        :param cache: The cache of the central directories (optional).
         """
         self.s3_client = s3_client
         self.config = config
+        self.cache = cache
 
     def _fetch_data_from_s3(self, filename: str, start: int, size: Optional[int] = None) -> bytes:
         """
@@ -74,6 +203,7 @@ class ZipFileHandler:
         signature: bytes,
         initial_buffer_size: int = BUFFER_SIZE_DEFAULT,
         max_buffer_size: int = MAX_BUFFER_SIZE_DEFAULT,
+        file_size: Optional[int] = None,
     ) -> Optional[bytes]:
         """
         Search for a specific signature in the file by checking chunks of increasing size.
@@ -83,10 +213,12 @@ class ZipFileHandler:
         :param signature: The byte signature to search for.
         :param initial_buffer_size: Initial size of the buffer to search in.
         :param max_buffer_size: Maximum size of the buffer to search in.
+        :param file_size: The size of the file, if known from the listing (optional).
         :return: The chunk of data containing the signature or None if not found.
         """
         buffer_size = initial_buffer_size
-        file_size = self.s3_client.head_object(Bucket=self.config.bucket, Key=filename)["ContentLength"]
+        if file_size is None:
+            file_size = self.s3_client.head_object(Bucket=self.config.bucket, Key=filename)["ContentLength"]
 
         while buffer_size <= max_buffer_size:
             chunk = self._fetch_data_from_s3(filename, file_size - buffer_size)
@@ -96,45 +228,59 @@ class ZipFileHandler:
             buffer_size *= 2
         return None
 
-    def _fetch_zip64_data(self, filename: str) -> bytes:
+    def _fetch_zip64_data(self, filename: str, file_size: Optional[int] = None) -> bytes:
         """
         Fetch the ZIP64 End of Central Directory (EOCD) data from a ZIP file.
 
         :param filename: The name of the file in S3.
+        :param file_size: The size of the file, if known from the listing (optional).
         :return: The ZIP64 EOCD data.
         """
-        chunk = self._find_signature(filename, self.ZIP64_LOCATOR_SIGNATURE)
+        chunk = self._find_signature(filename, self.ZIP64_LOCATOR_SIGNATURE, file_size=file_size)
         zip64_eocd_offset = struct.unpack_from("<Q", chunk, self.ZIP64_EOCD_OFFSET)[0]
         return self._fetch_data_from_s3(filename, zip64_eocd_offset, self.ZIP64_EOCD_SIZE)
 
-    def _get_central_directory_start(self, filename: str) -> int:
+    def _get_central_directory_start(self, filename: str, file_size: Optional[int] = None) -> int:
         """
         Determine the starting position of the central directory in the ZIP file.
         Adjusts for ZIP64 format if necessary.
 
         :param filename: The name of the file in S3.
+        :param file_size: The size of the file, if known from the listing (optional).
         :return: The starting position of the central directory.
         """
-        eocd_data = self._find_signature(filename, self.EOCD_SIGNATURE)
+        eocd_data = self._find_signature(filename, self.EOCD_SIGNATURE, file_size=file_size)
         central_dir_start = struct.unpack_from("<L", eocd_data, self.EOCD_CENTRAL_DIR_START_OFFSET)[0]
 
         # Check for ZIP64 format and adjust offsets if necessary
         if central_dir_start == 0xFFFFFFFF:
-            zip64_data = self._fetch_zip64_data(filename)
+            zip64_data = self._fetch_zip64_data(filename, file_size)
             central_dir_start = struct.unpack_from("<Q", zip64_data, self.ZIP64_CENTRAL_DIR_START_OFFSET)[0]
 
         return central_dir_start
 
-    def get_zip_files(self, filename: str) -> Tuple[List[zipfile.ZipInfo], int]:
+    def get_zip_files(
+        self, filename: str, etag: Optional[str] = None, file_size: Optional[int] = None
+    ) -> Tuple[List[zipfile.ZipInfo], int]:
         """
         Extract metadata about the files inside a ZIP archive stored in S3.
+        The central directory is cached, when the ETag and the size of the archive are known from the listing.
 
         :param filename: The name of the ZIP file in S3.
+        :param etag: The ETag of the ZIP file (optional).
+        :param file_size: The size of the ZIP file (optional).
         :return: A tuple containing a list of ZipInfo objects representing the files inside the ZIP archive
                  and the starting position of the central directory.
         """
-        central_dir_start = self._get_central_directory_start(filename)
-        central_dir_data = self._fetch_data_from_s3(filename, central_dir_start)
+        cacheable = self.cache is not None and etag is not None and file_size is not None
+        cached = self.cache.get(self.config.bucket, filename, etag, file_size) if cacheable else None
+        if cached:
+            central_dir_data, central_dir_start = cached
+        else:
+            central_dir_start = self._get_central_directory_start(filename, file_size)
+            central_dir_data = self._fetch_data_from_s3(filename, central_dir_start)
+            if cacheable:
+                self.cache.put(self.config.bucket, filename, etag, file_size, central_dir_data, central_dir_start)
 
         with io.BytesIO(central_dir_data) as bytes_io:
             with zipfile.ZipFile(bytes_io, "r") as zf:
@@ -145,18 +291,30 @@ class DecompressedStream(io.IOBase):
     """
     A custom stream class that handles decompression of data from a given file object.
     This class supports seeking, reading, and other basic file operations on compressed data.
+
+    The decompressed data is buffered and consumed by moving the read position within the buffer,
+    so the small reads don't copy the rest of the buffer. While reading the deflated data, the decompressor
+    state is checkpointed every `checkpoint_interval` bytes, so seeking resumes from the closest checkpoint
+    instead of decompressing from the start of the file.
     """
 
     LOCAL_FILE_HEADER_SIZE: int = 30
     NAME_LENGTH_OFFSET: int = 26
 
-    def __init__(self, file_obj: IO[bytes], file_info: RemoteFileInsideArchive, buffer_size: int = BUFFER_SIZE_DEFAULT):
+    def __init__(
+        self,
+        file_obj: IO[bytes],
+        file_info: RemoteFileInsideArchive,
+        buffer_size: int = BUFFER_SIZE_DEFAULT,
+        checkpoint_interval: int = CHECKPOINT_INTERVAL_DEFAULT,
+    ):
         """
         Initialize a DecompressedStream.
 
         :param file_obj: Underlying file-like object.
         :param file_info: Meta information about the file inside the archive.
         :param buffer_size: Size of the buffer for reading data.
+        :param checkpoint_interval: Number of uncompressed bytes between the decompressor checkpoints.
         """
         self._file = file_obj
         self.file_start = self._calculate_actual_start(file_info.start_offset)
@@ -164,12 +322,16 @@ class DecompressedStream(io.IOBase):
         self.uncompressed_size = file_info.uncompressed_size
         self.compression_method = file_info.compression_method
         self._buffer = bytearray()
+        self._buffer_position = 0  # Read position within the buffer, the data before it is consumed
         self.buffer_size = buffer_size
+        self.checkpoint_interval = checkpoint_interval
         self._reset_decompressor()
         self.position = 0  # Current position in uncompressed stream
+        self._decompressed_offset = 0  # Uncompressed offset of the data decompressed so far, including the buffered data
+        self._compressed_position = self.file_start  # Position in the underlying file
         self._file.seek(self.file_start)
-        # Mapping between uncompressed and compressed offsets for quick seeking
-        self.offset_map = {0: self.file_start, self.uncompressed_size: self.file_start + self.compressed_size}
+        # Mapping between uncompressed offsets and compressed offsets along with the decompressor state for quick seeking
+        self.offset_map: Dict[int, Tuple[int, Optional[object]]] = {0: (self.file_start, None)}
 
     def _calculate_actual_start(self, file_start: int) -> int:
         """
@@ -204,50 +366,83 @@ class DecompressedStream(io.IOBase):
             return chunk
         return self.decompressor.decompress(chunk)
 
-    def read(self, size: int = -1) -> bytes:
+    @property
+    def _buffered(self) -> int:
         """
-        Read a specified number of bytes from the stream.
+        Return the number of buffered bytes, which are not consumed yet.
         """
-        # Size not specified, read till end
-        if size == -1:
-            size = self.uncompressed_size - self.position
+        return len(self._buffer) - self._buffer_position
 
-        # If buffer already has enough data, return it directly
-        if size <= len(self._buffer):
-            data = self._buffer[:size]
-            self._buffer = self._buffer[size:]
-            self.position += len(data)
-            return data
+    def _checkpoint(self) -> None:
+        """
+        Save the decompressor state for the current offsets, if the decompressor supports copying (e.g. deflate).
+        """
+        last_checkpoint = max(self.offset_map)
+        if self._decompressed_offset - last_checkpoint >= self.checkpoint_interval and hasattr(self.decompressor, "copy"):
+            self.offset_map[self._decompressed_offset] = (self._compressed_position, self.decompressor.copy())
 
-        data = self._buffer
-        self._buffer = bytearray()
-        while len(data) < size and self._file.tell() - self.file_start < self.compressed_size:
-            max_read_size = min(self.buffer_size, self.compressed_size + self.file_start - self._file.tell())
-            chunk = self._file.read(max_read_size)
+    def _fill_buffer(self) -> bool:
+        """
+        Decompress the next chunk of data into the buffer.
 
-            if not chunk:
-                break
+        :return: False if there is no more data to decompress.
+        """
+        remaining_size = self.file_start + self.compressed_size - self._compressed_position
+        if remaining_size <= 0:
+            return False
+        chunk = self._file.read(min(self.buffer_size, remaining_size))
+        if not chunk:
+            return False
+        self._compressed_position += len(chunk)
+        decompressed_data = self._decompress_chunk(chunk)
+        self._decompressed_offset += len(decompressed_data)
+        if self.compression_method != zipfile.ZIP_STORED:
+            self._checkpoint()
 
-            decompressed_data = self._decompress_chunk(chunk)
+        # drop the consumed data, once per chunk
+        if self._buffer_position:
+            del self._buffer[: self._buffer_position]
+            self._buffer_position = 0
+        self._buffer += decompressed_data
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read a specified number of bytes from the stream.
+        """
+        # Size not specified, read till end
+        if size is None or size < 0:
+            size = self.uncompressed_size - self.position
 
-            # Buffer excessive data for future reads
-            if len(data) + len(decompressed_data) > size:
-                desired_length = size - len(data)
-                data += decompressed_data[:desired_length]
-                self._buffer = decompressed_data[desired_length:]
-            else:
-                data += decompressed_data
+        while self._buffered < size and self._fill_buffer():
+            pass
 
+        end = min(self._buffer_position + size, len(self._buffer))
+        data = bytes(memoryview(self._buffer)[self._buffer_position : end])
+        self._buffer_position = end
         self.position += len(data)
         return data
 
+    def _restore(self, uncompressed_offset: int, compressed_offset: int, decompressor_state: Optional[object]) -> None:
+        """
+        Restore the stream state to the given offsets, the buffered data is dropped.
+        """
+        self._file.seek(compressed_offset)
+        self._compressed_position = compressed_offset
+        if decompressor_state is None:
+            self._reset_decompressor()
+        else:
+            # the checkpoint could be used again, so the copy of the saved state is used
+            self.decompressor = decompressor_state.copy()
+        self._buffer = bytearray()
+        self._buffer_position = 0
+        self.position = self._decompressed_offset = uncompressed_offset
+
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
         """
         Seek to a specific position in the uncompressed stream.
         """
-        if whence == io.SEEK_SET:
-            self._buffer = bytearray()
-        elif whence == io.SEEK_CUR:
+        if whence == io.SEEK_CUR:
             offset = self.position + offset
         elif whence == io.SEEK_END:
             offset = self.uncompressed_size + offset
@@ -255,17 +450,26 @@ class DecompressedStream(io.IOBase):
         # Ensure the offset is within the file's boundaries
         offset = max(0, min(offset, self.uncompressed_size))
 
-        closest_offset = max(k for k in self.offset_map if k <= offset)
-        closest_position = self.offset_map[closest_offset]
+        # The offset is within the buffered data
+        buffer_start = self.position - self._buffer_position
+        if buffer_start <= offset <= self.position + self._buffered:
+            self._buffer_position = offset - buffer_start
+            self.position = offset
+            return self.position
 
-        self._file.seek(closest_position)
-        self._reset_decompressor()
-        self.position = closest_offset
+        if self.compression_method == zipfile.ZIP_STORED:
+            # The offsets are the same for the stored data
+            self._restore(offset, self.file_start + offset, None)
+        else:
+            closest_offset = max(k for k in self.offset_map if k <= offset)
+            # Reading forward from the current position is not slower, than from the closest checkpoint
+            if not closest_offset <= self.position <= offset:
+                self._restore(closest_offset, *self.offset_map[closest_offset])
 
         # Read till desired offset
         while self.position < offset:
-            read_size = min(self.buffer_size, offset - self.position)
-            self.read(read_size)
+            if not self.read(min(self.buffer_size, offset - self.position)):
+                break
 
         return self.position
 
@@ -312,6 +516,7 @@ class ZipContentReader:
         self.encoding = encoding
         self.buffer_size = buffer_size
         self.buffer = bytearray()
+        self._buffer_position = 0  # Read position within the buffer, the data before it is consumed
         self._closed = False
 
     def __iter__(self):
@@ -329,6 +534,31 @@ class ZipContentReader:
             raise StopIteration
         return line
 
+    def _fill_buffer(self) -> bool:
+        """
+        Read the next chunk from the decompressed stream into the buffer.
+
+        :return: False if the stream is exhausted.
+        """
+        chunk = self.raw.read(self.buffer_size)
+        if not chunk:
+            return False
+        # drop the consumed data, once per chunk
+        if self._buffer_position:
+            del self.buffer[: self._buffer_position]
+            self._buffer_position = 0
+        self.buffer += chunk
+        return True
+
+    def _consume(self, size: int) -> Union[str, bytes]:
+        """
+        Consume the specified number of the buffered bytes.
+        """
+        end = min(self._buffer_position + size, len(self.buffer))
+        data = bytes(memoryview(self.buffer)[self._buffer_position : end])
+        self._buffer_position = end
+        return data.decode(self.encoding) if self.encoding else data
+
     def readline(self, limit: int = -1) -> Union[str, bytes]:
         """
         Read a single line from the stream.
@@ -336,43 +566,52 @@ class ZipContentReader:
         if limit != -1:
             raise NotImplementedError("Limits other than -1 not implemented yet")
 
-        line = ""
+        # the number of buffered bytes checked for the line ending so far
+        scanned = 0
         while True:
-            char = self.read(1)
-            if not char:
-                break
-
-            line += char
-            if char in ["\n", "\r"]:
+            match = NEWLINE_PATTERN.search(self.buffer, self._buffer_position + scanned)
+            if not match:
+                scanned = len(self.buffer) - self._buffer_position
+                if not self._fill_buffer():
+                    return self._consume(scanned)
+                continue
+
+            line_size = match.end() - self._buffer_position
+            if match.group() == b"\r":
                 # Handling different types of newlines
-                next_char = self.read(1)
-                if char == "\r" and next_char == "\n":
-                    line += next_char
-                else:
-                    self.buffer = next_char.encode(self.encoding) + self.buffer
-                break
-        return line
+                if match.end() == len(self.buffer):
+                    # the next chunk could start with "\n"
+                    scanned = line_size - 1
+                    if self._fill_buffer():
+                        continue
+                elif self.buffer[match.end()] == ord("\n"):
+                    line_size += 1
+            return self._consume(line_size)
 
     def read(self, size: int = -1) -> Union[str, bytes]:
         """
         Read a specified number of bytes/characters from the reader.
         """
-        while len(self.buffer) < size:
-            chunk = self.raw.read(self.buffer_size)
-            if not chunk:
-                break
-            self.buffer += chunk
+        if size is None or size < 0:
+            while self._fill_buffer():
+                pass
+            size = len(self.buffer) - self._buffer_position
 
-        data = self.buffer[:size]
-        self.buffer = self.buffer[size:]
+        while len(self.buffer) - self._buffer_position < size:
+            if not self._fill_buffer():
+                break
 
-        return data.decode(self.encoding) if self.encoding else bytes(data)
+        return self._consume(size)
 
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
         """
         Seek to a specific position in the decompressed stream.
         """
+        if whence == io.SEEK_CUR:
+            # the buffered data is read from the decompressed stream already
+            offset, whence = self.tell() + offset, io.SEEK_SET
         self.buffer = bytearray()
+        self._buffer_position = 0
         return self.raw.seek(offset, whence)
 
     def close(self):
@@ -386,7 +625,7 @@ class ZipContentReader:
         """
         Return the current position in the decompressed stream.
         """
-        return self.raw.tell()
+        return self.raw.tell() - (len(self.buffer) - self._buffer_position)
 
     @property
     def closed(self) -> bool:
@@ -490,3 +490,23 @@ def _init_cursor_with_state(input_state, max_history_size: Optional[int] = None)
     if max_history_size is not None:
         cursor.DEFAULT_MAX_HISTORY_SIZE = max_history_size
     return cursor
+
+
+def test_get_files_to_sync_parses_history_once(mocker) -> None:
+    cursor = _init_cursor_with_state(
+        {
+            "history": {"file1.txt": "2023-08-01T00:00:00.000000Z", "file2.txt": "2023-08-01T00:00:00.000000Z"},
+            "_ab_source_file_last_modified": "2023-08-01T00:00:00.000000Z_file2.txt",
+        },
+        10,
+    )
+    all_files = [
+        RemoteFile(uri="file1.txt", last_modified=_create_datetime("2023-08-01T00:00:00.000000Z")),
+        RemoteFile(uri="file2.txt", last_modified=_create_datetime("2023-08-02T00:00:00.000000Z")),
+        RemoteFile(uri="file3.txt", last_modified=_create_datetime("2023-07-01T00:00:00.000000Z")),
+    ]
+    default_should_sync_file = mocker.spy(DefaultFileBasedCursor, "_should_sync_file")
+    files_to_sync = list(cursor.get_files_to_sync(all_files, Mock()))
+    assert [file.uri for file in files_to_sync] == ["file2.txt", "file3.txt"]
+    # the files from the history are checked against the parsed history
+    assert [call.args[1].uri for call in default_should_sync_file.call_args_list] == ["file3.txt"]
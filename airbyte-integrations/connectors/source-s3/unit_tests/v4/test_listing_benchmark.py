@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+"""
+The benchmark for listing the objects with `SourceS3StreamReader.get_matching_files()`, using the local stub S3 client.
+
+Skipped by default, to run:
+    S3_LISTING_BENCHMARK=1 pytest -s unit_tests/v4/test_listing_benchmark.py
+
+The number of the listed objects could be overridden with `S3_LISTING_BENCHMARK_OBJECTS` (default: 5_000_000).
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import PropertyMock, patch
+
+import pytest
+from source_s3.v4.config import Config
+from source_s3.v4.stream_reader import SourceS3StreamReader
+
+
+BENCHMARK_OBJECTS: int = int(os.getenv("S3_LISTING_BENCHMARK_OBJECTS", 5_000_000))
+PAGE_SIZE: int = 1000
+# every 10th object is modified after the start date and every 2nd one matches the globs
+START_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class StubS3Client:
+    """
+    Generates the `list_objects_v2` pages on the fly, without keeping the objects in memory.
+    """
+
+    def __init__(self, objects: int):
+        self.objects = objects
+        self.old = START_DATE - timedelta(days=1)
+        self.new = START_DATE + timedelta(days=1)
+
+    def list_objects_v2(self, Bucket: str, ContinuationToken: str = "0", **kwargs):
+        start = int(ContinuationToken)
+        end = min(start + PAGE_SIZE, self.objects)
+        contents = [
+            {
+                "Key": f"data/{index // 100_000}/{index}.{'csv' if index % 2 else 'json'}",
+                "LastModified": self.new if index % 10 in (0, 1) else self.old,
+                "Size": 1024,
+            }
+            for index in range(start, end)
+        ]
+        response = {"Contents": contents, "KeyCount": len(contents)}
+        if end < self.objects:
+            response["NextContinuationToken"] = str(end)
+        return response
+
+
+@pytest.mark.skipif(not os.getenv("S3_LISTING_BENCHMARK"), reason="The benchmark is enabled with `S3_LISTING_BENCHMARK=1`")
+def test_listing_objects_per_second() -> None:
+    reader = SourceS3StreamReader()
+    reader.config = Config(
+        bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[], start_date="2024-01-01T00:00:00.000000Z"
+    )
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=PropertyMock, return_value=StubS3Client(BENCHMARK_OBJECTS)):
+        start = time.perf_counter()
+        files = sum(1 for _ in reader.get_matching_files(["**/*.csv"], None, logging.getLogger("benchmark")))
+        elapsed = time.perf_counter() - start
+
+    assert files == BENCHMARK_OBJECTS // 10
+    print(
+        f"\nS3 listing: {BENCHMARK_OBJECTS} objects, {files} files matched in {elapsed:.2f}s, {BENCHMARK_OBJECTS / elapsed:,.0f} objects/sec."
+    )
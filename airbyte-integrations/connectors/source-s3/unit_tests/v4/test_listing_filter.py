@@ -0,0 +1,60 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+from datetime import datetime, timezone
+
+import pytest
+from source_s3.v4.listing_filter import ListingFilter
+
+from airbyte_cdk.sources.file_based.file_based_stream_reader import AbstractFileBasedStreamReader
+from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+
+
+_KEYS = [
+    "file.csv",
+    "a/file.csv",
+    "a/b/file.jsonl",
+    "data/year=2024/month=01/part-0.parquet",
+    "data/year=2024/part-0.parquet",
+    ".hidden.csv",
+    "a/.hidden/file.csv",
+    "archive.zip",
+    "a/",
+]
+
+
+@pytest.mark.parametrize(
+    "globs",
+    [
+        ["**"],
+        ["*.csv"],
+        ["**/*.csv", "a/b/*.jsonl"],
+        ["data/year=*/month=*/*.parquet"],
+        ["a/*"],
+        ["*.zip"],
+        [],
+    ],
+)
+def test_listing_filter_matches_globs_as_file_matches_globs(globs) -> None:
+    listing_filter = ListingFilter(globs)
+    for key in _KEYS:
+        remote_file = RemoteFile(uri=key, last_modified=datetime(2024, 1, 1))
+        assert listing_filter.matches_globs(key) == AbstractFileBasedStreamReader.file_matches_globs(remote_file, globs), key
+
+
+def test_listing_filter_page() -> None:
+    listing_filter = ListingFilter(["**/*.csv"], start_date=datetime(2024, 1, 1))
+    contents = [
+        {"Key": "new.csv", "LastModified": datetime(2024, 1, 2, tzinfo=timezone.utc)},
+        {"Key": "same.csv", "LastModified": datetime(2024, 1, 1, tzinfo=timezone.utc)},
+        {"Key": "old.csv", "LastModified": datetime(2023, 12, 31, 23, 59, tzinfo=timezone.utc)},
+        {"Key": "new.jsonl", "LastModified": datetime(2024, 1, 2, tzinfo=timezone.utc)},
+        {"Key": "folder/", "LastModified": datetime(2024, 1, 2, tzinfo=timezone.utc)},
+        # the files inside the archive are matched once the archive is expanded
+        {"Key": "old.zip", "LastModified": datetime(2023, 1, 1, tzinfo=timezone.utc)},
+    ]
+    assert [file["Key"] for file in listing_filter.filter_page(contents)] == ["new.csv", "same.csv", "old.zip"]
+
+    assert listing_filter.matches(RemoteFile(uri="old.zip#member.csv", last_modified=datetime(2024, 1, 2)))
+    assert not listing_filter.matches(RemoteFile(uri="old.zip#member.csv", last_modified=datetime(2023, 1, 2)))
@@ -5,6 +5,7 @@
 
 import io
 import logging
+import zipfile
 from datetime import datetime, timedelta
 from itertools import product
 from typing import Any, Dict, List, Optional, Set
@@ -16,6 +17,7 @@ from moto import mock_sts
 from pydantic.v1 import AnyUrl
 from source_s3.v4.config import Config
 from source_s3.v4.stream_reader import SourceS3StreamReader
+from source_s3.v4.zip_reader import ZipCentralDirectoryCache
 
 from airbyte_cdk.sources.file_based.config.abstract_file_based_spec import AbstractFileBasedSpec
 from airbyte_cdk.sources.file_based.exceptions import ErrorListingFiles, FileBasedSourceError
@@ -357,3 +359,97 @@ def test_filter_file_by_start_date(start_date: datetime, last_modified_date: dat
     )
 
     assert expected_result == reader.is_modified_after_start_date(last_modified_date)
+
+
+def _setup_fake_bucket(mock_s3_client, keys: List[str], page_size: int = 2) -> None:
+    """
+    Mimics `list_objects_v2` over the sorted keys, including the delimiter-based listing and the pagination.
+    """
+
+    def list_objects_v2(Bucket, Prefix="", Delimiter=None, ContinuationToken=None, **kwargs):
+        if Delimiter:
+            entries = sorted({Prefix + key[len(Prefix) :].split(Delimiter)[0] + Delimiter for key in keys if key.startswith(Prefix)})
+        else:
+            entries = sorted(key for key in keys if key.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = entries[start : start + page_size]
+        response = {"KeyCount": len(page)}
+        if Delimiter:
+            response["CommonPrefixes"] = [{"Prefix": entry} for entry in page]
+        else:
+            response["Contents"] = [{"Key": key, "LastModified": datetime(2024, 1, 1)} for key in page]
+        if start + page_size < len(entries):
+            response["NextContinuationToken"] = str(start + page_size)
+        return response
+
+    mock_s3_client.list_objects_v2 = MagicMock(side_effect=list_objects_v2)
+
+
+_PARTITIONED_KEYS = [
+    f"data/year={year}/month={month:02d}/part-{part}.csv" for year in (2023, 2024) for month in (1, 2, 3) for part in range(3)
+] + ["data/year=2024/_SUCCESS", "other/file.csv"]
+
+
+@pytest.mark.parametrize("listing_concurrency", [1, 4])
+def test_get_matching_files_partitioned_prefixes(listing_concurrency: int) -> None:
+    reader = SourceS3StreamReader()
+    reader.config = Config(
+        bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[], listing_concurrency=listing_concurrency
+    )
+    globs = ["data/year=*/month=*/*.csv", "data/year=2024/month=*/*.csv"]
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        _setup_fake_bucket(mock_s3_client, _PARTITIONED_KEYS)
+        files = list(reader.get_matching_files(globs, None, logger))
+
+    # the files are de-duplicated and yielded in the same order, regardless of the concurrency
+    assert [file.uri for file in files] == sorted(key for key in _PARTITIONED_KEYS if key.endswith(".csv") and key.startswith("data/"))
+    listed_prefixes = {
+        call.kwargs.get("Prefix") for call in mock_s3_client.list_objects_v2.call_args_list if "Delimiter" not in call.kwargs
+    }
+    if listing_concurrency > 1:
+        # the leaf prefixes are listed, instead of the static one
+        assert listed_prefixes == {f"data/year={year}/month={month:02d}/" for year in (2023, 2024) for month in (1, 2, 3)}
+    else:
+        assert listed_prefixes == {"data/year="}
+
+
+def test_get_matching_files_concurrent_listing_error() -> None:
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[], listing_concurrency=2)
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        _setup_fake_bucket(mock_s3_client, _PARTITIONED_KEYS)
+        list_objects_v2 = mock_s3_client.list_objects_v2.side_effect
+
+        def failing_list_objects_v2(**kwargs):
+            if kwargs.get("Prefix", "").startswith("data/year=2024/month=02/"):
+                raise Exception("Access Denied")
+            return list_objects_v2(**kwargs)
+
+        mock_s3_client.list_objects_v2.side_effect = failing_list_objects_v2
+        with pytest.raises(ErrorListingFiles):
+            list(reader.get_matching_files(["data/year=*/month=*/*.csv"], None, logger))
+
+
+def test_get_matching_files_zip_central_directories_cached(tmp_path) -> None:
+    with io.BytesIO() as buffer:
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("a.csv", "a,b\n1,2\n")
+        archive = buffer.getvalue()
+    contents = [{"Key": key, "LastModified": datetime(2024, 1, 1), "ETag": '"etag"', "Size": len(archive)} for key in ("1.zip", "2.zip")]
+
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+    reader._zip_cache = ZipCentralDirectoryCache(str(tmp_path))
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        mock_s3_client.list_objects_v2.return_value = {"Contents": contents, "KeyCount": len(contents)}
+        # the archive is smaller than the buffer, so the range start is negative while looking for the central directory
+        mock_s3_client.get_object.side_effect = lambda Bucket, Key, Range: {
+            "Body": io.BytesIO(archive[max(int(Range[len("bytes=") :].rsplit("-", 1)[0]), 0) :])
+        }
+        files = list(reader.get_matching_files(["**"], None, logger))
+        requests_count = mock_s3_client.get_object.call_count
+        # the unchanged archives are not fetched again
+        assert [file.uri for file in reader.get_matching_files(["**"], None, logger)] == [file.uri for file in files]
+        assert mock_s3_client.get_object.call_count == requests_count
+    assert [file.uri for file in files] == ["1.zip#a.csv", "2.zip#a.csv"]
+    mock_s3_client.head_object.assert_not_called()
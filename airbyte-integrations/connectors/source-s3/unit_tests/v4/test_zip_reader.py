@@ -7,7 +7,7 @@ import zipfile
 from unittest.mock import MagicMock, patch
 
 import pytest
-from source_s3.v4.zip_reader import DecompressedStream, RemoteFileInsideArchive, ZipContentReader, ZipFileHandler
+from source_s3.v4.zip_reader import DecompressedStream, RemoteFileInsideArchive, ZipCentralDirectoryCache, ZipContentReader, ZipFileHandler
 
 
 # Mocking the S3 client and config for testing
@@ -138,3 +138,113 @@ def test_zip_content_reader_iteration():
 
     # Verify the lines extracted match expected values
     assert lines == ["line1\n", "line2\r", "line3\r\n", "line4\n"]
+
+
+def _zip_archive(members: dict) -> bytes:
+    with io.BytesIO() as archive:
+        with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name, content in members.items():
+                zf.writestr(name, content)
+        return archive.getvalue()
+
+
+def _range_get_object(archive: bytes):
+    def get_object(Bucket, Key, Range):
+        # the range start is negative, when the archive is smaller than the buffer
+        start, end = Range[len("bytes=") :].rsplit("-", 1)
+        start = max(int(start), 0)
+        body = archive[start : int(end) + 1] if end else archive[start:]
+        return {"Body": io.BytesIO(body)}
+
+    return get_object
+
+
+def test_zip_central_directory_cache(tmp_path):
+    cache = ZipCentralDirectoryCache(str(tmp_path), max_entries=2)
+    cache.put("bucket", "a.zip", '"etag-a"', 10, b"central-dir-a", 1)
+    assert cache.get("bucket", "a.zip", '"etag-a"', 10) == (b"central-dir-a", 1)
+    # the changed archive is not served from the cache
+    assert cache.get("bucket", "a.zip", '"etag-b"', 10) is None
+    assert cache.get("bucket", "a.zip", '"etag-a"', 11) is None
+
+    # the entries are kept on disk, across the cache instances
+    cache = ZipCentralDirectoryCache(str(tmp_path), max_entries=2)
+    cache.put("bucket", "b.zip", '"etag-b"', 10, b"central-dir-b", 2)
+    # the least recently used entry is evicted
+    cache._entries[ZipCentralDirectoryCache._entry_name("bucket", "a.zip", '"etag-a"', 10)] = (0, 21)
+    cache.put("bucket", "c.zip", '"etag-c"', 10, b"central-dir-c", 3)
+    assert cache.get("bucket", "a.zip", '"etag-a"', 10) is None
+    assert cache.get("bucket", "b.zip", '"etag-b"', 10) == (b"central-dir-b", 2)
+    assert cache.get("bucket", "c.zip", '"etag-c"', 10) == (b"central-dir-c", 3)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_zip_central_directory_cache_truncated_entry(tmp_path):
+    cache = ZipCentralDirectoryCache(str(tmp_path))
+    cache.put("bucket", "a.zip", '"etag-a"', 10, b"central-dir-a", 1)
+    entry_path = tmp_path / ZipCentralDirectoryCache._entry_name("bucket", "a.zip", '"etag-a"', 10)
+    entry_path.write_bytes(b"\x01\x02")
+    # the truncated entry is a cache miss, and it's dropped
+    assert cache.get("bucket", "a.zip", '"etag-a"', 10) is None
+    assert not entry_path.exists()
+    cache.put("bucket", "a.zip", '"etag-a"', 10, b"central-dir-a", 1)
+    assert cache.get("bucket", "a.zip", '"etag-a"', 10) == (b"central-dir-a", 1)
+
+
+def test_get_zip_files_cached(tmp_path, mock_s3_client, mock_config):
+    archive = _zip_archive({"a.csv": "a,b\n1,2\n", "b.csv": "c,d\n3,4\n"})
+    mock_s3_client.get_object.side_effect = _range_get_object(archive)
+    handler = ZipFileHandler(mock_s3_client, mock_config, ZipCentralDirectoryCache(str(tmp_path)))
+
+    members, cd_start = handler.get_zip_files("archive.zip", '"etag"', len(archive))
+    # the size is known from the listing
+    mock_s3_client.head_object.assert_not_called()
+    requests_count = mock_s3_client.get_object.call_count
+
+    cached_members, cached_cd_start = handler.get_zip_files("archive.zip", '"etag"', len(archive))
+    assert mock_s3_client.get_object.call_count == requests_count
+    assert cached_cd_start == cd_start
+    assert [(m.filename, m.header_offset, m.compress_size) for m in cached_members] == [
+        (m.filename, m.header_offset, m.compress_size) for m in members
+    ]
+    assert [m.filename for m in members] == ["a.csv", "b.csv"]
+
+
+def _archive_member_stream(archive: bytes, **kwargs) -> DecompressedStream:
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        member = zf.infolist()[0]
+    file_info = RemoteFileInsideArchive(
+        uri=f"archive.zip#{member.filename}",
+        last_modified=datetime.datetime(2022, 12, 28),
+        start_offset=member.header_offset,
+        compressed_size=member.compress_size,
+        uncompressed_size=member.file_size,
+        compression_method=member.compress_type,
+    )
+    return DecompressedStream(io.BytesIO(archive), file_info, **kwargs)
+
+
+def test_decompressed_stream_seek_from_checkpoints():
+    content = "".join(f"{i},value-{i * 7919 % 10007}\n" for i in range(20000)).encode()
+    stream = _archive_member_stream(_zip_archive({"data.csv": content}), buffer_size=1024, checkpoint_interval=16 * 1024)
+
+    assert stream.read() == content
+    # the checkpoints are taken while reading
+    assert len(stream.offset_map) > 10
+
+    for offset in [len(content) - 10, 100_000, 5, 250_000, 16 * 1024 * 3 + 1]:
+        assert stream.seek(offset) == offset
+        assert stream.read(100) == content[offset : offset + 100]
+    assert stream.seek(-50, io.SEEK_CUR) == 16 * 1024 * 3 + 51
+    assert stream.read(50) == content[16 * 1024 * 3 + 51 : 16 * 1024 * 3 + 101]
+
+
+def test_zip_content_reader_readline_across_chunks():
+    content = "id,name\r\n1,naïve\r\n2,日本語\n3,last".encode("utf-8")
+    stream = _archive_member_stream(_zip_archive({"data.csv": content}), buffer_size=3)
+    reader = ZipContentReader(stream, encoding="utf-8", buffer_size=4)
+    assert list(reader) == ["id,name\r\n", "1,naïve\r\n", "2,日本語\n", "3,last"]
+
+    reader.seek(0)
+    assert reader.readline() == "id,name\r\n"
+    assert reader.tell() == len("id,name\r\n")
@@ -0,0 +1,82 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+"""
+The benchmark for reading the deflated CSV member of the ZIP archive with `ZipContentReader.readline()`.
+
+Skipped by default, to run:
+    S3_ZIP_BENCHMARK=1 pytest -s unit_tests/v4/test_zip_reader_benchmark.py
+
+The uncompressed size of the CSV member could be overridden with `S3_ZIP_BENCHMARK_BYTES` (default: 2 GB).
+"""
+
+import datetime
+import io
+import os
+import time
+import zipfile
+
+import pytest
+from source_s3.v4.zip_reader import DecompressedStream, RemoteFileInsideArchive, ZipContentReader
+
+
+BENCHMARK_BYTES: int = int(os.getenv("S3_ZIP_BENCHMARK_BYTES", 2 * 1024 * 1024 * 1024))
+# the lines are written in blocks, to generate the archive faster
+LINES_PER_BLOCK: int = 10_000
+
+
+def _csv_block(first_line: int) -> bytes:
+    return "".join(
+        f"{line},2024-01-01T00:00:00Z,customer-{line % 9973},{line * 31 % 100000 / 100:.2f}\r\n"
+        for line in range(first_line, first_line + LINES_PER_BLOCK)
+    ).encode()
+
+
+def _generate_archive(filename: str, size: int) -> int:
+    lines = 0
+    with zipfile.ZipFile(filename, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        with zf.open("data.csv", "w", force_zip64=True) as member:
+            written = member.write(b"id,created_at,customer,amount\r\n")
+            lines += 1
+            while written < size:
+                written += member.write(_csv_block(lines))
+                lines += LINES_PER_BLOCK
+    return lines
+
+
+def _open_member(archive: io.BufferedReader) -> ZipContentReader:
+    with zipfile.ZipFile(archive) as zf:
+        member = zf.infolist()[0]
+    file_info = RemoteFileInsideArchive(
+        uri=f"benchmark.zip#{member.filename}",
+        last_modified=datetime.datetime(2024, 1, 1),
+        start_offset=member.header_offset,
+        compressed_size=member.compress_size,
+        uncompressed_size=member.file_size,
+        compression_method=member.compress_type,
+    )
+    return ZipContentReader(DecompressedStream(archive, file_info), encoding="utf-8")
+
+
+@pytest.mark.skipif(not os.getenv("S3_ZIP_BENCHMARK"), reason="The benchmark is enabled with `S3_ZIP_BENCHMARK=1`")
+def test_readline_throughput(tmp_path) -> None:
+    filename = str(tmp_path / "benchmark.zip")
+    expected_lines = _generate_archive(filename, BENCHMARK_BYTES)
+
+    with open(filename, "rb") as archive:
+        reader = _open_member(archive)
+        start = time.perf_counter()
+        lines = sum(1 for _ in iter(reader.readline, ""))
+        elapsed = time.perf_counter() - start
+        size = reader.tell()
+
+        # the backward seek resumes from the closest checkpoint
+        seek_start = time.perf_counter()
+        reader.seek(size * 3 // 4)
+        reader.readline()
+        seek_elapsed = time.perf_counter() - seek_start
+
+    assert lines == expected_lines
+    print(
+        f"\nS3 ZIP `readline`: {size / 1024**2:,.0f} MB, {lines} lines in {elapsed:.2f}s, "
+        f"{size / 1024**2 / elapsed:,.2f} MB/sec, {lines / elapsed:,.0f} lines/sec. Seek to 75%: {seek_elapsed:.3f}s."
+    )
@@ -30,6 +30,11 @@ class ShopifyBulkExceptions:
     class BulkJobResultUrlError(BaseBulkException):
         """Raised when BULK Job has ACCESS_DENIED status"""
 
+    class BulkJobResultStreamError(BaseBulkException):
+        """Raised when the BULK Job result download has stopped, while streaming the result"""
+
+        failure_type: FailureType = FailureType.transient_error
+
     class BulkRecordProduceError(BaseBulkException):
         """Raised when there are error producing records from BULK Job result"""
 
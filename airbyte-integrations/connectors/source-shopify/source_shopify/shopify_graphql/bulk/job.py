@@ -5,8 +5,12 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from itertools import islice
+from os import remove
+from queue import Full, Queue
+from threading import Event, Thread
 from time import sleep, time
-from typing import Any, Final, Iterable, List, Mapping, Optional
+from typing import TYPE_CHECKING, Any, Final, Iterable, List, Mapping, Optional, Tuple, Union
 
 import pendulum as pdm
 import requests
@@ -20,10 +24,15 @@ from .exceptions import AirbyteTracedException, ShopifyBulkExceptions
 from .query import ShopifyBulkQuery, ShopifyBulkTemplates
 from .record import ShopifyBulkRecord
 from .retry import bulk_retry_on_exception
+from .slicer import ShopifyBulkJobSizeController
 from .status import ShopifyBulkJobStatus
 from .tools import END_OF_FILE, BulkTools
 
 
+if TYPE_CHECKING:
+    from .scheduler import ShopifyBulkJobScheduler
+
+
 class BulkOperationUserErrorCode(Enum):
     """
     Possible error codes that can be returned by BulkOperationUserError.
@@ -45,9 +54,17 @@ class ShopifyBulkManager:
 
     parent_stream_name: Optional[str] = None
     parent_stream_cursor: Optional[str] = None
+    # whether or not the Job result should be parsed while it's being downloaded
+    job_stream_result: bool = False
 
     # 10Mb chunk size to save the file
     _retrieve_chunk_size: Final[int] = 1024 * 1024 * 10
+    # 1Mb chunk size to stream the result, to emit the first records as soon as possible
+    _stream_chunk_size: Final[int] = 1024 * 1024
+    # the max number of downloaded chunks waiting to be parsed, while streaming the result
+    _stream_queue_size: Final[int] = 16
+    # time to wait for the free slot in the queue, before checking the consumer is still there
+    _stream_queue_timeout: Final[int] = 1
     _job_max_retries: Final[int] = 6
     _job_backoff_time: int = 5
 
@@ -68,6 +85,12 @@ class ShopifyBulkManager:
     _job_state: str | None = field(init=False, default=None)  # this string is based on ShopifyBulkJobStatus
     # completed and saved Bulk Job result filename
     _job_result_filename: Optional[str] = field(init=False, default=None)
+    # completed Bulk Job result url, used to stream the result
+    _job_result_url: Optional[str] = field(init=False, default=None)
+    # the scheduler, which creates the first Bulk Job ahead of time, if set
+    _job_scheduler: Optional["ShopifyBulkJobScheduler"] = field(init=False, default=None)
+    # the slice of the Bulk Job created by the scheduler, before the stream has started
+    _job_scheduled_slice: Optional[Mapping[str, str]] = field(init=False, default=None)
     # date-time when the Bulk Job was created on the server
     _job_created_at: Optional[str] = field(init=False, default=None)
     # indicated whether or not we manually force-cancel the current job
@@ -85,15 +108,16 @@ class ShopifyBulkManager:
     # keeps the last checkpointed cursor value for supported streams
     _job_last_checkpoint_cursor_value: str | None = field(init=False, default=None)
 
-    # expand slice factor
-    _job_size_expand_factor: int = field(init=False, default=2)
     # reduce slice factor
     _job_size_reduce_factor: int = field(init=False, default=2)
     # whether or not the slicer should revert the previous start value
     _job_should_revert_slice: bool = field(init=False, default=False)
 
-    # 2 sec is set as default value to cover the case with the empty-fast-completed jobs
-    _job_last_elapsed_time: float = field(init=False, default=2.0)
+    # the part of the `job_termination_threshold` each job should ideally take,
+    # to leave the room for the slower jobs, before they are canceled
+    _job_target_elapsed_time_ratio: Final[float] = 1 / 6
+    # the rows collected and the time taken by the checkpointed job, observed once the checkpointed cursor is known
+    _job_checkpointed_stats: Optional[Tuple[int, float]] = field(init=False, default=None)
 
     def __post_init__(self) -> None:
         self._job_size = self.job_size
@@ -106,6 +130,14 @@ class ShopifyBulkManager:
         self._job_max_elapsed_time = self.job_termination_threshold
         # how many records should be collected before we use the checkpoining
         self._job_checkpoint_interval = self.job_checkpoint_interval
+        # picks the next slice size, based on the observed records-per-second rate of the previous jobs
+        self._job_size_controller = ShopifyBulkJobSizeController(
+            size_min=self._job_size_min,
+            size_max=self._job_size_max,
+            target_elapsed_time=self._job_max_elapsed_time * self._job_target_elapsed_time_ratio,
+            # the jobs collecting more records are checkpointed anyway
+            max_records=self._job_checkpoint_interval if self._supports_checkpointing else None,
+        )
         # define Record Producer instance
         self.record_producer: ShopifyBulkRecord = ShopifyBulkRecord(self.query, self.parent_stream_name, self.parent_stream_cursor)
 
@@ -126,18 +158,6 @@ class ShopifyBulkManager:
             ShopifyBulkJobStatus.ACCESS_DENIED.value: self._on_access_denied_job,
         }
 
-    @property
-    def _job_size_adjusted_expand_factor(self, coef: float = 0.5) -> float:
-        """
-        The Job Size expand factor is calculated using EMA (Expotentional Moving Average):
-            coef - the expantion coefficient
-            previous_expand_factor - previous factor value
-
-        Formula: expand_factor = coef * previous_expand_factor + (1 - coef)
-        """
-
-        return coef * self._job_size_expand_factor + (1 - coef)
-
     @property
     def _job_size_adjusted_reduce_factor(self) -> float:
         """
@@ -179,9 +199,6 @@ class ShopifyBulkManager:
     def _job_any_lines_collected(self) -> bool:
         return self._job_last_rec_count > 0
 
-    def _expand_job_size(self) -> None:
-        self._job_size += self._job_size_adjusted_expand_factor
-
     def _reduce_job_size(self) -> None:
         self._job_size /= self._job_size_adjusted_reduce_factor
 
@@ -191,23 +208,48 @@ class ShopifyBulkManager:
         self._reduce_job_size()
 
     def __adjust_job_size(self, job_current_elapsed_time: float) -> None:
+        if self._job_adjust_slice_from_checkpoint:
+            # the part of the slice collected is known once the checkpointed cursor is provided, see `get_adjusted_job_end`
+            self._job_checkpointed_stats = (self._job_last_rec_count, job_current_elapsed_time)
+            return
+        # the whole slice is collected, unless the job was canceled for running too long
+        slice_completed = not self._job_should_revert_slice
+        self._job_size_controller.observe(self._job_size, self._job_last_rec_count, job_current_elapsed_time, slice_completed)
         if self._job_should_revert_slice:
+            # the slice is reduced before the next slice is emitted, see `get_adjusted_job_end`
             pass
         else:
-            if job_current_elapsed_time < 1 or job_current_elapsed_time < self._job_last_elapsed_time:
-                self._expand_job_size()
-            elif job_current_elapsed_time > self._job_last_elapsed_time < self._job_max_elapsed_time:
-                pass
-            # set the last job time
-            self._job_last_elapsed_time = job_current_elapsed_time
-            # check the job size slice interval are acceptable
-            self._job_size = max(self._job_size_min, min(self._job_size, self._job_size_max))
+            self._job_size = self._job_size_controller.next_size(self._job_size)
+
+    def _adjust_job_size_from_checkpoint(self, slice_start: datetime, checkpointed_cursor: Optional[str] = None) -> None:
+        if self._job_checkpointed_stats and checkpointed_cursor:
+            records, elapsed_time = self._job_checkpointed_stats
+            # the job has collected the records up to the checkpointed cursor
+            collected_size = (pdm.parse(checkpointed_cursor) - slice_start).total_days()
+            self._job_size_controller.observe(collected_size, records, elapsed_time)
+            self._job_size = self._job_size_controller.next_size(self._job_size)
+        self._job_checkpointed_stats = None
+
+    def job_size_get_state(self) -> Optional[Mapping[str, float]]:
+        """
+        Returns the learned records-per-second rates to keep in the stream state.
+        """
+        return self._job_size_controller.get_state()
+
+    def job_size_set_state(self, stream_state: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Restores the learned rates from the stream state, to start with the right slice size.
+        """
+        self._job_size_controller.set_state(stream_state)
+        self._job_size = self._job_size_controller.initial_size(self._job_size)
 
     def __reset_state(self) -> None:
         # reset the job state to default
         self._job_state = None
         # reset the filename to default
         self._job_result_filename = None
+        # reset the result url to default
+        self._job_result_url = None
         # setting self-cancelation to default
         self._job_self_canceled = False
         # set the running job message counter to default
@@ -288,30 +330,132 @@ class ShopifyBulkManager:
         else:
             LOGGER.info(pattern)
 
-    def _job_get_result(self, response: Optional[requests.Response] = None) -> Optional[str]:
+    def _job_get_result_url(self, response: Optional[requests.Response] = None) -> Optional[str]:
         parsed_response = response.json().get("data", {}).get("node", {}) if response else None
         # get `complete` or `partial` result from collected Bulk Job results
         full_result_url = parsed_response.get("url") if parsed_response else None
         partial_result_url = parsed_response.get("partialDataUrl") if parsed_response else None
-        job_result_url = full_result_url if full_result_url else partial_result_url
+        return full_result_url if full_result_url else partial_result_url
+
+    def _job_get_result(self, response: Optional[requests.Response] = None) -> Optional[str]:
+        job_result_url = self._job_get_result_url(response)
         if job_result_url:
-            # save to local file using chunks to avoid OOM
-            filename = self._tools.filename_from_url(job_result_url)
+            return self._job_save_result(job_result_url)
+
+    def _job_save_result(self, job_result_url: str, http_client: Optional[HttpClient] = None, filename: Optional[str] = None) -> str:
+        # save to local file using chunks to avoid OOM
+        filename = filename or self._tools.filename_from_url(job_result_url)
+        http_client = http_client or self.http_client
+        _, response = http_client.send_request(http_method="GET", url=job_result_url, request_kwargs={"stream": True})
+        response.raise_for_status()
+        with open(filename, "wb") as file:
+            for chunk in response.iter_content(chunk_size=self._retrieve_chunk_size):
+                file.write(chunk)
+            # add `<end_of_file>` line to the bottom  of the saved data for easy parsing
+            file.write(END_OF_FILE.encode())
+        return filename
+
+    def _job_collect_result(self, response: Optional[requests.Response] = None) -> None:
+        self._job_collect_result_from_url(self._job_get_result_url(response))
+
+    def _job_collect_result_from_url(self, job_result_url: Optional[str] = None) -> None:
+        if self.job_stream_result:
+            # the result is downloaded and parsed at the same time, later on
+            self._job_result_url = job_result_url
+        else:
+            self._job_result_filename = self._job_save_result(job_result_url) if job_result_url else None
+
+    def _job_download_result_chunks(self, job_result_url: str, chunks: Queue, consumer_stopped: Event) -> None:
+        """
+        Downloads the Job result and puts the chunks into the bounded `chunks` queue,
+        the download is paused while the queue is full, so the memory usage is limited by the queue size.
+        The last item is always put, unless the consumer has gone: `None` when the download is finished,
+        or the `Exception` if it has failed, so the consumer could wait for it without a timeout.
+        """
+
+        def put(item: Union[bytes, Exception, None]) -> bool:
+            while not consumer_stopped.is_set():
+                try:
+                    chunks.put(item, timeout=self._stream_queue_timeout)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        last_item: Union[Exception, None] = ShopifyBulkExceptions.BulkJobResultStreamError(
+            f"The BULK Job: `{self._job_id}` result download has stopped unexpectedly."
+        )
+        try:
             _, response = self.http_client.send_request(http_method="GET", url=job_result_url, request_kwargs={"stream": True})
             response.raise_for_status()
-            with open(filename, "wb") as file:
-                for chunk in response.iter_content(chunk_size=self._retrieve_chunk_size):
-                    file.write(chunk)
-                # add `<end_of_file>` line to the bottom  of the saved data for easy parsing
-                file.write(END_OF_FILE.encode())
-            return filename
+            for chunk in response.iter_content(chunk_size=self._stream_chunk_size):
+                if not put(chunk):
+                    # the consumer has gone, stop downloading
+                    return
+            last_item = None
+        except Exception as e:
+            last_item = e
+        finally:
+            put(last_item)
+
+    def _job_stream_result(self, job_result_url: str) -> Iterable[str]:
+        """
+        Yields the lines of the Job result, while it's being downloaded by the background thread.
+        """
+        chunks: Queue = Queue(maxsize=self._stream_queue_size)
+        consumer_stopped = Event()
+        downloader = Thread(target=self._job_download_result_chunks, args=(job_result_url, chunks, consumer_stopped), daemon=True)
+        downloader.start()
+        try:
+            pending = b""
+            while True:
+                # the downloader always puts the last item, see `_job_download_result_chunks`
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                elif isinstance(chunk, Exception):
+                    raise chunk
+                # split the lines by `bytes`, to not break the multibyte chars between the chunks
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    yield line.decode("utf-8")
+            if pending:
+                yield pending.decode("utf-8")
+        finally:
+            consumer_stopped.set()
+            downloader.join()
+
+    def _job_result_lines(self, job_result_url: str) -> Iterable[str]:
+        """
+        Yields the lines of the Job result using the streaming mode.
+        If the download fails, the result is saved to the temp file (retried by the `http_client`)
+        and the lines are read from it, skipping the lines already processed.
+        """
+        lines_processed = 0
+        try:
+            for line in self._job_stream_result(job_result_url):
+                yield line
+                lines_processed += 1
+        except (requests.exceptions.RequestException, ShopifyBulkExceptions.BulkJobResultStreamError) as e:
+            LOGGER.warning(
+                f"Stream: `{self.http_client.name}`, the BULK Job: `{self._job_id}` result streaming has failed after {lines_processed} lines, retrying using the `tmp job result` file. Details: {repr(e)}."
+            )
+            self._job_result_filename = self._job_save_result(job_result_url)
+            try:
+                with open(self._job_result_filename, "r") as jsonl_file:
+                    yield from islice(jsonl_file, lines_processed, None)
+            finally:
+                remove(self._job_result_filename)
+        else:
+            # add `<end_of_file>` line to the bottom of the streamed data, same as for the saved file
+            yield END_OF_FILE
 
     def _job_get_checkpointed_result(self, response: Optional[requests.Response]) -> None:
         if self._job_any_lines_collected or self._job_should_checkpoint:
             # set the flag to adjust the next slice from the checkpointed cursor value
             self._set_checkpointing()
             # fetch the collected records from CANCELED Job on checkpointing
-            self._job_result_filename = self._job_get_result(response)
+            self._job_collect_result(response)
 
     def _job_update_state(self, response: Optional[requests.Response] = None) -> None:
         if response:
@@ -361,7 +505,7 @@ class ShopifyBulkManager:
             sleep(self._job_check_interval)
 
     def _on_completed_job(self, response: Optional[requests.Response] = None) -> None:
-        self._job_result_filename = self._job_get_result(response)
+        self._job_collect_result(response)
 
     def _on_failed_job(self, response: requests.Response) -> AirbyteTracedException | None:
         if not self._supports_checkpointing:
@@ -475,8 +619,54 @@ class ShopifyBulkManager:
             else:
                 self._job_track_running()
 
+    def set_job_scheduler(self, scheduler: "ShopifyBulkJobScheduler") -> None:
+        self._job_scheduler = scheduler
+
+    def job_claim_scheduled(self) -> None:
+        """
+        Takes the ownership of the Bulk Job created by the scheduler, if any.
+        Should be called before the slices are produced, the scheduler no longer touches this manager after that.
+        """
+        if self._job_scheduler:
+            self._job_scheduler.claim(self)
+
+    def _job_is_scheduled_slice(self, stream_slice: Optional[Mapping[str, str]]) -> bool:
+        return self._job_scheduled_slice is not None and self._job_scheduled_slice == (stream_slice or {})
+
+    def _job_adopt_scheduled(self, stream_slice: Optional[Mapping[str, str]]) -> bool:
+        """
+        Returns `True` if the Bulk Job for the `stream_slice` was already created by the scheduler.
+        The scheduled Bulk Job for the different slice is canceled.
+        """
+        if self._job_scheduled_slice is None:
+            return False
+        if self._job_is_scheduled_slice(stream_slice):
+            LOGGER.info(
+                f"Stream: `{self.http_client.name}`, the BULK Job: `{self._job_id}` was created ahead of time, status: {self._job_state}."
+            )
+            self._job_scheduled_slice = None
+            return True
+        # the slice has changed since the Bulk Job was scheduled, the scheduled job is discarded
+        LOGGER.info(f"Stream: `{self.http_client.name}`, the scheduled BULK Job: `{self._job_id}` doesn't match the slice, discarding.")
+        self._job_scheduled_slice = None
+        if self._job_completed():
+            if self._job_result_filename:
+                remove(self._job_result_filename)
+        else:
+            self._job_cancel()
+        self.__reset_state()
+        return False
+
     @bulk_retry_on_exception()
     def create_job(self, stream_slice: Mapping[str, str], filter_field: str) -> None:
+        if self._job_adopt_scheduled(stream_slice):
+            return
+        self._job_submit(stream_slice, filter_field)
+
+    def _job_submit(self, stream_slice: Mapping[str, str], filter_field: str) -> None:
+        """
+        Creates the Bulk Job for the `stream_slice`, without retrying.
+        """
         if stream_slice:
             query = self.query.get(filter_field, stream_slice["start"], stream_slice["end"])
         else:
@@ -506,6 +696,39 @@ class ShopifyBulkManager:
 
         self._job_process_created(response)
 
+    def job_submit_scheduled(self, stream_slice: Mapping[str, str], filter_field: str) -> None:
+        """
+        Creates the Bulk Job for the first `stream_slice` ahead of time, used by the scheduler.
+        """
+        self._job_submit(stream_slice, filter_field)
+        if self._job_id:
+            self._job_scheduled_slice = stream_slice or {}
+
+    def job_download_scheduled_result(self, node: Mapping[str, Any], http_client: HttpClient) -> Optional[str]:
+        """
+        Saves the result of the Bulk Job `COMPLETED` while waiting for the stream to start, used by the scheduler.
+        The state of the manager is left untouched, so the result could be downloaded while the stream is allowed to start,
+        the file name is prefixed to not collide with the result downloaded by the stream itself.
+        """
+        job_result_url = node.get("url") or node.get("partialDataUrl")
+        if self.job_stream_result or not job_result_url:
+            # the result is downloaded and parsed at the same time, once the stream is started
+            return None
+        filename = f"scheduled-{self._tools.filename_from_url(job_result_url)}"
+        return self._job_save_result(job_result_url, http_client=http_client, filename=filename)
+
+    def job_complete_scheduled(self, node: Mapping[str, Any], result_filename: Optional[str] = None) -> None:
+        """
+        Marks the Bulk Job `COMPLETED` while waiting for the stream to start, with the result saved by `job_download_scheduled_result`.
+        """
+        self._job_state = node.get("status")
+        self._job_last_rec_count = int(node.get("objectCount") or 0)
+        self._log_state()
+        if self.job_stream_result:
+            self._job_result_url = node.get("url") or node.get("partialDataUrl")
+        else:
+            self._job_result_filename = result_filename
+
     def _job_process_created(self, response: requests.Response) -> None:
         """
         The Bulk Job with CREATED status, should be processed, before we move forward with Job Status Checks.
@@ -524,6 +747,10 @@ class ShopifyBulkManager:
         self._job_size = requested_slice_size if requested_slice_size < self._job_size else self._job_size
 
     def get_adjusted_job_start(self, slice_start: datetime) -> datetime:
+        if self._job_scheduled_slice:
+            # use the slice of the Bulk Job created ahead of time, when it starts at the same point
+            if pdm.parse(self._job_scheduled_slice["start"]) == slice_start:
+                return pdm.parse(self._job_scheduled_slice["end"])
         step = self._job_size if self._job_size else self._job_size_min
         return slice_start.add(days=step)
 
@@ -549,6 +776,7 @@ class ShopifyBulkManager:
         if self._job_adjust_slice_from_checkpoint:
             # set the checkpointing to default, before the next slice is emitted, to avoid inf.loop
             self._reset_checkpointing()
+            self._adjust_job_size_from_checkpoint(slice_start, checkpointed_cursor)
             return self._adjust_slice_end(slice_end, checkpointed_cursor)
 
         if self._is_long_running_job:
@@ -568,7 +796,10 @@ class ShopifyBulkManager:
         LOGGER.info(f"{final_message}")
 
     def _process_bulk_results(self) -> Iterable[Mapping[str, Any]]:
-        if self._job_result_filename:
+        if self._job_result_url:
+            # produce records while the bulk job result is being downloaded
+            yield from self.record_producer.read_lines(self._job_result_lines(self._job_result_url))
+        elif self._job_result_filename:
             # produce records from saved bulk job result
             yield from self.record_producer.read_file(self._job_result_filename)
         else:
@@ -48,10 +48,12 @@ class ShopifyBulkRecord:
         component_prepare(record): Prepares the given record by initializing a "record_components" dictionary.
         buffer_flush(): Flushes the buffer by processing each record in the buffer.
         record_compose(record): Processes a given record and yields buffered records if certain conditions are met.
-        process_line(jsonl_file): Processes a JSON Lines (jsonl) file and yields records.
+        process_line(jsonl_file): Processes a JSON Lines (jsonl) file or the iterable of lines and yields records.
         record_resolve_id(record): Resolves and updates the 'id' field in the given record.
         produce_records(filename): Reads the JSONL content saved from `job.job_retrieve_result()` line-by-line to avoid OOM.
+        produce_records_from_lines(lines): Produces records from the iterable of JSONL lines.
         read_file(filename, remove_file): Reads a file and produces records from it.
+        read_lines(lines): Produces records from the JSONL lines, while the BULK Job result is being downloaded.
     """
 
     query: ShopifyBulkQuery
@@ -73,7 +75,8 @@ class ShopifyBulkRecord:
 
     @cached_property
     def tools(self) -> BulkTools:
-        return BulkTools()
+        # share the `query` tools, so the parent records and their nested components use the same field names cache
+        return self.query.tools
 
     @cached_property
     def has_parent_stream(self) -> bool:
@@ -269,12 +272,12 @@ class ShopifyBulkRecord:
         elif self.check_type(record, self.components):
             self.record_new_component(record)
 
-    def process_line(self, jsonl_file: TextIOWrapper) -> Iterable[MutableMapping[str, Any]]:
+    def process_line(self, jsonl_file: Union[TextIOWrapper, Iterable[str]]) -> Iterable[MutableMapping[str, Any]]:
         """
         Processes a JSON Lines (jsonl) file and yields records.
 
         Args:
-            jsonl_file (TextIOWrapper): A file-like object containing JSON Lines data.
+            jsonl_file (Union[TextIOWrapper, Iterable[str]]): A file-like object or the iterable of lines containing JSON Lines data.
 
         Yields:
             Iterable[MutableMapping[str, Any]]: An iterable of dictionaries representing the processed records.
@@ -334,12 +337,25 @@ class ShopifyBulkRecord:
         """
 
         with open(filename, "r") as jsonl_file:
-            # reset the counter
-            self.record_composed = 0
+            yield from self.produce_records_from_lines(jsonl_file)
 
-            for record in self.process_line(jsonl_file):
-                yield self.tools.fields_names_to_snake_case(record)
-                self.record_composed += 1
+    def produce_records_from_lines(self, lines: Iterable[str]) -> Iterable[MutableMapping[str, Any]]:
+        """
+        Produce records from the iterable of JSON Lines (jsonl), converting the field names to snake_case.
+
+        Args:
+            lines (Iterable[str]): The JSON Lines, ending with the `<end_of_file>` marker.
+
+        Yields:
+            MutableMapping[str, Any]: A dictionary representing a processed record with field names in snake_case.
+        """
+
+        # reset the counter
+        self.record_composed = 0
+
+        for record in self.process_line(lines):
+            yield self.tools.fields_names_to_snake_case(record)
+            self.record_composed += 1
 
     def read_file(self, filename: str, remove_file: Optional[bool] = True) -> Iterable[Mapping[str, Any]]:
         """
@@ -380,3 +396,26 @@ class ShopifyBulkRecord:
                 except Exception as e:
                     LOGGER.info(f"Failed to remove the `tmp job result` file, the file doen't exist. Details: {repr(e)}.")
                     pass
+
+    def read_lines(self, lines: Iterable[str]) -> Iterable[Mapping[str, Any]]:
+        """
+        Produce records from the JSONL lines, while the BULK Job result is being downloaded (streaming mode).
+
+        Args:
+            lines (Iterable[str]): The JSON Lines of the BULK Job result, ending with the `<end_of_file>` marker.
+
+        Yields:
+            Iterable[Mapping[str, Any]]: An iterable of records produced from the lines.
+
+        Raises:
+            ShopifyBulkExceptions.BulkRecordProduceError: If an error occurs while producing records from the lines.
+        """
+
+        try:
+            yield from self.produce_records_from_lines(lines)
+        except ShopifyBulkExceptions.BaseBulkException as e:
+            raise e
+        except Exception as e:
+            raise ShopifyBulkExceptions.BulkRecordProduceError(
+                f"An error occured while producing records from BULK Job result. Trace: {repr(e)}.",
+            )
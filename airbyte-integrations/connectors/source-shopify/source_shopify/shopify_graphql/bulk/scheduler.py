@@ -0,0 +1,280 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+from dataclasses import dataclass, field
+from os import remove
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Final, List, Mapping, Optional
+
+from source_shopify.auth import ShopifyAuthenticator
+from source_shopify.http_request import ShopifyErrorHandler
+from source_shopify.utils import LOGGER
+
+from airbyte_cdk.sources.streams.http import HttpClient
+
+from .exceptions import ShopifyBulkExceptions
+from .job import ShopifyBulkManager
+from .query import ShopifyBulkTemplates
+from .status import ShopifyBulkJobStatus
+
+
+@dataclass
+class ShopifyBulkScheduledStream:
+    """
+    The BULK stream registered within the scheduler.
+
+    Attributes:
+        name (str): The name of the stream.
+        job_manager (ShopifyBulkManager): The BULK Job manager of the stream.
+        filter_field (Optional[str]): The field used to filter the BULK Job query by the slice.
+        first_slice (Callable[[], Optional[Mapping[str, str]]]): Returns the first slice of the stream, `None` if there is nothing to fetch.
+    """
+
+    name: str
+    job_manager: ShopifyBulkManager
+    filter_field: Optional[str]
+    first_slice: Callable[[], Optional[Mapping[str, str]]]
+    # guards the `job_manager`, while the scheduler creates the job or collects the result
+    lock: Lock = field(default_factory=Lock)
+
+
+@dataclass
+class ShopifyBulkJobScheduler:
+    """
+    Keeps up to `max_concurrent_jobs` BULK Jobs in flight across the streams.
+
+    The CDK reads the streams one after another, so while the current stream is being read,
+    the scheduler creates the BULK Job for the first slice of the next streams in the catalog ahead of time,
+    polls the statuses of all scheduled jobs with a single `nodes(ids:)` request and collects the results of the completed ones.
+    Once the stream starts, it claims its job (see `ShopifyBulkManager.job_claim_scheduled`) and proceeds as usual:
+    the completed job result is read right away, the running job is tracked by the `ShopifyBulkManager` itself.
+
+    The `max_concurrent_jobs` includes the job of the stream being read, so `1` disables the scheduling.
+
+    The scheduler sends the status checks and downloads the results with its own `http_client`, from its own thread,
+    so it never shares the session with the stream being read.
+    """
+
+    max_concurrent_jobs: int = 1
+    # set from the authenticator of the first registered stream, if not provided
+    http_client: Optional[HttpClient] = None
+
+    # time between job status checks
+    _poll_interval: Final[int] = 3
+
+    _streams: Dict[str, ShopifyBulkScheduledStream] = field(init=False, default_factory=dict)
+    # the stream names in the order they are going to be read
+    _pending: List[str] = field(init=False, default_factory=list)
+    # the scheduled job id > stream name
+    _in_flight: Dict[str, str] = field(init=False, default_factory=dict)
+    _claimed: set = field(init=False, default_factory=set)
+    _lock: Lock = field(init=False, default_factory=Lock)
+    _stopped: Event = field(init=False, default_factory=Event)
+    _worker: Optional[Thread] = field(init=False, default=None)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent_jobs > 1
+
+    @property
+    def _max_scheduled_jobs(self) -> int:
+        # one slot is always reserved for the stream being read
+        return self.max_concurrent_jobs - 1
+
+    def set_streams_order(self, stream_names: List[str]) -> None:
+        """
+        Sets the order, the streams are going to be read in, typically the order of the configured catalog.
+        """
+        with self._lock:
+            self._pending = list(stream_names)
+
+    def register(
+        self,
+        name: str,
+        job_manager: ShopifyBulkManager,
+        filter_field: Optional[str],
+        first_slice: Callable[[], Optional[Mapping[str, str]]],
+        authenticator: Optional[ShopifyAuthenticator] = None,
+    ) -> None:
+        """
+        Registers the stream, the `authenticator` of the stream is used by the scheduler to send its own requests.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._streams[name] = ShopifyBulkScheduledStream(name, job_manager, filter_field, first_slice)
+            if not self.http_client:
+                self.http_client = HttpClient("shopify-bulk-job-scheduler", LOGGER, ShopifyErrorHandler(), authenticator=authenticator)
+        job_manager.set_job_scheduler(self)
+
+    def claim(self, job_manager: ShopifyBulkManager) -> None:
+        """
+        Hands the `job_manager` over to the stream being read, the scheduler doesn't touch it afterwards.
+        Starts scheduling the jobs for the next streams, on the first call.
+        """
+        stream = self._find_stream(job_manager)
+        if not stream:
+            return
+        with self._lock:
+            self._claimed.add(stream.name)
+            if stream.name in self._pending:
+                self._pending.remove(stream.name)
+            for job_id, name in list(self._in_flight.items()):
+                if name == stream.name:
+                    self._in_flight.pop(job_id)
+        # wait for the scheduler to finish with this stream, if it's in progress
+        with stream.lock:
+            pass
+        self._start()
+
+    def stop(self) -> None:
+        """
+        Stops scheduling, the jobs scheduled for the streams that were not read are canceled.
+        """
+        self._stopped.set()
+        if self._worker:
+            self._worker.join()
+        with self._lock:
+            unclaimed = [self._streams[name] for name in self._streams if name not in self._claimed]
+        for stream in unclaimed:
+            self._discard(stream)
+
+    def _find_stream(self, job_manager: ShopifyBulkManager) -> Optional[ShopifyBulkScheduledStream]:
+        with self._lock:
+            for stream in self._streams.values():
+                if stream.job_manager is job_manager:
+                    return stream
+
+    def _start(self) -> None:
+        if not self._worker:
+            self._worker = Thread(target=self._run, name="shopify-bulk-job-scheduler", daemon=True)
+            self._worker.start()
+
+    def _is_claimed(self, stream: ShopifyBulkScheduledStream) -> bool:
+        with self._lock:
+            return stream.name in self._claimed
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._schedule_next()
+            with self._lock:
+                in_flight = dict(self._in_flight)
+                has_pending = any(name in self._streams for name in self._pending)
+            if in_flight:
+                self._poll(in_flight)
+            elif not has_pending:
+                # nothing left to schedule
+                break
+            self._stopped.wait(self._poll_interval)
+
+    def _next_pending(self) -> Optional[ShopifyBulkScheduledStream]:
+        with self._lock:
+            if len(self._in_flight) >= self._max_scheduled_jobs:
+                return None
+            while self._pending:
+                name = self._pending.pop(0)
+                if name in self._streams and name not in self._claimed:
+                    return self._streams[name]
+
+    def _schedule_next(self) -> None:
+        while not self._stopped.is_set():
+            stream = self._next_pending()
+            if not stream:
+                return
+            with stream.lock:
+                if self._is_claimed(stream):
+                    continue
+                try:
+                    stream_slice = stream.first_slice()
+                    if stream_slice is None:
+                        continue
+                    stream.job_manager.job_submit_scheduled(stream_slice, stream.filter_field)
+                except ShopifyBulkExceptions.BulkJobCreationFailedConcurrentError:
+                    with self._lock:
+                        if self._in_flight:
+                            # the shop doesn't allow more concurrent jobs, try again once the scheduled job is completed
+                            self._pending.insert(0, stream.name)
+                        else:
+                            # the shop doesn't allow concurrent jobs at all, the streams create their jobs on their own
+                            LOGGER.info("The concurrent BULK Jobs are not allowed for this shop, the scheduling is stopped.")
+                            self._pending.clear()
+                    return
+                except Exception as e:
+                    # the stream creates the job on it's own, once it's started
+                    LOGGER.info(f"Stream: `{stream.name}`, couldn't schedule the BULK Job ahead of time. Details: {repr(e)}.")
+                    continue
+                job_id = stream.job_manager._job_id
+                if job_id:
+                    with self._lock:
+                        self._in_flight[job_id] = stream.name
+
+    def _poll(self, in_flight: Mapping[str, str]) -> None:
+        """
+        Checks the statuses of all scheduled jobs with the single request.
+        """
+        # the streams could be registered meanwhile, so the polled ones are taken under the lock
+        with self._lock:
+            streams = {job_id: self._streams[name] for job_id, name in in_flight.items() if name not in self._claimed}
+        if not streams:
+            return
+        # all the streams send their requests to the same GraphQL endpoint
+        base_url = next(iter(streams.values())).job_manager.base_url
+        try:
+            _, response = self.http_client.send_request(
+                http_method="POST",
+                url=base_url,
+                json={"query": ShopifyBulkTemplates.statuses(list(streams.keys()))},
+                request_kwargs={},
+            )
+            nodes = response.json().get("data", {}).get("nodes", [])
+        except Exception as e:
+            LOGGER.info(f"Couldn't check the statuses of the scheduled BULK Jobs. Details: {repr(e)}.")
+            return
+
+        for node in nodes:
+            if node and node.get("id") in streams:
+                self._on_job_status(streams[node.get("id")], node)
+
+    def _on_job_status(self, stream: ShopifyBulkScheduledStream, node: Mapping[str, Any]) -> None:
+        status = node.get("status")
+        if status in [ShopifyBulkJobStatus.CREATED.value, ShopifyBulkJobStatus.RUNNING.value]:
+            return
+        with stream.lock:
+            if self._is_claimed(stream):
+                return
+            with self._lock:
+                self._in_flight.pop(node.get("id"), None)
+        if status != ShopifyBulkJobStatus.COMPLETED.value:
+            # other statuses are left to the stream, to be handled as usual, once it's started
+            return
+        # the result is downloaded without holding the `stream.lock`, so the stream could start meanwhile
+        try:
+            result_filename = stream.job_manager.job_download_scheduled_result(node, self.http_client)
+        except Exception as e:
+            # the stream collects the result on it's own, once it's started
+            LOGGER.info(f"Stream: `{stream.name}`, couldn't collect the scheduled BULK Job result. Details: {repr(e)}.")
+            return
+        with stream.lock:
+            if self._is_claimed(stream):
+                # the stream has started during the download, it checks the job status and collects the result on it's own
+                if result_filename:
+                    remove(result_filename)
+                return
+            stream.job_manager.job_complete_scheduled(node, result_filename)
+
+    def _discard(self, stream: ShopifyBulkScheduledStream) -> None:
+        job_manager = stream.job_manager
+        if job_manager._job_scheduled_slice is None:
+            return
+        try:
+            if job_manager._job_completed():
+                if job_manager._job_result_filename:
+                    remove(job_manager._job_result_filename)
+            else:
+                job_manager.http_client.send_request(
+                    http_method="POST",
+                    url=job_manager.base_url,
+                    json={"query": ShopifyBulkTemplates.cancel(job_manager._job_id)},
+                    request_kwargs={},
+                )
+        except Exception as e:
+            LOGGER.info(f"Stream: `{stream.name}`, couldn't discard the scheduled BULK Job: `{job_manager._job_id}`. Details: {repr(e)}.")
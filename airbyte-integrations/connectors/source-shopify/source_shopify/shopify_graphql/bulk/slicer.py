@@ -0,0 +1,113 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+from dataclasses import dataclass
+from typing import Any, Final, Mapping, MutableMapping, Optional
+
+
+# the key to keep the learned rates in the stream state
+BULK_JOB_RATES_STATE_KEY: Final[str] = "bulk_job_rates"
+
+
+@dataclass
+class ShopifyBulkJobSizeController:
+    """
+    Picks the next BULK Job slice size (in days), based on the observed throughput of the previous jobs.
+
+    For each finished job the controller observes:
+        - the density: how many records there are per day of the slice (`records_per_day`)
+        - the throughput: how many records the job has collected per second (`records_per_second`)
+    Both are smoothed using EMA (Expotentional Moving Average), to tolerate the noise between the jobs.
+    The job could be canceled before the whole slice is collected, in this case the density is raised
+    up to the observed one, since there are at least that many records in the slice.
+
+    The next slice size is calculated to have the job finished within `target_elapsed_time`:
+        target_records = records_per_second * target_elapsed_time
+        next_size = target_records / records_per_day
+    The `target_records` is kept below the `max_records` (the BULK checkpoint interval, if supported),
+    the size change is limited by `max_size_change` per job, to avoid the oscillation.
+    When there are no records observed yet (sparse data), the slice size is expanded by `max_size_change`.
+
+    The learned rates are kept in the stream state, so the next sync starts from the right slice size.
+    """
+
+    size_min: float
+    size_max: float
+    target_elapsed_time: float
+    max_records: Optional[int] = None
+    # the weight of the last observation
+    smoothing: float = 0.5
+    # the max factor the slice size could be expanded or reduced by, per job
+    max_size_change: float = 2.0
+    # the part of the `max_records` the job should collect, to not get checkpointed
+    max_records_ratio: float = 0.8
+    # the learned rates
+    records_per_day: Optional[float] = None
+    records_per_second: Optional[float] = None
+
+    def _smooth(self, previous: Optional[float], current: float) -> float:
+        return current if previous is None else self.smoothing * current + (1 - self.smoothing) * previous
+
+    def _clamp(self, size: float) -> float:
+        return max(self.size_min, min(size, self.size_max))
+
+    def observe(self, size: float, records: int, elapsed_time: float, slice_completed: bool = True) -> None:
+        """
+        Records the result of the finished job.
+
+        Args:
+            size (float): The slice size of the job, in days.
+            records (int): The number of records (rows) collected by the job.
+            elapsed_time (float): The time taken by the job, in seconds.
+            slice_completed (bool): Whether or not the job has collected the whole slice,
+                for the canceled jobs the observed density is the lower boundary only.
+        """
+        if records > 0 and elapsed_time > 0:
+            self.records_per_second = self._smooth(self.records_per_second, records / elapsed_time)
+        if size > 0:
+            if slice_completed:
+                self.records_per_day = self._smooth(self.records_per_day, records / size)
+            else:
+                self.records_per_day = max(self.records_per_day or 0, records / size)
+
+    def _target_size(self) -> Optional[float]:
+        """
+        Returns the slice size to have the job finished within `target_elapsed_time`, `None` if there are no rates learned yet.
+        """
+        if not self.records_per_day or not self.records_per_second:
+            return None
+        target_records = self.records_per_second * self.target_elapsed_time
+        if self.max_records:
+            target_records = min(target_records, self.max_records * self.max_records_ratio)
+        return target_records / self.records_per_day
+
+    def next_size(self, current_size: float) -> float:
+        """
+        Returns the next slice size, in days.
+        """
+        target_size = self._target_size()
+        if target_size is None:
+            # no records observed so far, expand the slice to get there faster
+            return self._clamp(current_size * self.max_size_change)
+        # limit the change per job
+        return self._clamp(max(current_size / self.max_size_change, min(target_size, current_size * self.max_size_change)))
+
+    def initial_size(self, default_size: float) -> float:
+        """
+        Returns the slice size for the first job of the sync, based on the learned rates, if any.
+        """
+        target_size = self._target_size()
+        return self._clamp(default_size if target_size is None else target_size)
+
+    def get_state(self) -> Optional[Mapping[str, float]]:
+        if self.records_per_day is not None and self.records_per_second is not None:
+            return {"records_per_day": self.records_per_day, "records_per_second": self.records_per_second}
+
+    def set_state(self, stream_state: Optional[Mapping[str, Any]] = None) -> None:
+        rates: MutableMapping[str, Any] = (stream_state or {}).get(BULK_JOB_RATES_STATE_KEY) or {}
+        try:
+            if rates.get("records_per_day") is not None and rates.get("records_per_second") is not None:
+                self.records_per_day = float(rates["records_per_day"])
+                self.records_per_second = float(rates["records_per_second"])
+        except (TypeError, ValueError):
+            # the malformed state value is ignored, the rates are learned again
+            pass
@@ -4,7 +4,7 @@
 
 
 import re
-from typing import Any, Mapping, MutableMapping, Optional, Union
+from typing import Any, Dict, Mapping, MutableMapping, Optional, Union
 from urllib.parse import parse_qsl, urlparse
 
 import pendulum as pdm
@@ -15,18 +15,25 @@ from .exceptions import ShopifyBulkExceptions
 # default end line tag
 END_OF_FILE: str = "<end_of_file>"
 BULK_PARENT_KEY: str = "__parentId"
+# the max number of field names kept in the per-job key-translation cache
+FIELD_NAMES_CACHE_MAX_SIZE: int = 4096
+# precompiled pattern to locate the upper-case chars in the `camelCase` field names
+UPPER_CASE_CHAR_PATTERN: re.Pattern = re.compile(r"[A-Z]")
 
 
 class BulkTools:
+    def __init__(self, field_names_cache_max_size: int = FIELD_NAMES_CACHE_MAX_SIZE) -> None:
+        # the `camelCase` > `snake_case` field names translation cache,
+        # the same field names are repeated for every record of the BULK Job result.
+        self._field_names_cache: Dict[str, str] = {BULK_PARENT_KEY: BULK_PARENT_KEY}
+        self._field_names_cache_max_size: int = field_names_cache_max_size
+
     @staticmethod
     def camel_to_snake(camel_case: str) -> str:
-        snake_case = []
-        for char in camel_case:
-            if char.isupper():
-                snake_case.append("_" + char.lower())
-            else:
-                snake_case.append(char)
-        return "".join(snake_case).lstrip("_")
+        if camel_case.islower():
+            # fast path: there is nothing to convert, only strip the leading underscores
+            return camel_case.lstrip("_")
+        return UPPER_CASE_CHAR_PATTERN.sub(r"_\g<0>", camel_case).lower().lstrip("_")
 
     @staticmethod
     def filename_from_url(job_result_url: str) -> str:
@@ -80,11 +87,25 @@ class BulkTools:
         target_value = record.get(field)
         return BulkTools._datetime_str_to_rfc3339(target_value) if target_value else record.get(field)
 
+    def field_name_to_snake_case(self, field_name: str) -> str:
+        """
+        Returns the `snake_case` version of the `field_name`, using the key-translation cache.
+        The `__parentId` relation is kept in place.
+        """
+        snake_case = self._field_names_cache.get(field_name)
+        if snake_case is None:
+            snake_case = self.camel_to_snake(field_name)
+            # keep the cache size bounded, the field names could come from the arbitrary user-defined data
+            if len(self._field_names_cache) < self._field_names_cache_max_size:
+                self._field_names_cache[field_name] = snake_case
+        return snake_case
+
     def fields_names_to_snake_case(self, dict_input: Optional[Mapping[str, Any]] = None) -> Optional[MutableMapping[str, Any]]:
         # transforming record field names from camel to snake case, leaving the `__parent_id` relation in place
         if dict_input:
             # the `None` type check is required, to properly handle nested missing entities (return None)
-            return {self.camel_to_snake(k) if dict_input and k != BULK_PARENT_KEY else k: v for k, v in dict_input.items()}
+            cache = self._field_names_cache
+            return {(cache.get(k) or self.field_name_to_snake_case(k)): v for k, v in dict_input.items()}
 
     @staticmethod
     def resolve_str_id(
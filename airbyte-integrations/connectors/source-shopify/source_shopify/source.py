@@ -4,17 +4,20 @@
 
 
 import logging
-from typing import Any, List, Mapping, Tuple
+from typing import Any, Iterator, List, Mapping, MutableMapping, Optional, Tuple
 
 from requests.exceptions import ConnectionError, RequestException, SSLError
 
-from airbyte_cdk.models import FailureType, SyncMode
+from airbyte_cdk.models import AirbyteMessage, AirbyteStateMessage, ConfiguredAirbyteCatalog, FailureType, SyncMode
 from airbyte_cdk.sources import AbstractSource
+from airbyte_cdk.sources.connector_state_manager import ConnectorStateManager
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.utils import AirbyteTracedException
 
 from .auth import MissingAccessTokenError, ShopifyAuthenticator
 from .scopes import ShopifyScopes
+from .shopify_graphql.bulk.scheduler import ShopifyBulkJobScheduler
+from .streams.base_streams import IncrementalShopifyGraphQlBulkStream
 from .streams.streams import (
     AbandonedCheckouts,
     Articles,
@@ -127,10 +130,49 @@ class ConnectionCheckTest:
 
 
 class SourceShopify(AbstractSource):
+    def __init__(self) -> None:
+        super().__init__()
+        # the BULK Job scheduler and the input state of the BULK streams, set for the `read` operation only
+        self._bulk_job_scheduler: Optional[ShopifyBulkJobScheduler] = None
+        self._bulk_streams_state: MutableMapping[str, Mapping[str, Any]] = {}
+
     @property
     def continue_sync_on_stream_failure(self) -> bool:
         return True
 
+    def read(
+        self,
+        logger: logging.Logger,
+        config: Mapping[str, Any],
+        catalog: ConfiguredAirbyteCatalog,
+        state: Optional[List[AirbyteStateMessage]] = None,
+    ) -> Iterator[AirbyteMessage]:
+        """
+        Sets the BULK Job scheduler up, to run the BULK Jobs for the selected streams concurrently, if enabled.
+        """
+        self._bulk_job_scheduler = ShopifyBulkJobScheduler(max_concurrent_jobs=config.get("bulk_max_concurrent_jobs", 1))
+        self._bulk_job_scheduler.set_streams_order([configured_stream.stream.name for configured_stream in catalog.streams])
+        state_manager = ConnectorStateManager(state=state)
+        self._bulk_streams_state = {
+            configured_stream.stream.name: (
+                state_manager.get_stream_state(configured_stream.stream.name, configured_stream.stream.namespace)
+                if configured_stream.sync_mode == SyncMode.incremental
+                else {}
+            )
+            for configured_stream in catalog.streams
+        }
+        try:
+            yield from super().read(logger, config, catalog, state)
+        finally:
+            self._bulk_job_scheduler.stop()
+            self._bulk_job_scheduler = None
+
+    def set_bulk_job_scheduler(self, streams: List[Stream]) -> None:
+        if self._bulk_job_scheduler and self._bulk_job_scheduler.enabled:
+            for stream in streams:
+                if isinstance(stream, IncrementalShopifyGraphQlBulkStream) and stream.name in self._bulk_streams_state:
+                    stream.set_bulk_job_scheduler(self._bulk_job_scheduler, self._bulk_streams_state.get(stream.name))
+
     @staticmethod
     def get_shop_name(config) -> str:
         split_pattern = ".myshopify.com"
@@ -220,6 +262,8 @@ class SourceShopify(AbstractSource):
             Countries(config=config, parent=ProfileLocationGroups(config)),
         ]
 
-        return [
+        streams = [
             stream_instance for stream_instance in stream_instances if self.format_stream_name(stream_instance.name) in permitted_streams
         ]
+        self.set_bulk_job_scheduler(streams)
+        return streams
@@ -16,6 +16,8 @@ from requests.exceptions import RequestException
 from source_shopify.http_request import ShopifyErrorHandler
 from source_shopify.shopify_graphql.bulk.job import ShopifyBulkManager
 from source_shopify.shopify_graphql.bulk.query import DeliveryZoneList, ShopifyBulkQuery
+from source_shopify.shopify_graphql.bulk.scheduler import ShopifyBulkJobScheduler
+from source_shopify.shopify_graphql.bulk.slicer import BULK_JOB_RATES_STATE_KEY
 from source_shopify.transform import DataTypeEnforcer
 from source_shopify.utils import ApiTypeEnum, ShopifyNonRetryableErrors
 from source_shopify.utils import EagerlyCachedStreamState as stream_state_cache
@@ -653,6 +655,8 @@ class IncrementalShopifyGraphQlBulkStream(IncrementalShopifyStream):
             job_checkpoint_interval=config.get("job_checkpoint_interval", 200_000),
             parent_stream_name=self.parent_stream_name,
             parent_stream_cursor=self.parent_stream_cursor,
+            # parse the job result while it's being downloaded, if enabled
+            job_stream_result=config.get("job_stream_result", False),
         )
 
     @property
@@ -751,6 +755,11 @@ class IncrementalShopifyGraphQlBulkStream(IncrementalShopifyStream):
             # add parent_stream_state to `updated_state`
             updated_state[self.parent_stream_name] = parent_state
 
+        # keep the learned BULK Job rates, to pick the right slice size for the next sync
+        job_size_state = self.job_manager.job_size_get_state()
+        if job_size_state:
+            updated_state[BULK_JOB_RATES_STATE_KEY] = job_size_state
+
         return updated_state
 
     def _get_parent_state_from_record(self, latest_record: Mapping[str, Any]) -> MutableMapping[str, Any]:
@@ -803,9 +812,41 @@ class IncrementalShopifyGraphQlBulkStream(IncrementalShopifyStream):
         if self.job_manager._job_adjust_slice_from_checkpoint:
             self.logger.info(f"Stream {self.name}, continue from checkpoint: `{self._checkpoint_cursor}`.")
 
+    def set_bulk_job_scheduler(self, scheduler: ShopifyBulkJobScheduler, stream_state: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Registers the stream within the scheduler, to create the BULK Job for the first slice ahead of time.
+        """
+        scheduler.register(
+            self.name,
+            self.job_manager,
+            self.filter_field,
+            lambda: self.get_first_slice(stream_state),
+            authenticator=self.config["authenticator"],
+        )
+
+    def get_first_slice(self, stream_state: Optional[Mapping[str, Any]] = None) -> Optional[Mapping[str, Any]]:
+        """
+        Returns the first slice produced by the `stream_slices`, `None` if there is nothing to fetch.
+        """
+        if self.filter_field:
+            self.job_manager.job_size_set_state(stream_state)
+            start = pdm.parse(self._get_state_value(stream_state))
+            end = pdm.now()
+            if start >= end:
+                return None
+            self.job_manager.job_size_normalize(start, end)
+            slice_end = self.job_manager.get_adjusted_job_start(start)
+            return {"start": start.to_rfc3339_string(), "end": slice_end.to_rfc3339_string()}
+        else:
+            return {}
+
     @stream_state_cache.cache_stream_state
     def stream_slices(self, stream_state: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
+        # take over the BULK Job created ahead of time, if any
+        self.job_manager.job_claim_scheduled()
         if self.filter_field:
+            # start with the slice size learned during the previous syncs, if any
+            self.job_manager.job_size_set_state(stream_state)
             state = self._get_state_value(stream_state)
             start = pdm.parse(state)
             end = pdm.now()
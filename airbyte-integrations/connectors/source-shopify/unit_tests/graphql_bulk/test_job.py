@@ -3,6 +3,7 @@
 #
 
 
+import os
 from os import remove
 
 import pytest
@@ -68,14 +69,12 @@ def test_job_manager_default_values(auth_config) -> None:
     assert stream.job_manager._job_checkpoint_interval == 200000
     # the flag to adjust the next slice from the checkpointed cursor vaue
     assert not stream.job_manager._job_adjust_slice_from_checkpoint
-    # expand slice factor
-    assert stream.job_manager._job_size_expand_factor == 2
     # reduce slice factor
     assert stream.job_manager._job_size_reduce_factor == 2
     # whether or not the slicer should revert the previous start value
     assert not stream.job_manager._job_should_revert_slice
-    # 2 sec is set as default value to cover the case with the empty-fast-completed jobs
-    assert stream.job_manager._job_last_elapsed_time == 2.0
+    # no records-per-second rates learned yet
+    assert not stream.job_manager.job_size_get_state()
 
 
 def test_get_errors_from_response_invalid_response(auth_config) -> None:
@@ -444,6 +443,82 @@ def test_bulk_stream_parse_response(
         assert test_records == expected_result
 
 
+@pytest.mark.parametrize(
+    "stream, json_content_example, expected",
+    [
+        (CustomerAddress, "customer_address_jsonl_content_example", "customer_address_parse_response_expected_result"),
+        (MetafieldOrders, "metafield_jsonl_content_example", "metafield_parse_response_expected_result"),
+        (Products, "products_jsonl_content_example", "products_response_expected_result"),
+    ],
+    ids=[
+        "CustomerAddress",
+        "MetafieldOrders",
+        "Products",
+    ],
+)
+def test_bulk_stream_parse_streamed_response(
+    request,
+    requests_mock,
+    bulk_job_completed_response,
+    stream,
+    json_content_example,
+    expected,
+    auth_config,
+) -> None:
+    stream = stream({**auth_config, "job_stream_result": True})
+    # split the lines between the chunks
+    stream.job_manager._stream_chunk_size = 7
+    test_result_url = bulk_job_completed_response.get("data").get("node").get("url")
+    requests_mock.post(stream.job_manager.base_url, json=bulk_job_completed_response)
+    requests_mock.get(test_result_url, text=request.getfixturevalue(json_content_example))
+    test_records = list(stream.read_records(SyncMode.full_refresh, stream_slice={}))
+    expected_result = request.getfixturevalue(expected)
+    if isinstance(expected_result, dict):
+        assert test_records == [expected_result]
+    elif isinstance(expected_result, list):
+        assert test_records == expected_result
+    # the result is not saved to the file, while streaming
+    assert not stream.job_manager._job_result_filename
+
+
+def test_bulk_stream_parse_streamed_response_fallback_to_file(
+    mocker,
+    request,
+    requests_mock,
+    bulk_job_completed_response,
+    auth_config,
+) -> None:
+    stream = CustomerAddress({**auth_config, "job_stream_result": True})
+    content = request.getfixturevalue("customer_address_jsonl_content_example")
+    lines = content.splitlines()
+
+    def broken_stream(*args, **kwargs):
+        # emit the first line, then fail
+        yield lines[0]
+        raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+    mocker.patch.object(stream.job_manager, "_job_stream_result", side_effect=broken_stream)
+    test_result_url = bulk_job_completed_response.get("data").get("node").get("url")
+    requests_mock.post(stream.job_manager.base_url, json=bulk_job_completed_response)
+    requests_mock.get(test_result_url, text=content)
+    test_records = list(stream.read_records(SyncMode.full_refresh, stream_slice={}))
+    assert test_records == request.getfixturevalue("customer_address_parse_response_expected_result")
+    # the `tmp job result` file is removed after reading
+    assert not os.path.exists("bulk-123456789.jsonl")
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_bulk_stream_result_download_stopped_unexpectedly(mocker, auth_config) -> None:
+    class DownloadInterrupted(BaseException):
+        pass
+
+    stream = CustomerAddress({**auth_config, "job_stream_result": True})
+    mocker.patch.object(stream.job_manager.http_client, "send_request", side_effect=DownloadInterrupted)
+    # the downloader puts the last item even if it's interrupted, so the consumer doesn't wait forever
+    with pytest.raises(ShopifyBulkExceptions.BulkJobResultStreamError):
+        list(stream.job_manager._job_stream_result("https://some_url"))
+
+
 @pytest.mark.parametrize(
     "stream, stream_state, with_start_date, expected_start",
     [
@@ -478,26 +553,31 @@ def test_stream_slices(
 
 
 @pytest.mark.parametrize(
-    "stream, json_content_example, last_job_elapsed_time, previous_slice_size, adjusted_slice_size",
+    "stream, json_content_example, object_count, learned_rates, previous_slice_size, adjusted_slice_size",
     [
-        (CustomerAddress, "customer_address_jsonl_content_example", 20, 4, 5.5),
+        (CustomerAddress, "customer_address_jsonl_content_example", "0", None, 4, 8),
+        (CustomerAddress, "customer_address_jsonl_content_example", "10", {"records_per_day": 1000, "records_per_second": 1}, 4, 2),
     ],
     ids=[
-        "Expand Slice Size",
+        "Expand Slice Size with no records",
+        "Reduce Slice Size for the dense data",
     ],
 )
-def test_expand_stream_slices_job_size(
+def test_adjust_stream_slices_job_size(
+    mocker,
     request,
     requests_mock,
     bulk_job_completed_response,
     stream,
     json_content_example,
-    last_job_elapsed_time,
+    object_count,
+    learned_rates,
     previous_slice_size,
     adjusted_slice_size,
     auth_config,
 ) -> None:
     stream = stream(auth_config)
+    bulk_job_completed_response["data"]["node"]["objectCount"] = object_count
     # get the mocked job_result_url
     test_result_url = bulk_job_completed_response.get("data").get("node").get("url")
     # mocking the result url with jsonl content
@@ -505,14 +585,12 @@ def test_expand_stream_slices_job_size(
     # mocking nested api call to get data from result url
     requests_mock.get(test_result_url, text=request.getfixturevalue(json_content_example))
 
-    # for the sake of simplicity we fake some parts to simulate the `current_job_time_elapsed`
+    # for the sake of simplicity we fake some parts to simulate the learned rates and the job taking 100 sec.
+    stream.job_manager._job_size_controller.set_state({"bulk_job_rates": learned_rates})
+    mocker.patch("source_shopify.shopify_graphql.bulk.job.time", side_effect=[0, 100])
+    first_slice = next(stream.stream_slices())
     # fake current slice interval value
     stream.job_manager._job_size = previous_slice_size
-    # fake `last job elapsed time`
-    if last_job_elapsed_time:
-        stream.job_manager._job_last_elapsed_time = last_job_elapsed_time
-
-    first_slice = next(stream.stream_slices())
     list(stream.read_records(SyncMode.incremental, stream_slice=first_slice))
     # check the next slice
     assert stream.job_manager._job_size == adjusted_slice_size
@@ -0,0 +1,83 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+"""
+The microbenchmark for the `ShopifyBulkRecord.read_file()` throughput.
+
+Skipped by default, to run:
+    SHOPIFY_BULK_BENCHMARK=1 pytest -s unit_tests/graphql_bulk/test_record_benchmark.py
+
+The number of the JSONL lines generated could be overidden with `SHOPIFY_BULK_BENCHMARK_LINES` (default: 1_000_000).
+"""
+
+import json
+import os
+import time
+from typing import Any, Iterable, MutableMapping
+
+import pytest
+from source_shopify.shopify_graphql.bulk.query import ShopifyBulkQuery
+from source_shopify.shopify_graphql.bulk.record import ShopifyBulkRecord
+from source_shopify.shopify_graphql.bulk.tools import END_OF_FILE
+
+
+BENCHMARK_LINES: int = int(os.getenv("SHOPIFY_BULK_BENCHMARK_LINES", 1_000_000))
+# each `Order` record is followed by the number of `LineItem` components
+LINE_ITEMS_PER_ORDER: int = 4
+
+
+class OrderLineItems(ShopifyBulkQuery):
+    query_name = "orders"
+    record_composition = {
+        "new_record": "Order",
+        "record_components": ["LineItem"],
+    }
+
+    def record_process_components(self, record: MutableMapping[str, Any]) -> Iterable[MutableMapping[str, Any]]:
+        line_items = record.get("record_components", {}).get("LineItem", [])
+        record["line_items"] = [self.tools.fields_names_to_snake_case(line_item) for line_item in line_items]
+        record.pop("record_components", None)
+        yield record
+
+
+def _generate_jsonl(filename: str, lines: int) -> None:
+    with open(filename, "w") as jsonl_file:
+        order_id = 0
+        for line in range(lines):
+            if line % (LINE_ITEMS_PER_ORDER + 1) == 0:
+                order_id += 1
+                entity = {
+                    "__typename": "Order",
+                    "id": f"gid://shopify/Order/{order_id}",
+                    "createdAt": "2024-01-01T00:00:00Z",
+                    "updatedAt": "2024-01-01T00:00:00Z",
+                    "displayFinancialStatus": "PAID",
+                    "totalPriceSet": {"shopMoney": {"amount": "10.0", "currencyCode": "USD"}},
+                }
+            else:
+                entity = {
+                    "__typename": "LineItem",
+                    "id": f"gid://shopify/LineItem/{line}",
+                    "currentQuantity": 1,
+                    "variantTitle": "Default",
+                    "originalUnitPriceSet": {"shopMoney": {"amount": "2.5", "currencyCode": "USD"}},
+                    "__parentId": f"gid://shopify/Order/{order_id}",
+                }
+            jsonl_file.write(json.dumps(entity) + "\n")
+        jsonl_file.write(END_OF_FILE)
+
+
+@pytest.mark.skipif(not os.getenv("SHOPIFY_BULK_BENCHMARK"), reason="The benchmark is enabled with `SHOPIFY_BULK_BENCHMARK=1`")
+def test_read_file_records_per_second(basic_config, tmp_path) -> None:
+    filename = str(tmp_path / "bulk-benchmark.jsonl")
+    _generate_jsonl(filename, BENCHMARK_LINES)
+
+    record_producer = ShopifyBulkRecord(OrderLineItems(basic_config))
+    start = time.perf_counter()
+    produced = sum(1 for _ in record_producer.read_file(filename))
+    elapsed = time.perf_counter() - start
+
+    expected = -(-BENCHMARK_LINES // (LINE_ITEMS_PER_ORDER + 1))
+    assert produced == expected
+    print(
+        f"\nShopify BULK `read_file`: {BENCHMARK_LINES} lines, {produced} records in {elapsed:.2f}s, {produced / elapsed:.0f} records/sec."
+    )
@@ -0,0 +1,153 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+
+from os import remove
+
+from source_shopify.shopify_graphql.bulk.query import ShopifyBulkTemplates
+from source_shopify.shopify_graphql.bulk.scheduler import ShopifyBulkJobScheduler
+from source_shopify.shopify_graphql.bulk.status import ShopifyBulkJobStatus
+from source_shopify.streams.streams import MetafieldOrders, Products
+
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.streams.http.requests_native_auth import TokenAuthenticator
+
+
+_SCHEDULED_JOB_ID = "gid://shopify/BulkOperation/4046733967549"
+
+
+def test_scheduler_statuses_template() -> None:
+    query = ShopifyBulkTemplates.statuses(["gid://shopify/BulkOperation/1", "gid://shopify/BulkOperation/2"])
+    assert 'nodes(ids: ["gid://shopify/BulkOperation/1", "gid://shopify/BulkOperation/2"])' in query
+
+
+def test_scheduler_disabled_by_default(auth_config) -> None:
+    scheduler = ShopifyBulkJobScheduler()
+    stream = Products(auth_config)
+    stream.set_bulk_job_scheduler(scheduler)
+    assert not scheduler.enabled
+    assert not stream.job_manager._job_scheduler
+
+
+def test_scheduler_runs_next_stream_job_ahead_of_time(
+    requests_mock,
+    auth_config,
+    bulk_successful_response,
+    bulk_job_completed_response,
+    metafield_jsonl_content_example,
+    metafield_parse_response_expected_result,
+) -> None:
+    scheduler = ShopifyBulkJobScheduler(max_concurrent_jobs=2)
+    scheduler._poll_interval = 0
+    scheduler.set_streams_order(["products", "metafield_orders"])
+    current_stream = Products(auth_config)
+    next_stream = MetafieldOrders(auth_config)
+    current_stream.set_bulk_job_scheduler(scheduler, {})
+    next_stream.set_bulk_job_scheduler(scheduler, {})
+
+    completed_node = bulk_job_completed_response["data"]["node"]
+    # the job created by the scheduler is `COMPLETED` by the first status check
+    nodes_response = {"data": {"nodes": [{**completed_node, "id": _SCHEDULED_JOB_ID}]}}
+    bodies = []
+
+    def graphql_response(request, context):
+        body = request.json()["query"]
+        bodies.append(body)
+        if "bulkOperationRunQuery" in body:
+            return bulk_successful_response
+        elif "nodes(ids" in body:
+            return nodes_response
+        return bulk_job_completed_response
+
+    requests_mock.post(next_stream.job_manager.base_url, json=graphql_response)
+    requests_mock.get(completed_node["url"], text=metafield_jsonl_content_example)
+
+    # the current stream starts, the scheduler creates the job for the next one
+    current_stream.job_manager.job_claim_scheduled()
+    scheduler._worker.join(timeout=10)
+
+    assert next_stream.job_manager._job_state == ShopifyBulkJobStatus.COMPLETED.value
+    assert next_stream.job_manager._job_result_filename == "scheduled-bulk-123456789.jsonl"
+    assert sum("bulkOperationRunQuery" in body for body in bodies) == 1
+    assert sum("nodes(ids" in body for body in bodies) == 1
+
+    # the next stream adopts the completed job, instead of creating the new one
+    stream_slice = next(iter(next_stream.stream_slices(sync_mode=SyncMode.incremental, stream_state={})))
+    records = list(next_stream.read_records(SyncMode.incremental, stream_slice=stream_slice, stream_state={}))
+    assert records == [metafield_parse_response_expected_result]
+    assert sum("bulkOperationRunQuery" in body for body in bodies) == 1
+    scheduler.stop()
+
+
+def test_scheduler_discards_unclaimed_jobs_on_stop(mocker, auth_config) -> None:
+    scheduler = ShopifyBulkJobScheduler(max_concurrent_jobs=2)
+    stream = MetafieldOrders(auth_config)
+    stream.set_bulk_job_scheduler(scheduler, {})
+    stream.job_manager._job_id = _SCHEDULED_JOB_ID
+    stream.job_manager._job_scheduled_slice = {}
+    stream.job_manager._job_state = ShopifyBulkJobStatus.COMPLETED.value
+    stream.job_manager._job_result_filename = "bulk-scheduled.jsonl"
+    with open(stream.job_manager._job_result_filename, "w") as result:
+        result.write("")
+    remove_mock = mocker.patch("source_shopify.shopify_graphql.bulk.scheduler.remove", side_effect=remove)
+    scheduler.stop()
+    remove_mock.assert_called_once_with("bulk-scheduled.jsonl")
+
+
+def test_scheduler_uses_own_http_client(auth_config) -> None:
+    auth_config["authenticator"] = TokenAuthenticator("test_access_token")
+    scheduler = ShopifyBulkJobScheduler(max_concurrent_jobs=2)
+    stream = MetafieldOrders(auth_config)
+    stream.set_bulk_job_scheduler(scheduler, {})
+    assert scheduler.http_client is not stream.job_manager.http_client
+    assert scheduler.http_client._session is not stream.job_manager.http_client._session
+    # the scheduler authenticates with the authenticator of the stream
+    assert scheduler.http_client._session.auth is auth_config["authenticator"]
+
+
+def test_scheduler_result_downloaded_while_stream_is_claimed(
+    mocker, requests_mock, auth_config, bulk_job_completed_response, metafield_jsonl_content_example
+) -> None:
+    scheduler = ShopifyBulkJobScheduler(max_concurrent_jobs=2)
+    stream = MetafieldOrders(auth_config)
+    stream.set_bulk_job_scheduler(scheduler, {})
+    stream.job_manager._job_id = _SCHEDULED_JOB_ID
+    stream.job_manager._job_state = ShopifyBulkJobStatus.CREATED.value
+    completed_node = {**bulk_job_completed_response["data"]["node"], "id": _SCHEDULED_JOB_ID}
+    requests_mock.get(completed_node["url"], text=metafield_jsonl_content_example)
+    download = stream.job_manager.job_download_scheduled_result
+
+    def claim_during_download(*args, **kwargs):
+        # the stream lock is not held during the download, so the stream could start meanwhile
+        stream.job_manager.job_claim_scheduled()
+        return download(*args, **kwargs)
+
+    mocker.patch.object(stream.job_manager, "job_download_scheduled_result", side_effect=claim_during_download)
+    remove_mock = mocker.patch("source_shopify.shopify_graphql.bulk.scheduler.remove", side_effect=remove)
+    scheduler._on_job_status(scheduler._streams[stream.name], completed_node)
+    scheduler.stop()
+
+    # the stream checks the job status and collects the result on it's own
+    remove_mock.assert_called_once_with("scheduled-bulk-123456789.jsonl")
+    assert stream.job_manager._job_state == ShopifyBulkJobStatus.CREATED.value
+    assert not stream.job_manager._job_result_filename
+
+
+def test_scheduler_stream_registered_during_poll(mocker, auth_config, bulk_job_completed_response) -> None:
+    scheduler = ShopifyBulkJobScheduler(max_concurrent_jobs=2)
+    stream = MetafieldOrders(auth_config)
+    stream.set_bulk_job_scheduler(scheduler, {})
+    running_node = {**bulk_job_completed_response["data"]["node"], "id": _SCHEDULED_JOB_ID, "status": ShopifyBulkJobStatus.RUNNING.value}
+
+    def register_during_poll(*args, **kwargs):
+        # the next stream is registered, while the statuses are being checked
+        Products(auth_config).set_bulk_job_scheduler(scheduler, {})
+        response = mocker.Mock()
+        response.json.return_value = {"data": {"nodes": [running_node]}}
+        return None, response
+
+    mocker.patch.object(scheduler.http_client, "send_request", side_effect=register_during_poll)
+    on_job_status = mocker.patch.object(scheduler, "_on_job_status")
+    scheduler._poll({_SCHEDULED_JOB_ID: stream.name})
+
+    on_job_status.assert_called_once_with(scheduler._streams[stream.name], running_node)
+    assert "products" in scheduler._streams
@@ -0,0 +1,115 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+
+from typing import List, Tuple
+
+import pytest
+from source_shopify.shopify_graphql.bulk.slicer import BULK_JOB_RATES_STATE_KEY, ShopifyBulkJobSizeController
+
+
+# the job timeline entry: (slice size in days, records collected, elapsed time in sec.)
+JobTimeline = List[Tuple[float, int, float]]
+
+# the timeline recorded for the dense store, starting from the default `P30D` slice size
+RECORDED_DENSE_TIMELINE: JobTimeline = [
+    (30.0, 100000, 2400.0),
+    (15.0, 100000, 2350.0),
+    (7.5, 98000, 2210.0),
+    (3.75, 51000, 1130.0),
+    (1.875, 24500, 560.0),
+    (1.875, 26000, 590.0),
+    (1.9, 25100, 575.0),
+]
+
+
+def _controller(**kwargs) -> ShopifyBulkJobSizeController:
+    params = {"size_min": 0.1, "size_max": 30.0, "target_elapsed_time": 600.0, "max_records": 100_000}
+    return ShopifyBulkJobSizeController(**{**params, **kwargs})
+
+
+def replay(controller: ShopifyBulkJobSizeController, timeline: JobTimeline) -> List[float]:
+    """
+    Replays the recorded job timeline, returns the slice sizes picked after each job.
+    """
+    sizes = []
+    for size, records, elapsed_time in timeline:
+        controller.observe(size, records, elapsed_time)
+        sizes.append(controller.next_size(size))
+    return sizes
+
+
+def simulate(
+    controller: ShopifyBulkJobSizeController,
+    records_per_day: float,
+    records_per_second: float,
+    start_size: float,
+    jobs: int,
+    job_overhead: float = 5.0,
+) -> JobTimeline:
+    """
+    Simulates the store with the uniform data `records_per_day` density and the server-side `records_per_second` throughput,
+    the jobs collecting more than `max_records` are checkpointed, so only the part of the slice is collected.
+    """
+    timeline = []
+    size = start_size
+    for _ in range(jobs):
+        records = int(records_per_day * size)
+        collected_size = size
+        if controller.max_records and records > controller.max_records:
+            records = controller.max_records
+            collected_size = records / records_per_day
+        elapsed_time = job_overhead + records / records_per_second
+        timeline.append((size, records, elapsed_time))
+        controller.observe(collected_size, records, elapsed_time)
+        size = controller.next_size(size)
+    return timeline
+
+
+@pytest.mark.parametrize(
+    "records_per_day, records_per_second, start_size, expected_size",
+    [
+        # 30k records (600 sec. * 50 records/sec.) per job, with 20k records per day
+        (20_000, 50, 30.0, 1.5),
+        # the job is kept below the checkpoint interval (80% of 100k records)
+        (50_000, 500, 30.0, 1.6),
+        # the sparse store, the slice is expanded to the max
+        (5, 50, 1.0, 30.0),
+    ],
+    ids=["dense", "dense with checkpointing", "sparse"],
+)
+def test_simulated_store_converges(records_per_day, records_per_second, start_size, expected_size) -> None:
+    timeline = simulate(_controller(), records_per_day, records_per_second, start_size, jobs=10)
+    sizes = [size for size, _, _ in timeline]
+    # converges within a few jobs
+    assert sizes[7] == pytest.approx(expected_size, rel=0.1)
+    # and stays there, without the oscillation
+    for previous, current in zip(sizes[7:], sizes[8:]):
+        assert current == pytest.approx(previous, rel=0.1)
+    # all jobs are within the termination threshold
+    assert all(elapsed_time < 3600 for _, _, elapsed_time in timeline)
+
+
+def test_replay_recorded_timeline() -> None:
+    sizes = replay(_controller(), RECORDED_DENSE_TIMELINE)
+    # the slice is never changed more than twice per job
+    for (size, _, _), next_size in zip(RECORDED_DENSE_TIMELINE, sizes):
+        assert size / 2 <= next_size <= size * 2
+    # the last jobs are close to the target elapsed time, so the size is stable
+    assert sizes[-1] == pytest.approx(RECORDED_DENSE_TIMELINE[-1][0], rel=0.2)
+
+
+def test_controller_state() -> None:
+    controller = _controller()
+    assert controller.get_state() is None
+    controller.observe(1.0, 1000, 10.0)
+    state = {BULK_JOB_RATES_STATE_KEY: controller.get_state()}
+    assert state[BULK_JOB_RATES_STATE_KEY] == {"records_per_day": 1000.0, "records_per_second": 100.0}
+
+    restored = _controller()
+    restored.set_state(state)
+    # 100 records/sec. * 600 sec. / 1000 records per day
+    assert restored.initial_size(30.0) == pytest.approx(30.0)
+    restored.set_state({BULK_JOB_RATES_STATE_KEY: {"records_per_day": 20000, "records_per_second": 50}})
+    assert restored.initial_size(30.0) == pytest.approx(1.5)
+    # the malformed state is ignored
+    _controller().set_state({BULK_JOB_RATES_STATE_KEY: {"records_per_day": "n/a", "records_per_second": 1}})
@@ -10,6 +10,8 @@ def test_camel_to_snake() -> None:
     assert BulkTools.camel_to_snake("camelCase") == "camel_case"
     assert BulkTools.camel_to_snake("snake_case") == "snake_case"
     assert BulkTools.camel_to_snake("PascalCase") == "pascal_case"
+    assert BulkTools.camel_to_snake("__typename") == "typename"
+    assert BulkTools.camel_to_snake("shopMoneyAmountV2") == "shop_money_amount_v2"
 
 
 @pytest.mark.parametrize(
@@ -48,6 +50,17 @@ def test_fields_names_to_snake_case() -> None:
     assert BulkTools().fields_names_to_snake_case(dict_input) == expected_output
 
 
+def test_fields_names_to_snake_case_cache() -> None:
+    tools = BulkTools(field_names_cache_max_size=3)
+    assert tools.fields_names_to_snake_case({"camelCase": 1, "otherCase": 2}) == {"camel_case": 1, "other_case": 2}
+    # the `__parentId` is always cached, the cache is bounded by the `field_names_cache_max_size`
+    assert tools._field_names_cache == {"__parentId": "__parentId", "camelCase": "camel_case", "otherCase": "other_case"}
+    assert tools.fields_names_to_snake_case({"notCachedCase": 3}) == {"not_cached_case": 3}
+    assert "notCachedCase" not in tools._field_names_cache
+    # missing nested entities are returned as `None`
+    assert tools.fields_names_to_snake_case(None) is None
+
+
 def test_resolve_str_id() -> None:
     assert BulkTools.resolve_str_id("123") == 123
     assert BulkTools.resolve_str_id("456", str) == "456"
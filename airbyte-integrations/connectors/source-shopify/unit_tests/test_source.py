@@ -517,3 +517,9 @@ def test_countries_parse_response(config, countries_response_data, countries_exp
         countries_expected_record_data,
     ]
     assert list(records) == expected_records
+
+
+def test_bulk_streams_state_is_not_shared():
+    source, other_source = SourceShopify(), SourceShopify()
+    source._bulk_streams_state["products"] = {"updated_at": "2024-01-01T00:00:00+00:00"}
+    assert other_source._bulk_streams_state == {}